@@ -0,0 +1,65 @@
+import argparse
+import sys
+from typing import Optional
+
+from architecture_simulator.simulation.batch import load_manifest, run_batch
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """Entry point of archsim-batch, which runs all programs of a manifest with all of its configurations
+    and writes the results as JSON lines. See load_manifest() for the format of the manifest.
+
+    Args:
+        argv (Optional[list[str]], optional): Command line arguments. Defaults to sys.argv[1:].
+
+    Returns:
+        int: 0 if all jobs finished, 1 otherwise.
+    """
+    parser = argparse.ArgumentParser(
+        prog="archsim-batch",
+        description="Runs RISC-V programs with several configurations of the simulator in parallel.",
+    )
+    parser.add_argument(
+        "manifest", help="JSON file with the programs and configurations"
+    )
+    parser.add_argument(
+        "-o",
+        "--output",
+        help="JSONL file for the results, one line per job (default: stdout)",
+    )
+    parser.add_argument(
+        "-j",
+        "--workers",
+        type=int,
+        help="number of worker processes (default: all processors)",
+    )
+    parser.add_argument(
+        "--max-instructions",
+        type=int,
+        help="instruction limit of every job, overrides the manifest",
+    )
+    parser.add_argument(
+        "--time-limit",
+        type=float,
+        help="time limit of every job in seconds, overrides the manifest",
+    )
+    args = parser.parse_args(argv)
+
+    jobs = load_manifest(args.manifest)
+    for job in jobs:
+        if args.max_instructions is not None:
+            job.max_instructions = args.max_instructions
+        if args.time_limit is not None:
+            job.time_limit = args.time_limit
+    if args.output is None:
+        unfinished = run_batch(jobs, sys.stdout, args.workers)
+    else:
+        with open(args.output, "w") as output:
+            unfinished = run_batch(jobs, output, args.workers)
+    if unfinished:
+        print(f"{unfinished} of {len(jobs)} jobs did not finish.", file=sys.stderr)
+    return 1 if unfinished else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,6 @@
 from architecture_simulator.simulation.riscv_simulation import RiscvSimulation
 from architecture_simulator.simulation.toy_simulation import ToySimulation
+from architecture_simulator.settings.settings import Settings
 from typing import Optional, Union
 from architecture_simulator.uarch.memory.memory_system import MemorySystem
 from architecture_simulator.uarch.memory.memory import Memory
@@ -40,8 +41,17 @@ List of available commands:
     '-toyProcessor'
     or
     '-fiveStage'
+    or
+    '-functional' (fastest, no pipeline visualization)
     Turn off data hazard detection in five-stage mode:
     '-noDataHazardDetection'
+    Turn on data forwarding in five-stage mode:
+    '-forwarding'
+    Set the number of cycles an M extension instruction spends in the
+    execute stage in five-stage mode (may be given multiple times):
+    '-latency=<mnemonic>:<cycles>'
+    Let independent multiplications follow each other without stalls:
+    '-pipelinedMultiplier'
     Conduct some number of execution cycles or run until done:
     '-step=<number of steps>'
     or
@@ -58,6 +68,9 @@ List of available commands:
 'step <number>' will execute <number> execution cycles or fewer,
                 if done earlier.
 
+'back <number>' will undo the last <number> steps (default 1), as far as
+                the history reaches back. Steps done by 'run' can not be undone.
+
 'run' will conduct execution cycles until done
       or the program is manually aborted by the user.
 
@@ -65,13 +78,16 @@ List of available commands:
                   state in that format.
     <format> = 'sdec' or 'udec' or 'hex' or 'bin'.
 
+'cache' will display the hits and the compulsory, capacity and conflict
+        misses of the caches, also for every set.
+
 'help' will bring up this help page.
 
 'exit' will close the program.
 =========================================================================="""
 
 # Args of load command
-mode_args = ["-singlestage", "-toyprocessor", "-fivestage"]
+mode_args = ["-singlestage", "-toyprocessor", "-fivestage", "-functional"]
 execution_args = ["-run"]  # step=<int>
 
 # Modes for displaying register and memory values
@@ -90,7 +106,9 @@ def main():
         LoadCommand(),
         RunCommand(),
         StepCommand(),
+        BackCommand(),
         ShowCommand(),
+        CacheCommand(),
         ExitCommand(),
     ]
     list_of_command_names = [cmd.get_name() for cmd in list_of_commands]
@@ -178,6 +196,7 @@ def display(sim: Union[ToySimulation, RiscvSimulation], display_mode: str) -> st
         res += hline
         res += "Performance Metrics:\n"
         res += sim.state.performance_metrics.__repr__()
+        res += sim.get_cache_stats_repr()
         res += hline
         return res
     else:
@@ -549,6 +568,9 @@ class LoadCommand(Command):
                 el in mode_args + display_args + execution_args
                 or el.startswith("-step=")
                 or el == "-nodatahazarddetection"
+                or el == "-forwarding"
+                or el.startswith("-latency=")
+                or el == "-pipelinedmultiplier"
             ):
                 unknown_arg = el
         if not unknown_arg == "":
@@ -561,6 +583,8 @@ class LoadCommand(Command):
             mode = "toy_simulation"
         elif "-fivestage" in command:
             mode = "five_stage_pipeline"
+        elif "-functional" in command:
+            mode = "functional"
         else:
             mode = "single_stage_pipeline"
 
@@ -573,6 +597,40 @@ class LoadCommand(Command):
 
         data_hazard_detection = not "-nodatahazarddetection" in command
 
+        # check for forwarding
+        if not mode == "five_stage_pipeline" and "-forwarding" in command:
+            return CommandResult(
+                "'-forwarding' is only available in combination with '-fiveStage'.",
+                sim,
+            )
+
+        forwarding = "-forwarding" in command
+
+        # check for execution latencies
+        execution_latencies = dict(Settings().get()["execution_latencies"])
+        for el in command:
+            if not el.startswith("-latency="):
+                continue
+            if not mode == "five_stage_pipeline":
+                return CommandResult(
+                    "'-latency' is only available in combination with '-fiveStage'.",
+                    sim,
+                )
+            mnemonic, _, cycles = el[len("-latency=") :].partition(":")
+            if mnemonic not in execution_latencies or not cycles.isdigit():
+                return CommandResult(
+                    f"Exception: {el} is not a valid latency, use '-latency=<mnemonic>:<cycles>' with one of "
+                    + ", ".join(execution_latencies),
+                    sim,
+                )
+            execution_latencies[mnemonic] = max(int(cycles), 1)
+        if not mode == "five_stage_pipeline" and "-pipelinedmultiplier" in command:
+            return CommandResult(
+                "'-pipelinedMultiplier' is only available in combination with '-fiveStage'.",
+                sim,
+            )
+        pipelined_multiplier = "-pipelinedmultiplier" in command
+
         # check for change of display mode
         change_dp_mode_args = [el for el in command if el in display_args]
         if len(change_dp_mode_args) == 1:
@@ -585,7 +643,11 @@ class LoadCommand(Command):
         # create new sim
         if not mode == "toy_simulation":
             new_sim = RiscvSimulation(
-                mode=mode, detect_data_hazards=data_hazard_detection
+                mode=mode,
+                detect_data_hazards=data_hazard_detection,
+                forwarding=forwarding,
+                execution_latencies=execution_latencies,
+                pipelined_multiplier=pipelined_multiplier,
             )
         else:
             new_sim = ToySimulation()
@@ -727,6 +789,52 @@ class StepCommand(Command):
         return CommandResult(step(sim, command[1], display_mode), sim)
 
 
+class BackCommand(Command):
+    """
+    BackCommand implements Command.
+    """
+
+    _name = "back"
+
+    def __call__(
+        self,
+        sim: Optional[Union[ToySimulation, RiscvSimulation]],
+        command: list[str],
+        display_mode: str,
+    ) -> CommandResult:
+        """
+        Implements the 'back' command, that will undo a number of steps and display the resulting state.
+
+        Parameters:
+        sim : Optional[Union[ToySimulation, RiscvSimulation]]
+        command : list[str]
+        display_mode: str
+
+        Returns:
+        CommandResult.
+        """
+        if sim is None:
+            return CommandResult(
+                "You have not set a simulation. Please execute the 'load' command.", sim
+            )
+        if len(command) > 2:
+            return CommandResult("'back' expects no more than one argument.", sim)
+        num_str = command[1] if len(command) == 2 else "1"
+        try:
+            num_int = int(num_str)
+        except ValueError:
+            return CommandResult(f"{num_str} could not be cast to an int.", sim)
+        if isinstance(sim, ToySimulation):
+            # the undo log of the toy simulation counts cycles, a step has two of them
+            undone = sim.step_back(2 * num_int) // 2
+        else:
+            undone = sim.step_back(num_int)
+        output = ""
+        if undone < num_int:
+            output = f"Only {undone} steps could be undone.\n"
+        return CommandResult(output + display(sim, display_mode), sim)
+
+
 class ShowCommand(Command):
     """
     ShowCommand implements Command.
@@ -764,6 +872,43 @@ class ShowCommand(Command):
         return CommandResult(display(sim, dp_mode), sim, False, dp_mode)
 
 
+class CacheCommand(Command):
+    """
+    CacheCommand implements Command.
+    """
+
+    _name = "cache"
+
+    def __call__(
+        self,
+        sim: Optional[Union[ToySimulation, RiscvSimulation]],
+        command: list[str],
+        display_mode: str,
+    ) -> CommandResult:
+        """
+        Implements the 'cache' command, that will display the cache statistics including the misses of every set.
+
+        Parameters:
+        sim : Optional[Union[ToySimulation, RiscvSimulation]]
+        command : list[str]
+        display_mode: str
+
+        Returns:
+        CommandResult.
+        """
+        if not len(command) == 1:
+            return CommandResult("'cache' takes no arguments.", sim)
+        if not isinstance(sim, RiscvSimulation):
+            return CommandResult(
+                "There is no RISC-V simulation. Please execute the 'load' command first.",
+                sim,
+            )
+        output = sim.get_cache_stats_repr(per_set=True)
+        if output == "":
+            output = "The simulation does not use a cache."
+        return CommandResult(output, sim)
+
+
 class ExitCommand(Command):
     """
     ExitCommand implements Command.
@@ -20,12 +20,16 @@ def get_riscv_simulation(
     data_hazard_detection: bool,
     data_cache_options: CacheOptions,
     instruction_cache_options: CacheOptions,
+    l2_cache_options: CacheOptions,
 ) -> RiscvSimulation:
     """Creates a new RiscvSimulation.
 
     Args:
-        pipeline_mode (str): "five_stage_pipeline" or "single_stage_pipeline"
+        pipeline_mode (str): "five_stage_pipeline", "single_stage_pipeline" or "functional" (no visualization)
         data_hazard_detection (bool): Whether to enable data hazard detection (only relevant for five stage pipeline)
+        data_cache_options (CacheOptions): Options of the L1 data cache.
+        instruction_cache_options (CacheOptions): Options of the L1 instruction cache.
+        l2_cache_options (CacheOptions): Options of the L2 cache behind both L1 caches.
 
     Returns:
         RiscvSimulation: The Simulation object.
@@ -35,6 +39,7 @@ def get_riscv_simulation(
         detect_data_hazards=data_hazard_detection,
         data_cache=data_cache_options,
         instruction_cache=instruction_cache_options,
+        l2_cache=l2_cache_options,
     )
 
 
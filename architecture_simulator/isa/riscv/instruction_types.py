@@ -1,9 +1,9 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from typing import Optional, TYPE_CHECKING
-import fixedint
 
 from architecture_simulator.uarch.riscv.control_unit_signals import ControlUnitSignals
+from architecture_simulator.util.integer_arithmetic import to_unsigned32
 from ..instruction import Instruction
 
 if TYPE_CHECKING:
@@ -103,7 +103,7 @@ class RiscvInstruction(Instruction):
 
         Args:
             write_register (Optional[int]): register index to write the data to or None.
-            register_write_data (Optional[int]): Data to be written to the register. Needs to be casted to fixedint.UInt32
+            register_write_data (Optional[int]): Data to be written to the register. Needs to be reduced to an unsigned 32 bit value
             architectural_state (ArchitecturalState): architectural state
         """
 
@@ -134,8 +134,8 @@ class RTypeInstruction(RiscvInstruction):
         return (
             self.rs1,
             self.rs2,
-            int(architectural_state.register_file.registers[self.rs1]),
-            int(architectural_state.register_file.registers[self.rs2]),
+            architectural_state.register_file.read(self.rs1),
+            architectural_state.register_file.read(self.rs2),
             None,
         )
 
@@ -174,8 +174,8 @@ class RTypeInstruction(RiscvInstruction):
     ):
         assert write_register is not None
         assert register_write_data is not None
-        architectural_state.register_file.registers[write_register] = fixedint.UInt32(
-            register_write_data
+        architectural_state.register_file.write(
+            write_register, to_unsigned32(register_write_data)
         )
 
 
@@ -204,7 +204,7 @@ class ITypeInstruction(RiscvInstruction):
         return (
             self.rs1,
             None,
-            int(architectural_state.register_file.registers[self.rs1]),
+            architectural_state.register_file.read(self.rs1),
             None,
             self.imm,
         )
@@ -243,8 +243,8 @@ class ITypeInstruction(RiscvInstruction):
     ):
         assert write_register is not None
         assert register_write_data is not None
-        architectural_state.register_file.registers[write_register] = fixedint.UInt32(
-            register_write_data
+        architectural_state.register_file.write(
+            write_register, to_unsigned32(register_write_data)
         )
 
 
@@ -365,8 +365,8 @@ class BTypeInstruction(RiscvInstruction):
         return (
             self.rs1,
             self.rs2,
-            int(architectural_state.register_file.registers[self.rs1]),
-            int(architectural_state.register_file.registers[self.rs2]),
+            architectural_state.register_file.read(self.rs1),
+            architectural_state.register_file.read(self.rs2),
             self.imm,
         )
 
@@ -405,8 +405,8 @@ class UTypeInstruction(RiscvInstruction):
     ):
         assert write_register is not None
         assert register_write_data is not None
-        architectural_state.register_file.registers[write_register] = fixedint.UInt32(
-            register_write_data
+        architectural_state.register_file.write(
+            write_register, to_unsigned32(register_write_data)
         )
 
     def access_register_file(
@@ -449,8 +449,8 @@ class JTypeInstruction(RiscvInstruction):
     ):
         assert write_register is not None
         assert register_write_data is not None
-        architectural_state.register_file.registers[write_register] = fixedint.UInt32(
-            register_write_data
+        architectural_state.register_file.write(
+            write_register, to_unsigned32(register_write_data)
         )
 
     def access_register_file(
@@ -0,0 +1,151 @@
+from __future__ import annotations
+from collections import OrderedDict
+import hashlib
+import os
+from pathlib import Path
+import pickle
+from typing import Optional, TYPE_CHECKING
+
+from architecture_simulator.settings.settings import Settings
+from .riscv_parser import ParsedProgram, RiscvParser
+
+if TYPE_CHECKING:
+    from architecture_simulator.uarch.riscv.riscv_architectural_state import (
+        RiscvArchitecturalState,
+    )
+
+# part of the key, has to be changed whenever ParsedProgram or the instruction classes change,
+# so that the files of older versions are not used anymore
+CACHE_FORMAT_VERSION = 1
+
+
+class ProgramCache:
+    """A bounded LRU cache of parsed programs, so that loading the same program again does not parse it again.
+
+    The key is the SHA-256 hash of the source together with the address ranges of the instruction and the data memory,
+    which are the only parts of the state that the parser depends on. If a directory is given, the parsed programs are
+    also stored there as pickle files, which are used when a program is not in memory. Only use a directory that no one
+    else can write to, loading a pickle file can execute arbitrary code.
+    """
+
+    def __init__(self, max_entries: int = 32, directory: Optional[str | Path] = None):
+        """Constructor of the program cache.
+
+        Args:
+            max_entries (int, optional): Number of parsed programs that are kept in memory. Defaults to 32.
+            directory (Optional[str | Path], optional): Directory of the persistent tier, created if needed.
+                Defaults to None (only in memory).
+        """
+        self.max_entries = max_entries
+        self.directory = None if directory is None else Path(directory)
+        # key -> parsed program, least recently used first
+        self.entries: OrderedDict[str, ParsedProgram] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def load_program(self, program: str, state: RiscvArchitecturalState) -> None:
+        """Loads the program into the state. Parses it only if it is not in the cache.
+        Parser exceptions are raised like by RiscvParser.parse().
+
+        Args:
+            program (str): Text format RISC-V assembly program.
+            state (RiscvArchitecturalState): The architectural state into which the program should get loaded.
+        """
+        key = self._get_key(program, state)
+        parsed_program = self._get(key)
+        if parsed_program is not None:
+            self.hits += 1
+            parsed_program.load(state)
+            return
+        self.misses += 1
+        parser = RiscvParser()
+        parser.parse(program=program, state=state)
+        self._put(key, parser.get_parsed_program())
+
+    def clear(self) -> None:
+        """Removes all programs from the memory tier. The files of the persistent tier are kept."""
+        self.entries.clear()
+
+    def _get_key(self, program: str, state: RiscvArchitecturalState) -> str:
+        """Returns the key of the program, which is also the name of its file.
+
+        Args:
+            program (str): The program.
+            state (RiscvArchitecturalState): The state the program gets loaded into.
+
+        Returns:
+            str: The key.
+        """
+        instruction_range = state.instruction_memory.get_address_range()
+        data_range = state.memory.get_address_range()
+        return (
+            f"{hashlib.sha256(program.encode()).hexdigest()}"
+            f"-{instruction_range.start:x}-{instruction_range.stop:x}"
+            f"-{data_range.start:x}-{data_range.stop:x}-v{CACHE_FORMAT_VERSION}"
+        )
+
+    def _get(self, key: str) -> Optional[ParsedProgram]:
+        """Returns the parsed program from memory or from the directory and marks it as most recently used.
+
+        Args:
+            key (str): Key of the program.
+
+        Returns:
+            Optional[ParsedProgram]: The parsed program, None if it is not cached.
+        """
+        parsed_program = self.entries.get(key)
+        if parsed_program is not None:
+            self.entries.move_to_end(key)
+            return parsed_program
+        if self.directory is None:
+            return None
+        try:
+            with open(self.directory / f"{key}.pickle", "rb") as file:
+                parsed_program = pickle.load(file)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            # not stored or unreadable, the program gets parsed and stored again
+            return None
+        if not isinstance(parsed_program, ParsedProgram):
+            return None
+        self._put_in_memory(key, parsed_program)
+        return parsed_program
+
+    def _put(self, key: str, parsed_program: ParsedProgram) -> None:
+        """Stores the parsed program in memory and in the directory.
+
+        Args:
+            key (str): Key of the program.
+            parsed_program (ParsedProgram): The parsed program.
+        """
+        self._put_in_memory(key, parsed_program)
+        if self.directory is None:
+            return
+        try:
+            self.directory.mkdir(parents=True, exist_ok=True)
+            # written to another file first, so that other processes never read a partially written file
+            temporary_path = self.directory / f"{key}.{os.getpid()}.tmp"
+            with open(temporary_path, "wb") as file:
+                pickle.dump(parsed_program, file)
+            os.replace(temporary_path, self.directory / f"{key}.pickle")
+        except OSError:
+            # the persistent tier is only an optimization
+            pass
+
+    def _put_in_memory(self, key: str, parsed_program: ParsedProgram) -> None:
+        """Stores the parsed program in memory and evicts the least recently used one if the cache is full.
+
+        Args:
+            key (str): Key of the program.
+            parsed_program (ParsedProgram): The parsed program.
+        """
+        self.entries[key] = parsed_program
+        self.entries.move_to_end(key)
+        while len(self.entries) > self.max_entries:
+            self.entries.popitem(last=False)
+
+
+# used by RiscvSimulation.load_program()
+program_cache = ProgramCache(
+    max_entries=Settings().get()["program_cache_size"],
+    directory=Settings().get()["program_cache_directory"],
+)
@@ -1,5 +1,7 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from dataclasses import dataclass
+import re
+from typing import Optional, TYPE_CHECKING
 import pyparsing as pp
 import fixedint
 
@@ -25,6 +27,50 @@ if TYPE_CHECKING:
     )
 
 
+@dataclass
+class ParsedProgram:
+    """The result of parsing a program with RiscvParser, see RiscvParser.get_parsed_program()."""
+
+    instructions: list[RiscvInstruction]
+    # (address, number of bytes, value) of the values of the data section, in the order in which they were written
+    data: list[tuple[int, int, int]]
+
+    def load(self, state: RiscvArchitecturalState) -> None:
+        """Writes the program into the state, like RiscvParser.parse() does.
+
+        Args:
+            state (RiscvArchitecturalState): The architectural state into which the program should get loaded.
+        """
+        for address, length, value in self.data:
+            self.write_data_value(state, address, length, value)
+        state.instruction_memory.write_instructions(self.instructions)
+
+    @staticmethod
+    def write_data_value(
+        state: RiscvArchitecturalState, address: int, length: int, value: int
+    ) -> None:
+        """Writes a value of the data section directly into the memory of the state, bypassing the caches.
+
+        Args:
+            state (RiscvArchitecturalState): The state.
+            address (int): Address of the first byte.
+            length (int): Number of bytes, 1, 2 or 4.
+            value (int): The value, only the lowest 8 * length bits are used.
+        """
+        if length == 1:
+            state.memory.write_byte(
+                address, fixedint.UInt8(value), directly_write_to_lower_memory=True
+            )
+        elif length == 2:
+            state.memory.write_halfword(
+                address, fixedint.UInt16(value), directly_write_to_lower_memory=True
+            )
+        else:
+            state.memory.write_word(
+                address, fixedint.UInt32(value), directly_write_to_lower_memory=True
+            )
+
+
 class RiscvParser(Parser):
     """A parser for RISC-V programs. It is capable of turning a text form program into instruction objects."""
 
@@ -311,6 +357,101 @@ class RiscvParser(Parser):
         )
     ) + pp.StringEnd().suppress()
 
+    # instruction patterns and the mnemonics they can start with, in the order of _pattern_instruction
+    _instruction_patterns = [
+        (_pattern_r_type_instruction, _reg_reg_reg_mnemonics),
+        (_pattern_u_type_instruction, _u_type_mnemonics),
+        (_pattern_b_type_instruction, _b_type_mnemonics),
+        (_pattern_memory_instruction, _mem_i_type_mnemonics + _s_type_mnemonics),
+        (
+            _pattern_memory_pseudo_instruction,
+            _mem_i_type_mnemonics + _mem_pseudo_mnemonics,
+        ),
+        (_pattern_s_pseudo_instruction, _s_type_mnemonics),
+        (_pattern_reg_csr_reg_instruction, _csr_mnemonics),
+        (_pattern_reg_csr_imm_instruction, _csr_i_mnemonics),
+        (
+            _pattern_reg_reg_imm_instruction,
+            _normal_i_type_mnemonics
+            + _mem_i_type_mnemonics
+            + _b_type_mnemonics
+            + _s_type_mnemonics,
+        ),
+        (_pattern_fence_instruction, ["fence"]),
+        (_pattern_jal_instruction, ["jal"]),
+        (_pattern_ecall_ebreak_instruction, ["ecall", "ebreak"]),
+        (_pattern_nop_instruction, ["nop"]),
+        (_pattern_li_instruction, ["li"]),
+        (_pattern_reg_reg_instruction, _reg_reg_mnemonics),
+    ]
+
+    # _pattern_line without _pattern_instruction, for lines whose first word (after a label) is empty or a directive
+    _pattern_non_instruction_line = (
+        (
+            _pattern_directive
+            ^ _pattern_variable_declaration("variable_declaration")
+            ^ _pattern_string_declaration("variable_declaration")
+            ^ _pattern_zero_initialization("variable_declaration")
+            ^ (_pattern_label + _D_COL)("label_declaration")
+        )
+    ) + pp.StringEnd().suppress()
+
+    # optional label declaration and the first word after it
+    _line_start = re.compile(r"(?:[A-Za-z_][A-Za-z0-9_]*\s*:\s*)?(\S*)")
+
+    # lowercase mnemonic -> _pattern_line restricted to the instruction patterns of the mnemonic, see _get_line_pattern()
+    _mnemonic_line_patterns: Optional[dict[str, pp.ParserElement]] = None
+
+    @classmethod
+    def _get_mnemonic_line_patterns(cls) -> dict[str, pp.ParserElement]:
+        """Returns cls._mnemonic_line_patterns and creates it on the first call.
+
+        Returns:
+            dict[str, pp.ParserElement]: Lowercase mnemonic -> pattern of the lines that start with it.
+        """
+        if cls._mnemonic_line_patterns is None:
+            alternatives: dict[str, list[pp.ParserElement]] = {}
+            for pattern, mnemonics in cls._instruction_patterns:
+                for mnemonic in mnemonics:
+                    alternatives.setdefault(mnemonic, []).append(pattern)
+            cls._mnemonic_line_patterns = {}
+            for mnemonic, patterns in alternatives.items():
+                # the group never matches, it only makes the named result a list like the one of
+                # _pattern_instruction, also if no pattern of the mnemonic is a group
+                instruction = pp.Or(patterns + [pp.Group(pp.NoMatch())])
+                cls._mnemonic_line_patterns[mnemonic] = (
+                    pp.Optional(cls._pattern_label + cls._D_COL)("in_line_label")
+                    + instruction("instruction")
+                    + pp.StringEnd().suppress()
+                )
+        return cls._mnemonic_line_patterns
+
+    def _get_line_pattern(self, line: str) -> pp.ParserElement:
+        """Returns a pattern that parses the line like _pattern_line, but only tries the alternatives that can match it.
+        The choice only depends on the first word after an optional label declaration: for an instruction, only the
+        patterns of its mnemonic can match, because no mnemonic is a shorter one followed by a register name.
+
+        Args:
+            line (str): A sanitized line.
+
+        Returns:
+            pp.ParserElement: The restricted pattern, or _pattern_line if the first word is no known mnemonic.
+        """
+        first_word = self._line_start.match(line).group(1)  # type: ignore[union-attr]
+        if not first_word or first_word.startswith("."):
+            return self._pattern_non_instruction_line
+        return self._get_mnemonic_line_patterns().get(
+            first_word.lower(), self._pattern_line
+        )
+
+    def get_parsed_program(self) -> ParsedProgram:
+        """Returns what the last call of parse() has written into the state, so that it can be loaded again without parsing.
+
+        Returns:
+            ParsedProgram: The instructions and the data of the program.
+        """
+        return ParsedProgram(instructions=self.instructions, data=self.data_writes)
+
     def parse(self, program: str, state: RiscvArchitecturalState, **kwargs) -> None:
         """Parses the text format assembly program and loads it into the architectural state.
 
@@ -335,6 +476,22 @@ class RiscvParser(Parser):
         self._process_labels()
         self._write_instructions()
 
+    def _tokenize(self) -> None:
+        """Turns self.sanitized_program into tokens like Parser._tokenize().
+        Tries every line with the pattern of _get_line_pattern() first, which is much faster than the longest match
+        over all alternatives of _pattern_line. Lines it does not match are parsed with _pattern_line, so that the
+        errors are the same."""
+        self.token_list: list[tuple[int, str, pp.ParseResults]] = []
+        for line_number, line in self.sanitized_program:
+            try:
+                tokens = self._get_line_pattern(line).parseString(line)
+            except pp.ParseException:
+                try:
+                    tokens = self._pattern_line.parseString(line)
+                except pp.ParseException:
+                    raise ParserSyntaxException(line_number=line_number, line=line)
+            self.token_list.append((line_number, line, tokens))
+
     def _list_access_at_zero_and_remove_inline_labels(self) -> None:
         """
         Removes in line labels from self.text and saves them in self.in_line_labels.
@@ -358,6 +515,7 @@ class RiscvParser(Parser):
 
         # variables are stored as (name: (address, byte_length))
         self.variables: dict[str, tuple[int, int]] = {}
+        self.data_writes: list[tuple[int, int, int]] = []
         address_counter = self.state.memory.get_address_range().start
 
         # ensure address_counter is word alinged
@@ -384,33 +542,21 @@ class RiscvParser(Parser):
                         {line_parsed.get("name"): (address_counter, 1)}
                     )
                     for val in line_parsed.get("values"):
-                        self.state.memory.write_byte(
-                            address_counter,
-                            fixedint.UInt8(int(val, base=0)),
-                            directly_write_to_lower_memory=True,
-                        )
+                        self._write_data_value(address_counter, int(val, base=0), 1)
                         address_counter += 1
                 elif line_parsed.type.type == "half":
                     self.variables.update(
                         {line_parsed.get("name"): (address_counter, 2)}
                     )
                     for val in line_parsed.get("values"):
-                        self.state.memory.write_halfword(
-                            address_counter,
-                            fixedint.UInt16(int(val, base=0)),
-                            directly_write_to_lower_memory=True,
-                        )
+                        self._write_data_value(address_counter, int(val, base=0), 2)
                         address_counter += 2
                 elif line_parsed.type.type == "word":
                     self.variables.update(
                         {line_parsed.get("name"): (address_counter, 4)}
                     )
                     for val in line_parsed.get("values"):
-                        self.state.memory.write_word(
-                            address_counter,
-                            fixedint.UInt32(int(val, base=0)),
-                            directly_write_to_lower_memory=True,
-                        )
+                        self._write_data_value(address_counter, int(val, base=0), 4)
                         address_counter += 4
                 # strings are saved as byte arrays
                 elif line_parsed.type.type == "string":
@@ -418,18 +564,10 @@ class RiscvParser(Parser):
                         {line_parsed.get("name"): (address_counter, 1)}
                     )
                     for char in line_parsed.string[1:-1]:
-                        self.state.memory.write_byte(
-                            address_counter,
-                            fixedint.UInt8(ord(char)),
-                            directly_write_to_lower_memory=True,
-                        )
+                        self._write_data_value(address_counter, ord(char), 1)
                         address_counter += 1
                     # write null terminator
-                    self.state.memory.write_byte(
-                        address_counter,
-                        fixedint.UInt8(0),
-                        directly_write_to_lower_memory=True,
-                    )
+                    self._write_data_value(address_counter, 0, 1)
                     address_counter += 1
                 elif line_parsed.type.type == "zero":
                     num_words = int(line_parsed.get("value"))
@@ -667,6 +805,17 @@ class RiscvParser(Parser):
                 if mnemonic is not None and mnemonic.lower() in instruction_map:
                     instruction_address += instruction_map[mnemonic.lower()].length
 
+    def _write_data_value(self, address: int, value: int, length: int) -> None:
+        """Writes the value to the memory of self.state and records the write in self.data_writes.
+
+        Args:
+            address (int): Address of the first byte.
+            value (int): The value, only the lowest 8 * length bits are used.
+            length (int): Number of bytes, 1, 2 or 4.
+        """
+        self.data_writes.append((address, length, value))
+        ParsedProgram.write_data_value(self.state, address, length, value)
+
     def _write_instructions(self) -> None:
         """Instantiates the instructions from self.text and writes them to the instruction memory of self.state."""
 
@@ -776,6 +925,7 @@ class RiscvParser(Parser):
                 instructions.append(FENCE())
             address_count += instruction_map[line_parsed.mnemonic.lower()].length
 
+        self.instructions = instructions
         self.state.instruction_memory.write_instructions(instructions)
 
     def _convert_label_or_imm(
@@ -5,6 +5,19 @@ from dataclasses import dataclass
 import fixedint
 
 from architecture_simulator.uarch.riscv.control_unit_signals import ControlUnitSignals
+from architecture_simulator.util.integer_arithmetic import (
+    MASK_32,
+    to_unsigned32,
+    to_signed32,
+    sign_extend,
+    mulh,
+    mulhsu,
+    mulhu,
+    div,
+    divu,
+    rem,
+    remu,
+)
 from .instruction_types import (
     RiscvInstruction,
     RTypeInstruction,
@@ -51,17 +64,15 @@ class ADD(RTypeInstruction):
         Returns:
             architectural_state
         """
-        rs1 = architectural_state.register_file.registers[self.rs1]
-        rs2 = architectural_state.register_file.registers[self.rs2]
-        architectural_state.register_file.registers[self.rd] = rs1 + rs2
+        rs1 = architectural_state.register_file.read(self.rs1)
+        rs2 = architectural_state.register_file.read(self.rs2)
+        architectural_state.register_file.write(self.rd, to_unsigned32(rs1 + rs2))
         return architectural_state
 
     def alu_compute(self, alu_in_1: Optional[int], alu_in_2: Optional[int]):
         assert alu_in_1 is not None
         assert alu_in_2 is not None
-        left = fixedint.UInt32(alu_in_1)
-        right = fixedint.UInt32(alu_in_2)
-        result = int(left + right)
+        result = to_unsigned32(alu_in_1 + alu_in_2)
         return (None, result)
 
 
@@ -82,17 +93,15 @@ class SUB(RTypeInstruction):
         Returns:
             architectural_state
         """
-        rs1 = architectural_state.register_file.registers[self.rs1]
-        rs2 = architectural_state.register_file.registers[self.rs2]
-        architectural_state.register_file.registers[self.rd] = rs1 - rs2
+        rs1 = architectural_state.register_file.read(self.rs1)
+        rs2 = architectural_state.register_file.read(self.rs2)
+        architectural_state.register_file.write(self.rd, to_unsigned32(rs1 - rs2))
         return architectural_state
 
     def alu_compute(self, alu_in_1: Optional[int], alu_in_2: Optional[int]):
         assert alu_in_1 is not None
         assert alu_in_2 is not None
-        left = fixedint.UInt32(alu_in_1)
-        right = fixedint.UInt32(alu_in_2)
-        result = int(left - right)
+        result = to_unsigned32(alu_in_1 - alu_in_2)
         return (None, result)
 
 
@@ -115,19 +124,15 @@ class SLL(RTypeInstruction):
         Returns:
             architectural_state
         """
-        rs1 = architectural_state.register_file.registers[self.rs1]
-        rs2 = architectural_state.register_file.registers[self.rs2] % fixedint.UInt32(
-            32
-        )
-        architectural_state.register_file.registers[self.rd] = rs1 << rs2
+        rs1 = architectural_state.register_file.read(self.rs1)
+        rs2 = architectural_state.register_file.read(self.rs2) & 31
+        architectural_state.register_file.write(self.rd, to_unsigned32(rs1 << rs2))
         return architectural_state
 
     def alu_compute(self, alu_in_1: Optional[int], alu_in_2: Optional[int]):
         assert alu_in_1 is not None
         assert alu_in_2 is not None
-        left = fixedint.UInt32(alu_in_1)
-        right = fixedint.UInt32(alu_in_2) % fixedint.UInt32(32)
-        result = int(left << right)
+        result = to_unsigned32(to_unsigned32(alu_in_1) << (alu_in_2 & 31))
         return (None, result)
 
 
@@ -150,19 +155,15 @@ class SLT(RTypeInstruction):
         Returns:
             architectural_state
         """
-        rs1 = fixedint.Int32(int(architectural_state.register_file.registers[self.rs1]))
-        rs2 = fixedint.Int32(int(architectural_state.register_file.registers[self.rs2]))
-        architectural_state.register_file.registers[self.rd] = (
-            fixedint.UInt32(1) if rs1 < rs2 else fixedint.UInt32(0)
-        )
+        rs1 = to_signed32(architectural_state.register_file.read(self.rs1))
+        rs2 = to_signed32(architectural_state.register_file.read(self.rs2))
+        architectural_state.register_file.write(self.rd, 1 if rs1 < rs2 else 0)
         return architectural_state
 
     def alu_compute(self, alu_in_1: Optional[int], alu_in_2: Optional[int]):
         assert alu_in_1 is not None
         assert alu_in_2 is not None
-        left = fixedint.Int32(alu_in_1)
-        right = fixedint.Int32(alu_in_2)
-        result = 1 if left < right else 0
+        result = 1 if to_signed32(alu_in_1) < to_signed32(alu_in_2) else 0
         return (None, result)
 
 
@@ -185,19 +186,15 @@ class SLTU(RTypeInstruction):
         Returns:
             architectural_state
         """
-        rs1 = architectural_state.register_file.registers[self.rs1]
-        rs2 = architectural_state.register_file.registers[self.rs2]
-        architectural_state.register_file.registers[self.rd] = (
-            fixedint.UInt32(1) if rs1 < rs2 else fixedint.UInt32(0)
-        )
+        rs1 = architectural_state.register_file.read(self.rs1)
+        rs2 = architectural_state.register_file.read(self.rs2)
+        architectural_state.register_file.write(self.rd, 1 if rs1 < rs2 else 0)
         return architectural_state
 
     def alu_compute(self, alu_in_1: Optional[int], alu_in_2: Optional[int]):
         assert alu_in_1 is not None
         assert alu_in_2 is not None
-        left = fixedint.UInt32(alu_in_1)
-        right = fixedint.UInt32(alu_in_2)
-        result = 1 if left < right else 0
+        result = 1 if to_unsigned32(alu_in_1) < to_unsigned32(alu_in_2) else 0
         return (None, result)
 
 
@@ -220,17 +217,15 @@ class XOR(RTypeInstruction):
         Returns:
             architectural_state
         """
-        rs1 = architectural_state.register_file.registers[self.rs1]
-        rs2 = architectural_state.register_file.registers[self.rs2]
-        architectural_state.register_file.registers[self.rd] = rs1 ^ rs2
+        rs1 = architectural_state.register_file.read(self.rs1)
+        rs2 = architectural_state.register_file.read(self.rs2)
+        architectural_state.register_file.write(self.rd, rs1 ^ rs2)
         return architectural_state
 
     def alu_compute(self, alu_in_1: Optional[int], alu_in_2: Optional[int]):
         assert alu_in_1 is not None
         assert alu_in_2 is not None
-        left = fixedint.UInt32(alu_in_1)
-        right = fixedint.UInt32(alu_in_2)
-        result = int(left ^ right)
+        result = to_unsigned32(alu_in_1 ^ alu_in_2)
         return (None, result)
 
 
@@ -253,19 +248,15 @@ class SRL(RTypeInstruction):
         Returns:
             architectural_state
         """
-        rs1 = architectural_state.register_file.registers[self.rs1]
-        rs2 = architectural_state.register_file.registers[self.rs2] % fixedint.UInt32(
-            32
-        )
-        architectural_state.register_file.registers[self.rd] = rs1 >> rs2
+        rs1 = architectural_state.register_file.read(self.rs1)
+        rs2 = architectural_state.register_file.read(self.rs2) & 31
+        architectural_state.register_file.write(self.rd, rs1 >> rs2)
         return architectural_state
 
     def alu_compute(self, alu_in_1: Optional[int], alu_in_2: Optional[int]):
         assert alu_in_1 is not None
         assert alu_in_2 is not None
-        left = fixedint.UInt32(alu_in_1)
-        right = fixedint.UInt32(alu_in_2) % fixedint.UInt32(32)
-        result = int(left >> right)
+        result = to_unsigned32(alu_in_1) >> (alu_in_2 & 31)
         return (None, result)
 
 
@@ -288,21 +279,15 @@ class SRA(RTypeInstruction):
         Returns:
             architectural_state
         """
-        rs1 = fixedint.Int32(int(architectural_state.register_file.registers[self.rs1]))
-        rs2 = fixedint.Int32(
-            architectural_state.register_file.registers[self.rs2] % fixedint.UInt32(32)
-        )
-        architectural_state.register_file.registers[self.rd] = fixedint.UInt32(
-            rs1 >> rs2
-        )
+        rs1 = to_signed32(architectural_state.register_file.read(self.rs1))
+        rs2 = architectural_state.register_file.read(self.rs2) & 31
+        architectural_state.register_file.write(self.rd, to_unsigned32(rs1 >> rs2))
         return architectural_state
 
     def alu_compute(self, alu_in_1: Optional[int], alu_in_2: Optional[int]):
         assert alu_in_1 is not None
         assert alu_in_2 is not None
-        left = fixedint.Int32(alu_in_1)
-        right = fixedint.Int32(int(fixedint.UInt32(alu_in_2) % fixedint.UInt32(32)))
-        result = int(left >> right)
+        result = to_signed32(alu_in_1) >> (alu_in_2 & 31)
         return (None, result)
 
 
@@ -325,17 +310,15 @@ class OR(RTypeInstruction):
         Returns:
             architectural_state
         """
-        rs1 = architectural_state.register_file.registers[self.rs1]
-        rs2 = architectural_state.register_file.registers[self.rs2]
-        architectural_state.register_file.registers[self.rd] = rs1 | rs2
+        rs1 = architectural_state.register_file.read(self.rs1)
+        rs2 = architectural_state.register_file.read(self.rs2)
+        architectural_state.register_file.write(self.rd, rs1 | rs2)
         return architectural_state
 
     def alu_compute(self, alu_in_1: Optional[int], alu_in_2: Optional[int]):
         assert alu_in_1 is not None
         assert alu_in_2 is not None
-        left = fixedint.UInt32(alu_in_1)
-        right = fixedint.UInt32(alu_in_2)
-        result = int(left | right)
+        result = to_unsigned32(alu_in_1 | alu_in_2)
         return (None, result)
 
 
@@ -358,17 +341,15 @@ class AND(RTypeInstruction):
         Returns:
             architectural_state
         """
-        rs1 = architectural_state.register_file.registers[self.rs1]
-        rs2 = architectural_state.register_file.registers[self.rs2]
-        architectural_state.register_file.registers[self.rd] = rs1 & rs2
+        rs1 = architectural_state.register_file.read(self.rs1)
+        rs2 = architectural_state.register_file.read(self.rs2)
+        architectural_state.register_file.write(self.rd, rs1 & rs2)
         return architectural_state
 
     def alu_compute(self, alu_in_1: Optional[int], alu_in_2: Optional[int]):
         assert alu_in_1 is not None
         assert alu_in_2 is not None
-        left = fixedint.UInt32(alu_in_1)
-        right = fixedint.UInt32(alu_in_2)
-        result = int(left & right)
+        result = to_unsigned32(alu_in_1 & alu_in_2)
         return (None, result)
 
 
@@ -380,18 +361,14 @@ class ADDI(ITypeInstruction):
         self, architectural_state: RiscvArchitecturalState
     ) -> RiscvArchitecturalState:
         """x[rd] = x[rs1] + sext(imm)"""
-        rs1 = architectural_state.register_file.registers[self.rs1]
-        architectural_state.register_file.registers[self.rd] = rs1 + fixedint.UInt32(
-            self.imm
-        )
+        rs1 = architectural_state.register_file.read(self.rs1)
+        architectural_state.register_file.write(self.rd, to_unsigned32(rs1 + self.imm))
         return architectural_state
 
     def alu_compute(self, alu_in_1: Optional[int], alu_in_2: Optional[int]):
         assert alu_in_1 is not None
         assert alu_in_2 is not None
-        left = fixedint.UInt32(alu_in_1)
-        right = fixedint.UInt32(alu_in_2)
-        result = int(left + right)
+        result = to_unsigned32(alu_in_1 + alu_in_2)
         return (None, result)
 
 
@@ -403,18 +380,14 @@ class SLTI(ITypeInstruction):
         self, architectural_state: RiscvArchitecturalState
     ) -> RiscvArchitecturalState:
         """x[rd] = x[rs1] <s sext(imm)"""
-        rs1 = fixedint.Int32(int(architectural_state.register_file.registers[self.rs1]))
-        architectural_state.register_file.registers[self.rd] = (
-            fixedint.UInt32(1) if rs1 < fixedint.Int32(self.imm) else fixedint.UInt32(0)
-        )
+        rs1 = to_signed32(architectural_state.register_file.read(self.rs1))
+        architectural_state.register_file.write(self.rd, 1 if rs1 < self.imm else 0)
         return architectural_state
 
     def alu_compute(self, alu_in_1: Optional[int], alu_in_2: Optional[int]):
         assert alu_in_1 is not None
         assert alu_in_2 is not None
-        left = fixedint.Int32(alu_in_1)
-        right = fixedint.Int32(alu_in_2)
-        result = 1 if left < right else 0
+        result = 1 if to_signed32(alu_in_1) < to_signed32(alu_in_2) else 0
         return (None, result)
 
 
@@ -426,20 +399,16 @@ class SLTIU(ITypeInstruction):
         self, architectural_state: RiscvArchitecturalState
     ) -> RiscvArchitecturalState:
         """x[rd] = x[rs1] <u sext(imm)"""
-        rs1 = architectural_state.register_file.registers[self.rs1]
-        architectural_state.register_file.registers[self.rd] = (
-            fixedint.UInt32(1)
-            if rs1 < fixedint.UInt32(self.imm)
-            else fixedint.UInt32(0)
+        rs1 = architectural_state.register_file.read(self.rs1)
+        architectural_state.register_file.write(
+            self.rd, 1 if rs1 < to_unsigned32(self.imm) else 0
         )
         return architectural_state
 
     def alu_compute(self, alu_in_1: Optional[int], alu_in_2: Optional[int]):
         assert alu_in_1 is not None
         assert alu_in_2 is not None
-        left = fixedint.UInt32(alu_in_1)
-        right = fixedint.UInt32(alu_in_2)
-        result = 1 if left < right else 0
+        result = 1 if to_unsigned32(alu_in_1) < to_unsigned32(alu_in_2) else 0
         return (None, result)
 
 
@@ -451,18 +420,14 @@ class XORI(ITypeInstruction):
         self, architectural_state: RiscvArchitecturalState
     ) -> RiscvArchitecturalState:
         """x[rd] = x[rs1] ^ sext(imm)"""
-        rs1 = architectural_state.register_file.registers[self.rs1]
-        architectural_state.register_file.registers[self.rd] = rs1 ^ fixedint.UInt32(
-            self.imm
-        )
+        rs1 = architectural_state.register_file.read(self.rs1)
+        architectural_state.register_file.write(self.rd, rs1 ^ to_unsigned32(self.imm))
         return architectural_state
 
     def alu_compute(self, alu_in_1: Optional[int], alu_in_2: Optional[int]):
         assert alu_in_1 is not None
         assert alu_in_2 is not None
-        left = fixedint.UInt32(alu_in_1)
-        right = fixedint.UInt32(alu_in_2)
-        result = int(left ^ right)
+        result = to_unsigned32(alu_in_1 ^ alu_in_2)
         return (None, result)
 
 
@@ -474,18 +439,14 @@ class ORI(ITypeInstruction):
         self, architectural_state: RiscvArchitecturalState
     ) -> RiscvArchitecturalState:
         """x[rd] = x[rs1] | sext(imm)"""
-        rs1 = architectural_state.register_file.registers[self.rs1]
-        architectural_state.register_file.registers[self.rd] = rs1 | fixedint.UInt32(
-            self.imm
-        )
+        rs1 = architectural_state.register_file.read(self.rs1)
+        architectural_state.register_file.write(self.rd, rs1 | to_unsigned32(self.imm))
         return architectural_state
 
     def alu_compute(self, alu_in_1: Optional[int], alu_in_2: Optional[int]):
         assert alu_in_1 is not None
         assert alu_in_2 is not None
-        left = fixedint.UInt32(alu_in_1)
-        right = fixedint.UInt32(alu_in_2)
-        result = int(left | right)
+        result = to_unsigned32(alu_in_1 | alu_in_2)
         return (None, result)
 
 
@@ -497,18 +458,14 @@ class ANDI(ITypeInstruction):
         self, architectural_state: RiscvArchitecturalState
     ) -> RiscvArchitecturalState:
         """x[rd] = x[rs1] & sext(imm)"""
-        rs1 = architectural_state.register_file.registers[self.rs1]
-        architectural_state.register_file.registers[self.rd] = rs1 & fixedint.UInt32(
-            self.imm
-        )
+        rs1 = architectural_state.register_file.read(self.rs1)
+        architectural_state.register_file.write(self.rd, rs1 & to_unsigned32(self.imm))
         return architectural_state
 
     def alu_compute(self, alu_in_1: Optional[int], alu_in_2: Optional[int]):
         assert alu_in_1 is not None
         assert alu_in_2 is not None
-        left = fixedint.UInt32(alu_in_1)
-        right = fixedint.UInt32(alu_in_2)
-        result = int(left & right)
+        result = to_unsigned32(alu_in_1 & alu_in_2)
         return (None, result)
 
 
@@ -520,18 +477,14 @@ class SLLI(ShiftITypeInstruction):
         self, architectural_state: RiscvArchitecturalState
     ) -> RiscvArchitecturalState:
         """x[rd] = x[rs1] << shamt  (imm)"""
-        rs1 = architectural_state.register_file.registers[self.rs1]
-        architectural_state.register_file.registers[self.rd] = rs1 << fixedint.UInt32(
-            self.imm
-        )
+        rs1 = architectural_state.register_file.read(self.rs1)
+        architectural_state.register_file.write(self.rd, to_unsigned32(rs1 << self.imm))
         return architectural_state
 
     def alu_compute(self, alu_in_1: Optional[int], alu_in_2: Optional[int]):
         assert alu_in_1 is not None
         assert alu_in_2 is not None
-        left = fixedint.UInt32(alu_in_1)
-        right = fixedint.UInt32(alu_in_2)
-        result = int(left << right)
+        result = to_unsigned32(to_unsigned32(alu_in_1) << alu_in_2)
         return (None, result)
 
 
@@ -543,18 +496,14 @@ class SRLI(ShiftITypeInstruction):
         self, architectural_state: RiscvArchitecturalState
     ) -> RiscvArchitecturalState:
         """x[rd] = x[rs1] >>u shamt  (imm)"""
-        rs1 = architectural_state.register_file.registers[self.rs1]
-        architectural_state.register_file.registers[self.rd] = rs1 >> fixedint.UInt32(
-            self.imm
-        )
+        rs1 = architectural_state.register_file.read(self.rs1)
+        architectural_state.register_file.write(self.rd, rs1 >> self.imm)
         return architectural_state
 
     def alu_compute(self, alu_in_1: Optional[int], alu_in_2: Optional[int]):
         assert alu_in_1 is not None
         assert alu_in_2 is not None
-        left = fixedint.UInt32(alu_in_1)
-        right = fixedint.UInt32(alu_in_2)
-        result = int(left >> right)
+        result = to_unsigned32(alu_in_1) >> to_unsigned32(alu_in_2)
         return (None, result)
 
 
@@ -566,18 +515,14 @@ class SRAI(ShiftITypeInstruction):
         self, architectural_state: RiscvArchitecturalState
     ) -> RiscvArchitecturalState:
         """x[rd] = x[rs1] >>s shamt   (imm)"""
-        rs1 = fixedint.Int32(int(architectural_state.register_file.registers[self.rs1]))
-        architectural_state.register_file.registers[self.rd] = fixedint.UInt32(
-            rs1 >> fixedint.UInt16(self.imm)
-        )
+        rs1 = to_signed32(architectural_state.register_file.read(self.rs1))
+        architectural_state.register_file.write(self.rd, to_unsigned32(rs1 >> self.imm))
         return architectural_state
 
     def alu_compute(self, alu_in_1: Optional[int], alu_in_2: Optional[int]):
         assert alu_in_1 is not None
         assert alu_in_2 is not None
-        left = fixedint.Int32(alu_in_1)
-        right = alu_in_2
-        result = int(left >> right)
+        result = to_signed32(alu_in_1) >> alu_in_2
         return (None, result)
 
 
@@ -589,19 +534,21 @@ class LB(MemoryITypeInstruction):
         self, architectural_state: RiscvArchitecturalState
     ) -> RiscvArchitecturalState:
         """x[rd] = sext(M[x[rs1] + sext(imm)][7:0])"""
-        rs1 = architectural_state.register_file.registers[self.rs1]
-        # casting like this is necessary for sign extension
-        architectural_state.register_file.registers[self.rd] = fixedint.UInt32(
-            fixedint.Int8(architectural_state.memory.read_byte(int(rs1) + self.imm))
+        rs1 = architectural_state.register_file.read(self.rs1)
+        architectural_state.register_file.write(
+            self.rd,
+            to_unsigned32(
+                sign_extend(
+                    int(architectural_state.memory.read_byte(rs1 + self.imm)), 8
+                )
+            ),
         )
         return architectural_state
 
     def alu_compute(self, alu_in_1: Optional[int], alu_in_2: Optional[int]):
         assert alu_in_1 is not None
         assert alu_in_2 is not None
-        left = fixedint.UInt32(alu_in_1)
-        right = alu_in_2
-        result = int(left) + right
+        result = to_unsigned32(alu_in_1) + alu_in_2
         return (None, result)
 
     def memory_access(
@@ -612,14 +559,13 @@ class LB(MemoryITypeInstruction):
         update_statistics: bool = True,
     ) -> Optional[int]:
         assert memory_address is not None
-        return int(
-            fixedint.Int8(
-                int(
-                    architectural_state.memory.read_byte(
-                        memory_address, update_statistics=update_statistics
-                    )
+        return sign_extend(
+            int(
+                architectural_state.memory.read_byte(
+                    memory_address, update_statistics=update_statistics
                 )
-            )
+            ),
+            8,
         )
 
 
@@ -631,20 +577,21 @@ class LH(MemoryITypeInstruction):
         self, architectural_state: RiscvArchitecturalState
     ) -> RiscvArchitecturalState:
         """x[rd] = sext(M[x[rs1] + sext(imm)][15:0])"""
-        rs1 = architectural_state.register_file.registers[self.rs1]
-        architectural_state.register_file.registers[self.rd] = fixedint.UInt32(
-            fixedint.Int16(
-                architectural_state.memory.read_halfword(int(rs1) + self.imm)
-            )
+        rs1 = architectural_state.register_file.read(self.rs1)
+        architectural_state.register_file.write(
+            self.rd,
+            to_unsigned32(
+                sign_extend(
+                    int(architectural_state.memory.read_halfword(rs1 + self.imm)), 16
+                )
+            ),
         )
         return architectural_state
 
     def alu_compute(self, alu_in_1: Optional[int], alu_in_2: Optional[int]):
         assert alu_in_1 is not None
         assert alu_in_2 is not None
-        left = fixedint.UInt32(alu_in_1)
-        right = alu_in_2
-        result = int(left) + right
+        result = to_unsigned32(alu_in_1) + alu_in_2
         return (None, result)
 
     def memory_access(
@@ -655,14 +602,13 @@ class LH(MemoryITypeInstruction):
         update_statistics: bool = True,
     ) -> Optional[int]:
         assert memory_address is not None
-        return int(
-            fixedint.Int16(
-                int(
-                    architectural_state.memory.read_halfword(
-                        memory_address, update_statistics=update_statistics
-                    )
+        return sign_extend(
+            int(
+                architectural_state.memory.read_halfword(
+                    memory_address, update_statistics=update_statistics
                 )
-            )
+            ),
+            16,
         )
 
 
@@ -674,18 +620,16 @@ class LW(MemoryITypeInstruction):
         self, architectural_state: RiscvArchitecturalState
     ) -> RiscvArchitecturalState:
         """x[rd] = sext(M[x[rs1] + sext(imm)][31:0])"""
-        rs1 = architectural_state.register_file.registers[self.rs1]
-        architectural_state.register_file.registers[
-            self.rd
-        ] = architectural_state.memory.read_word(int(rs1) + self.imm)
+        rs1 = architectural_state.register_file.read(self.rs1)
+        architectural_state.register_file.write(
+            self.rd, int(architectural_state.memory.read_word(rs1 + self.imm))
+        )
         return architectural_state
 
     def alu_compute(self, alu_in_1: Optional[int], alu_in_2: Optional[int]):
         assert alu_in_1 is not None
         assert alu_in_2 is not None
-        left = fixedint.UInt32(alu_in_1)
-        right = alu_in_2
-        result = int(left) + right
+        result = to_unsigned32(alu_in_1) + alu_in_2
         return (None, result)
 
     def memory_access(
@@ -711,9 +655,9 @@ class LBU(MemoryITypeInstruction):
         self, architectural_state: RiscvArchitecturalState
     ) -> RiscvArchitecturalState:
         """x[rd] = M[x[rs1] + sext(imm)][7:0]"""
-        rs1 = int(architectural_state.register_file.registers[self.rs1])
-        architectural_state.register_file.registers[self.rd] = fixedint.UInt32(
-            architectural_state.memory.read_byte(rs1 + self.imm)
+        rs1 = architectural_state.register_file.read(self.rs1)
+        architectural_state.register_file.write(
+            self.rd, int(architectural_state.memory.read_byte(rs1 + self.imm))
         )
 
         return architectural_state
@@ -721,9 +665,7 @@ class LBU(MemoryITypeInstruction):
     def alu_compute(self, alu_in_1: Optional[int], alu_in_2: Optional[int]):
         assert alu_in_1 is not None
         assert alu_in_2 is not None
-        left = fixedint.UInt32(alu_in_1)
-        right = alu_in_2
-        result = int(left) + right
+        result = to_unsigned32(alu_in_1) + alu_in_2
         return (None, result)
 
     def memory_access(
@@ -749,18 +691,16 @@ class LHU(MemoryITypeInstruction):
         self, architectural_state: RiscvArchitecturalState
     ) -> RiscvArchitecturalState:
         """x[rd] = M[x[rs1] + sext(imm)][15:0]"""
-        rs1 = int(architectural_state.register_file.registers[self.rs1])
-        architectural_state.register_file.registers[self.rd] = fixedint.UInt32(
-            architectural_state.memory.read_halfword(rs1 + self.imm)
+        rs1 = architectural_state.register_file.read(self.rs1)
+        architectural_state.register_file.write(
+            self.rd, int(architectural_state.memory.read_halfword(rs1 + self.imm))
         )
         return architectural_state
 
     def alu_compute(self, alu_in_1: Optional[int], alu_in_2: Optional[int]):
         assert alu_in_1 is not None
         assert alu_in_2 is not None
-        left = fixedint.UInt32(alu_in_1)
-        right = alu_in_2
-        result = int(left) + right
+        result = to_unsigned32(alu_in_1) + alu_in_2
         return (None, result)
 
     def memory_access(
@@ -786,12 +726,12 @@ class JALR(ITypeInstruction):
         self, architectural_state: RiscvArchitecturalState
     ) -> RiscvArchitecturalState:
         """t=pc+4; pc=(x[rs1]+sext(imm))&∼1; x[rd]=t"""
-        rs1 = fixedint.Int32(int(architectural_state.register_file.registers[self.rs1]))
-        architectural_state.register_file.registers[self.rd] = fixedint.UInt32(
-            architectural_state.program_counter + 4
+        rs1 = architectural_state.register_file.read(self.rs1)
+        architectural_state.register_file.write(
+            self.rd, to_unsigned32(architectural_state.program_counter + 4)
         )
         architectural_state.program_counter = (
-            int((rs1 + fixedint.Int16(self.imm))) & (pow(2, 32) - 2)
+            (rs1 + self.imm) & (MASK_32 - 1)
         ) - self.length
         return architectural_state
 
@@ -844,12 +784,12 @@ class ECALL(ITypeInstruction):
         Returns:
             str|int: Returns either a string to be printed to the output or an exit code.
         """
-        code = int(architectural_state.register_file.registers[17])
-        arg = int(architectural_state.register_file.registers[10])
+        code = architectural_state.register_file.read(17)
+        arg = architectural_state.register_file.read(10)
 
         match code:
             case 1:  # print arg as sint
-                return str(fixedint.Int32(arg))
+                return str(to_signed32(arg))
             case 2:  # print arg as 32-bit float
                 return str(unpack(">f", arg.to_bytes(4, "big"))[0])
             case 4:  # print null-terminated string stored at address in arg
@@ -908,10 +848,10 @@ class SB(STypeInstruction):
         self, architectural_state: RiscvArchitecturalState
     ) -> RiscvArchitecturalState:
         """M[x[rs1] + sext(imm)] = x[rs2][7:0]"""
-        rs1 = architectural_state.register_file.registers[self.rs1]
-        rs2 = architectural_state.register_file.registers[self.rs2][:8]
+        rs1 = architectural_state.register_file.read(self.rs1)
+        rs2 = architectural_state.register_file.read(self.rs2) & 0xFF
         architectural_state.memory.write_byte(
-            int(rs1 + fixedint.UInt32(self.imm)), fixedint.UInt8(rs2)
+            to_unsigned32(rs1 + self.imm), fixedint.UInt8(rs2)
         )
         return architectural_state
 
@@ -938,8 +878,8 @@ class SB(STypeInstruction):
         return (
             self.rs1,
             self.rs2,
-            int(architectural_state.register_file.registers[self.rs1]),
-            int(architectural_state.register_file.registers[self.rs2][:8]),
+            architectural_state.register_file.read(self.rs1),
+            architectural_state.register_file.read(self.rs2) & 0xFF,
             self.imm,
         )
 
@@ -952,11 +892,11 @@ class SH(STypeInstruction):
         self, architectural_state: RiscvArchitecturalState
     ) -> RiscvArchitecturalState:
         """M[x[rs1] + sext(imm)] = x[rs2][15:0]"""
-        rs2 = architectural_state.register_file.registers[self.rs2][:16]
-        rs1 = architectural_state.register_file.registers[self.rs1]
+        rs2 = architectural_state.register_file.read(self.rs2) & 0xFFFF
+        rs1 = architectural_state.register_file.read(self.rs1)
         architectural_state.memory.write_halfword(
-            int(rs1 + fixedint.UInt32(self.imm)),
-            fixedint.UInt16((rs2)),
+            to_unsigned32(rs1 + self.imm),
+            fixedint.UInt16(rs2),
         )
         return architectural_state
 
@@ -968,8 +908,8 @@ class SH(STypeInstruction):
         return (
             self.rs1,
             self.rs2,
-            int(architectural_state.register_file.registers[self.rs1]),
-            int(architectural_state.register_file.registers[self.rs2][:16]),
+            architectural_state.register_file.read(self.rs1),
+            architectural_state.register_file.read(self.rs2) & 0xFFFF,
             self.imm,
         )
 
@@ -997,9 +937,11 @@ class SW(STypeInstruction):
         self, architectural_state: RiscvArchitecturalState
     ) -> RiscvArchitecturalState:
         """M[x[rs1] + sext(imm)] = x[rs2][31:0]"""
-        rs2 = architectural_state.register_file.registers[self.rs2]
-        rs1 = architectural_state.register_file.registers[self.rs1]
-        architectural_state.memory.write_word(int(rs1 + fixedint.UInt32(self.imm)), rs2)
+        rs2 = architectural_state.register_file.read(self.rs2)
+        rs1 = architectural_state.register_file.read(self.rs1)
+        architectural_state.memory.write_word(
+            to_unsigned32(rs1 + self.imm), fixedint.UInt32(rs2)
+        )
         return architectural_state
 
     def access_register_file(
@@ -1010,8 +952,8 @@ class SW(STypeInstruction):
         return (
             self.rs1,
             self.rs2,
-            int(architectural_state.register_file.registers[self.rs1]),
-            int(architectural_state.register_file.registers[self.rs2]),
+            architectural_state.register_file.read(self.rs1),
+            architectural_state.register_file.read(self.rs2),
             self.imm,
         )
 
@@ -1039,8 +981,8 @@ class BEQ(BTypeInstruction):
         self, architectural_state: RiscvArchitecturalState
     ) -> RiscvArchitecturalState:
         """if (x[rs1] == x[rs2]) pc += sext(imm)"""
-        rs1 = architectural_state.register_file.registers[self.rs1]
-        rs2 = architectural_state.register_file.registers[self.rs2]
+        rs1 = architectural_state.register_file.read(self.rs1)
+        rs2 = architectural_state.register_file.read(self.rs2)
         if rs1 == rs2:
             architectural_state.program_counter += self.imm - self.length
             architectural_state.performance_metrics.branch_count += 1
@@ -1062,8 +1004,8 @@ class BNE(BTypeInstruction):
         self, architectural_state: RiscvArchitecturalState
     ) -> RiscvArchitecturalState:
         """if (x[rs1] != x[rs2]) pc += sext(imm)"""
-        rs1 = architectural_state.register_file.registers[self.rs1]
-        rs2 = architectural_state.register_file.registers[self.rs2]
+        rs1 = architectural_state.register_file.read(self.rs1)
+        rs2 = architectural_state.register_file.read(self.rs2)
         if rs1 != rs2:
             architectural_state.program_counter += self.imm - self.length
             architectural_state.performance_metrics.branch_count += 1
@@ -1085,8 +1027,8 @@ class BLT(BTypeInstruction):
         self, architectural_state: RiscvArchitecturalState
     ) -> RiscvArchitecturalState:
         """if (x[rs1] <s x[rs2]) pc += sext(imm)"""
-        rs1 = fixedint.Int32(int(architectural_state.register_file.registers[self.rs1]))
-        rs2 = fixedint.Int32(int(architectural_state.register_file.registers[self.rs2]))
+        rs1 = to_signed32(architectural_state.register_file.read(self.rs1))
+        rs2 = to_signed32(architectural_state.register_file.read(self.rs2))
         if rs1 < rs2:
             architectural_state.program_counter += self.imm - self.length
             architectural_state.performance_metrics.branch_count += 1
@@ -1098,7 +1040,7 @@ class BLT(BTypeInstruction):
         assert alu_in_1 is not None
         assert alu_in_2 is not None
         # casting for signed comparison (inputs are unsigned)
-        return (fixedint.Int32(alu_in_1) < fixedint.Int32(alu_in_2)), None
+        return (to_signed32(alu_in_1) < to_signed32(alu_in_2)), None
 
 
 class BGE(BTypeInstruction):
@@ -1109,8 +1051,8 @@ class BGE(BTypeInstruction):
         self, architectural_state: RiscvArchitecturalState
     ) -> RiscvArchitecturalState:
         """if (x[rs1] >= x[rs2]) pc += sext(imm)"""
-        rs1 = fixedint.Int32(int(architectural_state.register_file.registers[self.rs1]))
-        rs2 = fixedint.Int32(int(architectural_state.register_file.registers[self.rs2]))
+        rs1 = to_signed32(architectural_state.register_file.read(self.rs1))
+        rs2 = to_signed32(architectural_state.register_file.read(self.rs2))
         if rs1 >= rs2:
             architectural_state.program_counter += self.imm - self.length
             architectural_state.performance_metrics.branch_count += 1
@@ -1122,7 +1064,7 @@ class BGE(BTypeInstruction):
         assert alu_in_1 is not None
         assert alu_in_2 is not None
         # casting for signed comparison (inputs are unsigned)
-        return (fixedint.Int32(alu_in_1) >= fixedint.Int32(alu_in_2)), None
+        return (to_signed32(alu_in_1) >= to_signed32(alu_in_2)), None
 
 
 class BLTU(BTypeInstruction):
@@ -1133,8 +1075,8 @@ class BLTU(BTypeInstruction):
         self, architectural_state: RiscvArchitecturalState
     ) -> RiscvArchitecturalState:
         """if (x[rs1] <u x[rs2]) pc += sext(imm)"""
-        rs1 = architectural_state.register_file.registers[self.rs1]
-        rs2 = architectural_state.register_file.registers[self.rs2]
+        rs1 = architectural_state.register_file.read(self.rs1)
+        rs2 = architectural_state.register_file.read(self.rs2)
         if rs1 < rs2:
             architectural_state.program_counter += self.imm - self.length
             architectural_state.performance_metrics.branch_count += 1
@@ -1156,8 +1098,8 @@ class BGEU(BTypeInstruction):
         self, architectural_state: RiscvArchitecturalState
     ) -> RiscvArchitecturalState:
         """if (x[rs1] >=u x[rs2]) pc += sext(imm)"""
-        rs1 = architectural_state.register_file.registers[self.rs1]
-        rs2 = architectural_state.register_file.registers[self.rs2]
+        rs1 = architectural_state.register_file.read(self.rs1)
+        rs2 = architectural_state.register_file.read(self.rs2)
         if rs1 >= rs2:
             architectural_state.program_counter += self.imm - self.length
             architectural_state.performance_metrics.branch_count += 1
@@ -1180,7 +1122,7 @@ class LUI(UTypeInstruction):
     ) -> RiscvArchitecturalState:
         """x[rd] = sext(imm[31:12] << 12)"""
         imm = self.imm << 12
-        architectural_state.register_file.registers[self.rd] = fixedint.UInt32(imm)
+        architectural_state.register_file.write(self.rd, to_unsigned32(imm))
         return architectural_state
 
     def control_unit_signals(self) -> ControlUnitSignals:
@@ -1207,8 +1149,8 @@ class AUIPC(UTypeInstruction):
     ) -> RiscvArchitecturalState:
         """x[rd] = pc + sext(imm[31:12] << 12)"""
         imm = self.imm << 12
-        architectural_state.register_file.registers[self.rd] = fixedint.UInt32(
-            architectural_state.program_counter + imm
+        architectural_state.register_file.write(
+            self.rd, to_unsigned32(architectural_state.program_counter + imm)
         )
         return architectural_state
 
@@ -1243,8 +1185,8 @@ class JAL(JTypeInstruction):
     ) -> RiscvArchitecturalState:
         # NOTE: Actually sets the pc to (pc+imm-4) because the simulation always increases the pc by 4 after execution
         """x[rd]=pc+4; pc+=sext(imm)"""
-        architectural_state.register_file.registers[self.rd] = fixedint.UInt32(
-            architectural_state.program_counter + 4
+        architectural_state.register_file.write(
+            self.rd, to_unsigned32(architectural_state.program_counter + 4)
         )
         architectural_state.program_counter += self.imm - self.length
         architectural_state.performance_metrics.procedure_count += 1
@@ -1277,11 +1219,12 @@ class CSRRW(CSRTypeInstruction):
         Returns:
             ArchitecturalState: _description_
         """
-        architectural_state.register_file.registers[
-            self.rd
-        ] = architectural_state.csr_registers.read_word(self.csr)
+        architectural_state.register_file.write(
+            self.rd, int(architectural_state.csr_registers.read_word(self.csr))
+        )
         architectural_state.csr_registers.write_word(
-            self.csr, architectural_state.register_file.registers[self.rs1]
+            self.csr,
+            fixedint.UInt32(architectural_state.register_file.read(self.rs1)),
         )
 
         return architectural_state
@@ -1302,11 +1245,13 @@ class CSRRS(CSRTypeInstruction):
         Returns:
             ArchitecturalState: _description_
         """
-        rs1_value = architectural_state.register_file.registers[self.rs1]
-        architectural_state.register_file.registers[
-            self.rd
-        ] = architectural_state.csr_registers.read_word(self.csr)
-        temp = architectural_state.csr_registers.read_word(self.csr) | rs1_value
+        rs1_value = architectural_state.register_file.read(self.rs1)
+        architectural_state.register_file.write(
+            self.rd, int(architectural_state.csr_registers.read_word(self.csr))
+        )
+        temp = fixedint.UInt32(
+            int(architectural_state.csr_registers.read_word(self.csr)) | rs1_value
+        )
         architectural_state.csr_registers.write_word(self.csr, temp)
 
         return architectural_state
@@ -1327,11 +1272,13 @@ class CSRRC(CSRTypeInstruction):
         Returns:
             ArchitecturalState: _description_
         """
-        rs1_value = architectural_state.register_file.registers[self.rs1]
-        architectural_state.register_file.registers[
-            self.rd
-        ] = architectural_state.csr_registers.read_word(self.csr)
-        temp = architectural_state.csr_registers.read_word(self.csr) & (~(rs1_value))
+        rs1_value = architectural_state.register_file.read(self.rs1)
+        architectural_state.register_file.write(
+            self.rd, int(architectural_state.csr_registers.read_word(self.csr))
+        )
+        temp = fixedint.UInt32(
+            int(architectural_state.csr_registers.read_word(self.csr)) & ~rs1_value
+        )
         architectural_state.csr_registers.write_word(self.csr, temp)
 
         return architectural_state
@@ -1352,9 +1299,9 @@ class CSRRWI(CSRITypeInstruction):
         Returns:
             ArchitecturalState: _description_
         """
-        architectural_state.register_file.registers[
-            self.rd
-        ] = architectural_state.csr_registers.read_word(self.csr)
+        architectural_state.register_file.write(
+            self.rd, int(architectural_state.csr_registers.read_word(self.csr))
+        )
         architectural_state.csr_registers.write_word(
             self.csr, fixedint.UInt32(self.uimm)
         )
@@ -1377,11 +1324,11 @@ class CSRRSI(CSRITypeInstruction):
         Returns:
             ArchitecturalState: _description_
         """
-        architectural_state.register_file.registers[
-            self.rd
-        ] = architectural_state.csr_registers.read_word(self.csr)
-        temp = architectural_state.csr_registers.read_word(self.csr) | fixedint.UInt32(
-            self.uimm
+        architectural_state.register_file.write(
+            self.rd, int(architectural_state.csr_registers.read_word(self.csr))
+        )
+        temp = fixedint.UInt32(
+            int(architectural_state.csr_registers.read_word(self.csr)) | self.uimm
         )
         architectural_state.csr_registers.write_word(self.csr, temp)
 
@@ -1403,11 +1350,11 @@ class CSRRCI(CSRITypeInstruction):
         Returns:
             ArchitecturalState: _description_
         """
-        architectural_state.register_file.registers[
-            self.rd
-        ] = architectural_state.csr_registers.read_word(self.csr)
-        temp = architectural_state.csr_registers.read_word(self.csr) & (
-            ~(fixedint.UInt32(self.uimm))
+        architectural_state.register_file.write(
+            self.rd, int(architectural_state.csr_registers.read_word(self.csr))
+        )
+        temp = fixedint.UInt32(
+            int(architectural_state.csr_registers.read_word(self.csr)) & ~self.uimm
         )
         architectural_state.csr_registers.write_word(self.csr, temp)
 
@@ -1436,17 +1383,15 @@ class MUL(RTypeInstruction):
         Returns:
             architectural_state
         """
-        rs1 = architectural_state.register_file.registers[self.rs1]
-        rs2 = architectural_state.register_file.registers[self.rs2]
-        architectural_state.register_file.registers[self.rd] = rs1 * rs2
+        rs1 = architectural_state.register_file.read(self.rs1)
+        rs2 = architectural_state.register_file.read(self.rs2)
+        architectural_state.register_file.write(self.rd, to_unsigned32(rs1 * rs2))
         return architectural_state
 
     def alu_compute(self, alu_in_1: Optional[int], alu_in_2: Optional[int]):
         assert alu_in_1 is not None
         assert alu_in_2 is not None
-        left = fixedint.UInt32(alu_in_1)
-        right = fixedint.UInt32(alu_in_2)
-        result = int(left * right)
+        result = to_unsigned32(alu_in_1 * alu_in_2)
         return (None, result)
 
 
@@ -1469,19 +1414,15 @@ class MULH(RTypeInstruction):
         Returns:
             architectural_state
         """
-        rs1 = architectural_state.register_file.registers[self.rs1]
-        rs2 = architectural_state.register_file.registers[self.rs2]
-        architectural_state.register_file.registers[self.rd] = fixedint.UInt32(
-            (int(fixedint.Int32(rs1)) * int(fixedint.Int32(rs2))) >> 32
-        )
+        rs1 = architectural_state.register_file.read(self.rs1)
+        rs2 = architectural_state.register_file.read(self.rs2)
+        architectural_state.register_file.write(self.rd, to_unsigned32(mulh(rs1, rs2)))
         return architectural_state
 
     def alu_compute(self, alu_in_1: Optional[int], alu_in_2: Optional[int]):
         assert alu_in_1 is not None
         assert alu_in_2 is not None
-        left = int(fixedint.Int32(alu_in_1))
-        right = int(fixedint.Int32(alu_in_2))
-        result = left * right >> 32
+        result = mulh(alu_in_1, alu_in_2)
         return (None, result)
 
 
@@ -1504,11 +1445,9 @@ class MULHU(RTypeInstruction):
         Returns:
             architectural_state
         """
-        rs1 = architectural_state.register_file.registers[self.rs1]
-        rs2 = architectural_state.register_file.registers[self.rs2]
-        architectural_state.register_file.registers[self.rd] = fixedint.UInt32(
-            (int(rs1) * int(rs2)) >> 32
-        )
+        rs1 = architectural_state.register_file.read(self.rs1)
+        rs2 = architectural_state.register_file.read(self.rs2)
+        architectural_state.register_file.write(self.rd, mulhu(rs1, rs2))
         return architectural_state
 
     def alu_compute(self, alu_in_1: Optional[int], alu_in_2: Optional[int]):
@@ -1539,19 +1478,17 @@ class MULHSU(RTypeInstruction):
         Returns:
             architectural_state
         """
-        rs1 = architectural_state.register_file.registers[self.rs1]
-        rs2 = architectural_state.register_file.registers[self.rs2]
-        architectural_state.register_file.registers[self.rd] = fixedint.UInt32(
-            (int(fixedint.Int32(rs1)) * int(rs2)) >> 32
+        rs1 = architectural_state.register_file.read(self.rs1)
+        rs2 = architectural_state.register_file.read(self.rs2)
+        architectural_state.register_file.write(
+            self.rd, to_unsigned32(mulhsu(rs1, rs2))
         )
         return architectural_state
 
     def alu_compute(self, alu_in_1: Optional[int], alu_in_2: Optional[int]):
         assert alu_in_1 is not None
         assert alu_in_2 is not None
-        left = int(fixedint.Int32(alu_in_1))
-        right = alu_in_2
-        result = left * right >> 32
+        result = to_signed32(alu_in_1) * alu_in_2 >> 32
         return (None, result)
 
 
@@ -1574,22 +1511,15 @@ class DIV(RTypeInstruction):
         Returns:
             architectural_state
         """
-        rs1 = architectural_state.register_file.registers[self.rs1]
-        rs2 = architectural_state.register_file.registers[self.rs2]
-        if rs2 == 0:
-            architectural_state.register_file.registers[self.rd] = fixedint.UInt32(-1)
-        else:
-            architectural_state.register_file.registers[self.rd] = fixedint.UInt32(
-                (int(int(fixedint.Int32(rs1)) / int(fixedint.Int32(rs2))))
-            )
+        rs1 = architectural_state.register_file.read(self.rs1)
+        rs2 = architectural_state.register_file.read(self.rs2)
+        architectural_state.register_file.write(self.rd, to_unsigned32(div(rs1, rs2)))
         return architectural_state
 
     def alu_compute(self, alu_in_1: Optional[int], alu_in_2: Optional[int]):
         assert alu_in_1 is not None
         assert alu_in_2 is not None
-        left = int(fixedint.Int32(alu_in_1))
-        right = int(fixedint.Int32(alu_in_2))
-        result = -1 if right == 0 else int(left / right)
+        result = div(alu_in_1, alu_in_2)
         return (None, result)
 
 
@@ -1612,20 +1542,15 @@ class DIVU(RTypeInstruction):
         Returns:
             architectural_state
         """
-        rs1 = architectural_state.register_file.registers[self.rs1]
-        rs2 = architectural_state.register_file.registers[self.rs2]
-        if rs2 == 0:
-            architectural_state.register_file.registers[self.rd] = fixedint.UInt32(-1)
-        else:
-            architectural_state.register_file.registers[self.rd] = rs1 // rs2
+        rs1 = architectural_state.register_file.read(self.rs1)
+        rs2 = architectural_state.register_file.read(self.rs2)
+        architectural_state.register_file.write(self.rd, to_unsigned32(divu(rs1, rs2)))
         return architectural_state
 
     def alu_compute(self, alu_in_1: Optional[int], alu_in_2: Optional[int]):
         assert alu_in_1 is not None
         assert alu_in_2 is not None
-        left = fixedint.UInt32(alu_in_1)
-        right = fixedint.UInt32(alu_in_2)
-        result = -1 if right == 0 else int(left // right)
+        result = divu(alu_in_1, alu_in_2)
         return (None, result)
 
 
@@ -1648,24 +1573,15 @@ class REM(RTypeInstruction):
         Returns:
             architectural_state
         """
-        rs1 = architectural_state.register_file.registers[self.rs1]
-        rs2 = architectural_state.register_file.registers[self.rs2]
-        if rs2 == 0:
-            architectural_state.register_file.registers[self.rd] = rs1
-        else:
-            n = int(fixedint.Int32(rs1))
-            b = int(fixedint.Int32(rs2))
-            architectural_state.register_file.registers[self.rd] = fixedint.UInt32(
-                (n - int(n / b) * b)
-            )
+        rs1 = architectural_state.register_file.read(self.rs1)
+        rs2 = architectural_state.register_file.read(self.rs2)
+        architectural_state.register_file.write(self.rd, to_unsigned32(rem(rs1, rs2)))
         return architectural_state
 
     def alu_compute(self, alu_in_1: Optional[int], alu_in_2: Optional[int]):
         assert alu_in_1 is not None
         assert alu_in_2 is not None
-        left = int(fixedint.Int32(alu_in_1))
-        right = int(fixedint.Int32(alu_in_2))
-        result = left if right == 0 else left - int(left / right) * right
+        result = rem(alu_in_1, alu_in_2)
         return (None, result)
 
 
@@ -1688,20 +1604,15 @@ class REMU(RTypeInstruction):
         Returns:
             architectural_state
         """
-        rs1 = architectural_state.register_file.registers[self.rs1]
-        rs2 = architectural_state.register_file.registers[self.rs2]
-        if rs2 == 0:
-            architectural_state.register_file.registers[self.rd] = rs1
-        else:
-            architectural_state.register_file.registers[self.rd] = rs1 % rs2
+        rs1 = architectural_state.register_file.read(self.rs1)
+        rs2 = architectural_state.register_file.read(self.rs2)
+        architectural_state.register_file.write(self.rd, remu(rs1, rs2))
         return architectural_state
 
     def alu_compute(self, alu_in_1: Optional[int], alu_in_2: Optional[int]):
         assert alu_in_1 is not None
         assert alu_in_2 is not None
-        left = fixedint.UInt32(alu_in_1)
-        right = fixedint.UInt32(alu_in_2)
-        result = left if right == 0 else int(left % right)
+        result = remu(alu_in_1, alu_in_2)
         return (None, result)
 
 
@@ -1,6 +1,10 @@
 import json
 
 from architecture_simulator.uarch.memory.cache import CacheOptions
+from architecture_simulator.uarch.memory.prefetchers import PrefetcherOptions
+from architecture_simulator.uarch.riscv.branch_prediction import (
+    BranchPredictionOptions,
+)
 
 
 class Settings:
@@ -17,6 +21,22 @@ class Settings:
         "default_memory_representation": 3,
         "default_pipeline_mode": "single_stage_pipeline",
         "hazard_detection": True,
+        "forwarding": False,
+        # cycles that the M extension instructions spend in the EX stage of the five stage pipeline
+        "execution_latencies": {
+            "mul": 1,
+            "mulh": 1,
+            "mulhsu": 1,
+            "mulhu": 1,
+            "div": 1,
+            "divu": 1,
+            "rem": 1,
+            "remu": 1,
+        },
+        # if True, independent multiplications do not wait for each other
+        "pipelined_multiplier": False,
+        # if True, the five stage pipeline stalls for the latency of cache accesses instead of adding it to the cycles
+        "memory_stalls": False,
         "instruction_memory_min_bytes": 0,
         "instruction_memory_max_bytes": 2**14,
         "memory_address_length": 32,
@@ -57,6 +77,10 @@ class Settings:
             "t6": 31,
         },
         "toy_memory_max_bytes": 4096,
+        # number of parsed programs that RiscvSimulation.load_program() keeps, so that loading them again does not parse them again
+        "program_cache_size": 32,
+        # directory in which the parsed programs are also stored, None keeps them only in memory
+        "program_cache_directory": None,
         "instruction_cache": CacheOptions(
             enable=False,
             num_index_bits=0,
@@ -75,6 +99,29 @@ class Settings:
             replacement_strategy="lru",
             miss_penalty=0,
         ),
+        "data_prefetcher": PrefetcherOptions(
+            prefetcher="none", degree=1, distance=1, num_entries=16
+        ),
+        "instruction_prefetcher": PrefetcherOptions(
+            prefetcher="none", degree=1, distance=1, num_entries=16
+        ),
+        # unified second level cache behind the data and the instruction cache, only used if one of them is enabled
+        "l2_cache": CacheOptions(
+            enable=False,
+            num_index_bits=4,
+            num_block_bits=2,
+            associativity=4,
+            cache_type="wb",
+            replacement_strategy="lru",
+            miss_penalty=0,
+        ),
+        "branch_prediction": BranchPredictionOptions(
+            predictor="not_taken",
+            num_entries=64,
+            num_history_bits=6,
+            btb_entries=0,
+            ras_size=0,
+        ),
     }
 
     def get_JSON(self) -> str:
@@ -0,0 +1,213 @@
+from __future__ import annotations
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+import json
+import os
+from pathlib import Path
+import signal
+from typing import Any, Iterable, Optional, TextIO
+
+from architecture_simulator.uarch.memory.cache import CacheOptions
+from architecture_simulator.uarch.memory.prefetchers import PrefetcherOptions
+from architecture_simulator.uarch.riscv.branch_prediction import (
+    BranchPredictionOptions,
+)
+from architecture_simulator.uarch.riscv.riscv_performance_metrics import (
+    RiscvPerformanceMetrics,
+)
+from .riscv_simulation import RiscvSimulation
+
+# keys of a configuration whose values are passed to the RiscvSimulation constructor as option objects
+OPTION_CLASSES: dict[str, type] = {
+    "data_cache": CacheOptions,
+    "instruction_cache": CacheOptions,
+    "l2_cache": CacheOptions,
+    "data_prefetcher": PrefetcherOptions,
+    "instruction_prefetcher": PrefetcherOptions,
+    "branch_prediction": BranchPredictionOptions,
+}
+# keys of a configuration whose values are passed to the RiscvSimulation constructor as they are
+PLAIN_OPTIONS = {
+    "mode",
+    "detect_data_hazards",
+    "forwarding",
+    "execution_latencies",
+    "pipelined_multiplier",
+    "memory_stalls",
+}
+
+
+class TimeLimitExceeded(BaseException):
+    """Raised by the timer of run_job() to interrupt a simulation.
+    It is no Exception, so that the simulation does not turn it into an InstructionExecutionException.
+    """
+
+
+@dataclass
+class BatchJob:
+    """A program and a configuration of the simulation to run it with, see run_batch()."""
+
+    # where the program came from, only used to identify the job in the results
+    program_name: str
+    program: str
+    # keyword arguments of RiscvSimulation, the option objects as dicts. 'name' is only used in the results.
+    configuration: dict[str, Any] = field(default_factory=dict)
+    max_instructions: Optional[int] = None
+    # in seconds
+    time_limit: Optional[float] = None
+
+
+def load_manifest(path: str | Path) -> list[BatchJob]:
+    """Reads a JSON manifest and returns one job for every combination of its programs and configurations.
+
+    The manifest is an object with the keys
+    - 'programs': list of paths of assembly programs, relative to the manifest,
+    - 'configurations' (optional): list of objects with the keyword arguments of RiscvSimulation, where the cache,
+      prefetcher and branch prediction options are objects with the arguments of their option classes.
+      'name' can be used to identify the configuration in the results. Defaults to one default configuration,
+    - 'max_instructions' and 'time_limit' (optional): limits of every job, the time in seconds.
+
+    Args:
+        path (str | Path): Path of the manifest.
+
+    Raises:
+        ValueError: If a configuration contains an unknown key.
+
+    Returns:
+        list[BatchJob]: The jobs, all configurations of the first program first.
+    """
+    path = Path(path)
+    manifest = json.loads(path.read_text())
+    configurations = manifest.get("configurations", [{}])
+    for configuration in configurations:
+        unknown = set(configuration) - PLAIN_OPTIONS - set(OPTION_CLASSES) - {"name"}
+        if unknown:
+            raise ValueError(
+                f"Unknown configuration keys: {', '.join(sorted(unknown))}"
+            )
+    jobs = []
+    for program_path in manifest["programs"]:
+        program = (path.parent / program_path).read_text()
+        for configuration in configurations:
+            jobs.append(
+                BatchJob(
+                    program_name=program_path,
+                    program=program,
+                    configuration=configuration,
+                    max_instructions=manifest.get("max_instructions"),
+                    time_limit=manifest.get("time_limit"),
+                )
+            )
+    return jobs
+
+
+def _metrics_to_dict(performance_metrics: RiscvPerformanceMetrics) -> dict[str, Any]:
+    """Returns the public fields of the performance metrics and the execution time.
+
+    Args:
+        performance_metrics (RiscvPerformanceMetrics): The metrics of a finished job.
+
+    Returns:
+        dict[str, Any]: Values that can be serialized as JSON.
+    """
+    result: dict[str, Any] = {
+        name: value
+        for name, value in vars(performance_metrics).items()
+        if not name.startswith("_") and name != "branch_predictions"
+    }
+    result["execution_time_s"] = performance_metrics.get_execution_time()
+    result["branch_predictions"] = {
+        hex(address): vars(statistics)
+        for address, statistics in performance_metrics.branch_predictions.items()
+    }
+    return result
+
+
+def _raise_time_limit_exceeded(signum, frame):
+    raise TimeLimitExceeded()
+
+
+def run_job(job: BatchJob) -> dict[str, Any]:
+    """Runs the job until the program has finished or one of its limits was reached.
+    The time limit needs signal.setitimer() and is ignored on platforms without it.
+
+    Args:
+        job (BatchJob): The job.
+
+    Returns:
+        dict[str, Any]: The result, with the keys 'program', 'configuration', 'status' (one of 'finished',
+            'instruction_limit_exceeded', 'time_limit_exceeded' and 'error'), 'error', 'exit_code', 'output'
+            and 'performance_metrics'.
+    """
+    status = "finished"
+    error = None
+    simulation = None
+    time_limit = job.time_limit if hasattr(signal, "setitimer") else None
+    try:
+        simulation = RiscvSimulation(
+            **{
+                key: (OPTION_CLASSES[key](**value) if key in OPTION_CLASSES else value)
+                for key, value in job.configuration.items()
+                if key != "name"
+            }
+        )
+        simulation.load_program(job.program)
+        if time_limit is not None:
+            signal.signal(signal.SIGALRM, _raise_time_limit_exceeded)
+            signal.setitimer(signal.ITIMER_REAL, time_limit)
+        try:
+            simulation.run(max_instructions=job.max_instructions)
+        finally:
+            if time_limit is not None:
+                signal.setitimer(signal.ITIMER_REAL, 0)
+        if not simulation.is_done():
+            status = "instruction_limit_exceeded"
+    except TimeLimitExceeded:
+        status = "time_limit_exceeded"
+    except Exception as e:
+        status = "error"
+        error = e.__repr__()
+    if simulation is not None:
+        simulation.state.performance_metrics.stop_timer()
+    return {
+        "program": job.program_name,
+        "configuration": job.configuration.get("name", job.configuration),
+        "status": status,
+        "error": error,
+        "exit_code": None if simulation is None else simulation.get_exit_code(),
+        "output": "" if simulation is None else simulation.get_output(),
+        "performance_metrics": (
+            None
+            if simulation is None
+            else _metrics_to_dict(simulation.get_performance_metrics())
+        ),
+    }
+
+
+def run_batch(
+    jobs: Iterable[BatchJob],
+    output: TextIO,
+    max_workers: Optional[int] = None,
+) -> int:
+    """Runs the jobs in a pool of worker processes and writes their results to the output as JSON lines,
+    in the order of the jobs. The workers are reused for many jobs, consecutive jobs are given to the same
+    worker, so that jobs with the same program find it in the program cache of the worker (see ProgramCache).
+
+    Args:
+        jobs (Iterable[BatchJob]): The jobs.
+        output (TextIO): Receives one JSON object per job, see run_job().
+        max_workers (Optional[int], optional): Number of worker processes. Defaults to the number of processors.
+
+    Returns:
+        int: Number of jobs that did not finish.
+    """
+    jobs = list(jobs)
+    num_workers = max_workers or os.cpu_count() or 1
+    # several chunks per worker, so that the load stays balanced
+    chunksize = max(1, len(jobs) // (4 * num_workers))
+    unfinished = 0
+    with ProcessPoolExecutor(max_workers=num_workers) as executor:
+        for result in executor.map(run_job, jobs, chunksize=chunksize):
+            unfinished += result["status"] != "finished"
+            output.write(json.dumps(result) + "\n")
+    return unfinished
@@ -0,0 +1,130 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import Iterable
+
+from architecture_simulator.uarch.memory.cache import CacheOptions
+from architecture_simulator.uarch.memory.stack_distance import (
+    CacheConfigurationResult,
+    RecordingInstructionMemorySystem,
+    RecordingMemorySystem,
+    StackDistanceAnalyzer,
+)
+from architecture_simulator.uarch.riscv.riscv_architectural_state import (
+    RiscvArchitecturalState,
+)
+from .riscv_simulation import RiscvSimulation
+
+
+@dataclass
+class CacheAnalysis:
+    """Results of analyze_cache_configurations() for all analyzed configurations of the data and the instruction cache."""
+
+    # cycles of the run without caches
+    cycles: int
+    miss_penalty: int
+    data_cache: list[CacheConfigurationResult] = field(default_factory=list)
+    instruction_cache: list[CacheConfigurationResult] = field(default_factory=list)
+
+    def get_cycles(self, result: CacheConfigurationResult) -> int:
+        """Returns the estimated number of cycles of the program if the cache of the result was used
+        (and the other cache was disabled).
+
+        Args:
+            result (CacheConfigurationResult): One of the results of this analysis.
+
+        Returns:
+            int: The estimated number of cycles.
+        """
+        return self.cycles + (result.accesses - result.hits) * self.miss_penalty
+
+    def get_table(self) -> str:
+        """Returns the results as text table with one line per configuration.
+
+        Returns:
+            str: The table.
+        """
+        lines = []
+        for name, results in [
+            ("Data cache", self.data_cache),
+            ("Instruction cache", self.instruction_cache),
+        ]:
+            lines.append(f"{name}:")
+            lines.append(
+                f"{'index bits':>10} {'block bits':>10} {'ways':>5} {'hits':>10} {'accesses':>10} {'hit rate':>8} {'cycles':>12}"
+            )
+            for result in results:
+                lines.append(
+                    f"{result.num_index_bits:>10} {result.num_block_bits:>10} {result.associativity:>5} "
+                    f"{result.hits:>10} {result.accesses:>10} {result.get_hit_rate():>8.2%} {self.get_cycles(result):>12}"
+                )
+        return "\n".join(lines) + "\n"
+
+
+def analyze_cache_configurations(
+    program: str,
+    num_index_bits: Iterable[int] = range(0, 5),
+    num_block_bits: Iterable[int] = range(0, 4),
+    associativities: Iterable[int] = (1, 2, 4, 8),
+    miss_penalty: int = 0,
+    mode: str = "single_stage_pipeline",
+) -> CacheAnalysis:
+    """Runs the program once without caches and computes the hits of LRU write back data caches
+    and instruction caches for all combinations of the given parameters.
+
+    Args:
+        program (str): The program to analyze.
+        num_index_bits (Iterable[int], optional): Index widths to analyze. Defaults to range(0, 5).
+        num_block_bits (Iterable[int], optional): Block widths to analyze. Defaults to range(0, 4).
+        associativities (Iterable[int], optional): Associativities to analyze. Defaults to (1, 2, 4, 8).
+        miss_penalty (int, optional): Cycles that get added for every miss in the cycle estimates. Defaults to 0.
+        mode (str, optional): Pipeline mode of the simulation. Defaults to "single_stage_pipeline".
+
+    Returns:
+        CacheAnalysis: The results, ordered by block bits, index bits and associativity.
+    """
+    num_index_bits = sorted(num_index_bits)
+    num_block_bits = sorted(num_block_bits)
+    associativities = sorted(associativities)
+    no_cache = CacheOptions(
+        enable=False,
+        num_index_bits=0,
+        num_block_bits=0,
+        associativity=1,
+        cache_type="wb",
+        replacement_strategy="lru",
+        miss_penalty=0,
+    )
+    state = RiscvArchitecturalState(
+        pipeline_mode=mode,
+        data_cache_options=no_cache,
+        instruction_cache_options=no_cache,
+    )
+    data_memory = RecordingMemorySystem(state.memory)
+    instruction_memory = RecordingInstructionMemorySystem(state.instruction_memory)
+    state.memory = data_memory
+    state.instruction_memory = instruction_memory
+    simulation = RiscvSimulation(state=state)
+    simulation.load_program(program)
+    simulation.run()
+
+    analysis = CacheAnalysis(
+        cycles=state.performance_metrics.cycles, miss_penalty=miss_penalty
+    )
+    for addresses, results in [
+        (data_memory.addresses, analysis.data_cache),
+        (instruction_memory.addresses, analysis.instruction_cache),
+    ]:
+        for block_bits in num_block_bits:
+            analyzer = StackDistanceAnalyzer(
+                num_block_bits=block_bits,
+                max_num_index_bits=num_index_bits[-1],
+                max_associativity=associativities[-1],
+            )
+            for address in addresses:
+                analyzer.access(address)
+            results.extend(
+                analyzer.get_result(index_bits, associativity)
+                for index_bits in num_index_bits
+                for associativity in associativities
+            )
+    return analysis
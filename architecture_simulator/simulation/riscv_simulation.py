@@ -1,4 +1,6 @@
 from __future__ import annotations
+from dataclasses import dataclass
+import sys
 from typing import Optional, TYPE_CHECKING, Any
 
 from architecture_simulator.settings.settings import Settings
@@ -6,7 +8,8 @@ from architecture_simulator.uarch.riscv.riscv_architectural_state import (
     RiscvArchitecturalState,
 )
 from architecture_simulator.isa.riscv.instruction_types import EmptyInstruction
-from architecture_simulator.isa.riscv.riscv_parser import RiscvParser
+from architecture_simulator.isa.riscv.program_cache import program_cache
+from architecture_simulator.uarch.riscv.functional_engine import FunctionalEngine
 from .simulation import Simulation
 from architecture_simulator.uarch.riscv.pipeline_registers import (
     InstructionDecodePipelineRegister,
@@ -22,6 +25,11 @@ if TYPE_CHECKING:
         RiscvPerformanceMetrics,
     )
     from architecture_simulator.uarch.memory.cache import CacheOptions
+    from architecture_simulator.uarch.memory.prefetchers import PrefetcherOptions
+    from architecture_simulator.uarch.memory.miss_classifier import MissClassification
+    from architecture_simulator.uarch.riscv.branch_prediction import (
+        BranchPredictionOptions,
+    )
 from architecture_simulator.gui.riscv_fiveStage_svg_directives import (
     RiscvFiveStageIFSvgDirectives,
     RiscvFiveStageIDSvgDirectives,
@@ -49,12 +57,22 @@ def save_to_str(input: Any, input_valid=True) -> str:
     return str(input) if input is not None and input_valid else ""
 
 
+@dataclass
+class RiscvCheckpoint:
+    """A snapshot of a RiscvSimulation, see RiscvSimulation.checkpoint()."""
+
+    state: RiscvArchitecturalState
+    has_started: bool
+
+
 class RiscvSimulation(Simulation):
     """A Simulation for the RISC-V architecture.
-    Currently supports single_stage_pipeline and five_stage_pipeline.
+    Currently supports single_stage_pipeline, five_stage_pipeline and functional.
+    The functional mode produces the same architectural results as the single stage pipeline,
+    but does not generate any values for the visualization.
 
     Args:
-        mode : "single_stage_pipeline" (=default) | "five_stage_pipeline"
+        mode : "single_stage_pipeline" (=default) | "five_stage_pipeline" | "functional"
     """
 
     def __init__(
@@ -62,22 +80,60 @@ class RiscvSimulation(Simulation):
         state: Optional[RiscvArchitecturalState] = None,
         mode: str = Settings().get()["default_pipeline_mode"],
         detect_data_hazards: bool = Settings().get()["hazard_detection"],
+        forwarding: bool = Settings().get()["forwarding"],
+        execution_latencies: dict[str, int] = Settings().get()["execution_latencies"],
+        pipelined_multiplier: bool = Settings().get()["pipelined_multiplier"],
+        memory_stalls: bool = Settings().get()["memory_stalls"],
         data_cache: CacheOptions = Settings().get()["data_cache"],
         instruction_cache: CacheOptions = Settings().get()["instruction_cache"],
+        l2_cache: CacheOptions = Settings().get()["l2_cache"],
+        data_prefetcher: PrefetcherOptions = Settings().get()["data_prefetcher"],
+        instruction_prefetcher: PrefetcherOptions = Settings().get()[
+            "instruction_prefetcher"
+        ],
+        branch_prediction: BranchPredictionOptions = Settings().get()[
+            "branch_prediction"
+        ],
     ) -> None:
         """Constructor for RISC-V simulations.
 
         Args:
             state (Optional[ArchitecturalState], optional): The state to use. Creates a sensible default.
-            mode (str, optional): Can be one of "single_stage_pipeline" (default) or "five_stage_pipeline".
+            mode (str, optional): Can be one of "single_stage_pipeline" (default), "five_stage_pipeline" or "functional".
             detect_data_hazards (bool, optional): Turn data hazard detection on or off. Defaults to True.
+            forwarding (bool, optional): Forward results to the EX stage in the five stage pipeline, so that only
+                loads cause stalls. Defaults to False.
+            execution_latencies (dict[str, int], optional): Cycles that the instructions with the given mnemonics
+                spend in the EX stage of the five stage pipeline. Defaults to 1 cycle for all instructions.
+            pipelined_multiplier (bool, optional): Let independent multiplications follow each other without stalls
+                in the five stage pipeline. Defaults to False.
+            memory_stalls (bool, optional): Let the IF and MA stages of the five stage pipeline stall for the latency
+                of the cache accesses instead of adding it to the cycles. The other modes always add it to the cycles.
+                Defaults to False.
+            data_cache (CacheOptions, optional): L1 data cache. Defaults to no cache.
+            instruction_cache (CacheOptions, optional): L1 instruction cache. Defaults to no cache.
+            l2_cache (CacheOptions, optional): Unified L2 cache that is accessed on misses of the L1 caches
+                instead of adding their miss penalty. Defaults to no cache.
+            data_prefetcher (PrefetcherOptions, optional): Prefetcher of the data cache. Defaults to no prefetcher.
+            instruction_prefetcher (PrefetcherOptions, optional): Prefetcher of the instruction cache.
+                Defaults to no prefetcher.
+            branch_prediction (BranchPredictionOptions, optional): Branch prediction of the five stage pipeline.
+                Defaults to static not taken prediction.
         """
         self.state = (
             RiscvArchitecturalState(
                 pipeline_mode=mode,
                 detect_data_hazards=detect_data_hazards,
+                forwarding=forwarding,
+                execution_latencies=execution_latencies,
+                pipelined_multiplier=pipelined_multiplier,
+                memory_stalls=memory_stalls,
                 data_cache_options=data_cache,
                 instruction_cache_options=instruction_cache,
+                l2_cache_options=l2_cache,
+                data_prefetcher_options=data_prefetcher,
+                instruction_prefetcher_options=instruction_prefetcher,
+                branch_prediction_options=branch_prediction,
             )
             if state is None
             else state
@@ -87,33 +143,73 @@ class RiscvSimulation(Simulation):
 
     def step(self) -> bool:
         if not self.is_done():
-            self.has_started = True
-            self.state.previous_program_counter = (
-                self.state.program_counter
-            )  # maybe this should not go here
-            self.state.pipeline.step()
+            self.undo_log.record(self.checkpoint)
+            self._execute_step()
         return not self.is_done()
 
-    def run(self):
+    def _execute_step(self):
+        self.has_started = True
+        self.state.previous_program_counter = (
+            self.state.program_counter
+        )  # maybe this should not go here
+        self.state.pipeline.step()
+
+    def run(self, max_instructions: Optional[int] = None):
+        """Execute instructions until the simulation has finished.
+        The steps are not recorded in the undo log, so it is cleared.
+
+        Args:
+            max_instructions (Optional[int], optional): Stop early once the instruction count of the performance
+                metrics has reached this value. The pipelines may overshoot it by the instructions of one step.
+                Defaults to None.
+        """
+        self.undo_log.clear()
         self.state.performance_metrics.resume_timer()
-        while not self.is_done():
-            self.step()
+        if isinstance(self.state.pipeline, FunctionalEngine):
+            self.has_started = True
+            self.state.pipeline.run(max_instructions)
+        else:
+            limit = sys.maxsize if max_instructions is None else max_instructions
+            performance_metrics = self.state.performance_metrics
+            while not self.is_done() and performance_metrics.instruction_count < limit:
+                self._execute_step()
+                # stall cycles that only move bubbles are not executed one by one
+                self.state.pipeline.skip_stall_cycles()
         self.state.performance_metrics.stop_timer()
 
+    def checkpoint(self) -> RiscvCheckpoint:
+        """Takes a snapshot of the simulation that restore() can return to, any number of times.
+        It holds the registers, the program counter, the CSRs, the pipeline, the caches, the branch predictor,
+        the performance metrics and the output. The pages of the data memory are shared copy on write with the
+        simulation, so taking a checkpoint only costs time proportional to the number of pages that were written.
+
+        Returns:
+            RiscvCheckpoint: The snapshot.
+        """
+        return RiscvCheckpoint(state=self.state.copy(), has_started=self.has_started)
+
+    def _restore_checkpoint(self, checkpoint: RiscvCheckpoint):
+        # the checkpoint is copied, so that it can be restored again. Access tracers are not attached to the restored state.
+        self.state = checkpoint.state.copy()
+        self.has_started = checkpoint.has_started
+
     def get_exit_code(self):
         return self.state.exit_code
 
     def load_program(self, program: str):
         """Loads a text form program into the simulation.
-        Resets the state before loading the new program.
+        Resets the state before loading the new program. Programs that were loaded before are not parsed again,
+        see ProgramCache.
 
         Args:
             program (str): A program which complies with (a subset of) the RISC-V syntax.
         """
+        self.undo_log.clear()
         self.state.memory.reset()
         self.state.instruction_memory.reset()
-        parser = RiscvParser()
-        parser.parse(program=program, state=self.state)
+        program_cache.load_program(program, self.state)
+        if isinstance(self.state.pipeline, FunctionalEngine):
+            self.state.pipeline.predecode()
 
     def is_done(self):
         return self.state.pipeline.is_done()
@@ -174,9 +270,12 @@ class RiscvSimulation(Simulation):
     def get_data_cache_entries(self):
         return self.state.memory.cache_repr()
 
-    def get_data_cache_stats(self):
+    def get_data_cache_stats(self, per_set: bool = False):
         """Returns the stats of the data cache (will be None if no cache is used).
 
+        Args:
+            per_set (bool, optional): Whether to add the classified misses of every set under the key "set_misses". Defaults to False.
+
         Returns:
             dict[str, Optional[str]] | None: The cache stats, plus the last address that was accessed under the key "address".
         """
@@ -204,6 +303,10 @@ class RiscvSimulation(Simulation):
 
         stats = self.state.memory.get_cache_stats()
         stats["address"] = address
+        if per_set:
+            stats["set_misses"] = self._get_set_misses(
+                self.state.memory.get_set_miss_classifications()
+            )
         return stats
 
     def get_instruction_cache_entries(self):
@@ -214,9 +317,12 @@ class RiscvSimulation(Simulation):
         """
         return self.state.instruction_memory.cache_repr()
 
-    def get_instruction_cache_stats(self):
+    def get_instruction_cache_stats(self, per_set: bool = False):
         """Returns the stats of the instruction cache (will be None if no cache is used).
 
+        Args:
+            per_set (bool, optional): Whether to add the classified misses of every set under the key "set_misses". Defaults to False.
+
         Returns:
             dict[str, Optional[str]] | None: The cache stats, plus the last address that was accessed under the key "address".
         """
@@ -236,8 +342,74 @@ class RiscvSimulation(Simulation):
         else:
             address = None
         stats["address"] = address
+        if per_set:
+            stats["set_misses"] = self._get_set_misses(
+                self.state.instruction_memory.get_set_miss_classifications()
+            )
         return stats
 
+    def get_l2_cache_stats(self, per_set: bool = False):
+        """Returns the stats of the L2 cache (will be None if no L2 cache is used).
+
+        Args:
+            per_set (bool, optional): Whether to add the classified misses of every set under the key "set_misses". Defaults to False.
+
+        Returns:
+            dict[str, Any] | None: The cache stats.
+        """
+        if self.state.l2_cache is None:
+            return None
+        stats: dict[str, Any] = dict(self.state.l2_cache.get_cache_stats())
+        if per_set:
+            stats["set_misses"] = self._get_set_misses(
+                self.state.l2_cache.get_set_miss_classifications()
+            )
+        return stats
+
+    def _get_set_misses(
+        self, set_miss_classifications: Optional[list[MissClassification]]
+    ) -> list[dict[str, str]]:
+        if set_miss_classifications is None:
+            return []
+        return [misses.get_stats() for misses in set_miss_classifications]
+
+    def get_cache_stats_repr(self, per_set: bool = False) -> str:
+        """Returns the hits, misses (split into compulsory, capacity and conflict misses) and average memory access time
+        of all cache levels as text.
+
+        Args:
+            per_set (bool, optional): Whether to add one line with the misses of every set. Defaults to False.
+
+        Returns:
+            str: One line per cache (plus one per set), empty if no cache is used.
+        """
+        result = ""
+        for name, stats in [
+            ("L1 instruction cache", self.get_instruction_cache_stats(per_set)),
+            ("L1 data cache", self.get_data_cache_stats(per_set)),
+            ("L2 cache", self.get_l2_cache_stats(per_set)),
+        ]:
+            if stats is None:
+                continue
+            misses = int(stats["accesses"]) - int(stats["hits"])
+            result += f"{name}: hits: {stats['hits']}, misses: {misses}, AMAT: {stats['amat']} cycles"
+            result += (
+                f", compulsory: {stats['compulsory_misses']}, capacity: {stats['capacity_misses']}, "
+                + f"conflict: {stats['conflict_misses']}"
+            )
+            if "prefetches" in stats:
+                result += (
+                    f", prefetches: {stats['prefetches']} (useful: {stats['useful_prefetches']}, "
+                    + f"useless: {stats['useless_prefetches']}, pollution: {stats['prefetch_pollution']})"
+                )
+            result += "\n"
+            for index, set_misses in enumerate(stats.get("set_misses", [])):
+                result += (
+                    f"    set {index}: compulsory: {set_misses['compulsory_misses']}, "
+                    + f"capacity: {set_misses['capacity_misses']}, conflict: {set_misses['conflict_misses']}\n"
+                )
+        return result
+
     def get_riscv_five_stage_svg_update_values(self) -> list[tuple[str, str, Any]]:
         """Returns all information needed to update the svg.
 
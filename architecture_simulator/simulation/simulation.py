@@ -1,7 +1,9 @@
 from __future__ import annotations
-from typing import TYPE_CHECKING
+from typing import Any, TYPE_CHECKING
 from abc import ABC, abstractmethod
 
+from .undo_log import UndoLog
+
 if TYPE_CHECKING:
     from architecture_simulator.uarch.performance_metrics import PerformanceMetrics
 
@@ -9,6 +11,8 @@ if TYPE_CHECKING:
 class Simulation(ABC):
     def __init__(self):
         self.has_started = False
+        # checkpoints of the recent steps, see step_back()
+        self.undo_log = UndoLog()
 
     @abstractmethod
     def step(self) -> bool:
@@ -18,6 +22,55 @@ class Simulation(ABC):
             bool: True if the simulation has not yet finished, else False.
         """
 
+    @abstractmethod
+    def checkpoint(self) -> Any:
+        """Take a snapshot of the simulation that restore() can return to.
+
+        Returns:
+            Any: The snapshot.
+        """
+
+    def restore(self, checkpoint: Any):
+        """Return the simulation to a snapshot that was taken by checkpoint(). The checkpoint is not changed,
+        so it can be restored again. Clears the undo log.
+
+        Args:
+            checkpoint (Any): The snapshot.
+        """
+        self._restore_checkpoint(checkpoint)
+        self.undo_log.clear()
+
+    @abstractmethod
+    def _restore_checkpoint(self, checkpoint: Any):
+        """Return the simulation to a snapshot that was taken by checkpoint(), without touching the undo log.
+
+        Args:
+            checkpoint (Any): The snapshot.
+        """
+
+    def step_back(self, n: int = 1) -> int:
+        """Return the simulation to the state it had n steps ago, as far as the undo log reaches back.
+        This restores a checkpoint of the undo log and executes the steps since then again.
+
+        Args:
+            n (int, optional): Number of steps to undo. Defaults to 1.
+
+        Returns:
+            int: Number of steps that were undone.
+        """
+        rewound = self.undo_log.rewind(n)
+        if rewound is None:
+            return 0
+        checkpoint, replayed_steps, undone = rewound
+        self._restore_checkpoint(checkpoint)
+        for _ in range(replayed_steps):
+            self._replay_step()
+        return undone
+
+    def _replay_step(self):
+        """Execute one of the steps that are counted by the undo log again, see step_back()."""
+        self.step()
+
     @abstractmethod
     def run(self):
         """Execute instructions until the simulation has finished."""
@@ -1,4 +1,6 @@
 from __future__ import annotations
+from copy import deepcopy
+from dataclasses import dataclass
 from typing import Any, Optional, TYPE_CHECKING
 
 from architecture_simulator.uarch.toy.toy_architectural_state import (
@@ -31,6 +33,15 @@ if TYPE_CHECKING:
     )
 
 
+@dataclass
+class ToyCheckpoint:
+    """A snapshot of a ToySimulation, see ToySimulation.checkpoint()."""
+
+    state: ToyArchitecturalState
+    next_cycle: int
+    has_started: bool
+
+
 class ToySimulation(Simulation):
     def __init__(
         self,
@@ -52,6 +63,7 @@ class ToySimulation(Simulation):
             raise StepSequenceError(
                 "Before you can call this function again, you have to call second_cycle_step()"
             )
+        self.undo_log.record(self.checkpoint)
         self.has_started = True
         self.next_cycle = 2
         self.state.loaded_instruction.behavior(self.state)
@@ -72,6 +84,7 @@ class ToySimulation(Simulation):
             raise StepSequenceError(
                 "Bevore you can call this function again, you have to call first_cycle_step()"
             )
+        self.undo_log.record(self.checkpoint)
         old_op_code = self.state.loaded_instruction.op_code_value()
         self.state.visualisation_values = SvgVisValues(
             op_code_old=old_op_code, pc_old=self.state.program_counter
@@ -106,6 +119,39 @@ class ToySimulation(Simulation):
         else:
             self.second_cycle_step()
 
+    def checkpoint(self) -> ToyCheckpoint:
+        """Takes a snapshot of the simulation that restore() can return to, any number of times.
+        The pages of the memory are shared copy on write with the simulation.
+
+        Returns:
+            ToyCheckpoint: The snapshot.
+        """
+        return ToyCheckpoint(
+            state=deepcopy(self.state),
+            next_cycle=self.next_cycle,
+            has_started=self.has_started,
+        )
+
+    def _restore_checkpoint(self, checkpoint: ToyCheckpoint):
+        self.state = deepcopy(checkpoint.state)
+        self.next_cycle = checkpoint.next_cycle
+        self.has_started = checkpoint.has_started
+
+    def step_back(self, n: int = 1) -> int:
+        """Return the simulation to the state it had n cycles ago, as far as the undo log reaches back.
+        step() executes two cycles.
+
+        Args:
+            n (int, optional): Number of cycles to undo. Defaults to 1.
+
+        Returns:
+            int: Number of cycles that were undone.
+        """
+        return super().step_back(n)
+
+    def _replay_step(self):
+        self.single_step()
+
     def is_done(self) -> bool:
         return not self.state.instruction_loaded()
 
@@ -116,6 +162,7 @@ class ToySimulation(Simulation):
         self.state.performance_metrics.stop_timer()
 
     def load_program(self, program: str):
+        self.undo_log.clear()
         self.state = ToyArchitecturalState(unified_memory_size=self.unified_memory_size)
         parser = ToyParser()
         parser.parse(program=program, state=self.state)
@@ -0,0 +1,75 @@
+from __future__ import annotations
+from collections import deque
+from typing import Any, Callable, Optional
+
+
+class UndoLog:
+    """A bounded history of the steps of a simulation, used by Simulation.step_back().
+
+    Instead of the changes of every single step, the log keeps a checkpoint of the simulation every
+    checkpoint_interval steps in a ring buffer of max_checkpoints entries, so its memory use is capped.
+    The checkpoints share the pages of the data memory copy on write, so each of them only costs the touched pages.
+    The simulations are deterministic, so the changes of a step do not have to be recorded: stepping back restores
+    the newest checkpoint before the target and executes the remaining steps again, which are at most
+    checkpoint_interval - 1.
+    """
+
+    def __init__(
+        self, checkpoint_interval: int = 100, max_checkpoints: int = 16
+    ) -> None:
+        """Constructor of the undo log.
+
+        Args:
+            checkpoint_interval (int, optional): Number of steps between two checkpoints. Defaults to 100.
+            max_checkpoints (int, optional): Number of checkpoints that are kept. The log reaches back at least
+                (max_checkpoints - 1) * checkpoint_interval steps. Defaults to 16.
+        """
+        self.checkpoint_interval = checkpoint_interval
+        # (position, checkpoint), oldest first
+        self.checkpoints: deque[tuple[int, Any]] = deque(maxlen=max_checkpoints)
+        # number of steps that were recorded since the log was cleared
+        self.position = 0
+
+    def clear(self) -> None:
+        """Forgets all recorded steps."""
+        self.checkpoints.clear()
+        self.position = 0
+
+    def record(self, take_checkpoint: Callable[[], Any]) -> None:
+        """Records a step. Has to be called before the step is executed.
+
+        Args:
+            take_checkpoint (Callable[[], Any]): Returns a checkpoint of the simulation. Only called every checkpoint_interval steps.
+        """
+        if self.position % self.checkpoint_interval == 0:
+            self.checkpoints.append((self.position, take_checkpoint()))
+        self.position += 1
+
+    def get_available_steps(self) -> int:
+        """Returns how many steps can be undone.
+
+        Returns:
+            int: Number of steps since the oldest checkpoint.
+        """
+        return self.position - self.checkpoints[0][0] if self.checkpoints else 0
+
+    def rewind(self, n: int) -> Optional[tuple[Any, int, int]]:
+        """Goes back n steps, or as many as possible. Removes the checkpoint that has to be restored and all newer
+        ones, so that the steps which are executed again after restoring it are recorded like new steps.
+
+        Args:
+            n (int): Number of steps to undo.
+
+        Returns:
+            Optional[tuple[Any, int, int]]: The checkpoint to restore, the number of steps to execute after restoring it
+                and the number of steps that are undone. None if there is nothing to undo.
+        """
+        undone = min(n, self.get_available_steps())
+        if undone <= 0:
+            return None
+        target = self.position - undone
+        while self.checkpoints[-1][0] > target:
+            self.checkpoints.pop()
+        position, checkpoint = self.checkpoints.pop()
+        self.position = position
+        return checkpoint, target - position, undone
@@ -0,0 +1,260 @@
+from __future__ import annotations
+from dataclasses import dataclass
+import mmap
+import struct
+from typing import BinaryIO, Iterator, Optional, TYPE_CHECKING
+
+from fixedint import UInt8, UInt16, UInt32
+
+from architecture_simulator.uarch.memory.cache import CacheOptions
+from architecture_simulator.uarch.memory.instruction_memory import InstructionMemory
+from architecture_simulator.uarch.memory.instruction_memory_cache_system import (
+    InstructionMemoryCacheSystem,
+)
+from architecture_simulator.uarch.memory.memory import AddressingType, Memory
+from architecture_simulator.uarch.memory.stack_distance import (
+    CacheConfigurationResult,
+)
+from architecture_simulator.uarch.memory.write_back_memory_system import (
+    WriteBackMemorySystem,
+)
+from architecture_simulator.uarch.memory.write_through_memory_system import (
+    WriteThroughMemorySystem,
+)
+from architecture_simulator.uarch.riscv.riscv_performance_metrics import (
+    RiscvPerformanceMetrics,
+)
+
+if TYPE_CHECKING:
+    from architecture_simulator.uarch.riscv.riscv_architectural_state import (
+        RiscvArchitecturalState,
+    )
+
+TRACE_MAGIC = b"ASTRACE1"
+# cycle, program counter, address, size in bytes, flags
+TRACE_RECORD = struct.Struct("<QIIBB")
+TRACE_FLAG_WRITE = 1
+TRACE_FLAG_INSTRUCTION = 2
+
+
+@dataclass
+class AccessRecord:
+    """One access of a memory access trace."""
+
+    cycle: int
+    pc: int
+    address: int
+    size: int
+    is_write: bool
+    is_instruction: bool
+
+
+class AccessTracer:
+    """Records the accesses of the cache memory systems of a state into a binary trace file.
+
+    The tracer attaches itself to the data and instruction cache memory systems of the state (memory systems without
+    a cache are not traced). Every access that updates the cache statistics is written into a preallocated buffer,
+    which is appended to the file whenever it is full and on close().
+    The cycle and the program counter of a record are the values of the state at the time of the access
+    (in the five stage pipeline, the program counter belongs to the instruction that is being fetched).
+    """
+
+    def __init__(
+        self, path: str, state: RiscvArchitecturalState, chunk_size: int = 65536
+    ) -> None:
+        """Constructor of the tracer.
+
+        Args:
+            path (str): Path of the trace file, will be overwritten.
+            state (RiscvArchitecturalState): The state whose accesses are traced.
+            chunk_size (int, optional): Number of records that are buffered before they are written. Defaults to 65536.
+        """
+        self.state = state
+        self.chunk_size = chunk_size
+        self.buffer = bytearray(chunk_size * TRACE_RECORD.size)
+        self.buffered = 0
+        self.num_records = 0
+        self.file: Optional[BinaryIO] = open(path, "wb")
+        self.file.write(TRACE_MAGIC)
+        self.memory_systems = [
+            memory_system
+            for memory_system in [state.memory, state.instruction_memory]
+            if isinstance(
+                memory_system,
+                (
+                    WriteBackMemorySystem,
+                    WriteThroughMemorySystem,
+                    InstructionMemoryCacheSystem,
+                ),
+            )
+        ]
+        for memory_system in self.memory_systems:
+            memory_system.tracer = self
+
+    def record_data(self, address: int, size: int, is_write: bool) -> None:
+        """Adds an access of the data memory to the trace.
+
+        Args:
+            address (int): The accessed address.
+            size (int): The size of the access in bytes.
+            is_write (bool): Whether the access was a write.
+        """
+        self._record(address, size, TRACE_FLAG_WRITE if is_write else 0)
+
+    def record_instruction(self, address: int) -> None:
+        """Adds an instruction fetch to the trace.
+
+        Args:
+            address (int): The address of the instruction.
+        """
+        self._record(address, 4, TRACE_FLAG_INSTRUCTION)
+
+    def _record(self, address: int, size: int, flags: int) -> None:
+        """Adds an access to the trace.
+
+        Args:
+            address (int): The accessed address.
+            size (int): The size of the access in bytes.
+            flags (int): TRACE_FLAG_WRITE and TRACE_FLAG_INSTRUCTION or-ed together.
+        """
+        TRACE_RECORD.pack_into(
+            self.buffer,
+            self.buffered * TRACE_RECORD.size,
+            self.state.performance_metrics.cycles,
+            self.state.program_counter & 0xFFFFFFFF,
+            address & 0xFFFFFFFF,
+            size,
+            flags,
+        )
+        self.buffered += 1
+        if self.buffered == self.chunk_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Writes the buffered records to the file."""
+        assert self.file is not None
+        self.file.write(memoryview(self.buffer)[: self.buffered * TRACE_RECORD.size])
+        self.num_records += self.buffered
+        self.buffered = 0
+
+    def close(self) -> None:
+        """Writes the remaining records, closes the file and detaches the tracer from the memory systems."""
+        if self.file is None:
+            return
+        self.flush()
+        self.file.close()
+        self.file = None
+        for memory_system in self.memory_systems:
+            memory_system.tracer = None
+
+    def __enter__(self) -> AccessTracer:
+        return self
+
+    def __exit__(self, *args) -> None:
+        self.close()
+
+
+def read_access_trace(path: str) -> Iterator[AccessRecord]:
+    """Reads a trace file that was written by an AccessTracer. The file is memory mapped, not read at once.
+
+    Args:
+        path (str): Path of the trace file.
+
+    Raises:
+        ValueError: If the file is not a trace file.
+
+    Yields:
+        AccessRecord: The records in the order in which they were recorded.
+    """
+    with open(path, "rb") as file:
+        if file.read(len(TRACE_MAGIC)) != TRACE_MAGIC:
+            raise ValueError(f"{path} is not a memory access trace")
+        if file.seek(0, 2) == len(TRACE_MAGIC):
+            return
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            for offset in range(
+                len(TRACE_MAGIC), len(mapped) - TRACE_RECORD.size + 1, TRACE_RECORD.size
+            ):
+                cycle, pc, address, size, flags = TRACE_RECORD.unpack_from(
+                    mapped, offset
+                )
+                yield AccessRecord(
+                    cycle=cycle,
+                    pc=pc,
+                    address=address,
+                    size=size,
+                    is_write=bool(flags & TRACE_FLAG_WRITE),
+                    is_instruction=bool(flags & TRACE_FLAG_INSTRUCTION),
+                )
+
+
+def replay_access_trace(
+    path: str, cache_options: CacheOptions, instruction_cache: bool = False
+) -> CacheConfigurationResult:
+    """Feeds the accesses of a trace file into a new cache without executing the program again.
+    The cache is simulated by the same memory systems that the simulation uses, so the results are identical
+    to the ones of a simulation with this cache.
+
+    Args:
+        path (str): Path of the trace file.
+        cache_options (CacheOptions): Configuration of the cache. enable is ignored.
+        instruction_cache (bool, optional): Replay the instruction fetches into an instruction cache instead of
+            replaying the data accesses into a data cache. Defaults to False.
+
+    Returns:
+        CacheConfigurationResult: Hits and accesses of the cache.
+    """
+    performance_metrics = RiscvPerformanceMetrics()
+    arguments = dict(
+        num_index_bits=cache_options.num_index_bits,
+        num_block_bits=cache_options.num_block_bits,
+        associativity=cache_options.associativity,
+        performance_metrics=performance_metrics,
+        miss_penality=cache_options.miss_penalty,
+        replacement_strategy=cache_options.replacement_strategy,
+    )
+    if instruction_cache:
+        instruction_memory_system = InstructionMemoryCacheSystem(
+            instruction_memory=InstructionMemory(), **arguments  # type: ignore[arg-type]
+        )
+        for record in read_access_trace(path):
+            if record.is_instruction:
+                instruction_memory_system.read_instruction(record.address)
+        hits, accesses = (
+            instruction_memory_system.hits,
+            instruction_memory_system.accesses,
+        )
+    else:
+        memory_class = (
+            WriteThroughMemorySystem
+            if cache_options.cache_type == "wt"
+            else WriteBackMemorySystem
+        )
+        memory_system = memory_class(
+            memory=Memory(AddressingType.BYTE, 32, True), **arguments  # type: ignore[arg-type]
+        )
+        readers = {
+            1: memory_system.read_byte,
+            2: memory_system.read_halfword,
+            4: memory_system.read_word,
+        }
+        writers = {
+            1: lambda address: memory_system.write_byte(address, UInt8(0)),
+            2: lambda address: memory_system.write_halfword(address, UInt16(0)),
+            4: lambda address: memory_system.write_word(address, UInt32(0)),
+        }
+        for record in read_access_trace(path):
+            if record.is_instruction:
+                continue
+            if record.is_write:
+                writers[record.size](record.address)
+            else:
+                readers[record.size](record.address)
+        hits, accesses = memory_system.hits, memory_system.accesses
+    return CacheConfigurationResult(
+        num_index_bits=cache_options.num_index_bits,
+        num_block_bits=cache_options.num_block_bits,
+        associativity=cache_options.associativity,
+        hits=hits,
+        accesses=accesses,
+    )
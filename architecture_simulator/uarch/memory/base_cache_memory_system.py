@@ -1,3 +1,5 @@
+from __future__ import annotations
+from typing import Optional, TYPE_CHECKING
 from fixedint import UInt8, UInt16, UInt32
 
 from architecture_simulator.uarch.memory.memory_system import MemorySystem
@@ -10,6 +12,14 @@ from architecture_simulator.util.integer_manipulation import (
 from architecture_simulator.uarch.memory.cache import Cache, CacheRepr
 from architecture_simulator.uarch.memory.decoded_address import DecodedAddress
 from architecture_simulator.uarch.memory.memory import Memory
+from architecture_simulator.uarch.memory.miss_classifier import (
+    MissClassification,
+    MissClassifier,
+)
+from architecture_simulator.uarch.memory.prefetchers import (
+    Prefetcher,
+    PrefetchStatistics,
+)
 from architecture_simulator.uarch.memory.replacement_strategies import (
     ReplacementStrategy,
     LRU,
@@ -20,6 +30,10 @@ from architecture_simulator.uarch.riscv.riscv_performance_metrics import (
 )
 from abc import abstractmethod
 
+if TYPE_CHECKING:
+    from architecture_simulator.uarch.memory.access_trace import AccessTracer
+    from architecture_simulator.uarch.memory.shared_cache import SharedCache
+
 
 class BaseCacheMemorySystem(MemorySystem):
     """
@@ -35,6 +49,10 @@ class BaseCacheMemorySystem(MemorySystem):
         performance_metrics: RiscvPerformanceMetrics,
         miss_penality: int,
         replacement_strategy: str,
+        hit_latency: int = 0,
+        next_level: Optional[SharedCache] = None,
+        prefetcher: Optional[Prefetcher] = None,
+        stall_on_access: bool = False,
     ) -> None:
         # TODO: check that num_index_bits, num_block_bits, associativity have legal values
         self.replacement_strategy_class: type[ReplacementStrategy] = LRU if replacement_strategy == "lru" else PLRU  # type: ignore[type-abstract]
@@ -51,10 +69,26 @@ class BaseCacheMemorySystem(MemorySystem):
 
         self.performance_metrics = performance_metrics
         self.miss_penality = miss_penality
+        self.hit_latency = hit_latency
+        # the L2 cache, if None a miss costs miss_penality cycles
+        self.next_level = next_level
         self.hits = 0
         self.accesses = 0
+        # cycles of all accesses that updated the statistics, including the cycles of the next level
+        self.access_cycles = 0
+        # if True, the cycles of the accesses are not added to the performance metrics, but collected
+        # in pending_stall_cycles, so that the pipeline stage that accessed the memory can stall for them
+        self.stall_on_access = stall_on_access
+        self.pending_stall_cycles = 0
+        self.prefetcher = prefetcher
+        self.prefetch_statistics = PrefetchStatistics()
+        self.miss_classifier = MissClassifier(
+            num_index_bits, num_block_bits, associativity
+        )
         self.memory = memory
         self.last_was_hit = False
+        # records the accesses if set, see AccessTracer
+        self.tracer: Optional[AccessTracer] = None
 
     def read_byte(self, address: int, update_statistics: bool = True) -> UInt8:
         """
@@ -70,13 +104,16 @@ class BaseCacheMemorySystem(MemorySystem):
             UInt8: The byte read from memory.
         """
         decoded_address = self._decode_address(address)
+        if update_statistics and self.tracer is not None:
+            self.tracer.record_data(address, 1, is_write=False)
         block_values, hit = self._read_block(decoded_address)
         if update_statistics:
             self.accesses += 1
             self.hits += int(hit)
             self.last_was_hit = hit
-            if not hit:
-                self.performance_metrics.cycles += self.miss_penality
+            self._add_access_cycles(address, hit)
+            self.miss_classifier.access(decoded_address, hit)
+            self._prefetch(address, hit)
         return byte_from_block(decoded_address, block_values)
 
     def read_halfword(self, address: int, update_statistics: bool = True) -> UInt16:
@@ -93,13 +130,16 @@ class BaseCacheMemorySystem(MemorySystem):
             UInt16: The byte halfword from memory.
         """
         decoded_address = self._decode_address(address)
+        if update_statistics and self.tracer is not None:
+            self.tracer.record_data(address, 2, is_write=False)
         block_values, hit = self._read_block(decoded_address)
         if update_statistics:
             self.accesses += 1
             self.hits += int(hit)
             self.last_was_hit = hit
-            if not hit:
-                self.performance_metrics.cycles += self.miss_penality
+            self._add_access_cycles(address, hit)
+            self.miss_classifier.access(decoded_address, hit)
+            self._prefetch(address, hit)
         return halfword_from_block(decoded_address, block_values)
 
     def read_word(self, address: int, update_statistics: bool = True) -> UInt32:
@@ -116,15 +156,116 @@ class BaseCacheMemorySystem(MemorySystem):
             UInt32: The byte word from memory.
         """
         decoded_address = self._decode_address(address)
+        if update_statistics and self.tracer is not None:
+            self.tracer.record_data(address, 4, is_write=False)
         block_values, hit = self._read_block(decoded_address)
         if update_statistics:
             self.accesses += 1
             self.hits += int(hit)
             self.last_was_hit = hit
-            if not hit:
-                self.performance_metrics.cycles += self.miss_penality
+            self._add_access_cycles(address, hit)
+            self.miss_classifier.access(decoded_address, hit)
+            self._prefetch(address, hit)
         return word_from_block(decoded_address, block_values)
 
+    def _add_access_cycles(
+        self, address: int, hit: bool, is_write: bool = False
+    ) -> None:
+        """
+        Adds the cycles of an access to the performance metrics (or to the pending stall cycles, if stall_on_access is set).
+        A hit costs hit_latency cycles, a miss additionally costs the latency of the next level
+        (or miss_penality cycles, if there is no next level).
+
+        Args:
+            address (int): The accessed address.
+            hit (bool): Whether the access was a hit.
+            is_write (bool, optional): Whether the next level is accessed by a store that does not allocate. Defaults to False.
+        """
+        cycles = self.hit_latency
+        if not hit:
+            if self.next_level is None:
+                cycles += self.miss_penality
+            else:
+                cycles += self.next_level.access(address, is_write)
+        self.access_cycles += cycles
+        self.performance_metrics.memory_cycles += cycles
+        if self.stall_on_access:
+            self.pending_stall_cycles += cycles
+        else:
+            self.performance_metrics.cycles += cycles
+
+    def take_pending_stall_cycles(self) -> int:
+        """
+        Returns the cycles that the accesses since the last call have to stall the pipeline and clears them.
+
+        Returns:
+            int: The pending stall cycles, always 0 if stall_on_access is not set.
+        """
+        cycles = self.pending_stall_cycles
+        self.pending_stall_cycles = 0
+        return cycles
+
+    def _prefetch(self, address: int, hit: bool) -> None:
+        """
+        Counts the useful prefetches and the pollution and writes the blocks that the prefetcher
+        wants to prefetch into the cache. Prefetches cost no cycles and do not count as accesses.
+
+        Args:
+            address (int): The accessed address.
+            hit (bool): Whether the access was a hit.
+        """
+        if self.prefetcher is None:
+            return
+        decoded_address = self._decode_address(address)
+        prefetch_hit = hit and self.cache.use_prefetched(decoded_address)
+        self.prefetch_statistics.useful += int(prefetch_hit)
+        block_address = decoded_address.block_alinged_address
+        if not hit and block_address in self.cache.replaced_by_prefetch:
+            self.prefetch_statistics.pollution += 1
+            self.cache.replaced_by_prefetch.discard(block_address)
+        address_range = self.get_address_range()
+        for prefetch_address in self.prefetcher.get_prefetch_addresses(
+            address, 4 * self.cache.num_words_in_block, hit, prefetch_hit
+        ):
+            decoded_prefetch_address = self._decode_address(prefetch_address)
+            if prefetch_address not in address_range or self.cache.contains(
+                decoded_prefetch_address
+            ):
+                continue
+            _, displaced_block = self.cache.write_block(
+                decoded_prefetch_address,
+                self._read_block_from_memory(decoded_prefetch_address),
+                write_access=False,
+                prefetch=True,
+            )
+            self.prefetch_statistics.prefetches += 1
+            if displaced_block is not None:
+                self._write_back_displaced_block(*displaced_block)
+
+    def _write_back_displaced_block(
+        self, decoded_address: DecodedAddress, block: list[UInt32]
+    ) -> None:
+        """
+        Is called with dirty blocks that were replaced by a prefetch.
+        Does nothing, because only write back caches have to write them to lower memory.
+
+        Args:
+            decoded_address (DecodedAddress): Decoded address that provides the address of the block.
+            block (list[UInt32]): The replaced block.
+        """
+
+    def get_prefetch_statistics(self) -> Optional[PrefetchStatistics]:
+        """
+        Returns the prefetch statistics.
+
+        Returns:
+            Optional[PrefetchStatistics]: The statistics, or None if there is no prefetcher.
+        """
+        if self.prefetcher is None:
+            return None
+        self.prefetch_statistics.useless = self.cache.unused_prefetches_replaced
+        return self.prefetch_statistics
+
     def _read_block_from_memory(self, decoded_address: DecodedAddress) -> list[UInt32]:
         """
         Method for reading a block from memory.
@@ -135,10 +276,31 @@ class BaseCacheMemorySystem(MemorySystem):
         Returns:
             list[UInt32]: Words of the block read from lower memory.
         """
-        return [
-            self.memory.read_word(decoded_address.block_alinged_address + 4 * i)
-            for i in range(self.cache.num_words_in_block)
-        ]
+        return self.memory.read_block(
+            decoded_address.block_alinged_address, self.cache.num_words_in_block
+        )
+
+    def write_block(
+        self,
+        address: int,
+        words: list[UInt32],
+        directly_write_to_lower_memory: bool = False,
+    ) -> None:
+        """
+        Writes consecutive words to memory.
+        Goes through the cache one word at a time, unless directly_write_to_lower_memory is set,
+        in which case the whole block is passed to the lower memory.
+
+        Args:
+            address (int): The memory address of the first word.
+            words (list[UInt32]): The words to write.
+            directly_write_to_lower_memory (bool, optional): Whether to bypass the cache and statistics
+                and directly write to lower memory. Defaults to False.
+        """
+        if directly_write_to_lower_memory:
+            self.memory.write_block(address, words)
+        else:
+            super().write_block(address, words)
 
     def _decode_address(self, address: int) -> DecodedAddress:
         """
@@ -159,13 +321,41 @@ class BaseCacheMemorySystem(MemorySystem):
         Returns cache stats as a dictionary.
 
         Returns:
-            dict[str, str]: Dictionary with keys 'hits', 'accesses' and 'last_hit'.
+            dict[str, str]: Dictionary with keys 'hits', 'accesses', 'last_hit', 'amat', 'compulsory_misses',
+                'capacity_misses' and 'conflict_misses', with a prefetcher also 'prefetches', 'useful_prefetches', 'useless_prefetches' and 'prefetch_pollution'.
         """
-        return {
+        stats: dict[str, str | bool] = {
             "hits": str(self.hits),
             "accesses": str(self.accesses),
             "last_hit": self.last_was_hit,
+            "amat": f"{self.get_amat():.2f}",
+            **self.miss_classifier.misses.get_stats(),
         }
+        prefetch_statistics = self.get_prefetch_statistics()
+        if prefetch_statistics is not None:
+            stats["prefetches"] = str(prefetch_statistics.prefetches)
+            stats["useful_prefetches"] = str(prefetch_statistics.useful)
+            stats["useless_prefetches"] = str(prefetch_statistics.useless)
+            stats["prefetch_pollution"] = str(prefetch_statistics.pollution)
+        return stats
+
+    def get_set_miss_classifications(self) -> list[MissClassification]:
+        """
+        Returns the classified misses of every set.
+
+        Returns:
+            list[MissClassification]: The misses of the sets, indexed by the set index.
+        """
+        return self.miss_classifier.set_misses
+
+    def get_amat(self) -> float:
+        """
+        Returns the average memory access time of the accesses that updated the statistics.
+
+        Returns:
+            float: Average number of cycles per access. 0 if there were no accesses.
+        """
+        return self.access_cycles / self.accesses if self.accesses else 0
 
     def reset(self) -> None:
         """
@@ -177,6 +367,19 @@ class BaseCacheMemorySystem(MemorySystem):
             associativity=self.associativity,
             replacement_strategy=self.replacement_strategy_class,
         )
+        self.hits = 0
+        self.accesses = 0
+        self.access_cycles = 0
+        self.pending_stall_cycles = 0
+        self.prefetch_statistics = PrefetchStatistics()
+        self.miss_classifier = MissClassifier(
+            self.num_index_bits, self.num_block_bits, self.associativity
+        )
+        self.last_was_hit = False
+        if self.prefetcher is not None:
+            self.prefetcher.reset()
+        if self.next_level is not None:
+            self.next_level.reset()
         self.memory.reset()
 
     def get_address_range(self) -> range:
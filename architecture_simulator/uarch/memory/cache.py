@@ -24,6 +24,7 @@ class CacheOptions:
         cache_type: str,
         replacement_strategy: str,
         miss_penalty: int,
+        hit_latency: int = 0,
     ) -> None:
         self.enable = enable
         self.num_index_bits = num_index_bits
@@ -32,6 +33,8 @@ class CacheOptions:
         self.cache_type = cache_type  # "wb" or "wt"
         self.replacement_strategy = replacement_strategy  # "lru" or "plru"
         self.miss_penalty = miss_penalty
+        # cycles of every access, the miss penalty is added on a miss
+        self.hit_latency = hit_latency
 
 
 class CacheBlockRepr(Generic[T]):
@@ -75,6 +78,8 @@ class CacheBlock(Generic[T]):
         self.values: list[T] = []
         self.valid_bit: bool = False
         self.dirty_bit: bool = False
+        # set if the block was written by a prefetch and has not been accessed since
+        self.prefetched: bool = False
         self.decoded_address: DecodedAddress = DecodedAddress(0, 0, 0)
 
     def write(self, values: list[T], decoded_address: DecodedAddress) -> None:
@@ -131,6 +136,10 @@ class CacheSet(Generic[T]):
         self.blocks = [CacheBlock[T](2**block_bits) for _ in range(associativity)]
         self.replacement_strategy = replacement_strategy
         self.index_str = index_str
+        # tag -> index of the valid block that stores it
+        self.block_indices: dict[int, int] = dict()
+        # address of the valid block that was replaced by the last write and whether it was an unused prefetch
+        self.last_replaced: Optional[tuple[DecodedAddress, bool]] = None
 
     def read(self, address: DecodedAddress) -> Optional[list[T]]:
         """Tries to read the value from the given address.
@@ -148,13 +157,18 @@ class CacheSet(Generic[T]):
         return None
 
     def write(
-        self, address: DecodedAddress, block_values: list[T], write_access: bool
+        self,
+        address: DecodedAddress,
+        block_values: list[T],
+        write_access: bool,
+        prefetch: bool = False,
     ) -> tuple[bool, Optional[tuple[DecodedAddress, list[T]]]]:
         """Writes the given block to the set.
 
         Args:
             address (DecodedAddress): Full memory address.
             block_values (list[T]): The block values to write.
+            prefetch (bool, optional): Marks a newly allocated block as prefetched. Defaults to False.
 
         Returns:
             tuple[bool, Optional[tuple[DecodedAddress, list[T]]]]: First element is whether it was a cache hit.
@@ -168,11 +182,18 @@ class CacheSet(Generic[T]):
             replaced = None
             if block.dirty_bit:
                 replaced = (block.decoded_address, block.values)
+            self.last_replaced = None
+            if block.valid_bit:
+                del self.block_indices[block.decoded_address.tag]
+                self.last_replaced = (block.decoded_address, block.prefetched)
+            block.prefetched = prefetch
             block.dirty_bit = write_access  # Bugfix: Always set to True if write is issued by a store instruction because write back will not write that data to the memory on a write miss
             block.write(block_values, address)
+            self.block_indices[address.tag] = block_index
             self.replacement_strategy.access(block_index)
             return False, replaced
         else:  # Already in Cache Case
+            self.last_replaced = None
             self.blocks[block_index].write(block_values, address)
             self.blocks[block_index].dirty_bit = True
             self.replacement_strategy.access(block_index)
@@ -198,10 +219,22 @@ class CacheSet(Generic[T]):
         Returns:
             Optional[int]: Returns the index of the block, if it is stored in the set, or None if it is not.
         """
-        for block_index, block in enumerate(self.blocks):
-            if block.valid_bit and (block.decoded_address.tag == address.tag):
-                return block_index
-        return None
+        return self.block_indices.get(address.tag)
+
+    def use_prefetched(self, address: DecodedAddress) -> bool:
+        """Marks a prefetched block as used.
+
+        Args:
+            address (DecodedAddress): Full memory address.
+
+        Returns:
+            bool: Whether the address is stored in a prefetched block that had not been used yet.
+        """
+        block_index = self.get_block_index(address)
+        if block_index is None or not self.blocks[block_index].prefetched:
+            return False
+        self.blocks[block_index].prefetched = False
+        return True
 
     def get_repr(self) -> CacheSetRepr:
         return CacheSetRepr(
@@ -247,6 +280,10 @@ class Cache(Generic[T]):
             )
             for i in range(2**num_index_bits)
         ]
+        # number of prefetched blocks that were replaced before they were used
+        self.unused_prefetches_replaced = 0
+        # block aligned addresses of the blocks that were replaced by prefetches
+        self.replaced_by_prefetch: set[int] = set()
 
     def read_block(self, decoded_address: DecodedAddress) -> Optional[list[T]]:
         """
@@ -261,7 +298,11 @@ class Cache(Generic[T]):
         return self.sets[decoded_address.cache_set_index].read(decoded_address)
 
     def write_block(
-        self, decoded_address: DecodedAddress, block_values: list[T], write_access: bool
+        self,
+        decoded_address: DecodedAddress,
+        block_values: list[T],
+        write_access: bool,
+        prefetch: bool = False,
     ) -> tuple[bool, Optional[tuple[DecodedAddress, list[T]]]]:
         """
         Writes block to cache.
@@ -269,12 +310,34 @@ class Cache(Generic[T]):
         Parameters:
             decoded_address (DecodedAddress): Address to write to.
             block_values (list[T]): Values to write.
+            prefetch (bool, optional): Whether the block is written by a prefetch. Defaults to False.
 
         Returns:
             tuple[bool, Optional[tuple[DecodedAddress, list[T]]]]: hit, address and values of displaced cache block if necessary.
         """
-        return self.sets[decoded_address.cache_set_index].write(
-            decoded_address, block_values, write_access
+        cache_set = self.sets[decoded_address.cache_set_index]
+        result = cache_set.write(decoded_address, block_values, write_access, prefetch)
+        if cache_set.last_replaced is not None:
+            replaced_address, unused_prefetch = cache_set.last_replaced
+            self.unused_prefetches_replaced += int(unused_prefetch)
+            if prefetch:
+                self.replaced_by_prefetch.add(replaced_address.block_alinged_address)
+        if prefetch:
+            self.replaced_by_prefetch.discard(decoded_address.block_alinged_address)
+        return result
+
+    def use_prefetched(self, decoded_address: DecodedAddress) -> bool:
+        """
+        Marks a prefetched block as used.
+
+        Parameters:
+            decoded_address (DecodedAddress): The accessed address.
+
+        Returns:
+            bool: Whether the address is stored in a prefetched block that had not been used yet.
+        """
+        return self.sets[decoded_address.cache_set_index].use_prefetched(
+            decoded_address
         )
 
     def contains(self, decoded_address: DecodedAddress) -> bool:
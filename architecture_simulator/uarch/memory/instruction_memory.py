@@ -1,4 +1,5 @@
 from __future__ import annotations
+import copy
 from typing import TypeVar, Generic
 from dataclasses import dataclass, field
 
@@ -29,10 +30,24 @@ class InstructionMemory(InstructionMemorySystem, Generic[T]):
             Settings().get()["instruction_memory_max_bytes"],
         )
     )
+    # Gets incremented whenever the contents change, so that data derived from the instructions (like predecoded dispatch tables) can be invalidated.
+    version: int = field(default=0, init=False, compare=False, repr=False)
+    # Whether the instructions dict is shared with a copy of the instruction memory and has to be copied before an instruction gets written.
+    _shared: bool = field(default=False, init=False, compare=False, repr=False)
 
     def reset(self):
         """Clears the instruction memory."""
         self.instructions = {}
+        self._shared = False
+        self.version += 1
+
+    def __deepcopy__(self, memo: dict) -> InstructionMemory[T]:
+        """Copies the instruction memory. The instructions are not copied, the dict that holds them is shared copy on write."""
+        result = copy.copy(self)
+        memo[id(self)] = result
+        self._shared = True
+        result._shared = True
+        return result
 
     def get_representation(self) -> list[tuple[int, str]]:
         """Returns a list of string representations for all instructions and their address. Sorted by address.
@@ -80,7 +95,11 @@ class InstructionMemory(InstructionMemorySystem, Generic[T]):
         """
         self._assert_address_in_range(address)
         self._assert_address_in_range(address + instr.length - 1)
+        if self._shared:
+            self.instructions = dict(self.instructions)
+            self._shared = False
         self.instructions[address] = instr
+        self.version += 1
 
     def write_instructions(self, instructions: list[T]):
         """Clear the instruction memory and store given instructions, starting at the first valid address.
@@ -89,6 +108,8 @@ class InstructionMemory(InstructionMemorySystem, Generic[T]):
             instructions (list[Instruction]): Instructions to be stored.
         """
         self.instructions = {}
+        self._shared = False
+        self.version += 1
         next_address = self.address_range.start
         for instr in instructions:
             self.write_instruction(next_address, instr=instr)
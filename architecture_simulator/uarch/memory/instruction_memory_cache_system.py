@@ -1,8 +1,16 @@
+from __future__ import annotations
+from typing import Optional, TYPE_CHECKING
+
 from architecture_simulator.uarch.memory.instruction_memory_system import (
     InstructionMemorySystem,
 )
 from architecture_simulator.uarch.memory.cache import Cache, CacheRepr
 from architecture_simulator.uarch.memory.instruction_memory import InstructionMemory
+from architecture_simulator.uarch.memory.miss_classifier import (
+    MissClassification,
+    MissClassifier,
+)
+from architecture_simulator.uarch.memory.prefetchers import PrefetchStatistics
 from architecture_simulator.isa.riscv.rv32i_instructions import RiscvInstruction
 from architecture_simulator.uarch.memory.decoded_address import DecodedAddress
 from architecture_simulator.isa.riscv.instruction_types import EmptyInstruction
@@ -15,6 +23,11 @@ from architecture_simulator.uarch.riscv.riscv_performance_metrics import (
     RiscvPerformanceMetrics,
 )
 
+if TYPE_CHECKING:
+    from architecture_simulator.uarch.memory.access_trace import AccessTracer
+    from architecture_simulator.uarch.memory.prefetchers import Prefetcher
+    from architecture_simulator.uarch.memory.shared_cache import SharedCache
+
 
 class InstructionMemoryCacheSystem(InstructionMemorySystem):
     """
@@ -30,6 +43,10 @@ class InstructionMemoryCacheSystem(InstructionMemorySystem):
         performance_metrics: RiscvPerformanceMetrics,
         miss_penality: int = 0,
         replacement_strategy: str = "lru",
+        hit_latency: int = 0,
+        next_level: Optional[SharedCache] = None,
+        prefetcher: Optional[Prefetcher] = None,
+        stall_on_access: bool = False,
     ) -> None:
         """
         Initialize a InstructionMemoryCacheSystem object.
@@ -42,6 +59,11 @@ class InstructionMemoryCacheSystem(InstructionMemorySystem):
             performance_metrics (RiscvPerformanceMetrics): Performance Metrics object to track cache performance.
             miss_penalty (int, optional): Amount of cycles to add to performance metrics if a cache miss occurs. Defaults to 0.
             replacement_strategy (str, optional): Cache replacement strategy. If 'lru', LRU will be used, otherwise PLRU will be used. Defaults to 'lru'.
+            hit_latency (int, optional): Amount of cycles to add to performance metrics for every access. Defaults to 0.
+            next_level (Optional[SharedCache], optional): L2 cache that is accessed on a miss instead of adding miss_penalty. Defaults to None.
+            prefetcher (Optional[Prefetcher], optional): Prefetcher that is asked after every access. Defaults to None.
+            stall_on_access (bool, optional): Collect the cycles of the fetches for the IF stage to stall instead of adding them
+                to the performance metrics, see take_pending_stall_cycles(). Defaults to False.
         """
         self.replacement_strategy_class: type[ReplacementStrategy] = LRU if replacement_strategy == "lru" else PLRU  # type: ignore[type-abstract]
         self.cache = Cache[RiscvInstruction](
@@ -58,9 +80,24 @@ class InstructionMemoryCacheSystem(InstructionMemorySystem):
         self.instruction_memory = instruction_memory
         self.performance_metrics = performance_metrics
         self.miss_penality = miss_penality
+        self.hit_latency = hit_latency
+        # the L2 cache, if None a miss costs miss_penality cycles
+        self.next_level = next_level
         self.hits = 0
         self.accesses = 0
+        # cycles of all accesses, including the cycles of the next level
+        self.access_cycles = 0
+        # if True, the cycles of the fetches are collected in pending_stall_cycles instead of being added to the performance metrics
+        self.stall_on_access = stall_on_access
+        self.pending_stall_cycles = 0
+        self.prefetcher = prefetcher
+        self.prefetch_statistics = PrefetchStatistics()
+        self.miss_classifier = MissClassifier(
+            num_index_bits, num_block_bits, associativity
+        )
         self.last_was_hit = False
+        # records the accesses if set, see AccessTracer
+        self.tracer: Optional[AccessTracer] = None
 
     def reset(self) -> None:
         """
@@ -69,7 +106,17 @@ class InstructionMemoryCacheSystem(InstructionMemorySystem):
         self.instruction_memory.reset()
         self.hits = 0
         self.accesses = 0
+        self.access_cycles = 0
+        self.pending_stall_cycles = 0
+        self.prefetch_statistics = PrefetchStatistics()
+        self.miss_classifier = MissClassifier(
+            self.num_index_bits, self.num_block_bits, self.associativity
+        )
         self.last_was_hit = False
+        if self.prefetcher is not None:
+            self.prefetcher.reset()
+        if self.next_level is not None:
+            self.next_level.reset()
         self.cache = Cache[RiscvInstruction](
             num_index_bits=self.num_index_bits,
             num_block_bits=self.num_block_bits,
@@ -96,16 +143,40 @@ class InstructionMemoryCacheSystem(InstructionMemorySystem):
         return self.instruction_memory.get_representation()
 
     def read_instruction(self, address: int) -> RiscvInstruction:
+        if self.tracer is not None:
+            self.tracer.record_instruction(address)
         decoded_address = self._decode_address(address)
         block_values, hit = self._read_block(decoded_address)
         self.accesses += 1
         self.hits += int(hit)
         self.last_was_hit = hit
+        cycles = self.hit_latency
         if not hit:
-            self.performance_metrics.cycles += self.miss_penality
-        self.performance_metrics
+            if self.next_level is None:
+                cycles += self.miss_penality
+            else:
+                cycles += self.next_level.access(address)
+        self.access_cycles += cycles
+        self.performance_metrics.memory_cycles += cycles
+        if self.stall_on_access:
+            self.pending_stall_cycles += cycles
+        else:
+            self.performance_metrics.cycles += cycles
+        self.miss_classifier.access(decoded_address, hit)
+        self._prefetch(address, hit)
         return block_values[decoded_address.block_offset]
 
+    def take_pending_stall_cycles(self) -> int:
+        """
+        Returns the cycles that the fetches since the last call have to stall the pipeline and clears them.
+
+        Returns:
+            int: The pending stall cycles, always 0 if stall_on_access is not set.
+        """
+        cycles = self.pending_stall_cycles
+        self.pending_stall_cycles = 0
+        return cycles
+
     def write_instruction(self, address: int, instr: RiscvInstruction):
         """
         Exposes write_instruction() of lower memory.
@@ -129,13 +200,53 @@ class InstructionMemoryCacheSystem(InstructionMemorySystem):
         Returns cache stats as a dictionary.
 
         Returns:
-            dict[str, str | bool]: Dictionary with keys 'hits', 'accesses' and 'last_hit'.
+            dict[str, str | bool]: Dictionary with keys 'hits', 'accesses', 'last_hit', 'amat', 'compulsory_misses',
+                'capacity_misses' and 'conflict_misses', with a prefetcher also 'prefetches', 'useful_prefetches', 'useless_prefetches' and 'prefetch_pollution'.
         """
-        return {
+        stats: dict[str, str | bool] = {
             "hits": str(self.hits),
             "accesses": str(self.accesses),
             "last_hit": self.last_was_hit,
+            "amat": f"{self.get_amat():.2f}",
+            **self.miss_classifier.misses.get_stats(),
         }
+        prefetch_statistics = self.get_prefetch_statistics()
+        if prefetch_statistics is not None:
+            stats["prefetches"] = str(prefetch_statistics.prefetches)
+            stats["useful_prefetches"] = str(prefetch_statistics.useful)
+            stats["useless_prefetches"] = str(prefetch_statistics.useless)
+            stats["prefetch_pollution"] = str(prefetch_statistics.pollution)
+        return stats
+
+    def get_prefetch_statistics(self) -> Optional[PrefetchStatistics]:
+        """
+        Returns the prefetch statistics.
+
+        Returns:
+            Optional[PrefetchStatistics]: The statistics, or None if there is no prefetcher.
+        """
+        if self.prefetcher is None:
+            return None
+        self.prefetch_statistics.useless = self.cache.unused_prefetches_replaced
+        return self.prefetch_statistics
+
+    def get_set_miss_classifications(self) -> list[MissClassification]:
+        """
+        Returns the classified misses of every set.
+
+        Returns:
+            list[MissClassification]: The misses of the sets, indexed by the set index.
+        """
+        return self.miss_classifier.set_misses
+
+    def get_amat(self) -> float:
+        """
+        Returns the average memory access time of the instruction fetches.
+
+        Returns:
+            float: Average number of cycles per access. 0 if there were no accesses.
+        """
+        return self.access_cycles / self.accesses if self.accesses else 0
 
     def cache_repr(self) -> CacheRepr:
         """
@@ -176,6 +287,41 @@ class InstructionMemoryCacheSystem(InstructionMemorySystem):
             self.cache.write_block(decoded_address, block_values, write_access=False)
         return block_values, hit
 
+    def _prefetch(self, address: int, hit: bool) -> None:
+        """
+        Counts the useful prefetches and the pollution and writes the blocks that the prefetcher
+        wants to prefetch into the cache. Prefetches cost no cycles and do not count as accesses.
+
+        Args:
+            address (int): The address of the fetched instruction.
+            hit (bool): Whether the fetch was a hit.
+        """
+        if self.prefetcher is None:
+            return
+        decoded_address = self._decode_address(address)
+        prefetch_hit = hit and self.cache.use_prefetched(decoded_address)
+        self.prefetch_statistics.useful += int(prefetch_hit)
+        block_address = decoded_address.block_alinged_address
+        if not hit and block_address in self.cache.replaced_by_prefetch:
+            self.prefetch_statistics.pollution += 1
+            self.cache.replaced_by_prefetch.discard(block_address)
+        address_range = self.get_address_range()
+        for prefetch_address in self.prefetcher.get_prefetch_addresses(
+            address, 4 * self.cache.num_words_in_block, hit, prefetch_hit
+        ):
+            decoded_prefetch_address = self._decode_address(prefetch_address)
+            if prefetch_address not in address_range or self.cache.contains(
+                decoded_prefetch_address
+            ):
+                continue
+            self.cache.write_block(
+                decoded_prefetch_address,
+                self._read_block_from_memory(decoded_prefetch_address),
+                write_access=False,
+                prefetch=True,
+            )
+            self.prefetch_statistics.prefetches += 1
+
     def _read_block_from_memory(
         self, decoded_address: DecodedAddress
     ) -> list[RiscvInstruction]:
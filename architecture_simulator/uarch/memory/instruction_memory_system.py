@@ -6,6 +6,7 @@ from architecture_simulator.isa.instruction import Instruction
 
 if TYPE_CHECKING:
     from architecture_simulator.uarch.memory.cache import CacheRepr
+    from architecture_simulator.uarch.memory.miss_classifier import MissClassification
 
 
 T = TypeVar("T", bound=Instruction)
@@ -92,6 +93,24 @@ class InstructionMemorySystem(ABC, Generic[T]):
         """
         return None
 
+    def take_pending_stall_cycles(self) -> int:
+        """
+        Subclasses implementing a cache can override this method to let the pipeline stall for the latency of the fetches.
+
+        Returns:
+            int: The cycles that the fetches since the last call have to stall the pipeline, 0 if not overridden.
+        """
+        return 0
+
+    def get_set_miss_classifications(self) -> Optional[list[MissClassification]]:
+        """
+        Subclasses implementing a cache can override this method to provide the classified misses of every set.
+
+        Returns:
+            Optional[list[MissClassification]]: The misses of the sets, indexed by the set index, or None if not overridden.
+        """
+        return None
+
     def cache_repr(self) -> Optional[CacheRepr]:
         """
         Subclasses implementing a cache can override this method to provide cache representation.
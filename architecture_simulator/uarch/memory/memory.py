@@ -1,4 +1,7 @@
+from __future__ import annotations
+import copy
 from dataclasses import dataclass
+import struct
 from typing import Generic, Optional, Type, TypeVar
 from enum import Enum
 from fixedint import UInt8, UInt16, UInt32, UInt64
@@ -44,11 +47,15 @@ class AddressingType(Enum):
 
 T = TypeVar("T", UInt8, UInt16, UInt32, UInt64)
 
+# size of one page of the backing store in bytes
+PAGE_SIZE = 4096
+
 
 class Memory(Generic[T], MemorySystem):
     """
     A class representing data memory (using Little-Endian byte-ordering).
     Implements MemorySystem.
+    The contents are stored in pages of PAGE_SIZE bytes, which get allocated on the first write to them.
 
     Parameters:
         - addressing_type (AddressingType): The addressing type for memory access (byte, half-word, word, double-word).
@@ -72,11 +79,38 @@ class Memory(Generic[T], MemorySystem):
         self.address_range = (
             range(2**self.address_length) if address_range is None else address_range
         )
-        self.memory_file: dict[int, T] = dict()
+        self._address_count = 2**self.address_length
+        self._value_bytes = self.memory_file_values_width // 8
+        self._values_per_page = PAGE_SIZE // self._value_bytes
+        self._page_bits = self._values_per_page.bit_length() - 1
+        # page number -> contents of the page (little endian), pages get allocated on their first write
+        self.pages: dict[int, bytearray] = dict()
+        # page number -> one flag per address of the page that is set once the address was written
+        self.written: dict[int, bytearray] = dict()
+        # numbers of the pages that are shared with copies of the memory and have to be copied before they get written
+        self._shared_pages: set[int] = set()
+
+    @property
+    def memory_file(self) -> dict[int, T]:
+        """All addresses that were written and their values, sorted by address.
+        The dict is a copy, assigning a dict replaces the contents of the memory.
+        """
+        return {
+            address: self.class_of_memory_file_values(self._load(address))
+            for address in self._written_addresses()
+        }
+
+    @memory_file.setter
+    def memory_file(self, memory_file: dict[int, T]):
+        self.reset()
+        for address, value in memory_file.items():
+            self._store(address, int(value))
 
     def reset(self):
         """Clears the memory."""
-        self.memory_file = {}
+        self.pages = {}
+        self.written = {}
+        self._shared_pages = set()
 
     def get_address_range(self) -> range:
         return self.address_range
@@ -93,6 +127,81 @@ class Memory(Generic[T], MemorySystem):
                 memory_type="data memory",
             )
 
+    def _load(self, address: int) -> int:
+        """
+        Reads the value at the specified memory address from the pages, without any checks.
+
+        Parameters:
+            address (int): The memory address from which to read.
+
+        Returns:
+            int: The value at the given address.
+        """
+        page = self.pages.get(address >> self._page_bits)
+        if page is None:
+            return 0
+        start = (address & (self._values_per_page - 1)) * self._value_bytes
+        return int.from_bytes(page[start : start + self._value_bytes], "little")
+
+    def _allocate_page(self, page_number: int) -> bytearray:
+        """
+        Returns the page with the given number for writing. Allocates the page if it does not exist yet
+        and copies it if it is shared with a copy of the memory.
+
+        Parameters:
+            page_number (int): Number of the page.
+
+        Returns:
+            bytearray: Contents of the page.
+        """
+        page = self.pages.get(page_number)
+        if page is None:
+            page = self.pages[page_number] = bytearray(PAGE_SIZE)
+            self.written[page_number] = bytearray(self._values_per_page)
+        elif page_number in self._shared_pages:
+            self._shared_pages.discard(page_number)
+            page = self.pages[page_number] = bytearray(page)
+            self.written[page_number] = bytearray(self.written[page_number])
+        return page
+
+    def __deepcopy__(self, memo: dict) -> Memory[T]:
+        """
+        Copies the memory. The pages are shared copy on write, so the cost depends only on the number of allocated pages.
+        """
+        result = copy.copy(self)
+        memo[id(self)] = result
+        result.pages = dict(self.pages)
+        result.written = dict(self.written)
+        self._shared_pages = set(self.pages)
+        result._shared_pages = set(self.pages)
+        return result
+
+    def _store(self, address: int, value: int) -> None:
+        """
+        Writes the value at the specified memory address into the pages, without any checks.
+
+        Parameters:
+            address (int): The memory address where the value will be written.
+            value (int): The value to be written, only the lowest memory_file_values_width bits are used.
+        """
+        page_number = address >> self._page_bits
+        page = self._allocate_page(page_number)
+        offset = address & (self._values_per_page - 1)
+        start = offset * self._value_bytes
+        page[start : start + self._value_bytes] = (
+            value & ((1 << self.memory_file_values_width) - 1)
+        ).to_bytes(self._value_bytes, "little")
+        self.written[page_number][offset] = 1
+
+    def _written_addresses(self):
+        """Yields all addresses that were written, in ascending order."""
+        for page_number in sorted(self.written):
+            flags = self.written[page_number]
+            offset = flags.find(1)
+            while offset != -1:
+                yield (page_number << self._page_bits) + offset
+                offset = flags.find(1, offset + 1)
+
     def _read_value(self, address: int) -> T:
         """
         Reads the value at the specified memory address.
@@ -106,11 +215,7 @@ class Memory(Generic[T], MemorySystem):
         if self.address_overflow:
             address = address % (2**self.address_length)
         self.assert_address_in_range(address)
-        try:
-            value = self.memory_file[address]
-        except KeyError:
-            value = self.class_of_memory_file_values(0)
-        return value
+        return self.class_of_memory_file_values(self._load(address))
 
     def _write_value(self, address: int, value: T) -> None:
         """
@@ -123,7 +228,31 @@ class Memory(Generic[T], MemorySystem):
         if self.address_overflow:
             address = address % (2**self.address_length)
         self.assert_address_in_range(address)
-        self.memory_file[address] = value
+        self._store(address, int(value))
+
+    def _page_offset(self, address: int, n: int) -> Optional[int]:
+        """
+        Checks whether n consecutive values starting at address can be accessed with a single slice of one page.
+        This is the case if they do not wrap around, are all in the address range and do not cross a page boundary.
+
+        Parameters:
+            address (int): The first address, address overflow already applied.
+            n (int): The number of values.
+
+        Returns:
+            Optional[int]: The offset of address in its page, or None if the values have to be accessed one at a time.
+        """
+        offset = address & (self._values_per_page - 1)
+        address_range = self.address_range
+        if (
+            offset + n <= self._values_per_page
+            and address_range.step == 1
+            and address_range.start <= address
+            and address + n <= address_range.stop
+            and address + n <= self._address_count
+        ):
+            return offset
+        return None
 
     def _read_multiple(self, address: int, n: int) -> int:
         """
@@ -136,6 +265,15 @@ class Memory(Generic[T], MemorySystem):
         Returns:
             int: The concatenated read values (Little Endian).
         """
+        if self.address_overflow:
+            address = address % self._address_count
+        offset = self._page_offset(address, n)
+        if offset is not None:
+            page = self.pages.get(address >> self._page_bits)
+            if page is None:
+                return 0
+            start = offset * self._value_bytes
+            return int.from_bytes(page[start : start + n * self._value_bytes], "little")
         res = 0
         for i in range(n):
             res = res | (
@@ -153,6 +291,19 @@ class Memory(Generic[T], MemorySystem):
             n (int): The number of consecutive addresses to write to.
             value (int): The value to be stored.
         """
+        if self.address_overflow:
+            address = address % self._address_count
+        offset = self._page_offset(address, n)
+        if offset is not None:
+            page_number = address >> self._page_bits
+            page = self._allocate_page(page_number)
+            start = offset * self._value_bytes
+            num_bytes = n * self._value_bytes
+            page[start : start + num_bytes] = (
+                value & ((1 << (8 * num_bytes)) - 1)
+            ).to_bytes(num_bytes, "little")
+            self.written[page_number][offset : offset + n] = b"\x01" * n
+            return
         for i in range(n):
             self._write_value(
                 address + i,
@@ -346,6 +497,93 @@ class Memory(Generic[T], MemorySystem):
             )
         self._write_multiple(address, 64 // self.memory_file_values_width, int(value))
 
+    def read_block(
+        self, address: int, n_words: int, update_statistics: bool = False
+    ) -> list[UInt32]:
+        """
+        Reads n_words consecutive words starting at the specified memory address.
+        Blocks that lie in one page are copied at once, otherwise the words are read one at a time.
+
+        Requires word-wise addressing or smaller; otherwise, raises a UnsupportedFunctionError.
+
+        Parameters:
+            address (int): The memory address of the first word.
+            n_words (int): The number of words to read.
+            update_statistics = False: No effect.
+
+        Raises:
+            UnsupportedFunctionError: If no word-wise addressing or smaller is used.
+            MemoryAddressError: If an address is outside the valid memory range.
+
+        Returns:
+            list[UInt32]: The words read from memory.
+        """
+        if self.memory_file_values_width > 32:
+            raise UnsupportedFunctionError(
+                "word-wise addressing or smaller", self.addressing_type.name
+            )
+        values_per_word = 32 // self.memory_file_values_width
+        if self.address_overflow:
+            address = address % self._address_count
+        offset = self._page_offset(address, n_words * values_per_word)
+        if offset is None:
+            return [
+                self.read_word(address + values_per_word * i) for i in range(n_words)
+            ]
+        page = self.pages.get(address >> self._page_bits)
+        if page is None:
+            return [UInt32(0)] * n_words
+        return [
+            UInt32(word)
+            for word in struct.unpack_from(
+                f"<{n_words}I", page, offset * self._value_bytes
+            )
+        ]
+
+    def write_block(
+        self,
+        address: int,
+        words: list[UInt32],
+        directly_write_to_lower_memory: bool = True,
+    ) -> None:
+        """
+        Writes consecutive words starting at the specified memory address.
+        Blocks that lie in one page are copied at once, otherwise the words are written one at a time.
+
+        Requires word-wise addressing or smaller; otherwise, raises a UnsupportedFunctionError.
+
+        Parameters:
+            address (int): The memory address of the first word.
+            words (list[UInt32]): The words to write.
+            directly_write_to_lower_memory = True: No effect.
+
+        Raises:
+            UnsupportedFunctionError: If no word-wise addressing or smaller is used.
+            MemoryAddressError: If an address is outside the valid memory range.
+        """
+        if self.memory_file_values_width > 32:
+            raise UnsupportedFunctionError(
+                "word-wise addressing or smaller", self.addressing_type.name
+            )
+        values_per_word = 32 // self.memory_file_values_width
+        n = len(words) * values_per_word
+        if self.address_overflow:
+            address = address % self._address_count
+        offset = self._page_offset(address, n)
+        if offset is None:
+            for i, word in enumerate(words):
+                self.write_word(address + values_per_word * i, word)
+            return
+        page_number = address >> self._page_bits
+        page = self._allocate_page(page_number)
+        struct.pack_into(
+            f"<{len(words)}I",
+            page,
+            offset * self._value_bytes,
+            *[int(word) & 0xFFFFFFFF for word in words],
+        )
+        self.written[page_number][offset : offset + n] = b"\x01" * n
+
     def _memory_repr(
         self, bits_of_one_block: int
     ) -> dict[int, tuple[str, str, str, str]]:
@@ -372,7 +610,7 @@ class Memory(Generic[T], MemorySystem):
             else self.read_doubleword
         )
 
-        for address in self.memory_file.keys():
+        for address in self._written_addresses():
             aligned_address = address - (address % num_keys_of_one_block)
             if aligned_address in repr_map:
                 continue
@@ -5,6 +5,7 @@ from fixedint import UInt32, UInt16, UInt8
 
 if TYPE_CHECKING:
     from architecture_simulator.uarch.memory.cache import CacheRepr
+    from architecture_simulator.uarch.memory.miss_classifier import MissClassification
 
 
 class MemorySystem(ABC):
@@ -112,6 +113,45 @@ class MemorySystem(ABC):
         """
         raise NotImplementedError
 
+    def read_block(
+        self, address: int, n_words: int, update_statistics: bool = True
+    ) -> list[UInt32]:
+        """
+        Reads n_words consecutive words from memory.
+        Subclasses can override this method to transfer the whole block at once.
+
+        Args:
+            address (int): The memory address of the first word.
+            n_words (int): The number of words to read.
+            update_statistics (bool, optional): Whether to update memory statistics.
+            Defaults to True.
+
+        Returns:
+            list[UInt32]: The words read from memory.
+        """
+        return [
+            self.read_word(address + 4 * i, update_statistics) for i in range(n_words)
+        ]
+
+    def write_block(
+        self,
+        address: int,
+        words: list[UInt32],
+        directly_write_to_lower_memory: bool = False,
+    ) -> None:
+        """
+        Writes consecutive words to memory.
+        Subclasses can override this method to transfer the whole block at once.
+
+        Args:
+            address (int): The memory address of the first word.
+            words (list[UInt32]): The words to write.
+            directly_write_to_lower_memory (bool, optional): Whether to bypass caches and statistics
+            and directly write to lower memory. Defaults to False.
+        """
+        for i, word in enumerate(words):
+            self.write_word(address + 4 * i, word, directly_write_to_lower_memory)
+
     @abstractmethod
     def reset(self) -> None:
         """
@@ -142,6 +182,24 @@ class MemorySystem(ABC):
         """
         return None
 
+    def take_pending_stall_cycles(self) -> int:
+        """
+        Subclasses implementing a cache can override this method to let the pipeline stall for the latency of the accesses.
+
+        Returns:
+            int: The cycles that the accesses since the last call have to stall the pipeline, 0 if not overridden.
+        """
+        return 0
+
+    def get_set_miss_classifications(self) -> Optional[list[MissClassification]]:
+        """
+        Subclasses implementing a cache can override this method to provide the classified misses of every set.
+
+        Returns:
+            Optional[list[MissClassification]]: The misses of the sets, indexed by the set index, or None if not overridden.
+        """
+        return None
+
     def cache_repr(self) -> Optional[CacheRepr]:
         """
         Subclasses implementing a cache can override this method to provide cache representation.
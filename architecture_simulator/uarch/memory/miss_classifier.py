@@ -0,0 +1,86 @@
+from collections import OrderedDict
+from dataclasses import dataclass
+
+from architecture_simulator.uarch.memory.decoded_address import DecodedAddress
+
+
+@dataclass
+class MissClassification:
+    """Misses of a cache (or of one set of a cache), split into the three Cs of Hill and Smith."""
+
+    # first access of the block
+    compulsory: int = 0
+    # would also have missed in a fully associative LRU cache of the same size
+    capacity: int = 0
+    # would have hit in a fully associative LRU cache of the same size
+    conflict: int = 0
+
+    def get_stats(self) -> dict[str, str]:
+        """Returns the counts in the same form as the get_cache_stats() method of the cache memory systems.
+
+        Returns:
+            dict[str, str]: Dictionary with keys 'compulsory_misses', 'capacity_misses' and 'conflict_misses'.
+        """
+        return {
+            "compulsory_misses": str(self.compulsory),
+            "capacity_misses": str(self.capacity),
+            "conflict_misses": str(self.conflict),
+        }
+
+
+class MissClassifier:
+    """Classifies the misses of a cache while it is simulated.
+
+    A miss is compulsory if the block has never been in the cache. Otherwise it is a conflict miss if the block is
+    still in a shadow cache, a fully associative LRU cache with as many blocks as the real cache, and a capacity miss
+    if it is not. The shadow cache is an OrderedDict of block addresses in LRU order, so every access costs O(1).
+    """
+
+    def __init__(
+        self, num_index_bits: int, num_block_bits: int, associativity: int
+    ) -> None:
+        """Constructor of the miss classifier.
+
+        Args:
+            num_index_bits (int): Number of bits used to form the index of the real cache.
+            num_block_bits (int): Number of bits used to form a block of the real cache.
+            associativity (int): Associativity of the real cache.
+        """
+        self.num_blocks = 2**num_index_bits * associativity
+        # block aligned addresses of all blocks that have been in the cache
+        self.seen_blocks: set[int] = set()
+        # block aligned addresses, least recently used first
+        self.shadow_cache: OrderedDict[int, None] = OrderedDict()
+        self.misses = MissClassification()
+        self.set_misses = [MissClassification() for _ in range(2**num_index_bits)]
+
+    def access(
+        self, decoded_address: DecodedAddress, hit: bool, allocate: bool = True
+    ) -> None:
+        """Updates the shadow cache with an access of the real cache and classifies the access if it was a miss.
+
+        Args:
+            decoded_address (DecodedAddress): The accessed address, decoded for the real cache.
+            hit (bool): Whether the access hit in the real cache.
+            allocate (bool, optional): Whether the access brings the block into the real cache.
+                False for write misses of a cache without write allocate. Defaults to True.
+        """
+        block = decoded_address.block_alinged_address
+        in_shadow_cache = block in self.shadow_cache
+        if not hit:
+            if block not in self.seen_blocks:
+                self.misses.compulsory += 1
+                self.set_misses[decoded_address.cache_set_index].compulsory += 1
+            elif in_shadow_cache:
+                self.misses.conflict += 1
+                self.set_misses[decoded_address.cache_set_index].conflict += 1
+            else:
+                self.misses.capacity += 1
+                self.set_misses[decoded_address.cache_set_index].capacity += 1
+        if in_shadow_cache:
+            self.shadow_cache.move_to_end(block)
+        elif hit or allocate:
+            self.seen_blocks.add(block)
+            self.shadow_cache[block] = None
+            if len(self.shadow_cache) > self.num_blocks:
+                self.shadow_cache.popitem(last=False)
@@ -0,0 +1,229 @@
+from abc import ABC, abstractmethod
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+
+class PrefetcherOptions:
+    """
+    Configuration object for the prefetcher of a cache.
+    """
+
+    def __init__(
+        self,
+        prefetcher: str,
+        degree: int,
+        distance: int,
+        num_entries: int,
+    ) -> None:
+        # "none", "next_line", "stride" or "stream"
+        self.prefetcher = prefetcher
+        # number of blocks that are prefetched at once
+        self.degree = degree
+        # how far ahead of the accessed block the first prefetched block is, in blocks (or strides)
+        self.distance = distance
+        # entries of the reference prediction table of the stride prefetcher, streams of the stream prefetcher
+        self.num_entries = num_entries
+
+
+@dataclass
+class PrefetchStatistics:
+    """Counts the prefetches of a cache."""
+
+    # blocks that were written into the cache by a prefetch
+    prefetches: int = 0
+    # prefetched blocks that were accessed before they were replaced
+    useful: int = 0
+    # prefetched blocks that were replaced before they were accessed
+    useless: int = 0
+    # misses on blocks that had been replaced by a prefetch
+    pollution: int = 0
+
+
+class Prefetcher(ABC):
+    """Decides which blocks to prefetch after an access of the cache."""
+
+    def __init__(self, degree: int, distance: int) -> None:
+        self.degree = degree
+        self.distance = distance
+
+    @abstractmethod
+    def get_prefetch_addresses(
+        self, address: int, block_size: int, hit: bool, prefetch_hit: bool
+    ) -> list[int]:
+        """Is called after every access that updates the statistics of the cache.
+
+        Args:
+            address (int): The accessed address.
+            block_size (int): Size of a block of the cache in bytes.
+            hit (bool): Whether the access was a hit.
+            prefetch_hit (bool): Whether the access was the first access of a prefetched block.
+
+        Returns:
+            list[int]: Addresses of the blocks to prefetch.
+        """
+
+    def reset(self) -> None:
+        """Forgets the accesses that have been seen, called when the cache is reset."""
+
+
+class NextLinePrefetcher(Prefetcher):
+    """Prefetches the blocks after the accessed block on a miss and on the first access of a prefetched block
+    (tagged prefetching), so a sequential walk keeps prefetching ahead.
+    """
+
+    def get_prefetch_addresses(
+        self, address: int, block_size: int, hit: bool, prefetch_hit: bool
+    ) -> list[int]:
+        if hit and not prefetch_hit:
+            return []
+        block_address = address - address % block_size
+        return [
+            block_address + (self.distance + i) * block_size for i in range(self.degree)
+        ]
+
+
+@dataclass
+class ReferencePredictionTableEntry:
+    pc: int
+    last_address: int
+    stride: int = 0
+    # the stride has been seen twice in a row
+    steady: bool = False
+
+
+class StridePrefetcher(Prefetcher):
+    """Reference prediction table (Chen and Baer), indexed with the word address of the instruction that
+    accesses the memory. Every entry remembers the last address and the last stride of its instruction.
+    Once the same stride has been seen twice in a row, the addresses distance to distance + degree - 1 strides
+    ahead of the access are prefetched on every access of the instruction.
+    """
+
+    def __init__(
+        self,
+        degree: int,
+        distance: int,
+        num_entries: int,
+        get_program_counter: Callable[[], int],
+    ) -> None:
+        """Constructor of the stride prefetcher.
+
+        Args:
+            degree (int): Number of addresses that are prefetched at once.
+            distance (int): Number of strides between the access and the first prefetched address.
+            num_entries (int): Number of entries of the reference prediction table.
+            get_program_counter (Callable[[], int]): Returns the address of the instruction that accesses the memory.
+        """
+        super().__init__(degree, distance)
+        self.get_program_counter = get_program_counter
+        self.table: list[Optional[ReferencePredictionTableEntry]] = [None] * num_entries
+
+    def get_prefetch_addresses(
+        self, address: int, block_size: int, hit: bool, prefetch_hit: bool
+    ) -> list[int]:
+        pc = self.get_program_counter()
+        index = (pc >> 2) % len(self.table)
+        entry = self.table[index]
+        if entry is None or entry.pc != pc:
+            self.table[index] = ReferencePredictionTableEntry(pc, address)
+            return []
+        stride = address - entry.last_address
+        entry.steady = stride == entry.stride and stride != 0
+        entry.stride = stride
+        entry.last_address = address
+        if not entry.steady:
+            return []
+        return [address + (self.distance + i) * stride for i in range(self.degree)]
+
+    def reset(self) -> None:
+        self.table = [None] * len(self.table)
+
+
+@dataclass
+class Stream:
+    # block number of the last access of the stream
+    last_block: int
+    # 1 for ascending, -1 for descending, 0 as long as only one access has been seen
+    direction: int = 0
+
+
+class StreamPrefetcher(Prefetcher):
+    """Tracks up to num_streams streams of misses to consecutive blocks, like the stream buffers of Jouppi.
+    A miss (or the first access of a prefetched block) that continues a stream in its direction prefetches
+    the blocks distance to distance + degree - 1 blocks ahead. Other misses start a new stream, replacing
+    the least recently used one. The prefetched blocks are written into the cache instead of separate buffers.
+    """
+
+    def __init__(self, degree: int, distance: int, num_streams: int) -> None:
+        """Constructor of the stream prefetcher.
+
+        Args:
+            degree (int): Number of blocks that are prefetched at once.
+            distance (int): Number of blocks between the access and the first prefetched block.
+            num_streams (int): Number of streams that are tracked at once.
+        """
+        super().__init__(degree, distance)
+        self.num_streams = num_streams
+        # least recently used first
+        self.streams: list[Stream] = []
+
+    def get_prefetch_addresses(
+        self, address: int, block_size: int, hit: bool, prefetch_hit: bool
+    ) -> list[int]:
+        if hit and not prefetch_hit:
+            return []
+        block = address // block_size
+        # a stream may skip the blocks that have been prefetched for it
+        window = self.distance + self.degree
+        for stream in self.streams:
+            offset = block - stream.last_block
+            if offset == 0:
+                return []
+            if stream.direction == 0 and abs(offset) == 1:
+                stream.direction = offset
+            elif not (
+                stream.direction != 0 and 0 < offset * stream.direction <= window
+            ):
+                continue
+            stream.last_block = block
+            self.streams.remove(stream)
+            self.streams.append(stream)
+            return [
+                (block + (self.distance + i) * stream.direction) * block_size
+                for i in range(self.degree)
+            ]
+        self.streams.append(Stream(block))
+        if len(self.streams) > self.num_streams:
+            del self.streams[0]
+        return []
+
+    def reset(self) -> None:
+        self.streams = []
+
+
+def create_prefetcher(
+    options: PrefetcherOptions, get_program_counter: Callable[[], int]
+) -> Optional[Prefetcher]:
+    """Creates the prefetcher that is described by the options.
+
+    Args:
+        options (PrefetcherOptions): Configuration of the prefetcher.
+        get_program_counter (Callable[[], int]): Returns the address of the instruction that accesses the memory,
+            only used by the stride prefetcher.
+
+    Raises:
+        ValueError: If the prefetcher is unknown.
+
+    Returns:
+        Optional[Prefetcher]: The prefetcher, or None for "none".
+    """
+    if options.prefetcher == "none":
+        return None
+    if options.prefetcher == "next_line":
+        return NextLinePrefetcher(options.degree, options.distance)
+    if options.prefetcher == "stride":
+        return StridePrefetcher(
+            options.degree, options.distance, options.num_entries, get_program_counter
+        )
+    if options.prefetcher == "stream":
+        return StreamPrefetcher(options.degree, options.distance, options.num_entries)
+    raise ValueError(f"Unknown prefetcher '{options.prefetcher}'")
@@ -1,4 +1,5 @@
 from typing import Any
+from collections import OrderedDict
 from abc import ABC, abstractmethod
 import math
 
@@ -41,14 +42,14 @@ class ReplacementStrategy(ABC):
 class LRU(ReplacementStrategy):
     def __init__(self, associativity: int) -> None:
         super().__init__(associativity)
-        self.lru = [i for i in range(associativity)]
+        # block indices ordered from least recently used to most recently used
+        self.lru: OrderedDict[int, None] = OrderedDict.fromkeys(range(associativity))
 
     def access(self, index: int) -> None:
-        self.lru.remove(index)
-        self.lru.append(index)
+        self.lru.move_to_end(index)
 
     def get_next_to_replace(self) -> int:
-        return self.lru[0]
+        return next(iter(self.lru))
 
     def get_repr(self) -> list[int]:
         """Returns the lru value for each block. The block that gets replaced next has the value 0,
@@ -57,7 +58,10 @@ class LRU(ReplacementStrategy):
         Returns:
             list[int]: A list of lru values.
         """
-        return [self.lru.index(i) for i in range(len(self.lru))]
+        lru_values = [0] * len(self.lru)
+        for lru_value, index in enumerate(self.lru):
+            lru_values[index] = lru_value
+        return lru_values
 
 
 class PLRU(ReplacementStrategy):
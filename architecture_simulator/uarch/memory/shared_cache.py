@@ -0,0 +1,187 @@
+from typing import Optional
+
+from architecture_simulator.uarch.memory.cache import Cache, CacheRepr
+from architecture_simulator.uarch.memory.decoded_address import DecodedAddress
+from architecture_simulator.uarch.memory.miss_classifier import (
+    MissClassification,
+    MissClassifier,
+)
+from architecture_simulator.uarch.memory.replacement_strategies import (
+    ReplacementStrategy,
+    LRU,
+    PLRU,
+)
+
+
+class SharedCache:
+    """
+    Unified second level cache behind the data and the instruction cache.
+
+    The L1 cache memory systems access the shared cache on every miss that updates their statistics and add the
+    returned latency to the cycles, so a miss costs the sum of the latencies of the levels it traverses.
+    Dirty blocks that are written back by a write back L1 and stores that hit in a write through L1 also update the
+    shared cache, but are not counted as accesses and cost no cycles (they go through a write buffer).
+
+    The shared cache only simulates which blocks are cached. The L1 caches still read and write the data directly
+    from and to the memory below, so the data of the instructions and the data memory never have to be merged.
+    """
+
+    def __init__(
+        self,
+        num_index_bits: int,
+        num_block_bits: int,
+        associativity: int,
+        hit_latency: int = 0,
+        miss_penalty: int = 0,
+        replacement_strategy: str = "lru",
+        cache_type: str = "wb",
+    ) -> None:
+        """
+        Initialize a SharedCache object.
+
+        Args:
+            num_index_bits (int): Number of bits used to form the index.
+            num_block_bits (int): Number of bits used to form a block. Block size is 2^N.
+            associativity (int): Associativity.
+            hit_latency (int, optional): Amount of cycles of every access. Defaults to 0.
+            miss_penalty (int, optional): Amount of cycles that are added if an access misses. Defaults to 0.
+            replacement_strategy (str, optional): Cache replacement strategy. If 'lru', LRU will be used, otherwise PLRU will be used. Defaults to 'lru'.
+            cache_type (str, optional): If 'wb', writes allocate the block (write back with write allocate),
+                otherwise write misses do not change the cache (write through with write no allocate). Defaults to 'wb'.
+        """
+        self.replacement_strategy_class: type[ReplacementStrategy] = LRU if replacement_strategy == "lru" else PLRU  # type: ignore[type-abstract]
+        self.num_index_bits = num_index_bits
+        self.num_block_bits = num_block_bits
+        self.associativity = associativity
+        self.hit_latency = hit_latency
+        self.miss_penalty = miss_penalty
+        self.cache_type = cache_type
+        self.cache = self._create_cache()
+        self.miss_classifier = self._create_miss_classifier()
+        self.hits = 0
+        self.accesses = 0
+        # cycles of all counted accesses
+        self.access_cycles = 0
+        self.last_was_hit = False
+
+    def access(self, address: int, is_write: bool = False) -> int:
+        """
+        Accesses the block of the address because of a miss in an L1 cache.
+
+        Args:
+            address (int): The address that missed in the L1 cache.
+            is_write (bool, optional): Whether the access is a store that missed in a write through L1 cache. Defaults to False.
+
+        Returns:
+            int: The latency of the access.
+        """
+        decoded_address = self._decode_address(address)
+        hit = self.cache.read_block(decoded_address) is not None
+        # read_block already updated the replacement strategy of a read hit,
+        # write misses only allocate in a write back cache
+        allocate = not is_write or self.cache_type == "wb"
+        if (hit and is_write) or (not hit and allocate):
+            self.cache.write_block(
+                decoded_address, self._empty_block(), write_access=is_write
+            )
+        self.miss_classifier.access(decoded_address, hit, allocate)
+        latency = self.hit_latency if hit else self.hit_latency + self.miss_penalty
+        self.hits += int(hit)
+        self.accesses += 1
+        self.access_cycles += latency
+        self.last_was_hit = hit
+        return latency
+
+    def update(self, address: int) -> None:
+        """
+        Writes the block of the address without counting the access, for write backs and buffered writes of an L1 cache.
+
+        Args:
+            address (int): An address of the written block.
+        """
+        decoded_address = self._decode_address(address)
+        if self.cache_type == "wb" or self.cache.contains(decoded_address):
+            self.cache.write_block(
+                decoded_address, self._empty_block(), write_access=True
+            )
+
+    def get_amat(self) -> float:
+        """
+        Returns the average memory access time of the counted accesses.
+
+        Returns:
+            float: Average number of cycles per access. 0 if there were no accesses.
+        """
+        return self.access_cycles / self.accesses if self.accesses else 0
+
+    def get_cache_stats(self) -> dict[str, str | bool]:
+        """
+        Returns cache stats as a dictionary.
+
+        Returns:
+            dict[str, str | bool]: Dictionary with keys 'hits', 'accesses', 'last_hit', 'amat', 'compulsory_misses',
+                'capacity_misses' and 'conflict_misses'.
+        """
+        return {
+            "hits": str(self.hits),
+            "accesses": str(self.accesses),
+            "last_hit": self.last_was_hit,
+            "amat": f"{self.get_amat():.2f}",
+            **self.miss_classifier.misses.get_stats(),
+        }
+
+    def get_set_miss_classifications(self) -> list[MissClassification]:
+        """
+        Returns the classified misses of every set.
+
+        Returns:
+            list[MissClassification]: The misses of the sets, indexed by the set index.
+        """
+        return self.miss_classifier.set_misses
+
+    def reset(self) -> None:
+        """
+        Clears the cache and the stats.
+        """
+        self.cache = self._create_cache()
+        self.miss_classifier = self._create_miss_classifier()
+        self.hits = 0
+        self.accesses = 0
+        self.access_cycles = 0
+        self.last_was_hit = False
+
+    def cache_repr(self) -> CacheRepr:
+        """
+        Exposes get_repr() of cache.
+        """
+        return self.cache.get_repr()
+
+    def _create_cache(self) -> Cache[Optional[int]]:
+        return Cache[Optional[int]](
+            num_index_bits=self.num_index_bits,
+            num_block_bits=self.num_block_bits,
+            associativity=self.associativity,
+            replacement_strategy=self.replacement_strategy_class,
+        )
+
+    def _create_miss_classifier(self) -> MissClassifier:
+        return MissClassifier(
+            self.num_index_bits, self.num_block_bits, self.associativity
+        )
+
+    def _empty_block(self) -> list[Optional[int]]:
+        return [None] * self.cache.num_words_in_block
+
+    def _decode_address(self, address: int) -> DecodedAddress:
+        """
+        Method for creating a decoded address based on cache configuration.
+
+        Args:
+            address (int): Address to decode.
+
+        Returns:
+            DecodedAddress: Object holding all information implicitly contained in the address.
+        """
+        return DecodedAddress(
+            self.cache.num_index_bits, self.cache.num_block_bits, address
+        )
@@ -0,0 +1,246 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Generic, Optional, TypeVar, Any
+
+from fixedint import UInt8, UInt16, UInt32
+
+from architecture_simulator.isa.instruction import Instruction
+from architecture_simulator.uarch.memory.decoded_address import DecodedAddress
+from architecture_simulator.uarch.memory.instruction_memory_system import (
+    InstructionMemorySystem,
+)
+from architecture_simulator.uarch.memory.memory_system import MemorySystem
+
+T = TypeVar("T", bound=Instruction)
+
+
+@dataclass
+class CacheConfigurationResult:
+    """Hits and accesses of one cache configuration, as computed by the StackDistanceAnalyzer."""
+
+    num_index_bits: int
+    num_block_bits: int
+    associativity: int
+    hits: int
+    accesses: int
+
+    def get_hit_rate(self) -> float:
+        """Returns the fraction of the accesses that were hits.
+
+        Returns:
+            float: Value between 0 and 1. 0 if there were no accesses.
+        """
+        return self.hits / self.accesses if self.accesses else 0
+
+    def get_cache_stats(self) -> dict[str, str]:
+        """Returns the stats in the same form as the get_cache_stats() method of the cache memory systems.
+
+        Returns:
+            dict[str, str]: Dictionary with keys 'hits' and 'accesses'.
+        """
+        return {"hits": str(self.hits), "accesses": str(self.accesses)}
+
+
+class StackDistanceAnalyzer:
+    """Computes the hits of LRU caches with any number of sets and any associativity in a single pass over
+    an address stream, using the stack distances of Mattson et al.
+
+    For every width of the index there is one LRU stack per set. The position of the accessed block in the stack of
+    its set is its stack distance. An access hits in a cache with that number of sets iff the stack distance
+    is smaller than the associativity, so a histogram of the stack distances gives the hits of every associativity.
+    The stacks are truncated to max_associativity entries.
+
+    This is exact for caches that allocate on every access, like the write back caches and the instruction cache.
+    Write through caches (no write allocate) and PLRU can not be described by stack distances.
+    """
+
+    def __init__(
+        self, num_block_bits: int, max_num_index_bits: int, max_associativity: int
+    ) -> None:
+        """Constructor of the analyzer.
+
+        Args:
+            num_block_bits (int): Number of bits used to form a block. Block size is 2^N words.
+            max_num_index_bits (int): Results are computed for all index widths from 0 to max_num_index_bits.
+            max_associativity (int): Results are computed for all associativities from 1 to max_associativity.
+        """
+        self.num_block_bits = num_block_bits
+        self.max_num_index_bits = max_num_index_bits
+        self.max_associativity = max_associativity
+        self.accesses = 0
+        # index width -> set index -> block aligned addresses, most recently used first
+        self.stacks: list[list[list[int]]] = [
+            [[] for _ in range(2**num_index_bits)]
+            for num_index_bits in range(max_num_index_bits + 1)
+        ]
+        # index width -> stack distance -> number of accesses with that distance
+        self.distance_counts: list[list[int]] = [
+            [0] * max_associativity for _ in range(max_num_index_bits + 1)
+        ]
+
+    def access(self, address: int) -> None:
+        """Processes one access of the address stream.
+
+        Args:
+            address (int): The accessed address.
+        """
+        self.accesses += 1
+        decoded_address = DecodedAddress(
+            self.max_num_index_bits, self.num_block_bits, address
+        )
+        block = decoded_address.block_alinged_address
+        for num_index_bits, stacks in enumerate(self.stacks):
+            # the index of a narrower index is made up of the lowest bits of the widest index
+            stack = stacks[
+                decoded_address.cache_set_index & ((1 << num_index_bits) - 1)
+            ]
+            try:
+                distance = stack.index(block)
+            except ValueError:
+                stack.insert(0, block)
+                if len(stack) > self.max_associativity:
+                    stack.pop()
+                continue
+            self.distance_counts[num_index_bits][distance] += 1
+            if distance:
+                del stack[distance]
+                stack.insert(0, block)
+
+    def get_hits(self, num_index_bits: int, associativity: int) -> int:
+        """Returns the number of hits of the cache with the given configuration.
+
+        Args:
+            num_index_bits (int): Width of the index, must not be greater than max_num_index_bits.
+            associativity (int): Associativity, must not be greater than max_associativity.
+
+        Returns:
+            int: Number of hits.
+        """
+        return sum(self.distance_counts[num_index_bits][:associativity])
+
+    def get_result(
+        self, num_index_bits: int, associativity: int
+    ) -> CacheConfigurationResult:
+        """Returns the hits and accesses of the cache with the given configuration.
+
+        Args:
+            num_index_bits (int): Width of the index, must not be greater than max_num_index_bits.
+            associativity (int): Associativity, must not be greater than max_associativity.
+
+        Returns:
+            CacheConfigurationResult: The result.
+        """
+        return CacheConfigurationResult(
+            num_index_bits=num_index_bits,
+            num_block_bits=self.num_block_bits,
+            associativity=associativity,
+            hits=self.get_hits(num_index_bits, associativity),
+            accesses=self.accesses,
+        )
+
+
+class RecordingMemorySystem(MemorySystem):
+    """A memory system that passes all accesses to the given memory system and records the address of every access
+    that would update the statistics of a data cache.
+    """
+
+    def __init__(self, memory: MemorySystem) -> None:
+        """Constructor of the recording memory system.
+
+        Args:
+            memory (MemorySystem): The memory system that holds the data.
+        """
+        self.memory = memory
+        self.addresses: list[int] = []
+
+    def get_address_range(self) -> range:
+        return self.memory.get_address_range()
+
+    def read_byte(self, address: int, update_statistics: bool = True) -> UInt8:
+        if update_statistics:
+            self.addresses.append(address)
+        return self.memory.read_byte(address, update_statistics)
+
+    def read_halfword(self, address: int, update_statistics: bool = True) -> UInt16:
+        if update_statistics:
+            self.addresses.append(address)
+        return self.memory.read_halfword(address, update_statistics)
+
+    def read_word(self, address: int, update_statistics: bool = True) -> UInt32:
+        if update_statistics:
+            self.addresses.append(address)
+        return self.memory.read_word(address, update_statistics)
+
+    def write_byte(
+        self, address: int, value: UInt8, directly_write_to_lower_memory: bool = False
+    ) -> None:
+        if not directly_write_to_lower_memory:
+            self.addresses.append(address)
+        self.memory.write_byte(address, value, directly_write_to_lower_memory)
+
+    def write_halfword(
+        self, address: int, value: UInt16, directly_write_to_lower_memory: bool = False
+    ) -> None:
+        if not directly_write_to_lower_memory:
+            self.addresses.append(address)
+        self.memory.write_halfword(address, value, directly_write_to_lower_memory)
+
+    def write_word(
+        self, address: int, value: UInt32, directly_write_to_lower_memory: bool = False
+    ) -> None:
+        if not directly_write_to_lower_memory:
+            self.addresses.append(address)
+        self.memory.write_word(address, value, directly_write_to_lower_memory)
+
+    def reset(self) -> None:
+        """Clears the memory and the recorded addresses."""
+        self.addresses = []
+        self.memory.reset()
+
+    def wordwise_repr(self) -> dict[int, tuple[str, str, str, str]]:
+        return self.memory.wordwise_repr()
+
+
+class RecordingInstructionMemorySystem(InstructionMemorySystem[T], Generic[T]):
+    """An instruction memory system that passes all accesses to the given instruction memory system
+    and records the address of every instruction that is read.
+    """
+
+    def __init__(self, instruction_memory: InstructionMemorySystem[T]) -> None:
+        """Constructor of the recording instruction memory system.
+
+        Args:
+            instruction_memory (InstructionMemorySystem[T]): The instruction memory system that holds the instructions.
+        """
+        self.instruction_memory = instruction_memory
+        self.addresses: list[int] = []
+
+    def has_instructions(self) -> bool:
+        return self.instruction_memory.has_instructions()
+
+    def get_address_range(self) -> range:
+        return self.instruction_memory.get_address_range()
+
+    def reset(self):
+        """Clears the instruction memory and the recorded addresses."""
+        self.addresses = []
+        self.instruction_memory.reset()
+
+    def get_representation(self) -> list[tuple[int, str]]:
+        return self.instruction_memory.get_representation()
+
+    def read_instruction(self, address: int) -> T:
+        self.addresses.append(address)
+        return self.instruction_memory.read_instruction(address)
+
+    def write_instruction(self, address: int, instr: T):
+        self.instruction_memory.write_instruction(address, instr)
+
+    def write_instructions(self, instructions: list[T]):
+        self.instruction_memory.write_instructions(instructions)
+
+    def instruction_at_address(self, address: int) -> bool:
+        return self.instruction_memory.instruction_at_address(address)
+
+    def get_cache_stats(self) -> Optional[dict[str, Any]]:
+        return self.instruction_memory.get_cache_stats()
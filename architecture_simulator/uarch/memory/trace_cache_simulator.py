@@ -0,0 +1,181 @@
+"""Simulates a cache for a whole recorded address trace at once.
+
+The simulation gives the same hits and misses as feeding the addresses one by one into a Cache with LRU or PLRU
+replacement, but works on plain ints: The tags and set indices of the whole trace are computed with the arithmetic of
+DecodedAddress up front, the accesses are grouped by set (sets do not influence each other) and every set is then
+simulated on its own with its state held in local variables.
+"""
+
+from array import array
+import math
+from typing import Optional, Sequence
+
+from architecture_simulator.uarch.memory.access_trace import read_access_trace
+
+
+def decode_addresses(
+    addresses: Sequence[int], num_index_bits: int, num_block_bits: int
+) -> tuple[list[int], list[int]]:
+    """Computes the tags and set indices of all addresses, like DecodedAddress does for a single address.
+
+    Args:
+        addresses (Sequence[int]): The addresses.
+        num_index_bits (int): The width of the index in bits.
+        num_block_bits (int): The number of bits that are used for the block offset.
+
+    Returns:
+        tuple[list[int], list[int]]: The tags and the set indices.
+    """
+    tag_shift = num_index_bits + num_block_bits + 2
+    index_shift = num_block_bits + 2
+    index_mask = 2**num_index_bits - 1
+    tags = [(address & 0xFFFFFFFF) >> tag_shift for address in addresses]
+    set_indices = [
+        ((address & 0xFFFFFFFF) >> index_shift) & index_mask for address in addresses
+    ]
+    return tags, set_indices
+
+
+def simulate_cache(
+    addresses: Sequence[int],
+    num_index_bits: int,
+    num_block_bits: int,
+    associativity: int,
+    replacement_strategy: str = "lru",
+    is_write: Optional[Sequence[int]] = None,
+    write_allocate: bool = True,
+) -> bytearray:
+    """Determines for every access of the trace whether it hits in the given cache.
+
+    Args:
+        addresses (Sequence[int]): The accessed addresses, in the order of the accesses.
+        num_index_bits (int): Number of bits used to form the index.
+        num_block_bits (int): Number of bits used to form a block. Block size is 2^N words.
+        associativity (int): Associativity.
+        replacement_strategy (str, optional): If 'lru', LRU will be used, otherwise PLRU will be used. Defaults to 'lru'.
+        is_write (Optional[Sequence[int]], optional): Nonzero for the accesses that are writes. Only needed
+            if write_allocate is False. Defaults to None (all accesses are reads).
+        write_allocate (bool, optional): Whether a write miss allocates the block, like in the write back cache.
+            If False, write misses do not change the cache, like in the write through cache. Defaults to True.
+
+    Returns:
+        bytearray: One entry per access, 1 for a hit and 0 for a miss.
+    """
+    tags, set_indices = decode_addresses(addresses, num_index_bits, num_block_bits)
+    no_allocate = (
+        bytes(len(tags))
+        if write_allocate or is_write is None
+        else bytes(1 if write else 0 for write in is_write)
+    )
+    hits = bytearray(len(tags))
+    # stable sort, so the accesses of each set stay in program order
+    order = sorted(range(len(tags)), key=set_indices.__getitem__)
+    simulate_set = (
+        _simulate_lru_set if replacement_strategy == "lru" else _simulate_plru_set
+    )
+    start = 0
+    while start < len(order):
+        set_index = set_indices[order[start]]
+        end = start + 1
+        while end < len(order) and set_indices[order[end]] == set_index:
+            end += 1
+        simulate_set(order[start:end], tags, no_allocate, associativity, hits)
+        start = end
+    return hits
+
+
+def _simulate_lru_set(
+    accesses: list[int],
+    tags: list[int],
+    no_allocate: bytes,
+    associativity: int,
+    hits: bytearray,
+) -> None:
+    """Simulates one set with LRU replacement. Writes 1 into hits for every access that hits.
+
+    The set is a dict of the cached tags in the order of their last use. Blocks that were never written are always
+    the next ones to be replaced by LRU, so the least recently used tag only gets evicted once the set is full.
+
+    Args:
+        accesses (list[int]): Indices of the accesses of this set, in program order.
+        tags (list[int]): Tags of all accesses.
+        no_allocate (bytes): Nonzero for the accesses that do not allocate on a miss.
+        associativity (int): Associativity.
+        hits (bytearray): Hit vector of all accesses.
+    """
+    cached: dict[int, None] = {}
+    for access in accesses:
+        tag = tags[access]
+        if tag in cached:
+            hits[access] = 1
+            del cached[tag]
+            cached[tag] = None
+        elif not no_allocate[access]:
+            if len(cached) == associativity:
+                del cached[next(iter(cached))]
+            cached[tag] = None
+
+
+def _simulate_plru_set(
+    accesses: list[int],
+    tags: list[int],
+    no_allocate: bytes,
+    associativity: int,
+    hits: bytearray,
+) -> None:
+    """Simulates one set with PLRU replacement, using the same tree as the PLRU class.
+    Writes 1 into hits for every access that hits.
+
+    Args:
+        accesses (list[int]): Indices of the accesses of this set, in program order.
+        tags (list[int]): Tags of all accesses.
+        no_allocate (bytes): Nonzero for the accesses that do not allocate on a miss.
+        associativity (int): Associativity.
+        hits (bytearray): Hit vector of all accesses.
+    """
+    tree_depth = int(math.log2(associativity))
+    tree = [False] * (associativity - 1)
+    # tag -> way, and way -> tag
+    ways: dict[int, int] = {}
+    way_tags: list[Optional[int]] = [None] * associativity
+    for access in accesses:
+        tag = tags[access]
+        way = ways.get(tag)
+        if way is not None:
+            hits[access] = 1
+        elif no_allocate[access]:
+            continue
+        else:
+            i = 0
+            for _ in range(tree_depth):
+                i = 2 * i + 2 if tree[i] else 2 * i + 1
+            way = i + 1 - associativity
+            old_tag = way_tags[way]
+            if old_tag is not None:
+                del ways[old_tag]
+            ways[tag] = way
+            way_tags[way] = tag
+        i = way + associativity - 1
+        for _ in range(tree_depth):
+            is_right_child = i % 2 == 1
+            i = (i - 1) // 2
+            tree[i] = is_right_child
+
+
+def load_trace(path: str, instruction_fetches: bool = False) -> tuple[array, bytes]:
+    """Loads the addresses of a trace file that was written by an AccessTracer.
+
+    Args:
+        path (str): Path of the trace file.
+        instruction_fetches (bool, optional): Load the instruction fetches instead of the data accesses. Defaults to False.
+
+    Returns:
+        tuple[array, bytes]: The addresses, and one entry per address that is 1 for writes.
+    """
+    addresses = array("I")
+    is_write = bytearray()
+    for record in read_access_trace(path):
+        if record.is_instruction == instruction_fetches:
+            addresses.append(record.address)
+            is_write.append(int(record.is_write))
+    return addresses, bytes(is_write)
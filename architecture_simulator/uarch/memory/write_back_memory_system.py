@@ -1,3 +1,6 @@
+from __future__ import annotations
+from typing import Optional, TYPE_CHECKING
+
 from fixedint import UInt8, UInt16, UInt32
 
 from architecture_simulator.uarch.memory.base_cache_memory_system import (
@@ -14,6 +17,10 @@ from architecture_simulator.uarch.riscv.riscv_performance_metrics import (
     RiscvPerformanceMetrics,
 )
 
+if TYPE_CHECKING:
+    from architecture_simulator.uarch.memory.prefetchers import Prefetcher
+    from architecture_simulator.uarch.memory.shared_cache import SharedCache
+
 
 class WriteBackMemorySystem(BaseCacheMemorySystem):
     """
@@ -29,6 +36,10 @@ class WriteBackMemorySystem(BaseCacheMemorySystem):
         performance_metrics: RiscvPerformanceMetrics,
         miss_penality: int = 0,
         replacement_strategy: str = "lru",
+        hit_latency: int = 0,
+        next_level: Optional[SharedCache] = None,
+        prefetcher: Optional[Prefetcher] = None,
+        stall_on_access: bool = False,
     ) -> None:
         """
         Initialize a WriteBackMemorySystem object.
@@ -41,6 +52,11 @@ class WriteBackMemorySystem(BaseCacheMemorySystem):
             performance_metrics (RiscvPerformanceMetrics): Performance Metrics object to track cache performance.
             miss_penalty (int, optional): Amount of cycles to add to performance metrics if a cache miss occurs. Defaults to 0.
             replacement_strategy (str, optional): Cache replacement strategy. If 'lru', LRU will be used, otherwise PLRU will be used. Defaults to 'lru'.
+            hit_latency (int, optional): Amount of cycles to add to performance metrics for every access. Defaults to 0.
+            next_level (Optional[SharedCache], optional): L2 cache that is accessed on a miss instead of adding miss_penalty. Defaults to None.
+            prefetcher (Optional[Prefetcher], optional): Prefetcher that is asked after every access. Defaults to None.
+            stall_on_access (bool, optional): Collect the cycles of the accesses for the pipeline to stall instead of adding them
+                to the performance metrics, see take_pending_stall_cycles(). Defaults to False.
         """
         super().__init__(
             memory,
@@ -50,6 +66,10 @@ class WriteBackMemorySystem(BaseCacheMemorySystem):
             performance_metrics,
             miss_penality,
             replacement_strategy,
+            hit_latency,
+            next_level,
+            prefetcher,
+            stall_on_access,
         )
 
     def write_byte(
@@ -74,6 +94,9 @@ class WriteBackMemorySystem(BaseCacheMemorySystem):
             self.memory.write_byte(address, value)
             return None
 
+        if self.tracer is not None:
+            self.tracer.record_data(address, 1, is_write=True)
+
         block_values = self.cache.read_block(decoded_address)
         hit = block_values is not None
 
@@ -94,8 +117,9 @@ class WriteBackMemorySystem(BaseCacheMemorySystem):
 
         self.hits += int(hit)
         self.last_was_hit = hit
-        if not hit:
-            self.performance_metrics.cycles += self.miss_penality
+        self._add_access_cycles(address, hit)
+        self.miss_classifier.access(decoded_address, hit)
+        self._prefetch(address, hit)
         self.accesses += 1
 
     def write_halfword(
@@ -120,6 +144,9 @@ class WriteBackMemorySystem(BaseCacheMemorySystem):
             self.memory.write_halfword(address, value)
             return None
 
+        if self.tracer is not None:
+            self.tracer.record_data(address, 2, is_write=True)
+
         block_values = self.cache.read_block(decoded_address)
         hit = block_values is not None
 
@@ -140,8 +167,9 @@ class WriteBackMemorySystem(BaseCacheMemorySystem):
 
         self.hits += int(hit)
         self.last_was_hit = hit
-        if not hit:
-            self.performance_metrics.cycles += self.miss_penality
+        self._add_access_cycles(address, hit)
+        self.miss_classifier.access(decoded_address, hit)
+        self._prefetch(address, hit)
         self.accesses += 1
 
     def write_word(
@@ -166,6 +194,9 @@ class WriteBackMemorySystem(BaseCacheMemorySystem):
             self.memory.write_word(address, value)
             return None
 
+        if self.tracer is not None:
+            self.tracer.record_data(address, 4, is_write=True)
+
         block_values = self.cache.read_block(decoded_address)
         hit = block_values is not None
 
@@ -186,8 +217,9 @@ class WriteBackMemorySystem(BaseCacheMemorySystem):
 
         self.hits += int(hit)
         self.last_was_hit = hit
-        if not hit:
-            self.performance_metrics.cycles += self.miss_penality
+        self._add_access_cycles(address, hit)
+        self.miss_classifier.access(decoded_address, hit)
+        self._prefetch(address, hit)
         self.accesses += 1
 
     def _write_block_to_memory(
@@ -200,8 +232,21 @@ class WriteBackMemorySystem(BaseCacheMemorySystem):
             decoded_address (DecodedAddress): Decoded address that provides the address of the block.
             block (list[UInt32]): Block to write.
         """
-        for i, word in enumerate(block):
-            self.memory.write_word(decoded_address.block_alinged_address + 4 * i, word)
+        self.memory.write_block(decoded_address.block_alinged_address, block)
+        if self.next_level is not None:
+            self.next_level.update(decoded_address.block_alinged_address)
+
+    def _write_back_displaced_block(
+        self, decoded_address: DecodedAddress, block: list[UInt32]
+    ) -> None:
+        """
+        Writes a dirty block that was replaced by a prefetch to lower memory.
+
+        Parameters:
+            decoded_address (DecodedAddress): Decoded address that provides the address of the block.
+            block (list[UInt32]): The replaced block.
+        """
+        self._write_block_to_memory(decoded_address, block)
 
     def _read_block(self, decoded_address: DecodedAddress) -> tuple[list[UInt32], bool]:
         """
@@ -0,0 +1,514 @@
+from __future__ import annotations
+import copy
+from typing import Any, Callable, Optional, TYPE_CHECKING
+from fixedint import UInt8, UInt16, UInt32
+
+from architecture_simulator.util.integer_arithmetic import MASK_32, div, rem
+
+from architecture_simulator.isa.riscv.instruction_types import BTypeInstruction
+from architecture_simulator.isa.riscv.rv32i_instructions import (
+    ADD,
+    SUB,
+    SLL,
+    SLT,
+    SLTU,
+    XOR,
+    SRL,
+    SRA,
+    OR,
+    AND,
+    ADDI,
+    SLTI,
+    SLTIU,
+    XORI,
+    ORI,
+    ANDI,
+    SLLI,
+    SRLI,
+    SRAI,
+    LB,
+    LH,
+    LW,
+    LBU,
+    LHU,
+    SB,
+    SH,
+    SW,
+    BEQ,
+    BNE,
+    BLT,
+    BGE,
+    BLTU,
+    BGEU,
+    LUI,
+    AUIPC,
+    JAL,
+    JALR,
+    MUL,
+    MULH,
+    MULHU,
+    MULHSU,
+    DIV,
+    DIVU,
+    REM,
+    REMU,
+)
+
+if TYPE_CHECKING:
+    from architecture_simulator.isa.riscv.instruction_types import RiscvInstruction
+    from architecture_simulator.uarch.riscv.riscv_architectural_state import (
+        RiscvArchitecturalState,
+    )
+
+# names that are available to the generated code
+_BLOCK_GLOBALS = {
+    "UInt8": UInt8,
+    "UInt16": UInt16,
+    "UInt32": UInt32,
+    "div": div,
+    "rem": rem,
+}
+
+
+def _reg(index: int) -> str:
+    """Returns the expression for reading the given register inside a block (x0 is always 0)."""
+    return "0" if index == 0 else f"x{index}"
+
+
+def _signed(expression: str) -> str:
+    """Returns an expression that interprets the unsigned 32 bit value of expression as signed."""
+    return f"(({expression} ^ 0x80000000) - 0x80000000)"
+
+
+def _assign(rd: int, expression: str) -> list[str]:
+    """Returns the lines for writing expression to rd. Writes to x0 are dropped."""
+    return [] if rd == 0 else [f"x{rd} = {expression}"]
+
+
+def _load(rd: int, expression: str) -> list[str]:
+    """Like _assign, but the expression is still evaluated for x0, since memory reads have side effects (statistics, errors)."""
+    return [expression] if rd == 0 else [f"x{rd} = {expression}"]
+
+
+def _branch(condition: str, address: int, imm: int) -> list[str]:
+    return [
+        f"if {condition}:",
+        "    performance_metrics.branch_count += 1",
+        f"    pc = {address + imm}",
+        "else:",
+        f"    pc = {address + 4}",
+    ]
+
+
+# condition under which a branch is taken
+_CONDITIONS: dict[type, Callable[[Any], str]] = {
+    BEQ: lambda i: f"{_reg(i.rs1)} == {_reg(i.rs2)}",
+    BNE: lambda i: f"{_reg(i.rs1)} != {_reg(i.rs2)}",
+    BLT: lambda i: f"{_signed(_reg(i.rs1))} < {_signed(_reg(i.rs2))}",
+    BGE: lambda i: f"{_signed(_reg(i.rs1))} >= {_signed(_reg(i.rs2))}",
+    BLTU: lambda i: f"{_reg(i.rs1)} < {_reg(i.rs2)}",
+    BGEU: lambda i: f"{_reg(i.rs1)} >= {_reg(i.rs2)}",
+}
+
+# Every template returns the python lines for the given instruction at the given address.
+# Terminating instructions (branches and jumps) have to assign the next program counter to 'pc'.
+_TEMPLATES: dict[type, Callable[[Any, int], list[str]]] = {
+    ADD: lambda i, a: _assign(i.rd, f"({_reg(i.rs1)} + {_reg(i.rs2)}) & {MASK_32}"),
+    SUB: lambda i, a: _assign(i.rd, f"({_reg(i.rs1)} - {_reg(i.rs2)}) & {MASK_32}"),
+    SLL: lambda i, a: _assign(
+        i.rd, f"({_reg(i.rs1)} << ({_reg(i.rs2)} & 31)) & {MASK_32}"
+    ),
+    SLT: lambda i, a: _assign(
+        i.rd, f"1 if {_signed(_reg(i.rs1))} < {_signed(_reg(i.rs2))} else 0"
+    ),
+    SLTU: lambda i, a: _assign(i.rd, f"1 if {_reg(i.rs1)} < {_reg(i.rs2)} else 0"),
+    XOR: lambda i, a: _assign(i.rd, f"{_reg(i.rs1)} ^ {_reg(i.rs2)}"),
+    SRL: lambda i, a: _assign(i.rd, f"{_reg(i.rs1)} >> ({_reg(i.rs2)} & 31)"),
+    SRA: lambda i, a: _assign(
+        i.rd, f"({_signed(_reg(i.rs1))} >> ({_reg(i.rs2)} & 31)) & {MASK_32}"
+    ),
+    OR: lambda i, a: _assign(i.rd, f"{_reg(i.rs1)} | {_reg(i.rs2)}"),
+    AND: lambda i, a: _assign(i.rd, f"{_reg(i.rs1)} & {_reg(i.rs2)}"),
+    ADDI: lambda i, a: _assign(
+        i.rd, f"({_reg(i.rs1)} + {i.imm & MASK_32}) & {MASK_32}"
+    ),
+    SLTI: lambda i, a: _assign(i.rd, f"1 if {_signed(_reg(i.rs1))} < {i.imm} else 0"),
+    SLTIU: lambda i, a: _assign(i.rd, f"1 if {_reg(i.rs1)} < {i.imm & MASK_32} else 0"),
+    XORI: lambda i, a: _assign(i.rd, f"{_reg(i.rs1)} ^ {i.imm & MASK_32}"),
+    ORI: lambda i, a: _assign(i.rd, f"{_reg(i.rs1)} | {i.imm & MASK_32}"),
+    ANDI: lambda i, a: _assign(i.rd, f"{_reg(i.rs1)} & {i.imm & MASK_32}"),
+    SLLI: lambda i, a: _assign(i.rd, f"({_reg(i.rs1)} << {i.imm}) & {MASK_32}"),
+    SRLI: lambda i, a: _assign(i.rd, f"{_reg(i.rs1)} >> {i.imm}"),
+    SRAI: lambda i, a: _assign(
+        i.rd, f"({_signed(_reg(i.rs1))} >> {i.imm}) & {MASK_32}"
+    ),
+    # loads use the address without overflow, just like the behavior methods
+    LB: lambda i, a: _load(
+        i.rd,
+        f"((int(memory.read_byte({_reg(i.rs1)} + {i.imm})) ^ 0x80) - 0x80) & {MASK_32}",
+    ),
+    LH: lambda i, a: _load(
+        i.rd,
+        f"((int(memory.read_halfword({_reg(i.rs1)} + {i.imm})) ^ 0x8000) - 0x8000) & {MASK_32}",
+    ),
+    LW: lambda i, a: _load(i.rd, f"int(memory.read_word({_reg(i.rs1)} + {i.imm}))"),
+    LBU: lambda i, a: _load(i.rd, f"int(memory.read_byte({_reg(i.rs1)} + {i.imm}))"),
+    LHU: lambda i, a: _load(
+        i.rd, f"int(memory.read_halfword({_reg(i.rs1)} + {i.imm}))"
+    ),
+    SB: lambda i, a: [
+        f"memory.write_byte(({_reg(i.rs1)} + {i.imm & MASK_32}) & {MASK_32}, UInt8({_reg(i.rs2)} & 0xFF))"
+    ],
+    SH: lambda i, a: [
+        f"memory.write_halfword(({_reg(i.rs1)} + {i.imm & MASK_32}) & {MASK_32}, UInt16({_reg(i.rs2)} & 0xFFFF))"
+    ],
+    SW: lambda i, a: [
+        f"memory.write_word(({_reg(i.rs1)} + {i.imm & MASK_32}) & {MASK_32}, UInt32({_reg(i.rs2)}))"
+    ],
+    LUI: lambda i, a: _assign(i.rd, f"{(i.imm << 12) & MASK_32}"),
+    AUIPC: lambda i, a: _assign(i.rd, f"{(a + (i.imm << 12)) & MASK_32}"),
+    MUL: lambda i, a: _assign(i.rd, f"({_reg(i.rs1)} * {_reg(i.rs2)}) & {MASK_32}"),
+    MULH: lambda i, a: _assign(
+        i.rd,
+        f"(({_signed(_reg(i.rs1))} * {_signed(_reg(i.rs2))}) >> 32) & {MASK_32}",
+    ),
+    MULHU: lambda i, a: _assign(i.rd, f"({_reg(i.rs1)} * {_reg(i.rs2)}) >> 32"),
+    MULHSU: lambda i, a: _assign(
+        i.rd, f"(({_signed(_reg(i.rs1))} * {_reg(i.rs2)}) >> 32) & {MASK_32}"
+    ),
+    DIV: lambda i, a: _assign(i.rd, f"div({_reg(i.rs1)}, {_reg(i.rs2)}) & {MASK_32}"),
+    DIVU: lambda i, a: _assign(
+        i.rd, f"{MASK_32} if {_reg(i.rs2)} == 0 else {_reg(i.rs1)} // {_reg(i.rs2)}"
+    ),
+    REM: lambda i, a: _assign(i.rd, f"rem({_reg(i.rs1)}, {_reg(i.rs2)}) & {MASK_32}"),
+    REMU: lambda i, a: _assign(
+        i.rd, f"{_reg(i.rs1)} if {_reg(i.rs2)} == 0 else {_reg(i.rs1)} % {_reg(i.rs2)}"
+    ),
+    **{
+        branch: (lambda i, a: _branch(_CONDITIONS[type(i)](i), a, i.imm))
+        for branch in _CONDITIONS
+    },
+    JAL: lambda i, a: _assign(i.rd, f"{(a + 4) & MASK_32}")
+    + ["performance_metrics.procedure_count += 1", f"pc = {a + i.imm}"],
+    # the target has to be computed before rd is written, since rd may be rs1
+    JALR: lambda i, a: [f"pc = ({_reg(i.rs1)} + {i.imm}) & {MASK_32 - 1}"]
+    + _assign(i.rd, f"{(a + 4) & MASK_32}"),
+}
+
+# Instructions that end a basic block
+TERMINATORS = (BTypeInstruction, JAL, JALR)
+
+
+def is_translatable(instruction: RiscvInstruction) -> bool:
+    """Returns whether the block translator can generate code for the instruction.
+    Instructions like ECALL or the CSR instructions are always executed by calling their behavior method.
+    """
+    return type(instruction) in _TEMPLATES and instruction.length == 4
+
+
+class TranslatedBlock:
+    """A basic block that has been compiled into a python function.
+
+    Calling function(state) executes all instructions of the block and sets the program counter to the next instruction.
+    If an instruction raises an exception, all registers written by previous instructions are stored,
+    the program counter is set to the address of the failing instruction and the exception is reraised.
+    """
+
+    def __init__(
+        self,
+        entry_address: int,
+        instructions: list[RiscvInstruction],
+        function: Callable[[RiscvArchitecturalState], None],
+        source: str,
+    ) -> None:
+        self.entry_address = entry_address
+        self.instructions = instructions
+        self.length = len(instructions)
+        self.last_address = entry_address + 4 * (self.length - 1)
+        self.function = function
+        self.source = source
+
+
+class Trace:
+    """A recorded path through the program that has been compiled into one python function (a superblock).
+
+    The path may cross branches and jumps. Every branch and JALR on the path is compiled into a guard that
+    leaves the trace if the direction or the target differs from the recorded one. If the path leads back to its
+    first instruction (closed), the function keeps executing it in a loop until a guard fails.
+
+    Calling function(state) executes the trace, sets the program counter and the previous program counter and
+    adds the executed instructions to the performance metrics. If an instruction raises an exception, the
+    program counter is set to the address of the failing instruction and the exception is reraised
+    (the metrics already contain the failing instruction).
+    """
+
+    def __init__(
+        self,
+        addresses: list[int],
+        closed: bool,
+        function: Callable[[RiscvArchitecturalState], None],
+        source: str,
+    ) -> None:
+        self.entry_address = addresses[0]
+        self.addresses = addresses
+        self.length = len(addresses)
+        self.closed = closed
+        self.function = function
+        self.source = source
+
+
+class BlockTranslator:
+    """Finds basic blocks in the instruction memory, translates them into python functions and caches them by their entry address.
+
+    A block ends after a branch or jump instruction, before an instruction that cannot be translated (e.g. ECALL)
+    or before an address that does not hold an instruction.
+    The generated code keeps the registers it uses in local variables and only loads and stores them
+    at the beginning and the end of the block.
+
+    Hot paths can additionally be compiled into traces (see Trace), which are cached by their first address, too.
+    """
+
+    def __init__(self, max_block_length: int = 64, max_trace_length: int = 256) -> None:
+        """
+        Args:
+            max_block_length (int, optional): Maximum number of instructions in one block. Defaults to 64.
+            max_trace_length (int, optional): Maximum number of instructions in one trace. Defaults to 256.
+        """
+        self.max_block_length = max_block_length
+        self.max_trace_length = max_trace_length
+        # None marks addresses at which no block can start (the instruction is not translatable)
+        self.blocks: dict[int, Optional[TranslatedBlock]] = {}
+        # None marks addresses at which no trace could be recorded
+        self.traces: dict[int, Optional[Trace]] = {}
+        # how often each branch target has been reached, used to find hot paths
+        self.execution_counts: dict[int, int] = {}
+        self.instructions: dict[int, RiscvInstruction] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def reset(self, instructions: dict[int, RiscvInstruction]) -> None:
+        """Invalidates all cached blocks and traces and sets the instructions to translate from.
+
+        Args:
+            instructions (dict[int, RiscvInstruction]): Mapping of addresses to instructions (like InstructionMemory.instructions).
+        """
+        self.instructions = instructions
+        self.blocks = {}
+        self.traces = {}
+        self.execution_counts = {}
+
+    def copy(self) -> BlockTranslator:
+        """Returns a translator that shares the cached blocks and traces with this one, but caches new ones on its own.
+
+        Returns:
+            BlockTranslator: The copy.
+        """
+        result = copy.copy(self)
+        result.blocks = dict(self.blocks)
+        result.traces = dict(self.traces)
+        result.execution_counts = dict(self.execution_counts)
+        return result
+
+    def get_block(self, address: int) -> Optional[TranslatedBlock]:
+        """Returns the block that starts at the given address. Translates it if it is not cached yet.
+
+        Args:
+            address (int): Entry address of the block.
+
+        Returns:
+            Optional[TranslatedBlock]: The block or None if no block can start at the address.
+        """
+        try:
+            block = self.blocks[address]
+            self.hits += 1
+            return block
+        except KeyError:
+            self.misses += 1
+            block = self.translate(address)
+            self.blocks[address] = block
+            return block
+
+    def translate(self, address: int) -> Optional[TranslatedBlock]:
+        """Translates the block that starts at the given address without caching it.
+
+        Args:
+            address (int): Entry address of the block.
+
+        Returns:
+            Optional[TranslatedBlock]: The block or None if the instruction at the address is missing or not translatable.
+        """
+        block_instructions: list[RiscvInstruction] = []
+        next_address = address
+        while len(block_instructions) < self.max_block_length:
+            instruction = self.instructions.get(next_address)
+            if instruction is None or not is_translatable(instruction):
+                break
+            block_instructions.append(instruction)
+            next_address += 4
+            if isinstance(instruction, TERMINATORS):
+                break
+        if not block_instructions:
+            return None
+
+        body: list[str] = []
+        for index, instruction in enumerate(block_instructions):
+            instruction_address = address + 4 * index
+            body.append(f"# 0x{instruction_address:08X}: {instruction!r}")
+            body.append(f"progress = {index}")
+            body += _TEMPLATES[type(instruction)](instruction, instruction_address)
+        if not isinstance(block_instructions[-1], TERMINATORS):
+            body.append(f"pc = {address + 4 * len(block_instructions)}")
+
+        used_registers, write_back = _registers(block_instructions)
+        lines = _prologue(used_registers)
+        lines.append("    try:")
+        lines += ["        " + line for line in body]
+        lines.append("    except BaseException:")
+        lines += ["        " + line for line in write_back]
+        lines.append(f"        state.program_counter = {address} + 4 * progress")
+        lines.append("        raise")
+        lines += ["    " + line for line in write_back]
+        lines.append("    state.program_counter = pc")
+        source = "\n".join(lines) + "\n"
+
+        return TranslatedBlock(
+            entry_address=address,
+            instructions=block_instructions,
+            function=_compile(source, f"<block 0x{address:08X}>"),
+            source=source,
+        )
+
+    def translate_trace(self, addresses: list[int], next_address: int) -> Trace:
+        """Compiles a recorded path into a trace without caching it.
+
+        Args:
+            addresses (list[int]): Addresses of the executed instructions in execution order. All of them have to be translatable.
+            next_address (int): Address that was executed after the last instruction of the path.
+                If it is the first address of the path, the trace is closed.
+
+        Returns:
+            Trace: The compiled trace.
+        """
+        instructions = [self.instructions[address] for address in addresses]
+        closed = next_address == addresses[0]
+        successors = addresses[1:] + [next_address]
+
+        body: list[str] = []
+        for index, (address, instruction, successor) in enumerate(
+            zip(addresses, instructions, successors)
+        ):
+            body.append(f"# 0x{address:08X}: {instruction!r}")
+            body.append(f"progress = {index}")
+            if isinstance(instruction, BTypeInstruction):
+                condition = _CONDITIONS[type(instruction)](instruction)
+                taken_address = address + instruction.imm
+                if successor == taken_address:
+                    body += [
+                        f"if {condition}:",
+                        "    performance_metrics.branch_count += 1",
+                        "else:",
+                        f"    exit_address = {address + 4}",
+                        "    break",
+                    ]
+                else:
+                    body += [
+                        f"if {condition}:",
+                        "    performance_metrics.branch_count += 1",
+                        f"    exit_address = {taken_address}",
+                        "    break",
+                    ]
+            elif isinstance(instruction, JALR):
+                body += _TEMPLATES[JALR](instruction, address)
+                body += [f"if pc != {successor}:", "    exit_address = pc", "    break"]
+            elif isinstance(instruction, JAL):
+                # the target of JAL is fixed, so there is nothing to check
+                body += _TEMPLATES[JAL](instruction, address)[:-1]
+            else:
+                body += _TEMPLATES[type(instruction)](instruction, address)
+        if closed:
+            body.append(f"done += {len(addresses)}")
+        else:
+            body += [f"exit_address = {next_address}", "guard_failed = False", "break"]
+
+        used_registers, write_back = _registers(instructions)
+        lines = _prologue(used_registers)
+        lines += [
+            "    done = 0",
+            "    guard_failed = True",
+            "    try:",
+            "        while True:",
+        ]
+        lines += ["            " + line for line in body]
+        lines.append("    except BaseException:")
+        lines += ["        " + line for line in write_back]
+        lines += [
+            "        state.program_counter = ADDRESSES[progress]",
+            "        executed = done + progress + 1",
+            "        performance_metrics.instruction_count += executed",
+            "        performance_metrics.cycles += executed",
+            "        performance_metrics.trace_instruction_count += executed",
+            "        raise",
+        ]
+        lines += ["    " + line for line in write_back]
+        lines += [
+            "    state.program_counter = exit_address",
+            "    state.previous_program_counter = ADDRESSES[progress]",
+            "    executed = done + progress + 1",
+            "    performance_metrics.instruction_count += executed",
+            "    performance_metrics.cycles += executed",
+            "    performance_metrics.trace_instruction_count += executed",
+            "    if guard_failed:",
+            "        performance_metrics.trace_guard_failures += 1",
+        ]
+        source = "\n".join(lines) + "\n"
+
+        return Trace(
+            addresses=addresses,
+            closed=closed,
+            function=_compile(
+                source,
+                f"<trace 0x{addresses[0]:08X}>",
+                ADDRESSES=tuple(addresses),
+            ),
+            source=source,
+        )
+
+
+def _registers(instructions: list[RiscvInstruction]) -> tuple[list[int], list[str]]:
+    """Returns the registers used by the instructions and the lines that write the modified registers back."""
+    used_registers: set[int] = set()
+    written_registers: set[int] = set()
+    for instruction in instructions:
+        for name in ("rs1", "rs2", "rd"):
+            register = getattr(instruction, name, 0)
+            if register != 0:
+                used_registers.add(register)
+        if getattr(instruction, "rd", 0) != 0:
+            written_registers.add(instruction.rd)  # type: ignore[attr-defined]
+    write_back = [
+        f"registers[{register}] = x{register}" for register in sorted(written_registers)
+    ]
+    return sorted(used_registers), write_back
+
+
+def _prologue(used_registers: list[int]) -> list[str]:
+    """Returns the first lines of a generated function, which load the used registers into local variables."""
+    lines = [
+        "def function(state):",
+        "    registers = state.register_file.registers",
+        "    memory = state.memory",
+        "    performance_metrics = state.performance_metrics",
+    ]
+    lines += [
+        f"    x{register} = int(registers[{register}])" for register in used_registers
+    ]
+    return lines
+
+
+def _compile(
+    source: str, filename: str, **names: Any
+) -> Callable[[RiscvArchitecturalState], None]:
+    """Compiles the source of a generated function and returns the function."""
+    namespace = dict(_BLOCK_GLOBALS, **names)
+    exec(compile(source, filename, "exec"), namespace)
+    return namespace["function"]
@@ -0,0 +1,324 @@
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from architecture_simulator.isa.riscv.instruction_types import (
+    BTypeInstruction,
+    RiscvInstruction,
+)
+from architecture_simulator.isa.riscv.rv32i_instructions import JAL, JALR
+
+# registers that hold return addresses by convention (ra and t0)
+LINK_REGISTERS = (1, 5)
+
+
+class BranchPredictionOptions:
+    """
+    Configuration object for the branch prediction of the five stage pipeline.
+    """
+
+    def __init__(
+        self,
+        predictor: str,
+        num_entries: int,
+        num_history_bits: int,
+        btb_entries: int,
+        ras_size: int,
+    ) -> None:
+        # "not_taken", "taken", "1bit", "2bit", "gshare" or "tournament"
+        self.predictor = predictor
+        # number of entries of the pattern tables of the 1bit, 2bit and tournament predictors
+        self.num_entries = num_entries
+        # length of the global history of the gshare and tournament predictors
+        self.num_history_bits = num_history_bits
+        # 0 disables the branch target buffer, which predicts the targets of jalr instructions that are no returns
+        # (and of jal with the not_taken predictor)
+        self.btb_entries = btb_entries
+        # 0 disables the return address stack
+        self.ras_size = ras_size
+
+
+class BranchPredictor(ABC):
+    """Predicts the direction of conditional branches."""
+
+    @abstractmethod
+    def predict(self, address: int) -> bool:
+        """Predicts whether the branch at the given address will be taken.
+
+        Args:
+            address (int): Address of the branch.
+
+        Returns:
+            bool: True if the branch is predicted to be taken.
+        """
+
+    @abstractmethod
+    def update(self, address: int, taken: bool) -> None:
+        """Informs the predictor about the outcome of a branch.
+
+        Args:
+            address (int): Address of the branch.
+            taken (bool): Whether the branch was taken.
+        """
+
+
+class StaticNotTakenPredictor(BranchPredictor):
+    def predict(self, address: int) -> bool:
+        return False
+
+    def update(self, address: int, taken: bool) -> None:
+        pass
+
+
+class StaticTakenPredictor(BranchPredictor):
+    def predict(self, address: int) -> bool:
+        return True
+
+    def update(self, address: int, taken: bool) -> None:
+        pass
+
+
+class OneBitPredictor(BranchPredictor):
+    """Predicts the last outcome of the branch. The table is indexed with the word address of the branch."""
+
+    def __init__(self, num_entries: int) -> None:
+        self.table = [False] * num_entries
+
+    def predict(self, address: int) -> bool:
+        return self.table[(address >> 2) % len(self.table)]
+
+    def update(self, address: int, taken: bool) -> None:
+        self.table[(address >> 2) % len(self.table)] = taken
+
+
+class TwoBitPredictor(BranchPredictor):
+    """Table of 2 bit saturating counters, indexed with the word address of the branch.
+    Counter values 2 and 3 predict taken, all counters start at 1 (weakly not taken).
+    """
+
+    def __init__(self, num_entries: int) -> None:
+        self.table = [1] * num_entries
+
+    def predict(self, address: int) -> bool:
+        return self.table[(address >> 2) % len(self.table)] >= 2
+
+    def update(self, address: int, taken: bool) -> None:
+        index = (address >> 2) % len(self.table)
+        self.table[index] = _count(self.table[index], taken)
+
+
+class GsharePredictor(BranchPredictor):
+    """Table of 2 bit saturating counters, indexed with the word address of the branch xor the global history.
+    The global history holds the outcomes of the last num_history_bits resolved branches.
+    """
+
+    def __init__(self, num_history_bits: int) -> None:
+        self.mask = 2**num_history_bits - 1
+        self.history = 0
+        self.table = [1] * 2**num_history_bits
+
+    def predict(self, address: int) -> bool:
+        return self.table[((address >> 2) ^ self.history) & self.mask] >= 2
+
+    def update(self, address: int, taken: bool) -> None:
+        index = ((address >> 2) ^ self.history) & self.mask
+        self.table[index] = _count(self.table[index], taken)
+        self.history = ((self.history << 1) | taken) & self.mask
+
+
+class TournamentPredictor(BranchPredictor):
+    """Chooses between a 2 bit predictor and a gshare predictor with a table of 2 bit saturating counters,
+    indexed with the word address of the branch. Counter values 2 and 3 choose the gshare predictor.
+    """
+
+    def __init__(self, num_entries: int, num_history_bits: int) -> None:
+        self.local_predictor = TwoBitPredictor(num_entries)
+        self.global_predictor = GsharePredictor(num_history_bits)
+        self.chooser = [1] * num_entries
+
+    def predict(self, address: int) -> bool:
+        if self.chooser[(address >> 2) % len(self.chooser)] >= 2:
+            return self.global_predictor.predict(address)
+        return self.local_predictor.predict(address)
+
+    def update(self, address: int, taken: bool) -> None:
+        local_correct = self.local_predictor.predict(address) == taken
+        global_correct = self.global_predictor.predict(address) == taken
+        if local_correct != global_correct:
+            index = (address >> 2) % len(self.chooser)
+            self.chooser[index] = _count(self.chooser[index], global_correct)
+        self.local_predictor.update(address, taken)
+        self.global_predictor.update(address, taken)
+
+
+def _count(counter: int, up: bool) -> int:
+    """Increments or decrements a 2 bit saturating counter."""
+    return min(counter + 1, 3) if up else max(counter - 1, 0)
+
+
+class BranchTargetBuffer:
+    """Direct mapped cache of the targets of taken control transfer instructions."""
+
+    def __init__(self, num_entries: int) -> None:
+        # address of the instruction, target
+        self.entries: list[Optional[tuple[int, int]]] = [None] * num_entries
+
+    def lookup(self, address: int) -> Optional[int]:
+        """Returns the last target of the instruction at the given address.
+
+        Args:
+            address (int): Address of the instruction.
+
+        Returns:
+            Optional[int]: The target, or None if the instruction is not in the buffer.
+        """
+        entry = self.entries[(address >> 2) % len(self.entries)]
+        if entry is None or entry[0] != address:
+            return None
+        return entry[1]
+
+    def update(self, address: int, target: int) -> None:
+        """Stores the target of the instruction at the given address.
+
+        Args:
+            address (int): Address of the instruction.
+            target (int): The target.
+        """
+        self.entries[(address >> 2) % len(self.entries)] = (address, target)
+
+
+class ReturnAddressStack:
+    """Stack of the return addresses of the calls. If the stack is full, the oldest address is dropped."""
+
+    def __init__(self, size: int) -> None:
+        self.size = size
+        self.stack: list[int] = []
+
+    def push(self, address: int) -> None:
+        self.stack.append(address)
+        if len(self.stack) > self.size:
+            del self.stack[0]
+
+    def pop(self) -> Optional[int]:
+        return self.stack.pop() if self.stack else None
+
+    def checkpoint(self) -> tuple[int, ...]:
+        return tuple(self.stack)
+
+    def restore(self, checkpoint: tuple[int, ...]) -> None:
+        self.stack = list(checkpoint)
+
+
+class BranchPredictionUnit:
+    """Predicts the address of the next instruction in the IF stage and is trained with the outcomes of the
+    control transfer instructions when they are resolved.
+
+    The targets of conditional branches and jal are computed from the fetched instruction (pc + imm), returns are
+    predicted with the return address stack and other jalr instructions with the branch target buffer. Conditional
+    branches are only redirected to their target if the direction predictor predicts them as taken, jumps are always
+    redirected if a target is known. The static not taken predictor models a pipeline that does not compute targets
+    in the IF stage, so with it jal is only redirected by the branch target buffer.
+    """
+
+    def __init__(self, options: BranchPredictionOptions) -> None:
+        """Constructor of the branch prediction unit.
+
+        Args:
+            options (BranchPredictionOptions): Configuration of the predictor, BTB and RAS.
+
+        Raises:
+            ValueError: If the predictor is unknown.
+        """
+        predictors = {
+            "not_taken": StaticNotTakenPredictor,
+            "taken": StaticTakenPredictor,
+            "1bit": lambda: OneBitPredictor(options.num_entries),
+            "2bit": lambda: TwoBitPredictor(options.num_entries),
+            "gshare": lambda: GsharePredictor(options.num_history_bits),
+            "tournament": lambda: TournamentPredictor(
+                options.num_entries, options.num_history_bits
+            ),
+        }
+        if options.predictor not in predictors:
+            raise ValueError(f"Unknown branch predictor '{options.predictor}'")
+        self.predictor: BranchPredictor = predictors[options.predictor]()
+        self.btb = (
+            BranchTargetBuffer(options.btb_entries) if options.btb_entries else None
+        )
+        self.ras = ReturnAddressStack(options.ras_size) if options.ras_size else None
+        self.computes_targets = options.predictor != "not_taken"
+
+    def predict(self, address: int, instruction: RiscvInstruction) -> Optional[int]:
+        """Predicts the address of the instruction that follows the fetched instruction.
+
+        Args:
+            address (int): Address of the fetched instruction.
+            instruction (RiscvInstruction): The fetched instruction.
+
+        Returns:
+            Optional[int]: The predicted target, or None if the next instruction is predicted to be at address + length.
+        """
+        target: Optional[int]
+        if isinstance(instruction, BTypeInstruction):
+            target = (
+                address + instruction.imm if self.predictor.predict(address) else None
+            )
+        elif isinstance(instruction, JAL):
+            if self.computes_targets:
+                target = address + instruction.imm
+            else:
+                target = self.btb.lookup(address) if self.btb is not None else None
+        elif isinstance(instruction, JALR):
+            target = None
+            if (
+                self.ras is not None
+                and instruction.rd == 0
+                and instruction.rs1 in LINK_REGISTERS
+            ):
+                target = self.ras.pop()
+            if target is None and self.btb is not None:
+                target = self.btb.lookup(address)
+        else:
+            return None
+        if (
+            self.ras is not None
+            and isinstance(instruction, (JAL, JALR))
+            and instruction.rd in LINK_REGISTERS
+        ):
+            self.ras.push(address + instruction.length)
+        return target
+
+    def update(
+        self, address: int, instruction: RiscvInstruction, taken: bool, target: int
+    ) -> None:
+        """Trains the predictor with the outcome of a resolved control transfer instruction.
+
+        Args:
+            address (int): Address of the instruction.
+            instruction (RiscvInstruction): The instruction.
+            taken (bool): Whether the instruction changed the control flow.
+            target (int): Address of the next instruction.
+        """
+        if isinstance(instruction, BTypeInstruction):
+            self.predictor.update(address, taken)
+        if taken and self.btb is not None and isinstance(instruction, (JAL, JALR)):
+            self.btb.update(address, target)
+
+    def checkpoint_return_address_stack(self) -> Optional[tuple[int, ...]]:
+        """Returns the content of the return address stack, so that it can be restored if the instructions that are
+        fetched after a mispredicted instruction get flushed.
+
+        Returns:
+            Optional[tuple[int, ...]]: The return addresses, None if there is no return address stack.
+        """
+        return self.ras.checkpoint() if self.ras is not None else None
+
+    def restore_return_address_stack(
+        self, checkpoint: Optional[tuple[int, ...]]
+    ) -> None:
+        """Undoes the pushes and pops of the instructions that were fetched after the checkpoint was taken.
+
+        Args:
+            checkpoint (Optional[tuple[int, ...]]): Return value of checkpoint_return_address_stack().
+        """
+        if self.ras is not None and checkpoint is not None:
+            self.ras.restore(checkpoint)
@@ -0,0 +1,388 @@
+from __future__ import annotations
+import copy
+import sys
+import time
+from typing import Any, Callable, Optional, TYPE_CHECKING
+
+from architecture_simulator.simulation.runtime_errors import (
+    InstructionExecutionException,
+)
+from architecture_simulator.uarch.memory.instruction_memory import InstructionMemory
+
+from .block_translator import BlockTranslator, TERMINATORS, is_translatable
+from .pipeline_registers import PipelineRegister
+from .register_file import ArrayRegisterFile, Registers
+
+if TYPE_CHECKING:
+    from architecture_simulator.uarch.riscv.riscv_architectural_state import (
+        RiscvArchitecturalState,
+    )
+
+
+class FunctionalEngine:
+    """An execution engine that only applies the instruction semantics to the architectural state.
+
+    It can be used in place of the Pipeline class when the visualization is not needed.
+    No pipeline registers or control signals are built, so one step only executes
+    instruction.behavior() and updates the program counter and the performance metrics.
+    The architectural results are identical to the ones of the single stage pipeline.
+    """
+
+    def __init__(
+        self, state: RiscvArchitecturalState, hot_trace_threshold: Optional[int] = 50
+    ) -> None:
+        """constructor of the functional engine
+
+        Args:
+            state (RiscvArchitecturalState): the state to execute the instructions on
+            hot_trace_threshold (Optional[int], optional): how often a branch target has to be reached
+                before the path that follows it is compiled into a trace. None disables traces. Defaults to 50.
+        """
+        self.state = state
+        self.num_stages = 1
+        # Only kept so that code which inspects the pipeline registers also works for this engine.
+        # The register is never filled.
+        self.pipeline_registers: list[PipelineRegister] = [PipelineRegister()]
+        self.stalled: list[int] | None = None
+
+        # Dispatch table indexed by (pc - start) // 4. Each entry is None if there is no instruction
+        # at that address, or a tuple of the bound behavior method and the length of the instruction.
+        self.predecoded: Optional[
+            list[Optional[tuple[Callable[[Any], Any], int]]]
+        ] = None
+        self.predecoded_start = 0
+        # (instructions dict, version) of the instruction memory the table was built from
+        self._predecoded_source: Optional[tuple[dict, int]] = None
+
+        # Whether run() may execute whole basic blocks that were translated into python functions
+        self.translate_blocks = True
+        self.block_translator = BlockTranslator()
+        self.hot_trace_threshold = hot_trace_threshold
+
+    def __deepcopy__(self, memo: dict) -> FunctionalEngine:
+        """Copies the engine together with its state, see RiscvArchitecturalState.copy().
+        The dispatch table and the translated blocks only depend on the instructions, which the copy of the state shares,
+        so they are shared, too.
+        """
+        result = copy.copy(self)
+        memo[id(self)] = result
+        result.state = copy.deepcopy(self.state, memo)
+        result.pipeline_registers = [PipelineRegister()]
+        result.block_translator = self.block_translator.copy()
+        return result
+
+    def predecode(self) -> bool:
+        """Builds the dispatch table from the contents of the instruction memory.
+        This is only possible for an InstructionMemory without a cache, because reads of a cached
+        instruction memory have to go through the cache to keep its statistics.
+
+        Returns:
+            bool: Whether a dispatch table could be built.
+        """
+        self.predecoded = None
+        self._predecoded_source = None
+        self.block_translator.reset({})
+        instruction_memory = self.state.instruction_memory
+        if not isinstance(instruction_memory, InstructionMemory):
+            return False
+        instructions = instruction_memory.instructions
+        start = instruction_memory.get_address_range().start
+        end = max(instructions.keys(), default=start - 1) + 1
+        table: list[Optional[tuple[Callable[[Any], Any], int]]] = [None] * (
+            (end - start + 3) // 4
+        )
+        for address, instruction in instructions.items():
+            if (address - start) % 4 != 0:
+                # cannot be represented in the table
+                return False
+            table[(address - start) // 4] = (instruction.behavior, instruction.length)
+        self.predecoded = table
+        self.predecoded_start = start
+        self._predecoded_source = (instructions, instruction_memory.version)
+        self.block_translator.reset(instructions)
+        return True
+
+    def _is_predecoded_valid(self) -> bool:
+        """Returns whether the dispatch table still matches the contents of the instruction memory."""
+        instruction_memory = self.state.instruction_memory
+        return (
+            self._predecoded_source is not None
+            and isinstance(instruction_memory, InstructionMemory)
+            and self._predecoded_source[0] is instruction_memory.instructions
+            and self._predecoded_source[1] == instruction_memory.version
+        )
+
+    def step(self):
+        """Execute the instruction at the program counter. Does nothing if there is no instruction at the program counter."""
+        state = self.state
+        if not state.instruction_at_pc():
+            return
+        address = state.program_counter
+        instruction = state.instruction_memory.read_instruction(address)
+        state.performance_metrics.cycles += 1
+        state.performance_metrics.instruction_count += 1
+        try:
+            instruction.behavior(state)
+        except Exception as e:
+            raise InstructionExecutionException(
+                address=address,
+                instruction_repr=instruction.__repr__(),
+                error_message=e.__repr__(),
+            )
+        state.program_counter += instruction.length
+
+    def run(self, max_instructions: Optional[int] = None):
+        """Execute instructions until the engine is done.
+        Equivalent to calling step() until is_done() returns True, but avoids the per instruction call overhead.
+        Executes translated basic blocks if possible and dispatches through the predecoded table otherwise.
+
+        Args:
+            max_instructions (Optional[int], optional): Stop once the instruction count of the performance metrics
+                has reached this value. Translated blocks and traces cannot stop in between, so they are not used
+                if a limit is given. Defaults to None.
+        """
+        if self._is_predecoded_valid() or self.predecode():
+            # the translated blocks rely on x0 being hardwired to zero
+            register_file = self.state.register_file
+            if (
+                self.translate_blocks
+                and max_instructions is None
+                and (
+                    isinstance(register_file, ArrayRegisterFile)
+                    or isinstance(register_file.registers, Registers)
+                )
+            ):
+                self._run_translated()
+            else:
+                self._run_predecoded(max_instructions)
+        else:
+            self._run_generic(max_instructions)
+
+    def _run_translated(self):
+        """Execute instructions until the engine is done, one translated basic block or trace at a time.
+
+        Cold code is executed as basic blocks. Instructions at which no block can start are executed through
+        the predecoded table. Every branch target reached by a block or a trace is counted. Once a target has
+        been reached hot_trace_threshold times, the path that follows it is recorded while it is interpreted and
+        compiled into a trace, which is executed whenever the program counter reaches the target again.
+        """
+        state = self.state
+        performance_metrics = state.performance_metrics
+        table = self.predecoded
+        assert table is not None
+        start = self.predecoded_start
+        table_length = len(table)
+        translator = self.block_translator
+        instructions = translator.instructions
+        blocks = translator.blocks
+        traces = translator.traces
+        execution_counts = translator.execution_counts
+        threshold = self.hot_trace_threshold
+        max_trace_length = translator.max_trace_length
+        get_block = translator.get_block
+        executed = 0
+        address = None
+        block_entry = None
+        in_trace = False
+        # addresses of the path that is currently being recorded
+        recording: Optional[list[int]] = None
+        hits = 0
+        try:
+            while state.exit_code is None:
+                pc = state.program_counter
+                offset = pc - start
+                # misaligned addresses and addresses outside of the table do not hold instructions
+                if offset & 3 or not 0 <= offset < table_length * 4:
+                    break
+                entry = table[offset >> 2]
+                if entry is None:
+                    break
+
+                if recording is not None:
+                    if (
+                        (recording and (pc == recording[0] or pc in traces))
+                        or len(recording) >= max_trace_length
+                        or not is_translatable(instructions[pc])
+                    ):
+                        self._compile_trace(recording, pc)
+                        recording = None
+                        continue
+                    recording.append(pc)
+                    address = pc
+                    behavior, length = entry
+                    executed += 1
+                    behavior(state)
+                    state.program_counter += length
+                    continue
+
+                trace = traces.get(pc)
+                if trace is not None:
+                    in_trace = True
+                    trace.function(state)
+                    in_trace = False
+                    address = state.previous_program_counter
+                    branched = True
+                else:
+                    if pc in blocks:
+                        hits += 1
+                        block = blocks[pc]
+                    else:
+                        block = get_block(pc)
+                    if block is not None:
+                        block_entry = pc
+                        block.function(state)
+                        block_entry = None
+                        executed += block.length
+                        address = block.last_address
+                        branched = isinstance(block.instructions[-1], TERMINATORS)
+                    else:
+                        address = pc
+                        behavior, length = entry
+                        executed += 1
+                        behavior(state)
+                        state.program_counter += length
+                        branched = False
+
+                if branched and threshold is not None:
+                    target = state.program_counter
+                    if target not in traces:
+                        count = execution_counts.get(target, 0) + 1
+                        execution_counts[target] = count
+                        if count >= threshold:
+                            recording = []
+        except BaseException as e:
+            if block_entry is not None:
+                # the block has set the program counter to the failing instruction
+                address = state.program_counter
+                executed += (address - block_entry) // 4 + 1
+            elif in_trace:
+                # the trace has set the program counter and updated the metrics itself
+                address = state.program_counter
+            if not isinstance(e, Exception):
+                raise
+            assert address is not None
+            raise InstructionExecutionException(
+                address=address,
+                instruction_repr=state.instruction_memory.read_instruction(
+                    address
+                ).__repr__(),
+                error_message=e.__repr__(),
+            )
+        finally:
+            translator.hits += hits
+            performance_metrics.cycles += executed
+            performance_metrics.instruction_count += executed
+            if address is not None:
+                state.previous_program_counter = address
+
+    def _compile_trace(self, addresses: list[int], next_address: int):
+        """Compiles the recorded path into a trace and caches it by its first address.
+        If nothing could be recorded, the address is marked so that it is not recorded again.
+
+        Args:
+            addresses (list[int]): Recorded addresses. The first one is the address at which recording started.
+            next_address (int): Address that is executed after the path.
+        """
+        translator = self.block_translator
+        performance_metrics = self.state.performance_metrics
+        if not addresses:
+            translator.traces[next_address] = None
+            return
+        start_time = time.perf_counter()
+        translator.traces[addresses[0]] = translator.translate_trace(
+            addresses, next_address
+        )
+        performance_metrics.trace_compilation_time_s += time.perf_counter() - start_time
+        performance_metrics.traces_compiled += 1
+
+    def _run_predecoded(self, max_instructions: Optional[int] = None):
+        """Execute instructions until the engine is done, dispatching through the predecoded table.
+
+        Args:
+            max_instructions (Optional[int], optional): Limit of the instruction count, see run(). Defaults to None.
+        """
+        state = self.state
+        performance_metrics = state.performance_metrics
+        table = self.predecoded
+        assert table is not None
+        start = self.predecoded_start
+        table_length = len(table)
+        executed = 0
+        limit = (
+            sys.maxsize
+            if max_instructions is None
+            else max_instructions - performance_metrics.instruction_count
+        )
+        address = None
+        try:
+            while state.exit_code is None and executed < limit:
+                offset = state.program_counter - start
+                # misaligned addresses and addresses outside of the table do not hold instructions
+                if offset & 3 or not 0 <= offset < table_length * 4:
+                    break
+                entry = table[offset >> 2]
+                if entry is None:
+                    break
+                address = state.program_counter
+                behavior, length = entry
+                executed += 1
+                behavior(state)
+                state.program_counter += length
+        except Exception as e:
+            assert address is not None
+            raise InstructionExecutionException(
+                address=address,
+                instruction_repr=state.instruction_memory.read_instruction(
+                    address
+                ).__repr__(),
+                error_message=e.__repr__(),
+            )
+        finally:
+            performance_metrics.cycles += executed
+            performance_metrics.instruction_count += executed
+            if address is not None:
+                state.previous_program_counter = address
+
+    def _run_generic(self, max_instructions: Optional[int] = None):
+        """Execute instructions until the engine is done, reading every instruction from the instruction memory.
+
+        Args:
+            max_instructions (Optional[int], optional): Limit of the instruction count, see run(). Defaults to None.
+        """
+        state = self.state
+        instruction_memory = state.instruction_memory
+        performance_metrics = state.performance_metrics
+        limit = sys.maxsize if max_instructions is None else max_instructions
+        while state.exit_code is None and performance_metrics.instruction_count < limit:
+            address = state.program_counter
+            if not instruction_memory.instruction_at_address(address):
+                break
+            instruction = instruction_memory.read_instruction(address)
+            state.previous_program_counter = address
+            performance_metrics.cycles += 1
+            performance_metrics.instruction_count += 1
+            try:
+                instruction.behavior(state)
+            except Exception as e:
+                raise InstructionExecutionException(
+                    address=address,
+                    instruction_repr=instruction.__repr__(),
+                    error_message=e.__repr__(),
+                )
+            state.program_counter += instruction.length
+
+    def is_empty(self) -> bool:
+        """The functional engine does not hold any instructions between steps, so it is always empty.
+
+        Returns:
+            bool: True
+        """
+        return True
+
+    def is_done(self) -> bool:
+        """Return True if the simulation was stopped with an ecall or if there is no instruction at the program counter.
+
+        Returns:
+            bool: if the engine has finished
+        """
+        return self.state.exit_code is not None or not self.state.instruction_at_pc()
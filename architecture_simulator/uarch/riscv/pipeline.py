@@ -1,4 +1,5 @@
 from __future__ import annotations
+from dataclasses import replace
 from typing import TYPE_CHECKING
 from architecture_simulator.simulation.runtime_errors import (
     InstructionExecutionException,
@@ -53,41 +54,33 @@ class Pipeline:
         """
         self.state.performance_metrics.cycles += 1
         next_pipeline_registers = [None] * self.num_stages
+        # the pipeline registers as seen by the stalled stages and the first stage after them while stalling:
+        # stalled stages get their old PipelineRegister values stored in stalled_pipeline_regs again and
+        # the first stage after the stalled stages gets an empty PipelineRegister
+        stalled_view: list[PipelineRegister] | None = None
+        if self.stalled is not None:
+            assert self.stalled_pipeline_regs is not None
+            stalled_view = list(self.pipeline_registers)
+            stalled_view[: self.stalled[0]] = self.stalled_pipeline_regs
+            stalled_view[self.stalled[0]] = PipelineRegister()
         for index in self.execution_ordering:
+            pipeline_registers = self.pipeline_registers
             try:
                 if self.stalled is not None:
                     if index == 0:  # first stage must not be recomputed when stalling
-                        next_pipeline_registers[0] = self.pipeline_registers[0]
-                        continue
-                    elif (
-                        index == self.stalled[0] + 1
-                    ):  # first stage after the stalled stages must get an empty PipelineRegister while stalling
-                        tmp = self.pipeline_registers[self.stalled[0]]
-                        self.pipeline_registers[self.stalled[0]] = PipelineRegister()
-                        next_pipeline_registers[index] = self.stages[index].behavior(
-                            pipeline_registers=self.pipeline_registers,
-                            index_of_own_input_register=(index - 1),
-                            state=self.state,
+                        # if the first stage caused the stall, it must not start it again
+                        next_pipeline_registers[0] = (
+                            replace(self.pipeline_registers[0], stall_signal=None)
+                            if self.stalled[0] == 0
+                            else self.pipeline_registers[0]
                         )
-                        self.pipeline_registers[self.stalled[0]] = tmp
-                        continue
-                    elif (
-                        index <= self.stalled[0]
-                    ):  # other stalled stages should get the old PipelineRegister values stored in stalled_pipeline_regs
-                        tmp = self.pipeline_registers[index - 1]
-                        self.pipeline_registers[index - 1] = self.stalled_pipeline_regs[
-                            index - 1
-                        ]
-                        next_pipeline_registers[index] = self.stages[index].behavior(
-                            pipeline_registers=self.pipeline_registers,
-                            index_of_own_input_register=(index - 1),
-                            state=self.state,
-                        )
-                        self.pipeline_registers[index - 1] = tmp
                         continue
+                    elif index <= self.stalled[0] + 1:
+                        assert stalled_view is not None
+                        pipeline_registers = stalled_view
 
                 next_pipeline_registers[index] = self.stages[index].behavior(
-                    pipeline_registers=self.pipeline_registers,
+                    pipeline_registers=pipeline_registers,
                     index_of_own_input_register=(index - 1),
                     state=self.state,
                 )
@@ -95,10 +88,8 @@ class Pipeline:
             except Exception as e:
                 if index - 1 >= 0:
                     raise InstructionExecutionException(
-                        address=self.pipeline_registers[
-                            index - 1
-                        ].address_of_instruction,
-                        instruction_repr=self.pipeline_registers[
+                        address=pipeline_registers[index - 1].address_of_instruction,
+                        instruction_repr=pipeline_registers[
                             index - 1
                         ].instruction.__repr__(),
                         error_message=e.__repr__(),
@@ -106,26 +97,32 @@ class Pipeline:
                 else:
                     raise
 
-        # Check if a stage has produced a meaningfull stall signal
+        # Check if a stage has produced a meaningfull stall signal.
+        # Stalled stages may only start a new stall in the last cycle of the current stall.
         for index, pipeline_register in reversed(
             list(enumerate(next_pipeline_registers))
         ):
             if (
                 pipeline_register is not None
                 and pipeline_register.stall_signal is not None
-                and (self.stalled is None or index > self.stalled[0])
+                and (
+                    self.stalled is None
+                    or index > self.stalled[0]
+                    or self.stalled[1] == 1
+                )
             ):
                 self.stalled = [index, pipeline_register.stall_signal.duration + 1]
                 self.state.performance_metrics.stalls += 1
+                # keep the inputs of the stalled stages in stalled_pipeline_regs
+                self.stalled_pipeline_regs = (
+                    stalled_view
+                    if stalled_view is not None
+                    else self.pipeline_registers
+                )[:index]
+                for reg in self.stalled_pipeline_regs:
+                    reg.is_of_stalled_value = True
                 break
 
-        # keep PipelineRegister values in stalled_pipeline_regs
-        if self.stalled and self.stalled_pipeline_regs is None:
-            self.stalled_pipeline_regs = self.pipeline_registers[: self.stalled[0]]
-
-            for reg in self.stalled_pipeline_regs:
-                reg.is_of_stalled_value = True
-
         self.pipeline_registers = next_pipeline_registers
 
         # Check if done stalling
@@ -145,6 +142,8 @@ class Pipeline:
                 # This works because int(True) = 1, int(False) = 0
                 # This is good code, trust me
                 num_to_flush = index + flush_signal.inclusive
+                for stage in self.stages:
+                    stage.flush(self.pipeline_registers[:num_to_flush])
                 self.pipeline_registers[:num_to_flush] = [
                     PipelineRegister()
                 ] * num_to_flush
@@ -157,6 +156,29 @@ class Pipeline:
 
                 break  # break since we don't care about the previous stages
 
+    def skip_stall_cycles(self) -> int:
+        """Fast-forwards the cycles of the current stall whose outcome is already known, as if they had been stepped.
+        That is the case once the stalled stage has served its stall signal and all later stages are empty:
+        the stalled stages compute the same results from the same inputs in every cycle and the later stages
+        only move bubbles, so only the cycles have to be counted.
+        The last cycle of the stall is always left to step(), because the stalled stages may start a new stall in it.
+
+        Returns:
+            int: The number of skipped cycles.
+        """
+        if self.stalled is None or self.stalled[1] <= 1:
+            return 0
+        stalled_index = self.stalled[0]
+        if self.pipeline_registers[stalled_index].stall_signal is not None or any(
+            type(pipeline_register.instruction) != EmptyInstruction
+            for pipeline_register in self.pipeline_registers[stalled_index + 1 : -1]
+        ):
+            return 0
+        skipped_cycles = self.stalled[1] - 1
+        self.stalled[1] = 1
+        self.state.performance_metrics.cycles += skipped_cycles
+        return skipped_cycles
+
     def is_empty(self) -> bool:
         """Return True if all pipeline registers (exluding the last) are empty (determined by whether the instruction in the pipeline register is empty).
             Note, that the last pipeline register is not considerd, because it will not be used as input for an other stage.
@@ -30,6 +30,10 @@ class PipelineRegister:
 class InstructionFetchPipelineRegister(PipelineRegister):
     control_unit_signals: ControlUnitSignals = field(default_factory=ControlUnitSignals)
     branch_prediction: Optional[bool] = None
+    # address the IF stage continued at if branch_prediction is True
+    predicted_target: Optional[int] = None
+    # content of the return address stack after the prediction, restored if the instruction was mispredicted
+    return_address_stack: Optional[tuple[int, ...]] = None
     pc_plus_instruction_length: Optional[int] = None
     abbreviation = "IF"
 
@@ -44,6 +48,8 @@ class InstructionDecodePipelineRegister(PipelineRegister):
     imm: Optional[int] = None
     write_register: Optional[int] = None
     branch_prediction: Optional[bool] = None
+    predicted_target: Optional[int] = None
+    return_address_stack: Optional[tuple[int, ...]] = None
     pc_plus_instruction_length: Optional[int] = None
     abbreviation = "ID"
 
@@ -63,8 +69,13 @@ class ExecutePipelineRegister(PipelineRegister):
     comparison: Optional[bool] = None
     pc_plus_imm: Optional[int] = None
     branch_prediction: Optional[bool] = None
+    predicted_target: Optional[int] = None
+    return_address_stack: Optional[tuple[int, ...]] = None
+    mispredicted: Optional[bool] = None
     pc_plus_instruction_length: Optional[int] = None
     exit_code: Optional[int] = None
+    # (register, previous entry) if the instruction changed ExecuteStage.pending_results, undone if it gets flushed
+    pending_result_change: Optional[tuple[int, Optional[int]]] = None
     abbreviation = "EX"
 
 
@@ -79,6 +90,7 @@ class MemoryAccessPipelineRegister(PipelineRegister):
     # control signals
     comparison: Optional[bool] = None
     comparison_or_jump: Optional[bool] = None
+    mispredicted: Optional[bool] = None
     pc_plus_imm: Optional[int] = None
     pc_plus_instruction_length: Optional[int] = None
     imm: Optional[int] = None
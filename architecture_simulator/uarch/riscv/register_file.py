@@ -1,5 +1,6 @@
+from array import array
 from dataclasses import dataclass, field
-import fixedint
+from typing import Iterable
 
 from architecture_simulator.settings.settings import Settings
 from architecture_simulator.util.integer_representations import (
@@ -10,10 +11,8 @@ from architecture_simulator.util.integer_representations import (
 class Registers(list):
     """Custom list that overwrites [] so that register x0 gets hardwired to zero."""
 
-    def __getitem__(self, index):
-        # access of x0 will alway return zero, since x0 get´s initialized as zero and can not be changed
-        # index out of bounds error will be thrown if trying to acces a register outside of x0 to x31
-        return super().__getitem__(index)
+    # reads are not overwritten: x0 get´s initialized as zero and can not be changed,
+    # index out of bounds error will be thrown if trying to acces a register outside of x0 to x31
 
     def __setitem__(self, index, value):
         # ensures, that register x0 stays 0 and that there are only 32 registers
@@ -27,12 +26,11 @@ class RegisterFile:
 
     Args:
         registers:
-            list[fixedint.UInt32] => provided list will be used to init registers, x0 can have any value (test mode). Default: 32 registers with x0 hard wired to zero.
+            list[int] => provided list will be used to init registers, x0 can have any value (test mode). Default: 32 registers with x0 hard wired to zero.
+            The registers hold unsigned 32 bit values as plain ints.
     """
 
-    registers: list[fixedint.UInt32] = field(
-        default_factory=lambda: Registers([fixedint.UInt32(0)] * 32)
-    )
+    registers: list[int] = field(default_factory=lambda: Registers([0] * 32))
 
     def reg_repr(self) -> list[tuple[str, str, str, str]]:
         """Returns the contents of the register file as bin, udec, hex, sdec values.
@@ -42,6 +40,26 @@ class RegisterFile:
         """
         return [get_32_bit_representations(int(reg)) for reg in self.registers]
 
+    def read(self, index: int) -> int:
+        """Returns the value of a register.
+
+        Args:
+            index (int): Index of the register.
+
+        Returns:
+            int: The value of the register as unsigned 32 bit int.
+        """
+        return int(self.registers[index])
+
+    def write(self, index: int, value: int):
+        """Sets the value of a register. Writes to x0 are ignored, unless the register file was created with a plain list (test mode).
+
+        Args:
+            index (int): Index of the register.
+            value (int): Unsigned 32 bit value to write.
+        """
+        self.registers[index] = value
+
     def get_abi_names(self, register: int) -> str:
         """Get the ABI name for the given register index.
 
@@ -59,3 +77,40 @@ class RegisterFile:
                     register_name += "/"
                 register_name += key
         return register_name
+
+
+# AND-ed to the value of a write, so that x0 keeps its value without a branch
+_WRITE_MASKS = (0,) + (0xFFFFFFFF,) * 31
+
+
+@dataclass
+class ArrayRegisterFile(RegisterFile):
+    """A register file that stores the registers in a compact array of unsigned 32 bit ints.
+
+    Use read() and write() to access the registers. Writes are masked instead of checking the index,
+    which hardwires x0 to zero without a branch or an overwritten __setitem__.
+    Writing to registers[0] directly bypasses this and must be avoided.
+
+    Args:
+        registers:
+            Iterable[int] => initial values of the 32 registers, x0 is always set to zero. Default: all registers are zero.
+    """
+
+    registers: array = field(default_factory=lambda: array("I", [0] * 32))  # type: ignore[assignment]
+
+    def __post_init__(self):
+        registers: Iterable[int] = self.registers
+        if not isinstance(registers, array) or registers.typecode != "I":
+            registers = array("I", [int(value) & 0xFFFFFFFF for value in registers])
+        if len(registers) != 32:
+            raise ValueError(
+                f"ArrayRegisterFile needs 32 registers, got {len(registers)}"
+            )
+        registers[0] = 0
+        self.registers = registers
+
+    def read(self, index: int) -> int:
+        return self.registers[index]
+
+    def write(self, index: int, value: int):
+        self.registers[index] = value & _WRITE_MASKS[index]
@@ -1,5 +1,6 @@
 from __future__ import annotations
-from typing import Optional, TYPE_CHECKING
+import copy
+from typing import Any, Optional, TYPE_CHECKING
 
 from architecture_simulator.settings.settings import Settings
 from .riscv_performance_metrics import RiscvPerformanceMetrics
@@ -17,6 +18,8 @@ from .stages import (
     RegisterWritebackStage,
 )
 from .pipeline import Pipeline
+from .branch_prediction import BranchPredictionOptions, BranchPredictionUnit
+from .functional_engine import FunctionalEngine
 from architecture_simulator.uarch.memory.instruction_memory_cache_system import (
     InstructionMemoryCacheSystem,
 )
@@ -26,6 +29,11 @@ from architecture_simulator.uarch.memory.write_through_memory_system import (
 from architecture_simulator.uarch.memory.write_back_memory_system import (
     WriteBackMemorySystem,
 )
+from architecture_simulator.uarch.memory.shared_cache import SharedCache
+from architecture_simulator.uarch.memory.prefetchers import (
+    PrefetcherOptions,
+    create_prefetcher,
+)
 
 if TYPE_CHECKING:
     from architecture_simulator.uarch.memory.memory_system import MemorySystem
@@ -45,18 +53,40 @@ class RiscvArchitecturalState:
         self,
         pipeline_mode: str = Settings().get()["default_pipeline_mode"],
         detect_data_hazards: bool = Settings().get()["hazard_detection"],
+        forwarding: bool = Settings().get()["forwarding"],
+        execution_latencies: dict[str, int] = Settings().get()["execution_latencies"],
+        pipelined_multiplier: bool = Settings().get()["pipelined_multiplier"],
+        memory_stalls: bool = Settings().get()["memory_stalls"],
         memory: Optional[MemorySystem] = None,
         register_file: Optional[RegisterFile] = None,
         instruction_memory: Optional[InstructionMemorySystem] = None,
         data_cache_options: CacheOptions = Settings().get()["data_cache"],
         instruction_cache_options: CacheOptions = Settings().get()["instruction_cache"],
+        l2_cache_options: CacheOptions = Settings().get()["l2_cache"],
+        data_prefetcher_options: PrefetcherOptions = Settings().get()[
+            "data_prefetcher"
+        ],
+        instruction_prefetcher_options: PrefetcherOptions = Settings().get()[
+            "instruction_prefetcher"
+        ],
+        branch_prediction_options: BranchPredictionOptions = Settings().get()[
+            "branch_prediction"
+        ],
     ):
         self.pipeline_mode = pipeline_mode
+        # the caches let the stages of the five stage pipeline stall for their latency
+        stall_on_access = memory_stalls and pipeline_mode == "five_stage_pipeline"
         if pipeline_mode == "five_stage_pipeline":
             stages = [
                 InstructionFetchStage(),
-                InstructionDecodeStage(detect_data_hazards=detect_data_hazards),
-                ExecuteStage(),
+                InstructionDecodeStage(
+                    detect_data_hazards=detect_data_hazards, forwarding=forwarding
+                ),
+                ExecuteStage(
+                    forwarding=forwarding,
+                    latencies=execution_latencies,
+                    pipelined_multiplier=pipelined_multiplier,
+                ),
                 MemoryAccessStage(),
                 RegisterWritebackStage(),
             ]
@@ -64,10 +94,30 @@ class RiscvArchitecturalState:
         else:
             stages = [SingleStage()]
             execution_ordering = [0]
-        self.pipeline = Pipeline(
-            stages=stages, execution_ordering=execution_ordering, state=self
-        )
+        self.pipeline: Pipeline | FunctionalEngine
+        if pipeline_mode == "functional":
+            self.pipeline = FunctionalEngine(state=self)
+        else:
+            self.pipeline = Pipeline(
+                stages=stages, execution_ordering=execution_ordering, state=self
+            )
         self.performance_metrics = RiscvPerformanceMetrics()
+        # only used by the five stage pipeline
+        self.branch_prediction_unit = BranchPredictionUnit(branch_prediction_options)
+        ###
+        self.l2_cache: Optional[SharedCache] = (
+            SharedCache(
+                num_index_bits=l2_cache_options.num_index_bits,
+                num_block_bits=l2_cache_options.num_block_bits,
+                associativity=l2_cache_options.associativity,
+                hit_latency=l2_cache_options.hit_latency,
+                miss_penalty=l2_cache_options.miss_penalty,
+                replacement_strategy=l2_cache_options.replacement_strategy,
+                cache_type=l2_cache_options.cache_type,
+            )
+            if l2_cache_options.enable
+            else None
+        )
         ###
         if instruction_memory is not None:
             self.instruction_memory = instruction_memory
@@ -81,6 +131,12 @@ class RiscvArchitecturalState:
                     performance_metrics=self.performance_metrics,
                     replacement_strategy=instruction_cache_options.replacement_strategy,
                     miss_penality=instruction_cache_options.miss_penalty,
+                    hit_latency=instruction_cache_options.hit_latency,
+                    next_level=self.l2_cache,
+                    prefetcher=create_prefetcher(
+                        instruction_prefetcher_options, self.get_program_counter
+                    ),
+                    stall_on_access=stall_on_access,
                 )
             else:
                 self.instruction_memory = InstructionMemory[RiscvInstruction]()
@@ -111,6 +167,12 @@ class RiscvArchitecturalState:
                     performance_metrics=self.performance_metrics,
                     replacement_strategy=data_cache_options.replacement_strategy,
                     miss_penality=data_cache_options.miss_penalty,
+                    hit_latency=data_cache_options.hit_latency,
+                    next_level=self.l2_cache,
+                    prefetcher=create_prefetcher(
+                        data_prefetcher_options, self.get_memory_access_pc
+                    ),
+                    stall_on_access=stall_on_access,
                 )
             else:
                 self.memory = Memory(
@@ -136,6 +198,37 @@ class RiscvArchitecturalState:
     def get_privilege_level(self):
         return self.csr_registers.privilege_level
 
+    def get_program_counter(self) -> int:
+        """Returns the program counter. The instruction prefetcher gets this method instead of a lambda,
+        so that it uses the program counter of the copy in a copy of the state.
+        """
+        return self.program_counter
+
+    def get_memory_access_pc(self) -> int:
+        """Returns the address of the instruction that accesses the data memory in the current cycle.
+        In the five stage pipeline this is the instruction in the MA stage, otherwise the program counter.
+        """
+        if self.pipeline_mode == "five_stage_pipeline":
+            address = self.pipeline.pipeline_registers[2].address_of_instruction
+            if address is not None:
+                return address
+        return self.program_counter
+
     def instruction_at_pc(self) -> bool:
         """Return whether there is an instruction at the current program counter."""
         return self.instruction_memory.instruction_at_address(self.program_counter)
+
+    def copy(self) -> RiscvArchitecturalState:
+        """Returns an independent copy of the state, including the pipeline, the caches, the branch predictor
+        and the performance metrics. The pages of the data memory and the instructions are shared copy on write,
+        so the cost does not depend on the size of the memory. Access tracers are not copied.
+
+        Returns:
+            RiscvArchitecturalState: The copy.
+        """
+        memo: dict[int, Any] = {}
+        for memory_system in [self.memory, self.instruction_memory]:
+            tracer = getattr(memory_system, "tracer", None)
+            if tracer is not None:
+                memo[id(tracer)] = None
+        return copy.deepcopy(self, memo)
@@ -1,15 +1,82 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 
 from ..performance_metrics import PerformanceMetrics
 
 
+@dataclass
+class BranchPredictionStatistics:
+    """Predictions of one control transfer instruction. Every misprediction causes a flush."""
+
+    predictions: int = 0
+    mispredictions: int = 0
+
+    def get_accuracy(self) -> float:
+        """Returns the fraction of the predictions that were correct.
+
+        Returns:
+            float: Value between 0 and 1. 0 if there were no predictions.
+        """
+        if self.predictions == 0:
+            return 0
+        return 1 - self.mispredictions / self.predictions
+
+
 @dataclass
 class RiscvPerformanceMetrics(PerformanceMetrics):
     branch_count: int = 0
     procedure_count: int = 0
     flushes: int = 0
     stalls: int = 0
+    # data hazards of the five stage pipeline that did not cause a stall because of forwarding
+    stalls_removed_by_forwarding: int = 0
     cycles: int = 0
+    # latency of all cache accesses, either added to the cycles or spent stalling the five stage pipeline
+    memory_cycles: int = 0
+    # statistics of the hot trace compilation of the functional engine
+    traces_compiled: int = 0
+    trace_instruction_count: int = 0
+    trace_guard_failures: int = 0
+    trace_compilation_time_s: float = 0
+    # address of the instruction -> statistics, only filled by the five stage pipeline
+    branch_predictions: dict[int, BranchPredictionStatistics] = field(
+        default_factory=dict
+    )
+
+    def record_branch_prediction(self, address: int, mispredicted: bool) -> None:
+        """Counts a resolved prediction of the control transfer instruction at the given address.
+
+        Args:
+            address (int): Address of the instruction.
+            mispredicted (bool): Whether the prediction was wrong.
+        """
+        statistics = self.branch_predictions.get(address)
+        if statistics is None:
+            statistics = self.branch_predictions[address] = BranchPredictionStatistics()
+        statistics.predictions += 1
+        statistics.mispredictions += mispredicted
+
+    def get_branch_prediction_accuracy(self) -> float:
+        """Returns the fraction of the predictions of all control transfer instructions that were correct.
+
+        Returns:
+            float: Value between 0 and 1. 0 if there were no predictions.
+        """
+        return BranchPredictionStatistics(
+            predictions=sum(s.predictions for s in self.branch_predictions.values()),
+            mispredictions=sum(
+                s.mispredictions for s in self.branch_predictions.values()
+            ),
+        ).get_accuracy()
+
+    def get_trace_coverage(self) -> float:
+        """Returns the fraction of the executed instructions that were executed inside of compiled traces.
+
+        Returns:
+            float: Value between 0 and 1. 0 if no instructions have been executed.
+        """
+        if self.instruction_count == 0:
+            return 0
+        return self.trace_instruction_count / self.instruction_count
 
     def __repr__(self) -> str:
         execution_time = self.get_execution_time()
@@ -27,7 +94,22 @@ class RiscvPerformanceMetrics(PerformanceMetrics):
         representation += f"procedures: {self.procedure_count}\n"
         representation += f"cycles: {self.cycles}\n"
         representation += f"stalls: {self.stalls}\n"
+        if self.memory_cycles:
+            representation += f"memory cycles: {self.memory_cycles}\n"
+        if self.stalls_removed_by_forwarding:
+            representation += (
+                f"stalls removed by forwarding: {self.stalls_removed_by_forwarding}\n"
+            )
         representation += f"flushes: {self.flushes}\n"
         if not self.instruction_count == 0:
             representation += f"cycles per instruction: {(self.cycles / self.instruction_count):.2f}\n"
+        if self.branch_predictions:
+            representation += f"branch prediction accuracy: {self.get_branch_prediction_accuracy():.2%}\n"
+        if self.traces_compiled:
+            representation += f"traces compiled: {self.traces_compiled}\n"
+            representation += f"trace coverage: {self.get_trace_coverage():.2%}\n"
+            representation += f"trace guard failures: {self.trace_guard_failures}\n"
+            representation += (
+                f"trace compilation time: {self.trace_compilation_time_s:.3f}s\n"
+            )
         return representation
@@ -1,6 +1,6 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import TYPE_CHECKING
+from dataclasses import dataclass, replace
+from typing import Optional, TYPE_CHECKING
 
 from .pipeline_registers import (
     PipelineRegister,
@@ -37,6 +37,7 @@ from architecture_simulator.isa.riscv.rv32i_instructions import (
     FENCE,
 )
 from .pipeline import InstructionExecutionException
+from architecture_simulator.util.integer_arithmetic import to_unsigned32
 
 if TYPE_CHECKING:
     from architecture_simulator.uarch.riscv.riscv_architectural_state import (
@@ -69,6 +70,14 @@ class Stage:
         """
         return PipelineRegister()
 
+    def flush(self, flushed_pipeline_registers: list[PipelineRegister]) -> None:
+        """Called by the pipeline when it flushes pipeline registers, so that the stage can forget the state
+        it keeps about their instructions.
+
+        Args:
+            flushed_pipeline_registers (list[PipelineRegister]): The pipeline registers that get flushed.
+        """
+
 
 class InstructionFetchStage(Stage):
     abbreviation = "IF"
@@ -93,28 +102,42 @@ class InstructionFetchStage(Stage):
         """
         if not state.instruction_at_pc():
             return InstructionFetchPipelineRegister()
-        # NOTE: PC gets incremented here. This means that branch prediction also happens here. Currently, we just statically predict not taken.
+        # NOTE: PC gets incremented here. This means that branch prediction also happens here.
         address_of_instruction = state.program_counter
         instruction = state.instruction_memory.read_instruction(address_of_instruction)
-        state.program_counter += instruction.length
+        # an instruction cache that stalls on access returns the latency of the fetch
+        stall_cycles = state.instruction_memory.take_pending_stall_cycles()
+        predicted_target = state.branch_prediction_unit.predict(
+            address_of_instruction, instruction
+        )
         pc_plus_instruction_length = address_of_instruction + instruction.length
+        state.program_counter = (
+            pc_plus_instruction_length if predicted_target is None else predicted_target
+        )
         control_unit_signals = instruction.control_unit_signals()
 
         return InstructionFetchPipelineRegister(
             instruction=instruction,
             address_of_instruction=address_of_instruction,
-            branch_prediction=False,
+            branch_prediction=predicted_target is not None,
+            predicted_target=predicted_target,
+            return_address_stack=state.branch_prediction_unit.checkpoint_return_address_stack(),
             pc_plus_instruction_length=pc_plus_instruction_length,
             control_unit_signals=control_unit_signals,
+            stall_signal=StallSignal(stall_cycles) if stall_cycles > 0 else None,
         )
 
 
 class InstructionDecodeStage(Stage):
     abbreviation = "ID"
 
-    def __init__(self, stages_until_writeback=2, detect_data_hazards=True) -> None:
+    def __init__(
+        self, stages_until_writeback=2, detect_data_hazards=True, forwarding=False
+    ) -> None:
         self.stages_until_writeback = stages_until_writeback
         self.detect_data_hazards = detect_data_hazards
+        # if True, the EX stage forwards the results of later stages, so only loads cause stalls
+        self.forwarding = forwarding
         super().__init__()
 
     def behavior(
@@ -165,13 +188,35 @@ class InstructionDecodeStage(Stage):
                 for i in range(self.stages_until_writeback)
             ]
             # Check if there is a data hazard
-            for register in write_registers_of_later_stages:
+            for distance, register in enumerate(write_registers_of_later_stages):
                 if register is None or register == 0:
                     continue
                 if register_read_addr_1 == register or register_read_addr_2 == register:
                     assert pipeline_register.address_of_instruction is not None
-                    stall_signal = StallSignal(2)
-                    break
+                    if not self.forwarding:
+                        stall_signal = StallSignal(2)
+                        break
+                    # the value of a load is only available after the MA stage, so the EX stage can not get
+                    # the value of a load that is directly ahead of this instruction
+                    producer = pipeline_registers[index_of_own_input_register + 1]
+                    if (
+                        distance == 0
+                        and isinstance(producer, InstructionDecodePipelineRegister)
+                        and producer.control_unit_signals.wb_src == 1
+                    ):
+                        stall_signal = StallSignal(1)
+                        break
+            if (
+                self.forwarding
+                and stall_signal is None
+                and any(
+                    register not in (None, 0)
+                    and register in (register_read_addr_1, register_read_addr_2)
+                    for register in write_registers_of_later_stages
+                )
+                and not pipeline_register.is_of_stalled_value
+            ):
+                state.performance_metrics.stalls_removed_by_forwarding += 1
 
         return InstructionDecodePipelineRegister(
             instruction=pipeline_register.instruction,
@@ -183,6 +228,8 @@ class InstructionDecodeStage(Stage):
             write_register=write_register,
             control_unit_signals=pipeline_register.control_unit_signals,
             branch_prediction=pipeline_register.branch_prediction,
+            predicted_target=pipeline_register.predicted_target,
+            return_address_stack=pipeline_register.return_address_stack,
             stall_signal=stall_signal,
             pc_plus_instruction_length=pipeline_register.pc_plus_instruction_length,
             address_of_instruction=pipeline_register.address_of_instruction,
@@ -192,6 +239,24 @@ class InstructionDecodeStage(Stage):
 class ExecuteStage(Stage):
     abbreviation = "EX"
 
+    def __init__(
+        self,
+        forwarding=False,
+        latencies: Optional[dict[str, int]] = None,
+        pipelined_multiplier=False,
+    ) -> None:
+        # if True, operands are taken from the EX/MEM and MEM/WB pipeline registers if they are newer than the register file
+        self.forwarding = forwarding
+        # mnemonic -> number of cycles the instruction spends in this stage, 1 if not contained
+        self.latencies = dict(latencies) if latencies is not None else {}
+        # if True, multiplications only stall the instructions that need their result
+        self.pipelined_multiplier = pipelined_multiplier
+        # register -> first cycle in which an instruction that reads it may be executed (pipelined multiplier only)
+        self.pending_results: dict[int, int] = {}
+        # (register, previous entry) of the last change of pending_results, see ExecutePipelineRegister
+        self.pending_result_change: Optional[tuple[int, Optional[int]]] = None
+        super().__init__()
+
     def behavior(
         self,
         pipeline_registers: list[PipelineRegister],
@@ -215,11 +280,35 @@ class ExecuteStage(Stage):
         if not isinstance(pipeline_register, InstructionDecodePipelineRegister):
             return ExecutePipelineRegister()
 
+        register_read_data_1 = pipeline_register.register_read_data_1
+        register_read_data_2 = pipeline_register.register_read_data_2
+        if self.forwarding and pipeline_register.is_of_stalled_value:
+            # while this stage was stalled, all older instructions have written their results back
+            if pipeline_register.register_read_addr_1 is not None:
+                register_read_data_1 = state.register_file.read(
+                    pipeline_register.register_read_addr_1
+                )
+            if pipeline_register.register_read_addr_2 is not None:
+                register_read_data_2 = state.register_file.read(
+                    pipeline_register.register_read_addr_2
+                )
+        elif self.forwarding:
+            register_read_data_1 = self._forward(
+                pipeline_registers[index_of_own_input_register + 1 :],
+                pipeline_register.register_read_addr_1,
+                register_read_data_1,
+            )
+            register_read_data_2 = self._forward(
+                pipeline_registers[index_of_own_input_register + 1 :],
+                pipeline_register.register_read_addr_2,
+                register_read_data_2,
+            )
+
         alu_in_1 = (
             None
             if pipeline_register.control_unit_signals.alu_src_1 is None
             else (
-                pipeline_register.register_read_data_1
+                register_read_data_1
                 if pipeline_register.control_unit_signals.alu_src_1
                 else pipeline_register.address_of_instruction
             )
@@ -227,7 +316,7 @@ class ExecuteStage(Stage):
         alu_in_2 = (
             pipeline_register.imm
             if pipeline_register.control_unit_signals.alu_src_2
-            else pipeline_register.register_read_data_2
+            else register_read_data_2
         )
         branch_taken, result = pipeline_register.instruction.alu_compute(
             alu_in_1=alu_in_1, alu_in_2=alu_in_2
@@ -239,17 +328,33 @@ class ExecuteStage(Stage):
             else None
         )
 
+        # compare the outcome of control transfer instructions with the prediction of the IF stage
+        control_unit_signals = pipeline_register.control_unit_signals
+        mispredicted: Optional[bool] = None
+        if (
+            control_unit_signals.branch
+            or control_unit_signals.jump
+            or control_unit_signals.alu_to_pc
+        ):
+            taken = bool(
+                control_unit_signals.alu_to_pc
+                or control_unit_signals.jump
+                or branch_taken
+            )
+            # jumps that were not predicted are mispredicted, even if their target is the next instruction
+            mispredicted = taken != pipeline_register.branch_prediction or (
+                taken
+                and pipeline_register.predicted_target
+                != (result if control_unit_signals.alu_to_pc else pc_plus_imm)
+            )
+
         # ECALL needs some special behavior (flush and print to output)
         stall_signal = None
         exit_code = None
         flush_signal = None  # Needed for exiting the simulation (ecall 10/93)
         if isinstance(pipeline_register.instruction, ECALL):
             # assume that all further stages need to be empty, unless this stage is already stalled and the value of the next register is only for display purposes
-            for other_pr in pipeline_registers[
-                index_of_own_input_register
-                + 1
-                + int(pipeline_register.is_of_stalled_value) : -1
-            ]:
+            for other_pr in pipeline_registers[index_of_own_input_register + 1 : -1]:
                 if not isinstance(other_pr.instruction, EmptyInstruction):
                     assert pipeline_register.address_of_instruction is not None
                     stall_signal = StallSignal(2)
@@ -265,13 +370,18 @@ class ExecuteStage(Stage):
                         False, pipeline_register.pc_plus_instruction_length
                     )
 
+        if not pipeline_register.is_of_stalled_value:
+            self.pending_result_change = None
+            if stall_signal is None:
+                stall_signal = self._get_latency_stall_signal(pipeline_register, state)
+
         return ExecutePipelineRegister(
             stall_signal=stall_signal,
             instruction=pipeline_register.instruction,
             alu_in_1=alu_in_1,
             alu_in_2=alu_in_2,
-            register_read_data_1=pipeline_register.register_read_data_1,
-            register_read_data_2=pipeline_register.register_read_data_2,
+            register_read_data_1=register_read_data_1,
+            register_read_data_2=register_read_data_2,
             imm=pipeline_register.imm,
             result=result,
             comparison=branch_taken,
@@ -279,16 +389,121 @@ class ExecuteStage(Stage):
             control_unit_signals=pipeline_register.control_unit_signals,
             pc_plus_imm=pc_plus_imm,
             branch_prediction=pipeline_register.branch_prediction,
+            predicted_target=pipeline_register.predicted_target,
+            return_address_stack=pipeline_register.return_address_stack,
+            mispredicted=mispredicted,
             pc_plus_instruction_length=pipeline_register.pc_plus_instruction_length,
             address_of_instruction=pipeline_register.address_of_instruction,
             exit_code=exit_code,
             flush_signal=flush_signal,
+            pending_result_change=self.pending_result_change,
         )
 
+    def flush(self, flushed_pipeline_registers: list[PipelineRegister]) -> None:
+        """Undoes the changes of pending_results by flushed instructions, so that no instruction waits for
+        the result of a multiplication that never completes.
+
+        Args:
+            flushed_pipeline_registers (list[PipelineRegister]): The pipeline registers that get flushed.
+        """
+        for pipeline_register in flushed_pipeline_registers:
+            if (
+                isinstance(pipeline_register, ExecutePipelineRegister)
+                and pipeline_register.pending_result_change is not None
+            ):
+                register, previous = pipeline_register.pending_result_change
+                if previous is None:
+                    self.pending_results.pop(register, None)
+                else:
+                    self.pending_results[register] = previous
+        self.pending_result_change = None
+
+    def _get_latency_stall_signal(
+        self,
+        pipeline_register: InstructionDecodePipelineRegister,
+        state: RiscvArchitecturalState,
+    ) -> Optional[StallSignal]:
+        """Returns the stall signal that keeps the instruction in this stage for its configured latency.
+        With a pipelined multiplier, multiplications do not stall, but the instructions that read their results
+        are stalled until the results are available.
+
+        Args:
+            pipeline_register (InstructionDecodePipelineRegister): The input register of this stage.
+            state (RiscvArchitecturalState): The current architectural state.
+
+        Returns:
+            Optional[StallSignal]: The stall signal or None if the instruction does not need to stall.
+        """
+        cycle = state.performance_metrics.cycles
+        stall_cycles = 0
+        for register in (
+            pipeline_register.register_read_addr_1,
+            pipeline_register.register_read_addr_2,
+        ):
+            if register in self.pending_results:
+                stall_cycles = max(stall_cycles, self.pending_results[register] - cycle)
+        if pipeline_register.write_register is not None:
+            self.pending_result_change = (
+                pipeline_register.write_register,
+                self.pending_results.pop(pipeline_register.write_register, None),
+            )
+
+        mnemonic = pipeline_register.instruction.mnemonic
+        latency = self.latencies.get(mnemonic, 1)
+        if latency > 1:
+            if self.pipelined_multiplier and mnemonic.startswith("mul"):
+                if pipeline_register.write_register:
+                    self.pending_results[pipeline_register.write_register] = (
+                        cycle + stall_cycles + latency
+                    )
+            else:
+                stall_cycles += latency - 1
+        return StallSignal(stall_cycles) if stall_cycles > 0 else None
+
+    def _forward(
+        self,
+        later_pipeline_registers: list[PipelineRegister],
+        register: Optional[int],
+        value: Optional[int],
+    ) -> Optional[int]:
+        """Returns the newest value of a register: The value that will be written back by the instruction in the
+        MA stage (EX/MEM register), the value that is being written back by the instruction in the WB stage
+        (MEM/WB register) or the value that was read from the register file.
+
+        Args:
+            later_pipeline_registers (list[PipelineRegister]): The pipeline registers after the input register of this stage.
+            register (Optional[int]): Index of the register.
+            value (Optional[int]): The value that was read from the register file.
+
+        Returns:
+            Optional[int]: The newest value.
+        """
+        if register is None or register == 0:
+            return value
+        for producer in later_pipeline_registers[:2]:
+            if (
+                isinstance(
+                    producer, (ExecutePipelineRegister, MemoryAccessPipelineRegister)
+                )
+                and producer.write_register == register
+            ):
+                forwarded_value = get_write_back_data(producer)
+                # loads in the MA stage have no value yet, the ID stage stalls for them
+                if forwarded_value is not None:
+                    # in the format of the register file, which stores unsigned 32 bit values
+                    return to_unsigned32(forwarded_value)
+        return value
+
 
 class MemoryAccessStage(Stage):
     abbreviation = "MA"
 
+    def __init__(self) -> None:
+        # the result of an access that stalls this stage, returned again while the stage is stalled
+        # so that the memory is only accessed once
+        self.stalled_result: Optional[MemoryAccessPipelineRegister] = None
+        super().__init__()
+
     def behavior(
         self,
         pipeline_registers: list[PipelineRegister],
@@ -312,6 +527,10 @@ class MemoryAccessStage(Stage):
         if not isinstance(pipeline_register, ExecutePipelineRegister):
             return MemoryAccessPipelineRegister()
 
+        if pipeline_register.is_of_stalled_value and self.stalled_result is not None:
+            return self.stalled_result
+        self.stalled_result = None
+
         memory_address = pipeline_register.result
         memory_write_data = pipeline_register.register_read_data_2
         memory_read_data = pipeline_register.instruction.memory_access(
@@ -324,22 +543,22 @@ class MemoryAccessStage(Stage):
         )
 
         # NOTE: comparison_or_jump = 0 -> select (pc+i_length), comparison_or_jump = 1 -> select (pc+imm)
-        incorrect_branch_prediction = (
-            pipeline_register.control_unit_signals.branch
-            and comparison_or_jump != pipeline_register.branch_prediction
-        )
-
-        if incorrect_branch_prediction or pipeline_register.control_unit_signals.jump:
-            # flush if (pc+imm) should have been written to the pc
-            assert pipeline_register.pc_plus_imm is not None
-            flush_signal = FlushSignal(
-                inclusive=False, address=pipeline_register.pc_plus_imm
+        if pipeline_register.control_unit_signals.alu_to_pc:
+            next_address = pipeline_register.result
+        elif comparison_or_jump:
+            next_address = pipeline_register.pc_plus_imm
+        else:
+            next_address = pipeline_register.pc_plus_instruction_length
+
+        if pipeline_register.mispredicted:
+            # flush if the IF stage did not continue at the correct address
+            assert next_address is not None
+            # the instructions on the wrong path have pushed to or popped from the return address stack
+            state.branch_prediction_unit.restore_return_address_stack(
+                pipeline_register.return_address_stack
             )
-        elif pipeline_register.control_unit_signals.alu_to_pc:
-            # flush if result should have been written to pc
-            assert pipeline_register.result is not None
-            flush_signal = FlushSignal(
-                inclusive=False, address=pipeline_register.result
+            flush_signal: Optional[FlushSignal] = FlushSignal(
+                inclusive=False, address=next_address
             )
         elif pipeline_register.exit_code is not None:
             # Exit codes stem from ecalls which cannot cause branches and thus cannot generate other flush signals
@@ -350,13 +569,29 @@ class MemoryAccessStage(Stage):
         else:
             flush_signal = None
 
-        if flush_signal is not None:
-            if isinstance(pipeline_register.instruction, BTypeInstruction):
+        if pipeline_register.mispredicted is not None:
+            # train the branch prediction with the outcome of the control transfer instruction
+            assert pipeline_register.address_of_instruction is not None
+            assert next_address is not None
+            taken = bool(
+                comparison_or_jump or pipeline_register.control_unit_signals.alu_to_pc
+            )
+            state.branch_prediction_unit.update(
+                pipeline_register.address_of_instruction,
+                pipeline_register.instruction,
+                taken,
+                next_address,
+            )
+            state.performance_metrics.record_branch_prediction(
+                pipeline_register.address_of_instruction,
+                pipeline_register.mispredicted,
+            )
+            if isinstance(pipeline_register.instruction, BTypeInstruction) and taken:
                 state.performance_metrics.branch_count += 1
             elif isinstance(pipeline_register.instruction, JAL):
                 state.performance_metrics.procedure_count += 1
 
-        return MemoryAccessPipelineRegister(
+        result = MemoryAccessPipelineRegister(
             instruction=pipeline_register.instruction,
             memory_address=memory_address,
             result=pipeline_register.result,
@@ -364,6 +599,7 @@ class MemoryAccessStage(Stage):
             memory_read_data=memory_read_data,
             comparison=pipeline_register.comparison,
             comparison_or_jump=comparison_or_jump,
+            mispredicted=pipeline_register.mispredicted,
             write_register=pipeline_register.write_register,
             control_unit_signals=pipeline_register.control_unit_signals,
             pc_plus_imm=pipeline_register.pc_plus_imm,
@@ -373,6 +609,12 @@ class MemoryAccessStage(Stage):
             address_of_instruction=pipeline_register.address_of_instruction,
             exit_code=pipeline_register.exit_code,
         )
+        # a data cache that stalls on access returns the latency of the access
+        stall_cycles = state.memory.take_pending_stall_cycles()
+        if stall_cycles > 0:
+            self.stalled_result = result
+            return replace(result, stall_signal=StallSignal(stall_cycles))
+        return result
 
 
 class RegisterWritebackStage(Stage):
@@ -407,17 +649,7 @@ class RegisterWritebackStage(Stage):
             state.performance_metrics.instruction_count += 1
 
         # select the correct data for write back
-        wb_src = pipeline_register.control_unit_signals.wb_src
-        if wb_src == 0:
-            register_write_data = pipeline_register.pc_plus_instruction_length
-        elif wb_src == 1:
-            register_write_data = pipeline_register.memory_read_data
-        elif wb_src == 2:
-            register_write_data = pipeline_register.result
-        elif wb_src == 3:
-            register_write_data = pipeline_register.imm
-        else:
-            register_write_data = None
+        register_write_data = get_write_back_data(pipeline_register)
 
         pipeline_register.instruction.write_back(
             write_register=pipeline_register.write_register,
@@ -447,6 +679,32 @@ class RegisterWritebackStage(Stage):
         )
 
 
+def get_write_back_data(
+    pipeline_register: ExecutePipelineRegister | MemoryAccessPipelineRegister,
+) -> Optional[int]:
+    """Selects the value that the instruction of the pipeline register writes back, depending on wb_src.
+
+    Args:
+        pipeline_register (ExecutePipelineRegister | MemoryAccessPipelineRegister): The pipeline register.
+
+    Returns:
+        Optional[int]: The value, or None if the instruction does not write back or if the value was not read from
+        the memory yet.
+    """
+    wb_src = pipeline_register.control_unit_signals.wb_src
+    if wb_src == 0:
+        return pipeline_register.pc_plus_instruction_length
+    elif wb_src == 1:
+        if isinstance(pipeline_register, MemoryAccessPipelineRegister):
+            return pipeline_register.memory_read_data
+        return None
+    elif wb_src == 2:
+        return pipeline_register.result
+    elif wb_src == 3:
+        return pipeline_register.imm
+    return None
+
+
 #
 # Single stage Pipeline:
 #
@@ -0,0 +1,90 @@
+"""32 bit integer arithmetic on plain python ints.
+
+Register values are stored as unsigned 32 bit ints (0 <= value < 2**32). The helpers in this module
+convert between the signed and unsigned interpretation and implement the operations that need more than
+a mask, like the upper half of a product or the division corner cases of the 'M' extension.
+All helpers accept arbitrary ints and interpret them modulo 2**32, just like fixedint.UInt32 and fixedint.Int32 would.
+"""
+
+MASK_32 = 0xFFFFFFFF
+SIGN_BIT_32 = 0x80000000
+
+
+def to_unsigned32(value: int) -> int:
+    """Returns value modulo 2**32 (like fixedint.UInt32)."""
+    return value & MASK_32
+
+
+def to_signed32(value: int) -> int:
+    """Returns value modulo 2**32, interpreted as twos complement (like fixedint.Int32)."""
+    return ((value & MASK_32) ^ SIGN_BIT_32) - SIGN_BIT_32
+
+
+def sign_extend(value: int, bits: int) -> int:
+    """Interprets the lowest bits of value as a twos complement number (like fixedint.Int8 for bits=8).
+
+    Args:
+        value (int): The value to extend.
+        bits (int): Width of the value.
+
+    Returns:
+        int: The signed value.
+    """
+    sign_bit = 1 << (bits - 1)
+    return ((value & ((1 << bits) - 1)) ^ sign_bit) - sign_bit
+
+
+def mulh(left: int, right: int) -> int:
+    """Returns the upper 32 bits of the signed * signed product as signed value."""
+    return (to_signed32(left) * to_signed32(right)) >> 32
+
+
+def mulhsu(left: int, right: int) -> int:
+    """Returns the upper 32 bits of the signed * unsigned product as signed value."""
+    return (to_signed32(left) * to_unsigned32(right)) >> 32
+
+
+def mulhu(left: int, right: int) -> int:
+    """Returns the upper 32 bits of the unsigned * unsigned product."""
+    return (to_unsigned32(left) * to_unsigned32(right)) >> 32
+
+
+def div(dividend: int, divisor: int) -> int:
+    """Signed division, rounding towards zero.
+
+    Returns -1 for a divisor of 0. The result is not reduced to 32 bits, so -2**31 / -1 is 2**31
+    (which is -2**31 as 32 bit value, as required by the specification).
+    """
+    dividend = to_signed32(dividend)
+    divisor = to_signed32(divisor)
+    if divisor == 0:
+        return -1
+    quotient = abs(dividend) // abs(divisor)
+    return -quotient if (dividend < 0) != (divisor < 0) else quotient
+
+
+def divu(dividend: int, divisor: int) -> int:
+    """Unsigned division. Returns -1 for a divisor of 0."""
+    divisor = to_unsigned32(divisor)
+    if divisor == 0:
+        return -1
+    return to_unsigned32(dividend) // divisor
+
+
+def rem(dividend: int, divisor: int) -> int:
+    """Signed remainder, which has the sign of the dividend. Returns the (signed) dividend for a divisor of 0."""
+    dividend = to_signed32(dividend)
+    divisor = to_signed32(divisor)
+    if divisor == 0:
+        return dividend
+    remainder = abs(dividend) % abs(divisor)
+    return -remainder if dividend < 0 else remainder
+
+
+def remu(dividend: int, divisor: int) -> int:
+    """Unsigned remainder. Returns the dividend for a divisor of 0."""
+    dividend = to_unsigned32(dividend)
+    divisor = to_unsigned32(divisor)
+    if divisor == 0:
+        return dividend
+    return dividend % divisor
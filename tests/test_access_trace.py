@@ -0,0 +1,120 @@
+import os
+import tempfile
+import unittest
+
+from architecture_simulator.simulation.riscv_simulation import RiscvSimulation
+from architecture_simulator.uarch.memory.access_trace import (
+    AccessTracer,
+    read_access_trace,
+    replay_access_trace,
+)
+from architecture_simulator.uarch.memory.cache import CacheOptions
+from tests.riscv_programs.fibonacci_recursive import get_fibonacci_recursive
+
+
+def cache_options(
+    num_index_bits: int,
+    num_block_bits: int,
+    associativity: int,
+    cache_type: str = "wb",
+    replacement_strategy: str = "lru",
+) -> CacheOptions:
+    return CacheOptions(
+        enable=True,
+        num_index_bits=num_index_bits,
+        num_block_bits=num_block_bits,
+        associativity=associativity,
+        cache_type=cache_type,
+        replacement_strategy=replacement_strategy,
+        miss_penalty=3,
+    )
+
+
+class TestAccessTrace(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "trace.bin")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_records(self):
+        program = """
+        .data
+        value: .word 5
+        .text
+        la x1, value
+        lw x2, 0(x1)
+        sb x2, 1(x1)
+        lhu x3, 0(x1)
+        """
+        simulation = RiscvSimulation(
+            data_cache=cache_options(0, 0, 1),
+            instruction_cache=cache_options(0, 0, 1),
+        )
+        simulation.load_program(program)
+        with AccessTracer(self.path, simulation.state, chunk_size=2) as tracer:
+            simulation.run()
+        self.assertIsNone(simulation.state.memory.tracer)  # type: ignore[attr-defined]
+        self.assertEqual(tracer.num_records, 8)
+        records = list(read_access_trace(self.path))
+        self.assertEqual(len(records), 8)
+        data_records = [record for record in records if not record.is_instruction]
+        self.assertEqual(
+            [(record.size, record.is_write) for record in data_records],
+            [(4, False), (1, True), (2, False)],
+        )
+        self.assertEqual(data_records[1].address, data_records[0].address + 1)
+        instruction_records = [record for record in records if record.is_instruction]
+        self.assertEqual(
+            [record.address for record in instruction_records], [0, 4, 8, 12, 16]
+        )
+        self.assertEqual(
+            [record.pc for record in instruction_records], [0, 4, 8, 12, 16]
+        )
+        cycles = [record.cycle for record in records]
+        self.assertEqual(cycles, sorted(cycles))
+
+        with open(self.path, "wb") as file:
+            file.write(b"something else")
+        with self.assertRaises(ValueError):
+            list(read_access_trace(self.path))
+
+    def test_replay(self):
+        program = get_fibonacci_recursive(6)
+        simulation = RiscvSimulation(
+            data_cache=cache_options(1, 1, 2),
+            instruction_cache=cache_options(1, 1, 2),
+        )
+        simulation.load_program(program)
+        with AccessTracer(self.path, simulation.state):
+            simulation.run()
+
+        configurations = [
+            cache_options(1, 1, 2),
+            cache_options(0, 2, 4, replacement_strategy="plru"),
+            cache_options(2, 0, 1, cache_type="wt"),
+        ]
+        for options in configurations:
+            for instruction_cache in [False, True]:
+                with self.subTest(
+                    options=vars(options), instruction_cache=instruction_cache
+                ):
+                    reference = (
+                        RiscvSimulation(instruction_cache=options)
+                        if instruction_cache
+                        else RiscvSimulation(data_cache=options)
+                    )
+                    reference.load_program(program)
+                    reference.run()
+                    stats = (
+                        reference.state.instruction_memory.get_cache_stats()
+                        if instruction_cache
+                        else reference.state.memory.get_cache_stats()
+                    )
+                    assert stats is not None
+                    result = replay_access_trace(self.path, options, instruction_cache)
+                    self.assertEqual(
+                        result.get_cache_stats(),
+                        {"hits": stats["hits"], "accesses": stats["accesses"]},
+                    )
@@ -0,0 +1,107 @@
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from architecture_simulator.simulation.batch import (
+    BatchJob,
+    load_manifest,
+    run_batch,
+    run_job,
+)
+
+program = """
+.data
+a: .word 5
+.text
+la x1, a
+lw x2, 0(x1)
+loop:
+addi x2, x2, -1
+bne x2, x0, loop
+lw a0, 0(x1)
+addi a7, x0, 1
+ecall
+addi a0, x0, 3
+addi a7, x0, 93
+ecall
+"""
+data_cache = {
+    "enable": True,
+    "num_index_bits": 1,
+    "num_block_bits": 1,
+    "associativity": 1,
+    "cache_type": "wb",
+    "replacement_strategy": "lru",
+    "miss_penalty": 10,
+}
+
+
+class TestBatch(unittest.TestCase):
+    def test_run_job(self):
+        for configuration in [
+            {},
+            {"mode": "functional"},
+            {"mode": "five_stage_pipeline", "data_cache": data_cache},
+        ]:
+            with self.subTest(configuration=configuration):
+                result = run_job(BatchJob("program", program, configuration))
+                self.assertEqual(result["status"], "finished")
+                self.assertEqual(result["performance_metrics"]["instruction_count"], 19)
+        result = run_job(BatchJob("program", program, {}, max_instructions=5))
+        self.assertEqual(result["status"], "instruction_limit_exceeded")
+        self.assertEqual(result["performance_metrics"]["instruction_count"], 5)
+        result = run_job(BatchJob("program", "addi x1, x1", {}))
+        self.assertEqual(result["status"], "error")
+
+    def test_time_limit(self):
+        result = run_job(
+            BatchJob(
+                "loop",
+                "loop:\nbeq x0, x0, loop",
+                {"mode": "functional"},
+                time_limit=0.1,
+            )
+        )
+        self.assertEqual(result["status"], "time_limit_exceeded")
+
+    def test_run_batch(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with open(os.path.join(directory, "program.s"), "w") as file:
+                file.write(program)
+            with open(os.path.join(directory, "manifest.json"), "w") as file:
+                json.dump(
+                    {
+                        "programs": ["program.s"],
+                        "configurations": [
+                            {"name": "single"},
+                            {
+                                "name": "cache",
+                                "mode": "five_stage_pipeline",
+                                "data_cache": data_cache,
+                            },
+                        ],
+                        "max_instructions": 1000,
+                    },
+                    file,
+                )
+            jobs = load_manifest(os.path.join(directory, "manifest.json"))
+        self.assertEqual(len(jobs), 2)
+        output = io.StringIO()
+        self.assertEqual(run_batch(jobs, output, max_workers=2), 0)
+        results = [json.loads(line) for line in output.getvalue().splitlines()]
+        self.assertEqual([r["configuration"] for r in results], ["single", "cache"])
+        self.assertEqual(results[0]["performance_metrics"]["cycles"], 19)
+        self.assertEqual(results[1]["performance_metrics"]["memory_cycles"], 10)
+        for result in results:
+            self.assertEqual(result["exit_code"], 3)
+            self.assertEqual(result["output"], "5")
+
+    def test_unknown_configuration_key(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "manifest.json")
+            with open(path, "w") as file:
+                json.dump({"programs": [], "configurations": [{"cache": 1}]}, file)
+            with self.assertRaises(ValueError):
+                load_manifest(path)
@@ -0,0 +1,367 @@
+import unittest
+from pathlib import Path
+from typing import Optional
+
+from architecture_simulator.simulation.riscv_simulation import RiscvSimulation
+from architecture_simulator.simulation.runtime_errors import (
+    InstructionExecutionException,
+)
+from architecture_simulator.isa.riscv.rv32i_instructions import ADDI
+from architecture_simulator.uarch.riscv.block_translator import BlockTranslator
+from architecture_simulator.uarch.riscv.functional_engine import FunctionalEngine
+from tests.riscv_programs.fibonacci_recursive import get_fibonacci_recursive
+
+
+def run_simulation(
+    program: str, translate_blocks: bool, hot_trace_threshold: Optional[int] = None
+) -> RiscvSimulation:
+    simulation = RiscvSimulation(mode="functional")
+    simulation.load_program(program)
+    assert isinstance(simulation.state.pipeline, FunctionalEngine)
+    simulation.state.pipeline.translate_blocks = translate_blocks
+    simulation.state.pipeline.hot_trace_threshold = hot_trace_threshold
+    simulation.run()
+    return simulation
+
+
+class TestBlockTranslator(unittest.TestCase):
+    # registers with interesting values for every instruction
+    operands = """
+    li x1, 0x80000000
+    li x2, -1
+    li x3, 7
+    li x4, -7
+    li x5, 0x7FFFFFFF
+    li x6, 33
+    li x7, 0
+    li x8, 0x00018000
+    """
+
+    def assert_equivalent(self, program: str):
+        interpreted = run_simulation(program, translate_blocks=False)
+        for hot_trace_threshold in [None, 1, 3]:
+            translated = run_simulation(
+                program, translate_blocks=True, hot_trace_threshold=hot_trace_threshold
+            )
+            self.assert_same_state(translated, interpreted)
+        return translated
+
+    def assert_same_state(
+        self, translated: RiscvSimulation, interpreted: RiscvSimulation
+    ):
+        self.assertEqual(
+            translated.state.register_file.registers,
+            interpreted.state.register_file.registers,
+        )
+        self.assertEqual(
+            translated.get_data_memory_entries(),
+            interpreted.get_data_memory_entries(),
+        )
+        self.assertEqual(
+            translated.state.program_counter, interpreted.state.program_counter
+        )
+        self.assertEqual(
+            translated.state.previous_program_counter,
+            interpreted.state.previous_program_counter,
+        )
+        self.assertEqual(translated.get_output(), interpreted.get_output())
+        self.assertEqual(translated.get_exit_code(), interpreted.get_exit_code())
+        for attribute in [
+            "instruction_count",
+            "branch_count",
+            "procedure_count",
+            "cycles",
+        ]:
+            self.assertEqual(
+                getattr(translated.state.performance_metrics, attribute),
+                getattr(interpreted.state.performance_metrics, attribute),
+            )
+
+    def test_register_instructions(self):
+        instructions = [
+            "add",
+            "sub",
+            "sll",
+            "slt",
+            "sltu",
+            "xor",
+            "srl",
+            "sra",
+            "or",
+            "and",
+            "mul",
+            "mulh",
+            "mulhu",
+            "mulhsu",
+            "div",
+            "divu",
+            "rem",
+            "remu",
+        ]
+        for instruction in instructions:
+            with self.subTest(instruction=instruction):
+                program = self.operands
+                destination = 9
+                for rs1 in range(1, 8):
+                    for rs2 in [1, 2, 3, 4, 5, 6, 7]:
+                        program += f"{instruction} x{destination}, x{rs1}, x{rs2}\n"
+                        destination = destination + 1 if destination < 31 else 9
+                # writes to x0 must be ignored
+                program += f"{instruction} x0, x1, x3\n"
+                self.assert_equivalent(program)
+
+    def test_immediate_instructions(self):
+        instructions = {
+            "addi": [-2048, -1, 0, 1, 2047],
+            "slti": [-2048, -1, 0, 7, 2047],
+            "sltiu": [-2048, -1, 0, 7, 2047],
+            "xori": [-2048, -1, 0, 1, 2047],
+            "ori": [-2048, -1, 0, 1, 2047],
+            "andi": [-2048, -1, 0, 1, 2047],
+            "slli": [0, 1, 4, 31],
+            "srli": [0, 1, 4, 31],
+            "srai": [0, 1, 4, 31],
+        }
+        for instruction, immediates in instructions.items():
+            with self.subTest(instruction=instruction):
+                program = self.operands
+                destination = 9
+                for rs1 in range(0, 8):
+                    for imm in immediates:
+                        program += f"{instruction} x{destination}, x{rs1}, {imm}\n"
+                        destination = destination + 1 if destination < 31 else 9
+                self.assert_equivalent(program)
+
+    def test_upper_immediate_instructions(self):
+        self.assert_equivalent(
+            "lui x1, 0xFFFFF\nauipc x2, 0xFFFFF\nauipc x3, 1\nlui x0, 1\nauipc x0, 1"
+        )
+
+    def test_memory_instructions(self):
+        program = self.operands
+        for store in ["sb", "sh", "sw"]:
+            for rs2 in [1, 2, 4, 5]:
+                program += f"{store} x{rs2}, 0(x8)\n"
+                for offset in [0, 1, 2]:
+                    for load in ["lb", "lh", "lw", "lbu", "lhu"]:
+                        program += f"{load} x9, {offset}(x8)\n"
+                        program += "add x10, x10, x9\n"
+                program += "lw x0, 0(x8)\n"
+        program += "sw x4, -4(x8)\nlw x11, -4(x8)\nsb x4, 2047(x8)\nlbu x12, 2047(x8)"
+        self.assert_equivalent(program)
+
+    def test_branches_and_jumps(self):
+        program = self.operands
+        for branch in ["beq", "bne", "blt", "bge", "bltu", "bgeu"]:
+            for rs1, rs2 in [(1, 2), (2, 1), (3, 3), (3, 4), (5, 1), (0, 7)]:
+                program += f"{branch} x{rs1}, x{rs2}, 8\naddi x20, x20, 1\n"
+        program += """
+        jal x21, skip
+        addi x20, x20, 100
+        skip:
+        auipc x22, 0
+        jalr x22, x22, 13
+        addi x20, x20, 100
+        jal x0, end
+        addi x20, x20, 100
+        end:
+        """
+        translated = self.assert_equivalent(program)
+        self.assertEqual(translated.state.performance_metrics.procedure_count, 2)
+
+    def test_programs(self):
+        self.assert_equivalent(get_fibonacci_recursive(10))
+        program = """
+        .data
+        text: .string "Hi"
+        .text
+        addi x2, x0, 10
+        loop:
+        add x3, x3, x2
+        addi x2, x2, -1
+        bne x2, zero, loop
+        la a0, text
+        li a7, 4
+        ecall
+        li a0, 3
+        li a7, 93
+        ecall
+        addi x7, x0, 1
+        """
+        translated = self.assert_equivalent(program)
+        self.assertEqual(translated.get_exit_code(), 3)
+        self.assertEqual(translated.get_output(), "Hi")
+
+    def test_dhrystone(self):
+        dhrystone_path = Path(__file__).parent / "riscv_programs" / "dhrystone.s"
+        self.assert_equivalent(dhrystone_path.read_text())
+
+    def test_blocks(self):
+        simulation = RiscvSimulation(mode="functional")
+        simulation.load_program(
+            """
+            addi x1, x0, 3
+            loop:
+            addi x1, x1, -1
+            bne x1, x0, loop
+            li a7, 93
+            ecall
+            """
+        )
+        engine = simulation.state.pipeline
+        assert isinstance(engine, FunctionalEngine)
+        engine.hot_trace_threshold = None
+        simulation.run()
+        translator = engine.block_translator
+        self.assertEqual(simulation.get_exit_code(), 0)
+        # ends with the branch
+        self.assertEqual(translator.blocks[0].length, 3)  # type: ignore
+        self.assertEqual(translator.blocks[4].length, 2)  # type: ignore
+        # ends before the ecall, which cannot be translated
+        self.assertEqual(translator.blocks[12].length, 1)  # type: ignore
+        self.assertIsNone(translator.blocks[16])
+        self.assertEqual(translator.misses, 4)
+        self.assertEqual(translator.hits, 1)
+        self.assertEqual(simulation.state.performance_metrics.instruction_count, 9)
+        self.assertEqual(simulation.state.performance_metrics.branch_count, 2)
+        self.assertEqual(simulation.state.previous_program_counter, 16)
+
+    def test_max_block_length(self):
+        translator = BlockTranslator(max_block_length=2)
+        translator.reset({0: ADDI(1, 1, 1), 4: ADDI(1, 1, 1), 8: ADDI(1, 1, 1)})
+        block = translator.get_block(0)
+        assert block is not None
+        self.assertEqual(block.length, 2)
+        self.assertEqual(block.last_address, 4)
+        self.assertIsNone(translator.get_block(12))
+
+    def test_invalidation(self):
+        simulation = RiscvSimulation(mode="functional")
+        simulation.load_program("addi x1, x0, 3\nadd x2, x1, x1")
+        engine = simulation.state.pipeline
+        assert isinstance(engine, FunctionalEngine)
+        engine.hot_trace_threshold = None
+        simulation.run()
+        self.assertEqual(simulation.state.register_file.registers[2], 6)
+        self.assertEqual(len(engine.block_translator.blocks), 1)
+
+        simulation.state.instruction_memory.write_instruction(4, ADDI(2, 1, 5))
+        simulation.state.program_counter = 0
+        simulation.run()
+        self.assertEqual(simulation.state.register_file.registers[2], 8)
+        self.assertEqual(engine.block_translator.misses, 2)
+        self.assertEqual(engine.block_translator.hits, 0)
+
+        simulation.state.program_counter = 0
+        simulation.run()
+        self.assertEqual(engine.block_translator.hits, 1)
+
+    def test_exception(self):
+        simulation = RiscvSimulation(mode="functional")
+        simulation.load_program(
+            "addi x1, x0, 3\nlw x3, 0(x0)\naddi x1, x0, 4\nsw x1, 0(x0)"
+        )
+        with self.assertRaises(InstructionExecutionException) as context:
+            simulation.run()
+        self.assertEqual(context.exception.address, 4)
+        self.assertEqual(context.exception.instruction_repr, "lw x3, 0(x0)")
+        # the results of the instructions before the failing one are kept
+        self.assertEqual(simulation.state.register_file.registers[1], 3)
+        self.assertEqual(simulation.state.program_counter, 4)
+        self.assertEqual(simulation.state.previous_program_counter, 4)
+        self.assertEqual(simulation.state.performance_metrics.instruction_count, 2)
+        self.assertEqual(simulation.state.performance_metrics.cycles, 2)
+
+    def test_plain_register_list(self):
+        # x0 is not hardwired in a plain list, so blocks must not be used
+        simulation = RiscvSimulation(mode="functional")
+        simulation.load_program("addi x0, x0, 3\naddi x1, x0, 1")
+        simulation.state.register_file.registers = [0, 0]  # type: ignore
+        simulation.run()
+        self.assertEqual(simulation.state.register_file.registers, [3, 4])
+        engine = simulation.state.pipeline
+        assert isinstance(engine, FunctionalEngine)
+        self.assertEqual(engine.block_translator.blocks, {})
+
+    def test_nested_loops(self):
+        self.assert_equivalent(
+            """
+            li x1, 20
+            outer:
+            li x2, 10
+            inner:
+            add x3, x3, x2
+            andi x4, x3, 1
+            beq x4, x0, even
+            addi x5, x5, 1
+            even:
+            addi x2, x2, -1
+            bne x2, x0, inner
+            addi x1, x1, -1
+            bne x1, x0, outer
+            """
+        )
+
+    def test_trace(self):
+        simulation = RiscvSimulation(mode="functional")
+        simulation.load_program(
+            """
+            li x1, 100
+            loop:
+            addi x2, x2, 2
+            addi x1, x1, -1
+            bne x1, x0, loop
+            li a7, 93
+            ecall
+            """
+        )
+        engine = simulation.state.pipeline
+        assert isinstance(engine, FunctionalEngine)
+        engine.hot_trace_threshold = 10
+        simulation.run()
+        translator = engine.block_translator
+        performance_metrics = simulation.state.performance_metrics
+        self.assertEqual(simulation.state.register_file.registers[2], 200)
+        trace = translator.traces[4]
+        assert trace is not None
+        self.assertTrue(trace.closed)
+        self.assertEqual(trace.addresses, [4, 8, 12])
+        self.assertEqual(performance_metrics.traces_compiled, 1)
+        self.assertEqual(performance_metrics.instruction_count, 303)
+        self.assertEqual(performance_metrics.branch_count, 99)
+        # 10 iterations run as blocks and one is interpreted while it is recorded
+        self.assertEqual(performance_metrics.trace_instruction_count, 89 * 3)
+        self.assertEqual(performance_metrics.trace_guard_failures, 1)
+        self.assertGreater(performance_metrics.trace_compilation_time_s, 0)
+        self.assertAlmostEqual(performance_metrics.get_trace_coverage(), 89 * 3 / 303)
+        self.assertIn("trace coverage", repr(performance_metrics))
+        self.assertEqual(simulation.state.previous_program_counter, 20)
+
+    def test_trace_exception(self):
+        simulation = RiscvSimulation(mode="functional")
+        # reads downwards until it leaves the data memory
+        simulation.load_program(
+            """
+            li x1, 0x00004010
+            loop:
+            lw x2, 0(x1)
+            addi x1, x1, -4
+            jal x0, loop
+            """
+        )
+        engine = simulation.state.pipeline
+        assert isinstance(engine, FunctionalEngine)
+        engine.hot_trace_threshold = 1
+        with self.assertRaises(InstructionExecutionException) as context:
+            simulation.run()
+        self.assertEqual(context.exception.address, 8)
+        self.assertEqual(simulation.state.program_counter, 8)
+        self.assertEqual(simulation.state.previous_program_counter, 8)
+        self.assertEqual(simulation.state.register_file.registers[1], 0x00004000 - 4)
+        # 2 instructions for li, 5 iterations of the loop and the failing load
+        self.assertEqual(simulation.state.performance_metrics.instruction_count, 18)
+        self.assertEqual(simulation.state.performance_metrics.cycles, 18)
+        self.assertEqual(simulation.state.performance_metrics.procedure_count, 5)
+        self.assertGreater(
+            simulation.state.performance_metrics.trace_instruction_count, 0
+        )
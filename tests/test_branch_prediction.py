@@ -0,0 +1,240 @@
+import unittest
+
+from architecture_simulator.isa.riscv.rv32i_instructions import ADD, BEQ, JAL, JALR
+from architecture_simulator.simulation.riscv_simulation import RiscvSimulation
+from architecture_simulator.uarch.riscv.branch_prediction import (
+    BranchPredictionOptions,
+    BranchPredictionUnit,
+    BranchTargetBuffer,
+    GsharePredictor,
+    OneBitPredictor,
+    ReturnAddressStack,
+    TournamentPredictor,
+    TwoBitPredictor,
+)
+
+LOOP_PROGRAM = """
+addi x1, x0, 20
+loop:
+addi x2, x2, 3
+addi x1, x1, -1
+bne x1, x0, loop
+addi x3, x2, 1
+"""
+
+CALL_PROGRAM = """
+addi x10, x0, 5
+loop:
+jal ra, function
+addi x10, x10, -1
+bne x10, x0, loop
+jal x0, end
+function:
+addi x11, x11, 2
+jalr x0, ra, 0
+end:
+"""
+
+
+def options(
+    predictor: str, btb_entries: int = 16, ras_size: int = 4
+) -> BranchPredictionOptions:
+    return BranchPredictionOptions(
+        predictor=predictor,
+        num_entries=16,
+        num_history_bits=4,
+        btb_entries=btb_entries,
+        ras_size=ras_size,
+    )
+
+
+class TestBranchPredictors(unittest.TestCase):
+    def test_one_bit(self):
+        predictor = OneBitPredictor(4)
+        self.assertFalse(predictor.predict(8))
+        predictor.update(8, True)
+        self.assertTrue(predictor.predict(8))
+        self.assertTrue(predictor.predict(24))  # same entry
+        self.assertFalse(predictor.predict(12))
+        predictor.update(8, False)
+        self.assertFalse(predictor.predict(8))
+
+    def test_two_bit(self):
+        predictor = TwoBitPredictor(4)
+        self.assertFalse(predictor.predict(0))
+        predictor.update(0, True)
+        self.assertTrue(predictor.predict(0))
+        predictor.update(0, True)
+        predictor.update(0, True)
+        # saturated, one not taken branch does not change the prediction
+        predictor.update(0, False)
+        self.assertTrue(predictor.predict(0))
+        predictor.update(0, False)
+        self.assertFalse(predictor.predict(0))
+
+    def test_gshare(self):
+        predictor = GsharePredictor(2)
+        # alternating branch: the history tells the outcomes apart
+        outcomes = [True, False] * 10
+        for outcome in outcomes:
+            predictor.update(0, outcome)
+        correct = 0
+        for outcome in outcomes:
+            correct += predictor.predict(0) == outcome
+            predictor.update(0, outcome)
+        self.assertEqual(correct, len(outcomes))
+
+    def test_tournament(self):
+        predictor = TournamentPredictor(4, 2)
+        outcomes = [True, False] * 10
+        for outcome in outcomes:
+            predictor.update(0, outcome)
+        # the 2 bit predictor can not predict the pattern, so gshare gets chosen
+        self.assertGreaterEqual(predictor.chooser[0], 2)
+        for outcome in outcomes:
+            self.assertEqual(predictor.predict(0), outcome)
+            predictor.update(0, outcome)
+
+    def test_btb_and_ras(self):
+        btb = BranchTargetBuffer(4)
+        self.assertIsNone(btb.lookup(4))
+        btb.update(4, 100)
+        self.assertEqual(btb.lookup(4), 100)
+        self.assertIsNone(btb.lookup(20))
+        btb.update(20, 200)
+        self.assertIsNone(btb.lookup(4))
+
+        ras = ReturnAddressStack(2)
+        for address in [4, 8, 12]:
+            ras.push(address)
+        self.assertEqual(ras.pop(), 12)
+        self.assertEqual(ras.pop(), 8)
+        self.assertIsNone(ras.pop())
+
+    def test_unit(self):
+        unit = BranchPredictionUnit(options("taken"))
+        # the targets of branches and jal are computed from the instruction
+        self.assertEqual(unit.predict(16, BEQ(rs1=0, rs2=0, imm=-8)), 8)
+        self.assertIsNone(unit.predict(16, ADD(rd=1, rs1=1, rs2=1)))
+        # other jalr instructions need the BTB
+        jump = JALR(rd=0, rs1=6, imm=0)
+        self.assertIsNone(unit.predict(40, jump))
+        unit.update(40, jump, True, 200)
+        self.assertEqual(unit.predict(40, jump), 200)
+        # calls push the return address, returns pop it
+        checkpoint = unit.checkpoint_return_address_stack()
+        self.assertEqual(unit.predict(20, JAL(rd=1, imm=100)), 120)
+        self.assertEqual(unit.predict(120, JALR(rd=0, rs1=1, imm=0)), 24)
+        unit.predict(20, JAL(rd=1, imm=100))
+        unit.restore_return_address_stack(checkpoint)
+        self.assertIsNone(unit.predict(120, JALR(rd=0, rs1=1, imm=0)))
+        # without target computation, jal needs the BTB
+        unit = BranchPredictionUnit(options("not_taken"))
+        self.assertIsNone(unit.predict(20, JAL(rd=0, imm=100)))
+        unit.update(20, JAL(rd=0, imm=100), True, 120)
+        self.assertEqual(unit.predict(20, JAL(rd=0, imm=100)), 120)
+        with self.assertRaises(ValueError):
+            BranchPredictionUnit(options("perfect"))
+
+
+class TestBranchPredictionPipeline(unittest.TestCase):
+    def run_program(
+        self, program: str, branch_prediction: BranchPredictionOptions
+    ) -> RiscvSimulation:
+        simulation = RiscvSimulation(
+            mode="five_stage_pipeline", branch_prediction=branch_prediction
+        )
+        simulation.load_program(program)
+        simulation.run()
+        return simulation
+
+    def test_predictors(self):
+        for program in [LOOP_PROGRAM, CALL_PROGRAM]:
+            reference = self.run_program(program, options("not_taken", 0, 0))
+            reference_metrics = reference.state.performance_metrics
+            for predictor in ["taken", "1bit", "2bit", "gshare", "tournament"]:
+                with self.subTest(predictor=predictor):
+                    simulation = self.run_program(program, options(predictor))
+                    metrics = simulation.state.performance_metrics
+                    self.assertEqual(
+                        simulation.state.register_file.registers,
+                        reference.state.register_file.registers,
+                    )
+                    self.assertEqual(
+                        metrics.instruction_count, reference_metrics.instruction_count
+                    )
+                    self.assertEqual(
+                        metrics.branch_count, reference_metrics.branch_count
+                    )
+                    self.assertEqual(
+                        metrics.procedure_count, reference_metrics.procedure_count
+                    )
+                    self.assertLess(metrics.flushes, reference_metrics.flushes)
+                    self.assertLess(metrics.cycles, reference_metrics.cycles)
+                    self.assertGreater(
+                        metrics.get_branch_prediction_accuracy(),
+                        reference_metrics.get_branch_prediction_accuracy(),
+                    )
+
+    def test_predictors_without_btb(self):
+        reference = self.run_program(LOOP_PROGRAM, options("not_taken", 0, 0))
+        for predictor in ["taken", "1bit", "2bit", "gshare", "tournament"]:
+            with self.subTest(predictor=predictor):
+                simulation = self.run_program(LOOP_PROGRAM, options(predictor, 0, 0))
+                self.assertLess(
+                    simulation.state.performance_metrics.flushes,
+                    reference.state.performance_metrics.flushes // 2,
+                )
+                self.assertLess(
+                    simulation.state.performance_metrics.cycles,
+                    reference.state.performance_metrics.cycles,
+                )
+
+    def test_return_address_stack_after_misprediction(self):
+        # the wrong path of the beq pops the return address of the call, which has to be restored
+        program = """
+        jal ra, function
+        jal x0, end
+        function:
+        beq x0, x0, skip
+        jalr x0, ra, 0
+        skip:
+        jalr x0, ra, 0
+        end:
+        """
+        for predictor in ["not_taken", "2bit"]:
+            with self.subTest(predictor=predictor):
+                simulation = self.run_program(program, options(predictor, 0, 4))
+                statistics = simulation.state.performance_metrics.branch_predictions
+                self.assertEqual(statistics[8].mispredictions, 1)
+                self.assertEqual(statistics[16].predictions, 1)
+                self.assertEqual(statistics[16].mispredictions, 0)
+
+    def test_statistics(self):
+        simulation = self.run_program(LOOP_PROGRAM, options("not_taken", 0, 0))
+        metrics = simulation.state.performance_metrics
+        # only the bne at address 12 is a control transfer instruction
+        self.assertEqual(list(metrics.branch_predictions), [12])
+        self.assertEqual(metrics.branch_predictions[12].predictions, 20)
+        self.assertEqual(metrics.branch_predictions[12].mispredictions, 19)
+        self.assertEqual(metrics.flushes, 19)
+        self.assertEqual(simulation.state.register_file.registers[3], 61)
+
+        simulation = self.run_program(LOOP_PROGRAM, options("2bit"))
+        statistics = simulation.state.performance_metrics.branch_predictions[12]
+        # the first iteration trains the counter, the last one leaves the loop
+        self.assertEqual(statistics.mispredictions, 2)
+        self.assertAlmostEqual(statistics.get_accuracy(), 18 / 20)
+        self.assertIn(
+            "branch prediction accuracy: 90.00%",
+            repr(simulation.state.performance_metrics),
+        )
+
+    def test_return_address_stack(self):
+        simulation = self.run_program(CALL_PROGRAM, options("2bit", 0, 4))
+        metrics = simulation.state.performance_metrics
+        # without a BTB, the returns are predicted with the return address stack
+        return_address = max(metrics.branch_predictions)
+        self.assertEqual(metrics.branch_predictions[return_address].predictions, 5)
+        self.assertEqual(metrics.branch_predictions[return_address].mispredictions, 0)
+        self.assertEqual(simulation.state.register_file.registers[11], 10)
@@ -241,6 +241,29 @@ class TestCache(TestCase):
         self.assertEqual(memory_system.hits, 3)
         self.assertEqual(memory_system.accesses, 6)
 
+    def test_blocks(self) -> None:
+        memory = Memory(AddressingType.BYTE, 32, True)
+        memory_system = WriteBackMemorySystem(
+            memory=memory,
+            num_index_bits=0,
+            num_block_bits=4,
+            associativity=1,
+            performance_metrics=RiscvPerformanceMetrics(),
+        )
+        words = [UInt32(i) for i in range(16)]
+        # passed to the lower memory without touching the cache
+        memory_system.write_block(0, words, directly_write_to_lower_memory=True)
+        self.assertEqual(memory.read_block(0, 16), words)
+        self.assertEqual(memory_system.accesses, 0)
+
+        # goes through the cache, the dirty block is written back on eviction
+        memory_system.write_block(64, words)
+        self.assertEqual(memory_system.accesses, 16)
+        self.assertEqual(memory_system.hits, 15)
+        self.assertEqual(memory.read_word(64 + 4), 0)
+        self.assertEqual(memory_system.read_block(0, 2), words[:2])
+        self.assertEqual(memory.read_block(64, 16), words)
+
     def test_byte_into_block_fix(self) -> None:
         memory = Memory(AddressingType.BYTE, 32, True)
         memory_system = WriteBackMemorySystem(
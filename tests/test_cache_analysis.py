@@ -0,0 +1,76 @@
+import unittest
+
+from architecture_simulator.simulation.cache_analysis import (
+    analyze_cache_configurations,
+)
+from architecture_simulator.simulation.riscv_simulation import RiscvSimulation
+from architecture_simulator.uarch.memory.cache import CacheOptions
+from architecture_simulator.uarch.memory.stack_distance import StackDistanceAnalyzer
+from tests.riscv_programs.fibonacci_recursive import get_fibonacci_recursive
+
+
+class TestCacheAnalysis(unittest.TestCase):
+    def test_stack_distance_analyzer(self):
+        analyzer = StackDistanceAnalyzer(
+            num_block_bits=0, max_num_index_bits=1, max_associativity=2
+        )
+        # blocks 0, 1, 2 (set 0, 1, 0 with one index bit)
+        for address in [0, 4, 8, 0, 4, 8, 8]:
+            analyzer.access(address)
+        # one set: 0 4 8 | 0 4 8 are at distance 2, the last 8 at distance 0
+        self.assertEqual(analyzer.get_hits(0, 1), 1)
+        self.assertEqual(analyzer.get_hits(0, 2), 1)
+        # two sets: set 0 sees 0 8 0 8 8, set 1 sees 4 4
+        self.assertEqual(analyzer.get_hits(1, 1), 2)
+        self.assertEqual(analyzer.get_hits(1, 2), 4)
+        self.assertEqual(
+            analyzer.get_result(1, 2).get_cache_stats(),
+            {"hits": "4", "accesses": "7"},
+        )
+
+    def test_against_simulation(self):
+        program = get_fibonacci_recursive(6)
+        analysis = analyze_cache_configurations(
+            program,
+            num_index_bits=[0, 1, 3],
+            num_block_bits=[0, 2],
+            associativities=[1, 2, 8],
+            miss_penalty=5,
+        )
+        self.assertEqual(len(analysis.data_cache), 18)
+        self.assertEqual(len(analysis.instruction_cache), 18)
+        for results, cache in [
+            (analysis.data_cache, "data_cache"),
+            (analysis.instruction_cache, "instruction_cache"),
+        ]:
+            for result in results:
+                options = CacheOptions(
+                    enable=True,
+                    num_index_bits=result.num_index_bits,
+                    num_block_bits=result.num_block_bits,
+                    associativity=result.associativity,
+                    cache_type="wb",
+                    replacement_strategy="lru",
+                    miss_penalty=5,
+                )
+                simulation = RiscvSimulation(**{cache: options})  # type: ignore[arg-type]
+                simulation.load_program(program)
+                simulation.run()
+                stats = (
+                    simulation.state.memory.get_cache_stats()
+                    if cache == "data_cache"
+                    else simulation.state.instruction_memory.get_cache_stats()
+                )
+                assert stats is not None
+                self.assertEqual(
+                    result.get_cache_stats(),
+                    {"hits": stats["hits"], "accesses": stats["accesses"]},
+                    msg=(cache, result),
+                )
+                self.assertEqual(
+                    analysis.get_cycles(result),
+                    simulation.state.performance_metrics.cycles,
+                )
+        table = analysis.get_table()
+        self.assertIn("Data cache:", table)
+        self.assertEqual(len(table.splitlines()), 2 * (18 + 2))
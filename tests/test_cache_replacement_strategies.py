@@ -1,4 +1,5 @@
 from unittest import TestCase
+import random
 from fixedint import UInt8, UInt16, UInt32
 
 from architecture_simulator.uarch.memory.decoded_address import DecodedAddress
@@ -10,7 +11,7 @@ from architecture_simulator.uarch.memory.write_back_memory_system import (
     WriteBackMemorySystem,
 )
 
-from architecture_simulator.uarch.memory.replacement_strategies import PLRU
+from architecture_simulator.uarch.memory.replacement_strategies import LRU, PLRU
 from architecture_simulator.uarch.riscv.riscv_performance_metrics import (
     RiscvPerformanceMetrics,
 )
@@ -138,3 +139,58 @@ class TestReplacementStrategies(TestCase):
 
         self.assertEqual(memory_system.get_cache_stats()["hits"], "3")
         self.assertEqual(memory_system.get_cache_stats()["accesses"], "7")
+
+    def test_lru_64_way(self) -> None:
+        # reference model: list ordered from least recently used to most recently used
+        lru_order: list[int] = []
+        memory = Memory(AddressingType.BYTE, 32, True)
+        memory_system = WriteBackMemorySystem(
+            num_index_bits=0,
+            num_block_bits=0,
+            associativity=64,
+            memory=memory,
+            replacement_strategy="lru",
+            performance_metrics=RiscvPerformanceMetrics(),
+        )
+        cache_set = memory_system.cache.sets[0]
+        rng = random.Random(0)
+        hits = 0
+        for step in range(2000):
+            address = 4 * rng.randrange(96)
+            hit = address in lru_order
+            if hit:
+                lru_order.remove(address)
+            elif len(lru_order) == 64:
+                lru_order.pop(0)
+            lru_order.append(address)
+            hits += int(hit)
+            if rng.random() < 0.5:
+                memory_system.read_word(address)
+            else:
+                memory_system.write_word(address, UInt32(step))
+            self.assertEqual(memory_system.last_was_hit, hit)
+            # every cached address is indexed by its tag
+            self.assertEqual(
+                sorted(cache_set.block_indices),
+                sorted(address >> 2 for address in lru_order),
+            )
+        self.assertEqual(memory_system.get_cache_stats()["hits"], str(hits))
+
+        # the representation still assigns 0 to the block that gets replaced next
+        repr = memory_system.cache_repr().sets[0].replacement_status
+        self.assertEqual(sorted(repr), list(range(64)))
+        next_to_replace = cache_set.replacement_strategy.get_next_to_replace()
+        self.assertEqual(repr[next_to_replace], 0)
+        self.assertEqual(
+            cache_set.blocks[next_to_replace].decoded_address.tag, lru_order[0] >> 2
+        )
+
+    def test_lru_repr(self) -> None:
+        lru = LRU(4)
+        self.assertEqual(lru.get_repr(), [0, 1, 2, 3])
+        lru.access(1)
+        lru.access(0)
+        self.assertEqual(lru.get_repr(), [3, 2, 0, 1])
+        lru.access(0)
+        self.assertEqual(lru.get_repr(), [3, 2, 0, 1])
+        self.assertEqual(lru.get_next_to_replace(), 2)
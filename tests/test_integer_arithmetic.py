@@ -0,0 +1,290 @@
+import unittest
+import itertools
+from fixedint import Int8, Int16, Int32, UInt8, UInt16, UInt32
+
+from architecture_simulator.isa.riscv.rv32i_instructions import instruction_map
+from architecture_simulator.isa.riscv.instruction_types import (
+    RTypeInstruction,
+    ITypeInstruction,
+    BTypeInstruction,
+)
+from architecture_simulator.uarch.riscv.riscv_architectural_state import (
+    RiscvArchitecturalState,
+)
+from architecture_simulator.util.integer_arithmetic import (
+    to_unsigned32,
+    to_signed32,
+    sign_extend,
+    mulh,
+    mulhsu,
+    mulhu,
+    div,
+    divu,
+    rem,
+    remu,
+)
+
+# register values that hit the corner cases of the operations
+VALUES = [
+    0,
+    1,
+    2,
+    7,
+    31,
+    32,
+    33,
+    0x12345678,
+    0x7FFFFFFF,
+    0x80000000,
+    0x80000001,
+    0xDEADBEEF,
+    0xFFFFFFF9,
+    0xFFFFFFFE,
+    0xFFFFFFFF,
+]
+IMMEDIATES = [-2048, -7, -1, 0, 1, 5, 31, 2047]
+# inputs of alu_compute may also be negative (immediates) or bigger than 32 bits (program counter + offset)
+ALU_VALUES = VALUES + [-2048, -1, -(2**31), 2**32, 2**32 + 5]
+
+# The fixedint implementation of the instructions before they were ported to plain ints.
+# register results are (rs1, rs2 or imm) -> value of rd
+REFERENCE_REGISTER_RESULTS = {
+    "add": lambda a, b: UInt32(a) + UInt32(b),
+    "sub": lambda a, b: UInt32(a) - UInt32(b),
+    "sll": lambda a, b: UInt32(a) << (UInt32(b) % UInt32(32)),
+    "slt": lambda a, b: UInt32(1) if Int32(a) < Int32(b) else UInt32(0),
+    "sltu": lambda a, b: UInt32(1) if UInt32(a) < UInt32(b) else UInt32(0),
+    "xor": lambda a, b: UInt32(a) ^ UInt32(b),
+    "srl": lambda a, b: UInt32(a) >> (UInt32(b) % UInt32(32)),
+    "sra": lambda a, b: UInt32(Int32(a) >> Int32(UInt32(b) % UInt32(32))),
+    "or": lambda a, b: UInt32(a) | UInt32(b),
+    "and": lambda a, b: UInt32(a) & UInt32(b),
+    "mul": lambda a, b: UInt32(a) * UInt32(b),
+    "mulh": lambda a, b: UInt32((int(Int32(a)) * int(Int32(b))) >> 32),
+    "mulhu": lambda a, b: UInt32((a * b) >> 32),
+    "mulhsu": lambda a, b: UInt32((int(Int32(a)) * b) >> 32),
+    "div": lambda a, b: UInt32(-1)
+    if b == 0
+    else UInt32(int(int(Int32(a)) / int(Int32(b)))),
+    "divu": lambda a, b: UInt32(-1) if b == 0 else UInt32(a) // UInt32(b),
+    "rem": lambda a, b: UInt32(a)
+    if b == 0
+    else UInt32(int(Int32(a)) - int(int(Int32(a)) / int(Int32(b))) * int(Int32(b))),
+    "remu": lambda a, b: UInt32(a) if b == 0 else UInt32(a) % UInt32(b),
+    "addi": lambda a, imm: UInt32(a) + UInt32(imm),
+    "slti": lambda a, imm: UInt32(1) if Int32(a) < Int32(imm) else UInt32(0),
+    "sltiu": lambda a, imm: UInt32(1) if UInt32(a) < UInt32(imm) else UInt32(0),
+    "xori": lambda a, imm: UInt32(a) ^ UInt32(imm),
+    "ori": lambda a, imm: UInt32(a) | UInt32(imm),
+    "andi": lambda a, imm: UInt32(a) & UInt32(imm),
+    "slli": lambda a, imm: UInt32(a) << UInt32(imm),
+    "srli": lambda a, imm: UInt32(a) >> UInt32(imm),
+    "srai": lambda a, imm: UInt32(Int32(a) >> UInt16(imm)),
+}
+# alu results are (alu_in_1, alu_in_2) -> (branch result, result)
+REFERENCE_ALU_RESULTS = {
+    "add": lambda a, b: (None, int(UInt32(a) + UInt32(b))),
+    "sub": lambda a, b: (None, int(UInt32(a) - UInt32(b))),
+    "sll": lambda a, b: (None, int(UInt32(a) << (UInt32(b) % UInt32(32)))),
+    "slt": lambda a, b: (None, 1 if Int32(a) < Int32(b) else 0),
+    "sltu": lambda a, b: (None, 1 if UInt32(a) < UInt32(b) else 0),
+    "xor": lambda a, b: (None, int(UInt32(a) ^ UInt32(b))),
+    "srl": lambda a, b: (None, int(UInt32(a) >> (UInt32(b) % UInt32(32)))),
+    "sra": lambda a, b: (
+        None,
+        int(Int32(a) >> Int32(int(UInt32(b) % UInt32(32)))),
+    ),
+    "or": lambda a, b: (None, int(UInt32(a) | UInt32(b))),
+    "and": lambda a, b: (None, int(UInt32(a) & UInt32(b))),
+    "mul": lambda a, b: (None, int(UInt32(a) * UInt32(b))),
+    "mulh": lambda a, b: (None, int(Int32(a)) * int(Int32(b)) >> 32),
+    "mulhu": lambda a, b: (None, a * b >> 32),
+    "mulhsu": lambda a, b: (None, int(Int32(a)) * b >> 32),
+    "div": lambda a, b: (
+        None,
+        -1 if int(Int32(b)) == 0 else int(int(Int32(a)) / int(Int32(b))),
+    ),
+    "divu": lambda a, b: (
+        None,
+        -1 if UInt32(b) == 0 else int(UInt32(a) // UInt32(b)),
+    ),
+    "rem": lambda a, b: (
+        None,
+        int(Int32(a))
+        if int(Int32(b)) == 0
+        else int(Int32(a)) - int(int(Int32(a)) / int(Int32(b))) * int(Int32(b)),
+    ),
+    "remu": lambda a, b: (
+        None,
+        UInt32(a) if UInt32(b) == 0 else int(UInt32(a) % UInt32(b)),
+    ),
+    "addi": lambda a, b: (None, int(UInt32(a) + UInt32(b))),
+    "slti": lambda a, b: (None, 1 if Int32(a) < Int32(b) else 0),
+    "sltiu": lambda a, b: (None, 1 if UInt32(a) < UInt32(b) else 0),
+    "xori": lambda a, b: (None, int(UInt32(a) ^ UInt32(b))),
+    "ori": lambda a, b: (None, int(UInt32(a) | UInt32(b))),
+    "andi": lambda a, b: (None, int(UInt32(a) & UInt32(b))),
+    "lb": lambda a, b: (None, int(UInt32(a)) + b),
+    "lh": lambda a, b: (None, int(UInt32(a)) + b),
+    "lw": lambda a, b: (None, int(UInt32(a)) + b),
+    "lbu": lambda a, b: (None, int(UInt32(a)) + b),
+    "lhu": lambda a, b: (None, int(UInt32(a)) + b),
+    "blt": lambda a, b: (Int32(a) < Int32(b), None),
+    "bge": lambda a, b: (Int32(a) >= Int32(b), None),
+}
+# shift immediates only take values between 0 and 31
+REFERENCE_SHIFT_ALU_RESULTS = {
+    "slli": lambda a, b: (None, int(UInt32(a) << UInt32(b))),
+    "srli": lambda a, b: (None, int(UInt32(a) >> UInt32(b))),
+    "srai": lambda a, b: (None, int(Int32(a) >> b)),
+}
+# branch conditions are (rs1, rs2) -> taken
+REFERENCE_BRANCHES = {
+    "beq": lambda a, b: UInt32(a) == UInt32(b),
+    "bne": lambda a, b: UInt32(a) != UInt32(b),
+    "blt": lambda a, b: Int32(a) < Int32(b),
+    "bge": lambda a, b: Int32(a) >= Int32(b),
+    "bltu": lambda a, b: UInt32(a) < UInt32(b),
+    "bgeu": lambda a, b: UInt32(a) >= UInt32(b),
+}
+
+
+class TestIntegerArithmetic(unittest.TestCase):
+    def test_conversions(self):
+        for value in ALU_VALUES + [2**40 + 3, -(2**40) - 3]:
+            self.assertEqual(to_unsigned32(value), int(UInt32(value)))
+            self.assertEqual(to_signed32(value), int(Int32(value)))
+            self.assertEqual(sign_extend(value, 8), int(Int8(value)))
+            self.assertEqual(sign_extend(value, 16), int(Int16(value)))
+
+    def test_m_extension_helpers(self):
+        for a, b in itertools.product(VALUES, repeat=2):
+            self.assertEqual(mulh(a, b), (int(Int32(a)) * int(Int32(b))) >> 32)
+            self.assertEqual(mulhsu(a, b), (int(Int32(a)) * b) >> 32)
+            self.assertEqual(mulhu(a, b), (a * b) >> 32)
+        # specification table of the division corner cases
+        self.assertEqual(div(7, 0), -1)
+        self.assertEqual(divu(7, 0), -1)
+        self.assertEqual(rem(7, 0), 7)
+        self.assertEqual(rem(-7, 0), -7)
+        self.assertEqual(remu(7, 0), 7)
+        self.assertEqual(to_unsigned32(div(-(2**31), -1)), 2**31)
+        self.assertEqual(rem(-(2**31), -1), 0)
+        self.assertEqual(div(-7, 2), -3)
+        self.assertEqual(rem(-7, 2), -1)
+        self.assertEqual(div(7, -2), -3)
+        self.assertEqual(rem(7, -2), 1)
+
+    def test_register_results(self):
+        for mnemonic, reference in REFERENCE_REGISTER_RESULTS.items():
+            instruction_class = instruction_map[mnemonic]
+            with self.subTest(mnemonic=mnemonic):
+                if issubclass(instruction_class, RTypeInstruction):
+                    cases = [
+                        (instruction_class(rd=3, rs1=1, rs2=2), a, b)
+                        for a, b in itertools.product(VALUES, repeat=2)
+                    ]
+                else:
+                    cases = [
+                        (instruction_class(rd=3, rs1=1, imm=imm), a, None)
+                        for a, imm in itertools.product(VALUES, IMMEDIATES)
+                    ]
+                for instruction, a, b in cases:
+                    state = RiscvArchitecturalState()
+                    state.register_file.registers[1] = a
+                    state.register_file.registers[2] = b if b is not None else 0
+                    instruction.behavior(state)
+                    result = state.register_file.registers[3]
+                    expected = reference(
+                        a, b if b is not None else instruction.imm  # type: ignore
+                    )
+                    self.assertIs(type(result), int)
+                    self.assertEqual(result, int(expected), msg=(instruction, a, b))
+
+    def test_alu_results(self):
+        for mnemonic, reference in REFERENCE_ALU_RESULTS.items():
+            instruction = instruction_map[mnemonic](1, 2, 3)
+            with self.subTest(mnemonic=mnemonic):
+                for a, b in itertools.product(ALU_VALUES, repeat=2):
+                    self.assertEqual(
+                        instruction.alu_compute(a, b), reference(a, b), msg=(a, b)
+                    )
+        for mnemonic, reference in REFERENCE_SHIFT_ALU_RESULTS.items():
+            instruction = instruction_map[mnemonic](1, 2, 3)
+            with self.subTest(mnemonic=mnemonic):
+                for a, b in itertools.product(ALU_VALUES, range(32)):
+                    self.assertEqual(
+                        instruction.alu_compute(a, b), reference(a, b), msg=(a, b)
+                    )
+
+    def test_branches(self):
+        for mnemonic, reference in REFERENCE_BRANCHES.items():
+            instruction = instruction_map[mnemonic](rs1=1, rs2=2, imm=16)
+            assert isinstance(instruction, BTypeInstruction)
+            with self.subTest(mnemonic=mnemonic):
+                for a, b in itertools.product(VALUES, repeat=2):
+                    state = RiscvArchitecturalState()
+                    state.register_file.registers[1] = a
+                    state.register_file.registers[2] = b
+                    instruction.behavior(state)
+                    self.assertEqual(
+                        state.program_counter == 12, reference(a, b), msg=(a, b)
+                    )
+
+    def test_loads_and_stores(self):
+        for value in VALUES:
+            state = RiscvArchitecturalState()
+            address = 0x20000
+            state.register_file.registers[1] = address
+            state.register_file.registers[2] = value
+            for store, load in [("sb", "lb"), ("sh", "lh"), ("sw", "lw")]:
+                for load_mnemonic in [load, load + "u"] if load != "lw" else [load]:
+                    with self.subTest(value=value, load=load_mnemonic):
+                        instruction_map[store](rs1=1, rs2=2, imm=4).behavior(state)
+                        load_instruction = instruction_map[load_mnemonic](
+                            rd=3, rs1=1, imm=4
+                        )
+                        assert isinstance(load_instruction, ITypeInstruction)
+                        load_instruction.behavior(state)
+                        if load_mnemonic == "lb":
+                            expected = UInt32(Int8(UInt8(value)))
+                        elif load_mnemonic == "lbu":
+                            expected = UInt32(UInt8(value))
+                        elif load_mnemonic == "lh":
+                            expected = UInt32(Int16(UInt16(value)))
+                        elif load_mnemonic == "lhu":
+                            expected = UInt32(UInt16(value))
+                        else:
+                            expected = UInt32(value)
+                        result = state.register_file.registers[3]
+                        self.assertIs(type(result), int)
+                        self.assertEqual(result, int(expected))
+                        self.assertEqual(
+                            load_instruction.memory_access(
+                                address + 4, None, state, False
+                            )
+                            & 0xFFFFFFFF,
+                            int(expected),
+                        )
+
+    def test_jumps(self):
+        for value in VALUES:
+            for imm in IMMEDIATES:
+                state = RiscvArchitecturalState()
+                state.program_counter = 8
+                state.register_file.registers[1] = value
+                instruction_map["jalr"](rd=1, rs1=1, imm=imm).behavior(state)
+                self.assertEqual(state.register_file.registers[1], 12)
+                self.assertEqual(
+                    state.program_counter,
+                    (int(Int32(value) + Int16(imm)) & (2**32 - 2)) - 4,
+                )
+        state = RiscvArchitecturalState()
+        state.program_counter = 8
+        instruction_map["jal"](rd=1, imm=-8).behavior(state)
+        self.assertEqual(state.register_file.registers[1], 12)
+        instruction_map["lui"](rd=2, imm=0xFFFFF).behavior(state)
+        self.assertEqual(state.register_file.registers[2], 0xFFFFF000)
+        state.program_counter = 4
+        instruction_map["auipc"](rd=3, imm=0xFFFFF).behavior(state)
+        self.assertEqual(state.register_file.registers[3], int(UInt32(4 + 0xFFFFF000)))
@@ -1,9 +1,11 @@
 from unittest import TestCase
+from copy import deepcopy
 from architecture_simulator.uarch.memory.memory import (
     Memory,
     AddressingType,
     UnsupportedFunctionError,
     MemoryAddressError,
+    PAGE_SIZE,
 )
 from fixedint import UInt8, UInt16, UInt32, UInt64
 
@@ -166,3 +168,114 @@ class TestMemory(TestCase):
         mem.write_doubleword(2**9 + 7, UInt64(122342354563))
 
         self.assertEqual(mem.read_doubleword(7), 122342354563)
+
+    def test_pages(self):
+        mem = Memory(AddressingType.BYTE, 32, True)
+        # reads do not allocate pages
+        self.assertEqual(mem.read_word(0x10000), 0)
+        self.assertEqual(mem.pages, {})
+
+        # accesses that cross a page boundary
+        mem.write_word(PAGE_SIZE - 2, UInt32(0x11223344))
+        self.assertEqual(len(mem.pages), 2)
+        self.assertEqual(mem.read_halfword(PAGE_SIZE - 2), 0x3344)
+        self.assertEqual(mem.read_halfword(PAGE_SIZE), 0x1122)
+        self.assertEqual(mem.read_word(PAGE_SIZE - 2), 0x11223344)
+
+        # accesses that wrap around the end of the address space
+        mem.write_word(2**32 - 1, UInt32(0xAABBCCDD))
+        self.assertEqual(mem.read_byte(2**32 - 1), 0xDD)
+        self.assertEqual(mem.read_word(0), 0x00AABBCC)
+        self.assertEqual(mem.read_word(2**32 - 1), 0xAABBCCDD)
+
+        # writes of zero are still part of the representation, in ascending order
+        mem.write_word(8, UInt32(0))
+        self.assertEqual(
+            list(mem.wordwise_repr().keys()),
+            [0, 8, PAGE_SIZE - 4, PAGE_SIZE, 2**32 - 4],
+        )
+        self.assertEqual(mem.wordwise_repr()[8][1], "0")
+
+        # memory_file is a view of the written addresses
+        memory_file = mem.memory_file
+        self.assertEqual(memory_file[PAGE_SIZE + 1], UInt8(0x11))
+        self.assertEqual(len(memory_file), 4 + 4 + 4)
+        mem.memory_file = {5: UInt8(0xFF)}
+        self.assertEqual(mem.read_word(4), 0xFF00)
+        self.assertEqual(list(mem.memory_file.items()), [(5, UInt8(0xFF))])
+        mem.reset()
+        self.assertEqual(mem.memory_file, {})
+
+        # accesses that reach out of the address range fail on the first invalid address
+        mem = Memory(AddressingType.BYTE, 32, False, range(PAGE_SIZE, 2 * PAGE_SIZE))
+        mem.write_word(2 * PAGE_SIZE - 4, UInt32(0x01020304))
+        with self.assertRaises(MemoryAddressError) as context:
+            mem.write_word(2 * PAGE_SIZE - 2, UInt32(0xFFFFFFFF))
+        self.assertEqual(context.exception.address, 2 * PAGE_SIZE)
+        self.assertEqual(mem.read_word(2 * PAGE_SIZE - 4), 0xFFFF0304)
+        with self.assertRaises(MemoryAddressError):
+            mem.read_word(PAGE_SIZE - 1)
+
+        # values wider than a byte
+        mem = Memory(AddressingType.HALF_WORD, 16, True)
+        mem.write_doubleword(PAGE_SIZE // 2 - 1, UInt64(0x1111222233334444))
+        self.assertEqual(mem.read_halfword(PAGE_SIZE // 2 - 1), 0x4444)
+        self.assertEqual(mem.read_halfword(PAGE_SIZE // 2 + 2), 0x1111)
+        self.assertEqual(mem.memory_file[PAGE_SIZE // 2], UInt16(0x3333))
+
+    def test_blocks(self):
+        mem = Memory(AddressingType.BYTE, 32, True)
+        words = [UInt32(0x01010101 * i) for i in range(16)]
+        self.assertEqual(mem.read_block(64, 16), [UInt32(0)] * 16)
+        mem.write_block(64, words)
+        self.assertEqual(mem.read_block(64, 16), words)
+        self.assertEqual(mem.read_word(68), 0x01010101)
+        self.assertEqual(len(mem.wordwise_repr()), 16)
+
+        # blocks that cross a page boundary or wrap around behave like single word accesses
+        for address in [PAGE_SIZE - 8, 2**32 - 8]:
+            mem.write_block(address, words)
+            self.assertEqual(
+                mem.read_block(address, 16),
+                [mem.read_word(address + 4 * i) for i in range(16)],
+            )
+            self.assertEqual(mem.read_block(address, 16), words)
+
+        mem = Memory(AddressingType.BYTE, 32, False, range(PAGE_SIZE, 2 * PAGE_SIZE))
+        with self.assertRaises(MemoryAddressError):
+            mem.write_block(2 * PAGE_SIZE - 8, words)
+        with self.assertRaises(MemoryAddressError):
+            mem.read_block(PAGE_SIZE - 4, 2)
+
+        mem = Memory(AddressingType.HALF_WORD, 16, True)
+        mem.write_block(2, [UInt32(0x11112222), UInt32(0x33334444)])
+        self.assertEqual(mem.read_halfword(2), 0x2222)
+        self.assertEqual(mem.read_halfword(5), 0x3333)
+        self.assertEqual(mem.read_block(2, 2), [0x11112222, 0x33334444])
+        self.assertEqual(mem.read_block(3, 1), [0x44441111])
+
+        mem = Memory(AddressingType.DOUBLE_WORD, 8)
+        with self.assertRaises(UnsupportedFunctionError):
+            mem.read_block(0, 1)
+
+    def test_copy_on_write(self):
+        memory = Memory(AddressingType.BYTE, 32)
+        memory.write_word(0, UInt32(1))
+        memory.write_word(PAGE_SIZE, UInt32(2))
+        copy = deepcopy(memory)
+        self.assertIs(copy.pages[0], memory.pages[0])
+        # only the written page gets copied
+        copy.write_word(0, UInt32(3))
+        self.assertIsNot(copy.pages[0], memory.pages[0])
+        self.assertIs(copy.pages[1], memory.pages[1])
+        memory.write_word(PAGE_SIZE, UInt32(4))
+        memory.write_word(2 * PAGE_SIZE, UInt32(5))
+        self.assertEqual(
+            memory.memory_file,
+            deepcopy(memory).memory_file,
+        )
+        self.assertEqual(copy.read_word(0), UInt32(3))
+        self.assertEqual(copy.read_word(PAGE_SIZE), UInt32(2))
+        self.assertEqual(copy.read_word(2 * PAGE_SIZE), UInt32(0))
+        self.assertEqual(memory.read_word(0), UInt32(1))
+        self.assertEqual(memory.read_word(PAGE_SIZE), UInt32(4))
@@ -0,0 +1,114 @@
+import unittest
+
+from fixedint import UInt32
+
+from architecture_simulator.simulation.riscv_simulation import RiscvSimulation
+from architecture_simulator.uarch.memory.cache import CacheOptions
+from architecture_simulator.uarch.memory.decoded_address import DecodedAddress
+from architecture_simulator.uarch.memory.memory import AddressingType, Memory
+from architecture_simulator.uarch.memory.miss_classifier import (
+    MissClassification,
+    MissClassifier,
+)
+from architecture_simulator.uarch.memory.write_through_memory_system import (
+    WriteThroughMemorySystem,
+)
+from architecture_simulator.uarch.riscv.riscv_performance_metrics import (
+    RiscvPerformanceMetrics,
+)
+
+
+class TestMissClassifier(unittest.TestCase):
+    def test_classification(self):
+        # two sets with one block each, the shadow cache holds two blocks
+        classifier = MissClassifier(num_index_bits=1, num_block_bits=0, associativity=1)
+        for address, hit in [(0, False), (8, False), (0, False), (8, False)]:
+            classifier.access(DecodedAddress(1, 0, address), hit)
+        self.assertEqual(classifier.misses, MissClassification(2, 0, 2))
+        # 4 and 12 evict 0 and 8 from the shadow cache
+        for address, hit in [(4, False), (12, False), (0, False), (12, True)]:
+            classifier.access(DecodedAddress(1, 0, address), hit)
+        self.assertEqual(classifier.misses, MissClassification(4, 1, 2))
+        self.assertEqual(
+            classifier.set_misses,
+            [MissClassification(2, 1, 2), MissClassification(2, 0, 0)],
+        )
+
+    def test_write_no_allocate(self):
+        memory_system = WriteThroughMemorySystem(
+            memory=Memory(AddressingType.BYTE, 32, True),
+            num_index_bits=0,
+            num_block_bits=0,
+            associativity=1,
+            performance_metrics=RiscvPerformanceMetrics(),
+        )
+        memory_system.write_word(0, UInt32(1))
+        memory_system.write_word(0, UInt32(1))
+        # the block is brought into the cache for the first time
+        memory_system.read_word(0)
+        memory_system.write_word(0, UInt32(1))
+        stats = memory_system.get_cache_stats()
+        self.assertEqual(
+            (
+                stats["compulsory_misses"],
+                stats["capacity_misses"],
+                stats["conflict_misses"],
+            ),
+            ("3", "0", "0"),
+        )
+
+    def test_simulation(self):
+        program = """
+        .data
+        a: .zero 16
+        .text
+        la x1, a
+        lw x2, 0(x1)
+        lw x2, 8(x1)
+        lw x2, 0(x1)
+        lw x2, 4(x1)
+        lw x2, 12(x1)
+        lw x2, 8(x1)
+        """
+        data_cache = CacheOptions(
+            enable=True,
+            num_index_bits=1,
+            num_block_bits=0,
+            associativity=1,
+            cache_type="wb",
+            replacement_strategy="lru",
+            miss_penalty=0,
+        )
+        simulation = RiscvSimulation(data_cache=data_cache)
+        simulation.load_program(program)
+        simulation.run()
+        stats = simulation.get_data_cache_stats(per_set=True)
+        self.assertEqual(
+            (
+                stats["compulsory_misses"],
+                stats["capacity_misses"],
+                stats["conflict_misses"],
+            ),
+            ("4", "1", "1"),
+        )
+        self.assertEqual(
+            stats["set_misses"],
+            [
+                {
+                    "compulsory_misses": "2",
+                    "capacity_misses": "1",
+                    "conflict_misses": "1",
+                },
+                {
+                    "compulsory_misses": "2",
+                    "capacity_misses": "0",
+                    "conflict_misses": "0",
+                },
+            ],
+        )
+        self.assertEqual(
+            simulation.get_cache_stats_repr(per_set=True),
+            "L1 data cache: hits: 0, misses: 6, AMAT: 0.00 cycles, compulsory: 4, capacity: 1, conflict: 1\n"
+            + "    set 0: compulsory: 2, capacity: 1, conflict: 1\n"
+            + "    set 1: compulsory: 2, capacity: 0, conflict: 0\n",
+        )
@@ -0,0 +1,173 @@
+import unittest
+
+from fixedint import UInt32
+
+from architecture_simulator.simulation.riscv_simulation import RiscvSimulation
+from architecture_simulator.uarch.memory.cache import CacheOptions
+from architecture_simulator.uarch.memory.memory import AddressingType, Memory
+from architecture_simulator.uarch.memory.prefetchers import (
+    NextLinePrefetcher,
+    PrefetcherOptions,
+    PrefetchStatistics,
+    StreamPrefetcher,
+    StridePrefetcher,
+    create_prefetcher,
+)
+from architecture_simulator.uarch.memory.write_back_memory_system import (
+    WriteBackMemorySystem,
+)
+from architecture_simulator.uarch.riscv.riscv_performance_metrics import (
+    RiscvPerformanceMetrics,
+)
+
+
+class TestPrefetchers(unittest.TestCase):
+    def test_next_line(self):
+        prefetcher = NextLinePrefetcher(degree=2, distance=1)
+        self.assertEqual(
+            prefetcher.get_prefetch_addresses(20, 8, False, False), [24, 32]
+        )
+        self.assertEqual(prefetcher.get_prefetch_addresses(20, 8, True, False), [])
+        self.assertEqual(prefetcher.get_prefetch_addresses(20, 8, True, True), [24, 32])
+
+    def test_stride(self):
+        pc = 0
+        prefetcher = StridePrefetcher(
+            degree=2, distance=1, num_entries=4, get_program_counter=lambda: pc
+        )
+        self.assertEqual(prefetcher.get_prefetch_addresses(100, 4, False, False), [])
+        self.assertEqual(prefetcher.get_prefetch_addresses(112, 4, False, False), [])
+        # another instruction does not disturb the entry
+        pc = 4
+        self.assertEqual(prefetcher.get_prefetch_addresses(0, 4, False, False), [])
+        pc = 0
+        self.assertEqual(
+            prefetcher.get_prefetch_addresses(124, 4, True, False), [136, 148]
+        )
+        self.assertEqual(prefetcher.get_prefetch_addresses(128, 4, True, False), [])
+        # same index, other instruction
+        pc = 16
+        self.assertEqual(prefetcher.get_prefetch_addresses(140, 4, True, False), [])
+        pc = 0
+        self.assertEqual(prefetcher.get_prefetch_addresses(132, 4, True, False), [])
+
+    def test_stream(self):
+        prefetcher = StreamPrefetcher(degree=1, distance=2, num_streams=2)
+        self.assertEqual(prefetcher.get_prefetch_addresses(64, 8, False, False), [])
+        self.assertEqual(prefetcher.get_prefetch_addresses(800, 8, False, False), [])
+        # descending stream
+        self.assertEqual(prefetcher.get_prefetch_addresses(56, 8, False, False), [40])
+        self.assertEqual(prefetcher.get_prefetch_addresses(40, 8, True, True), [24])
+        self.assertEqual(prefetcher.get_prefetch_addresses(40, 8, True, False), [])
+        # ascending stream
+        self.assertEqual(prefetcher.get_prefetch_addresses(808, 8, False, False), [824])
+        # replaces the least recently used stream (the descending one)
+        self.assertEqual(prefetcher.get_prefetch_addresses(0, 8, False, False), [])
+        self.assertEqual(prefetcher.get_prefetch_addresses(816, 8, False, False), [832])
+        self.assertEqual(prefetcher.get_prefetch_addresses(32, 8, False, False), [])
+
+    def test_create_prefetcher(self):
+        self.assertIsNone(create_prefetcher(PrefetcherOptions("none", 1, 1, 4), int))
+        self.assertIsInstance(
+            create_prefetcher(PrefetcherOptions("stride", 1, 1, 4), int),
+            StridePrefetcher,
+        )
+        with self.assertRaises(ValueError):
+            create_prefetcher(PrefetcherOptions("something", 1, 1, 4), int)
+
+    def test_statistics(self):
+        memory = Memory(AddressingType.BYTE, 32, True)
+        memory_system = WriteBackMemorySystem(
+            memory=memory,
+            num_index_bits=0,
+            num_block_bits=0,
+            associativity=1,
+            performance_metrics=RiscvPerformanceMetrics(),
+            miss_penality=10,
+            prefetcher=NextLinePrefetcher(degree=1, distance=1),
+        )
+        # the prefetch of 4 replaces the dirty block of 0
+        memory_system.write_word(0, UInt32(7))
+        self.assertEqual(memory.read_word(0), UInt32(7))
+        # 0 had been replaced by a prefetch, the prefetched block of 4 was not used
+        self.assertEqual(memory_system.read_word(0), UInt32(7))
+        self.assertEqual(memory_system.read_word(4), UInt32(0))
+        self.assertEqual(
+            memory_system.get_prefetch_statistics(),
+            PrefetchStatistics(prefetches=3, useful=1, useless=1, pollution=1),
+        )
+        stats = memory_system.get_cache_stats()
+        self.assertEqual((stats["hits"], stats["accesses"]), ("1", "3"))
+        self.assertEqual(memory_system.performance_metrics.cycles, 20)
+
+    def test_reset(self):
+        pc = 0
+        stride_prefetcher = StridePrefetcher(
+            degree=1, distance=1, num_entries=4, get_program_counter=lambda: pc
+        )
+        stride_prefetcher.get_prefetch_addresses(100, 4, False, False)
+        stride_prefetcher.reset()
+        self.assertEqual(stride_prefetcher.table, [None] * 4)
+        stream_prefetcher = StreamPrefetcher(degree=1, distance=1, num_streams=2)
+        stream_prefetcher.get_prefetch_addresses(64, 8, False, False)
+        stream_prefetcher.reset()
+        self.assertEqual(stream_prefetcher.streams, [])
+
+        memory_system = WriteBackMemorySystem(
+            memory=Memory(AddressingType.BYTE, 32, True),
+            num_index_bits=0,
+            num_block_bits=0,
+            associativity=1,
+            performance_metrics=RiscvPerformanceMetrics(),
+            miss_penality=10,
+            prefetcher=stream_prefetcher,
+        )
+        for address in [0, 4, 8, 8]:
+            memory_system.read_word(address)
+        memory_system.reset()
+        stats = memory_system.get_cache_stats()
+        self.assertEqual((stats["hits"], stats["accesses"]), ("0", "0"))
+        self.assertEqual(stats["amat"], "0.00")
+        self.assertFalse(stats["last_hit"])
+        self.assertEqual(stats["prefetches"], "0")
+        self.assertEqual(stream_prefetcher.streams, [])
+
+    def test_array_walk(self):
+        program = """
+        .data
+        array: .zero 256
+        .text
+        la x1, array
+        addi x2, x0, 64
+        loop:
+        lw x3, 0(x1)
+        add x4, x4, x3
+        addi x1, x1, 4
+        addi x2, x2, -1
+        bne x2, x0, loop
+        """
+        data_cache = CacheOptions(
+            enable=True,
+            num_index_bits=2,
+            num_block_bits=1,
+            associativity=2,
+            cache_type="wb",
+            replacement_strategy="lru",
+            miss_penalty=10,
+        )
+        for mode in ["single_stage_pipeline", "five_stage_pipeline"]:
+            for options, hits in [
+                (PrefetcherOptions("none", 1, 1, 16), 32),
+                (PrefetcherOptions("next_line", 1, 1, 16), 63),
+                (PrefetcherOptions("stride", 1, 2, 16), 62),
+                (PrefetcherOptions("stream", 2, 1, 16), 62),
+            ]:
+                with self.subTest(mode=mode, prefetcher=options.prefetcher):
+                    simulation = RiscvSimulation(
+                        mode=mode, data_cache=data_cache, data_prefetcher=options
+                    )
+                    simulation.load_program(program)
+                    simulation.run()
+                    stats = simulation.get_data_cache_stats()
+                    self.assertEqual(stats["hits"], str(hits))
+                    self.assertEqual(stats["accesses"], "64")
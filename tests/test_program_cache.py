@@ -0,0 +1,85 @@
+import tempfile
+import unittest
+
+from architecture_simulator.isa.parser_exceptions import ParserSyntaxException
+from architecture_simulator.isa.riscv.program_cache import ProgramCache
+from architecture_simulator.isa.riscv.riscv_parser import RiscvParser
+from architecture_simulator.uarch.memory.cache import CacheOptions
+from architecture_simulator.uarch.riscv.riscv_architectural_state import (
+    RiscvArchitecturalState,
+)
+
+program = """
+.data
+b: .byte 1, 2, 3
+h: .half -2
+w: .word 0x12345678
+s: .string "hi"
+z: .zero 2
+.text
+la x1, w
+lw x2, 0(x1)
+ecall
+"""
+
+
+class TestProgramCache(unittest.TestCase):
+    def assert_same_program(
+        self, state: RiscvArchitecturalState, expected: RiscvArchitecturalState
+    ):
+        self.assertEqual(
+            state.instruction_memory.get_representation(),
+            expected.instruction_memory.get_representation(),
+        )
+        self.assertEqual(
+            state.memory.wordwise_repr(),
+            expected.memory.wordwise_repr(),
+        )
+
+    def test_load_program(self):
+        expected = RiscvArchitecturalState()
+        RiscvParser().parse(program=program, state=expected)
+        cache = ProgramCache()
+        for _ in range(2):
+            state = RiscvArchitecturalState()
+            cache.load_program(program, state)
+            self.assert_same_program(state, expected)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+        # the data bypasses the caches
+        state = RiscvArchitecturalState(
+            data_cache_options=CacheOptions(True, 1, 1, 1, "wb", "lru", 10)
+        )
+        cache.load_program(program, state)
+        self.assertEqual(state.memory.get_cache_stats()["accesses"], "0")
+        self.assertEqual(
+            state.memory.memory.wordwise_repr(), expected.memory.wordwise_repr()
+        )
+        self.assertEqual((cache.hits, cache.misses), (2, 1))
+
+        with self.assertRaises(ParserSyntaxException):
+            cache.load_program("addi x1", RiscvArchitecturalState())
+        self.assertEqual(len(cache.entries), 1)
+
+    def test_lru(self):
+        cache = ProgramCache(max_entries=2)
+        programs = ["addi x1, x0, 1", "addi x1, x0, 2", "addi x1, x0, 3"]
+        for source in programs[:2] + programs[:1] + programs[2:]:
+            cache.load_program(source, RiscvArchitecturalState())
+        # the second program was the least recently used one
+        cache.load_program(programs[0], RiscvArchitecturalState())
+        cache.load_program(programs[1], RiscvArchitecturalState())
+        self.assertEqual((cache.hits, cache.misses), (2, 4))
+
+    def test_directory(self):
+        with tempfile.TemporaryDirectory() as directory:
+            ProgramCache(directory=directory).load_program(
+                program, RiscvArchitecturalState()
+            )
+            cache = ProgramCache(directory=directory)
+            state = RiscvArchitecturalState()
+            cache.load_program(program, state)
+            self.assertEqual((cache.hits, cache.misses), (1, 0))
+            expected = RiscvArchitecturalState()
+            RiscvParser().parse(program=program, state=expected)
+            self.assert_same_program(state, expected)
@@ -1,7 +1,12 @@
 import unittest
 import fixedint
 
-from architecture_simulator.uarch.riscv.register_file import RegisterFile
+from architecture_simulator.uarch.riscv.register_file import (
+    RegisterFile,
+    ArrayRegisterFile,
+)
+from architecture_simulator.simulation.riscv_simulation import RiscvSimulation
+from tests.riscv_programs.fibonacci_recursive import get_fibonacci_recursive
 from architecture_simulator.uarch.memory.memory import (
     Memory,
     MemoryAddressError,
@@ -77,6 +82,61 @@ class TestRiscvArchitecture(unittest.TestCase):
         self.assertEqual(state.register_file.reg_repr()[3][1], "3")
         self.assertEqual(state.register_file.reg_repr()[3][2], "00 00 00 03")
 
+    def test_array_register_file(self):
+        register_file = ArrayRegisterFile()
+        self.assertEqual(len(register_file.registers), 32)
+        register_file.write(0, 187)
+        self.assertEqual(register_file.read(0), 0)
+        register_file.write(31, 0xFFFFFFFF)
+        self.assertEqual(register_file.read(31), 0xFFFFFFFF)
+        self.assertIs(type(register_file.read(31)), int)
+        with self.assertRaises(IndexError):
+            register_file.write(32, 1)
+        with self.assertRaises(IndexError):
+            register_file.read(32)
+        self.assertEqual(
+            register_file.reg_repr()[31],
+            ("11111111 11111111 11111111 11111111", "4294967295", "FF FF FF FF", "-1"),
+        )
+        self.assertEqual(register_file.get_abi_names(2), "sp")
+
+        # initial values are reduced to 32 bits and x0 is hardwired
+        register_file = ArrayRegisterFile(registers=[5, -1] + [0] * 30)
+        self.assertEqual(register_file.read(0), 0)
+        self.assertEqual(register_file.read(1), 0xFFFFFFFF)
+        with self.assertRaises(ValueError):
+            ArrayRegisterFile(registers=[0] * 31)
+
+        # instructions use the typed accessors
+        state = RiscvArchitecturalState(register_file=ArrayRegisterFile())
+        state.register_file.write(1, 0x_80_00_00_00)
+        state.register_file.write(2, 0x_FF_FF_FF_FF)
+        ADD(rd=3, rs1=1, rs2=2).behavior(state)
+        ADD(rd=0, rs1=1, rs2=2).behavior(state)
+        self.assertEqual(state.register_file.read(3), 0x_7F_FF_FF_FF)
+        self.assertEqual(state.register_file.read(0), 0)
+
+        # programs produce the same results as with the default register file
+        program = get_fibonacci_recursive(7)
+        for mode in ["single_stage_pipeline", "five_stage_pipeline", "functional"]:
+            reference = RiscvSimulation(mode=mode)
+            reference.load_program(program)
+            reference.run()
+            simulation = RiscvSimulation(
+                state=RiscvArchitecturalState(
+                    pipeline_mode=mode, register_file=ArrayRegisterFile()
+                )
+            )
+            simulation.load_program(program)
+            simulation.run()
+            self.assertEqual(
+                list(simulation.state.register_file.registers),
+                list(reference.state.register_file.registers),
+            )
+            self.assertEqual(
+                simulation.get_register_entries(), reference.get_register_entries()
+            )
+
     def test_mem(self):
         # test the wordwise repr method
         state = RiscvArchitecturalState(memory=Memory(AddressingType.BYTE, 32))
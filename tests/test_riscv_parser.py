@@ -1,4 +1,5 @@
 import unittest
+from pathlib import Path
 import fixedint
 from architecture_simulator.isa.riscv.rv32i_instructions import (
     ADD,
@@ -1583,3 +1584,55 @@ fibonacci:
         self.assertEqual(simulation.state.register_file.registers[22], 4)
         self.assertEqual(simulation.state.register_file.registers[27], 5)
         self.assertEqual(simulation.state.register_file.registers[0], 0)
+
+    def test_mnemonic_dispatch(self):
+        program = """
+        .data
+        var: .word 1, 2
+        text: .string "a"
+        .text
+        start:
+        addi x1, x0, 1
+        ADD x2, x1, x1
+        loop: lw x3, 4(x1)
+        lw x4, var
+        sw x4, var, x5
+        beq x1, x2, loop
+        beq x1, x2, 8
+        jal ra, start
+        jalr ra, 0(x1)
+        li x5, 0x10
+        la x6, var[1]
+        mv x7, x6
+        lui x8, 1
+        csrrwi x9, 0x300, 5
+        fence x0, x0
+        ecall
+        end: nop
+        """
+        dhrystone = (
+            Path(__file__).parent / "riscv_programs" / "dhrystone.s"
+        ).read_text()
+        for source in [program, dhrystone]:
+            parser = RiscvParser()
+            parser.program = source
+            parser._sanitize()
+            parser._tokenize()
+            for _, line, tokens in parser.token_list:
+                self.assertEqual(
+                    tokens.dump(), RiscvParser._pattern_line.parseString(line).dump()
+                )
+
+        # lines with a known mnemonic that the dispatched patterns do not match
+        for program, line_number, line in [
+            ("addi x1, x0, 1\nadd x0, x5", 2, "add x0, x5"),
+            ("nop\n\nlbl: ecall x1", 3, "lbl: ecall x1"),
+            ("foo x1, x2, x3", 1, "foo x1, x2, x3"),
+            (".data\nvar: .word x", 2, "var: .word x"),
+        ]:
+            with self.assertRaises(ParserSyntaxException) as cm:
+                RiscvParser().parse(program, RiscvArchitecturalState())
+            self.assertEqual(
+                cm.exception,
+                ParserSyntaxException(line_number=line_number, line=line),
+            )
@@ -2,6 +2,10 @@ import unittest
 import fixedint
 from architecture_simulator.uarch.memory.memory import Memory, AddressingType
 from architecture_simulator.simulation.riscv_simulation import RiscvSimulation
+from architecture_simulator.uarch.memory.cache import CacheOptions
+from architecture_simulator.isa.riscv.rv32i_instructions import SW
+from architecture_simulator.uarch.riscv.pipeline import Pipeline
+from tests.riscv_programs.fibonacci_recursive import get_fibonacci_recursive
 
 
 class TestRiscvPipeline(unittest.TestCase):
@@ -1450,3 +1454,318 @@ nop"""
         self.assertEqual(sim.state.performance_metrics.cycles, 9)
         self.assertEqual(sim.state.performance_metrics.instruction_count, 3)
         self.assertEqual(sim.state.memory.read_word(-4, False), 0)
+
+    def test_forwarding(self):
+        program = """
+        addi x1, x0, 11
+        addi x2, x1, 22
+        """
+        sim = RiscvSimulation(mode="five_stage_pipeline", forwarding=True)
+        sim.load_program(program)
+        sim.run()
+        self.assertEqual(sim.state.register_file.registers[2], 33)
+        self.assertEqual(sim.state.performance_metrics.cycles, 6)
+        self.assertEqual(sim.state.performance_metrics.stalls, 0)
+        self.assertEqual(sim.state.performance_metrics.stalls_removed_by_forwarding, 1)
+
+        # results of lui, jal, auipc and the alu from both the EX/MEM and MEM/WB registers
+        program = """
+        lui x1, 5
+        jal x2, next
+        next:
+        add x3, x1, x2
+        auipc x4, 1
+        sub x5, x4, x3
+        addi x6, x5, 3
+        add x7, x6, x5
+        """
+        for forwarding, cycles, stalls in [(False, 20, 4), (True, 14, 0)]:
+            sim = RiscvSimulation(mode="five_stage_pipeline", forwarding=forwarding)
+            sim.load_program(program)
+            sim.run()
+            self.assertEqual(
+                sim.state.register_file.registers[:8],
+                [0, 20480, 8, 20488, 4108, 4294950916, 4294950919, 4294934539],
+            )
+            self.assertEqual(sim.state.performance_metrics.cycles, cycles)
+            self.assertEqual(sim.state.performance_metrics.stalls, stalls)
+
+    def test_forwarding_unsigned_operands(self):
+        # forwarded results with bit 31 set have to be compared as unsigned values like the ones in the register file
+        program = """
+        .data
+        value: .half -2
+        .text
+        la t0, value
+        lui a0, 0xFFFFF
+        bgeu zero, a0, skip_1
+        addi a1, zero, 1
+        skip_1:
+        addi a2, zero, -8
+        srai a2, a2, 1
+        sltu a3, zero, a2
+        bltu a2, zero, skip_2
+        addi a4, zero, 1
+        skip_2:
+        lh a5, 0(t0)
+        addi x0, x0, 0
+        sltu a6, a5, a0
+        bgeu zero, a5, skip_3
+        addi a7, zero, 1
+        skip_3:
+        """
+        reference = RiscvSimulation(mode="single_stage_pipeline")
+        reference.load_program(program)
+        reference.run()
+        self.assertEqual(
+            reference.state.register_file.registers[11:18],
+            [1, 4294967292, 1, 1, 4294967294, 0, 1],
+        )
+        for forwarding in [False, True]:
+            with self.subTest(forwarding=forwarding):
+                sim = RiscvSimulation(mode="five_stage_pipeline", forwarding=forwarding)
+                sim.load_program(program)
+                sim.run()
+                self.assertEqual(
+                    sim.state.register_file.registers,
+                    reference.state.register_file.registers,
+                )
+
+    def test_forwarding_load_use(self):
+        program = """
+        .data
+        value: .word 7
+        .text
+        la x5, value
+        lw x1, 0(x5)
+        addi x2, x1, 1
+        sw x2, 4(x5)
+        lw x3, 4(x5)
+        add x4, x3, x1
+        """
+        sim = RiscvSimulation(mode="five_stage_pipeline", forwarding=True)
+        sim.load_program(program)
+        sim.run()
+        self.assertEqual(sim.state.register_file.registers[1:5], [7, 8, 8, 15])
+        self.assertEqual(sim.state.performance_metrics.cycles, 13)
+        # the two instructions that use a loaded value directly after the load
+        self.assertEqual(sim.state.performance_metrics.stalls, 2)
+        self.assertEqual(sim.state.performance_metrics.stalls_removed_by_forwarding, 3)
+
+    def test_forwarding_fibonacci(self):
+        program = get_fibonacci_recursive(8)
+        without_forwarding = RiscvSimulation(mode="five_stage_pipeline")
+        without_forwarding.load_program(program)
+        without_forwarding.run()
+        sim = RiscvSimulation(mode="five_stage_pipeline", forwarding=True)
+        sim.load_program(program)
+        sim.run()
+        self.assertEqual(sim.state.register_file.registers[10], 21)
+        self.assertEqual(
+            sim.state.register_file.registers,
+            without_forwarding.state.register_file.registers,
+        )
+        self.assertEqual(
+            sim.state.performance_metrics.instruction_count,
+            without_forwarding.state.performance_metrics.instruction_count,
+        )
+        self.assertLess(
+            sim.state.performance_metrics.cycles,
+            without_forwarding.state.performance_metrics.cycles,
+        )
+
+    def test_execution_latencies(self):
+        program = """
+        addi x1, x0, 3
+        addi x2, x0, 5
+        mul x3, x1, x2
+        mul x4, x1, x1
+        mul x5, x2, x2
+        addi x6, x0, 1
+        addi x7, x0, 1
+        addi x8, x0, 1
+        add x9, x3, x4
+        """
+        latencies = {"mul": 4, "div": 10}
+        for kwargs, cycles, stalls in [
+            ({}, 15, 1),
+            ({"execution_latencies": latencies}, 24, 4),
+            ({"execution_latencies": latencies, "pipelined_multiplier": True}, 15, 1),
+            ({"execution_latencies": latencies, "forwarding": True}, 22, 3),
+        ]:
+            with self.subTest(**kwargs):
+                sim = RiscvSimulation(mode="five_stage_pipeline", **kwargs)
+                sim.load_program(program)
+                sim.run()
+                self.assertEqual(
+                    sim.state.register_file.registers[1:10],
+                    [3, 5, 15, 9, 25, 1, 1, 1, 24],
+                )
+                self.assertEqual(sim.state.performance_metrics.cycles, cycles)
+                self.assertEqual(sim.state.performance_metrics.stalls, stalls)
+
+    def test_execution_latencies_dependent(self):
+        program = """
+        addi x1, x0, 3
+        addi x2, x0, 5
+        mul x3, x1, x2
+        add x4, x3, x3
+        div x5, x4, x1
+        mul x6, x5, x5
+        mul x6, x6, x6
+        addi x7, x6, 1
+        """
+        latencies = {"mul": 4, "div": 10}
+        for kwargs in [
+            {"execution_latencies": latencies},
+            {"execution_latencies": latencies, "pipelined_multiplier": True},
+            {"execution_latencies": latencies, "forwarding": True},
+            {
+                "execution_latencies": latencies,
+                "pipelined_multiplier": True,
+                "forwarding": True,
+            },
+        ]:
+            with self.subTest(**kwargs):
+                sim = RiscvSimulation(mode="five_stage_pipeline", **kwargs)
+                sim.load_program(program)
+                sim.run()
+                self.assertEqual(
+                    sim.state.register_file.registers[1:8],
+                    [3, 5, 15, 30, 10, 10000, 10001],
+                )
+
+    def test_pipelined_multiplier_flushed_result(self):
+        # the multiplication on the wrong path of the branch is flushed, so the add must not wait for its result
+        for previous in ["addi x0, x0, 0", "mul x5, x1, x1"]:
+            for destination in ["x5", "x11"]:
+                program = f"""
+                addi x1, x0, 3
+                {previous}
+                beq x0, x0, target
+                mul {destination}, x1, x1
+                target:
+                add x6, x5, x5
+                """
+                with self.subTest(previous=previous, destination=destination):
+                    sim = RiscvSimulation(
+                        mode="five_stage_pipeline",
+                        forwarding=True,
+                        pipelined_multiplier=True,
+                        execution_latencies={"mul": 10},
+                    )
+                    sim.load_program(program)
+                    sim.run()
+                    cycles = 16 if previous.startswith("mul") else 11
+                    stalls = 1 if previous.startswith("mul") else 0
+                    self.assertEqual(sim.state.performance_metrics.cycles, cycles)
+                    self.assertEqual(sim.state.performance_metrics.stalls, stalls)
+
+    def test_memory_stalls(self):
+        program = """
+        .data
+        a: .zero 64
+        .text
+        la x1, a
+        addi x2, x0, 16
+        loop:
+        sw x2, 0(x1)
+        lw x3, 0(x1)
+        add x4, x4, x3
+        addi x1, x1, 4
+        addi x2, x2, -1
+        bne x2, x0, loop
+        """
+        data_cache = CacheOptions(True, 1, 1, 1, "wb", "lru", 10)
+        instruction_cache = CacheOptions(True, 1, 1, 1, "wt", "lru", 7)
+        no_cache = CacheOptions(False, 0, 0, 1, "wb", "lru", 0)
+        for kwargs, cycles, stalls in [
+            ({"instruction_cache": no_cache, "memory_stalls": False}, 296, 34),
+            ({"instruction_cache": no_cache, "memory_stalls": True}, 296, 42),
+            ({"instruction_cache": instruction_cache, "memory_stalls": False}, 751, 34),
+            # misses of the IF stage overlap with the stalls of the other stages or are cut short by flushes
+            ({"instruction_cache": instruction_cache, "memory_stalls": True}, 679, 91),
+        ]:
+            with self.subTest(**kwargs):
+                sim = RiscvSimulation(
+                    mode="five_stage_pipeline", data_cache=data_cache, **kwargs
+                )
+                sim.load_program(program)
+                sim.run()
+                self.assertEqual(sim.state.register_file.registers[4], 136)
+                self.assertEqual(sim.state.performance_metrics.cycles, cycles)
+                self.assertEqual(sim.state.performance_metrics.stalls, stalls)
+                # every access is only counted once
+                stats = sim.get_data_cache_stats()
+                self.assertEqual((stats["hits"], stats["accesses"]), ("24", "32"))
+
+        # the first store misses and stays in the MA stage for 1 + 10 cycles
+        sim = RiscvSimulation(
+            mode="five_stage_pipeline", data_cache=data_cache, memory_stalls=True
+        )
+        sim.load_program(program)
+        cycles_in_ma = 0
+        while cycles_in_ma == 0 or isinstance(
+            sim.state.pipeline.pipeline_registers[3].instruction, SW
+        ):
+            sim.step()
+            if isinstance(sim.state.pipeline.pipeline_registers[3].instruction, SW):
+                cycles_in_ma += 1
+        self.assertEqual(cycles_in_ma, 11)
+        self.assertEqual(sim.state.performance_metrics.memory_cycles, 10)
+
+    def test_skip_stall_cycles(self):
+        sim = RiscvSimulation(
+            mode="five_stage_pipeline", execution_latencies={"div": 10}
+        )
+        sim.load_program("div x3, x1, x2")
+        sim.state.register_file.registers[1] = fixedint.UInt32(7)
+        sim.state.register_file.registers[2] = fixedint.UInt32(2)
+        pipeline = sim.state.pipeline
+        assert isinstance(pipeline, Pipeline)
+        for _ in range(3):
+            sim.step()
+            # the div has not reached the EX stage or has just started its stall
+            self.assertEqual(pipeline.skip_stall_cycles(), 0)
+        sim.step()
+        # the MA and WB stages are empty, only the last cycle of the stall is left
+        self.assertEqual(pipeline.skip_stall_cycles(), 7)
+        self.assertEqual(sim.state.performance_metrics.cycles, 11)
+        self.assertEqual(pipeline.skip_stall_cycles(), 0)
+        sim.run()
+        self.assertEqual(sim.state.register_file.registers[3], 3)
+        self.assertEqual(sim.state.performance_metrics.cycles, 14)
+        self.assertEqual(sim.state.performance_metrics.stalls, 1)
+
+        # run() counts the same cycles and stalls as stepping through every cycle
+        data_cache = CacheOptions(True, 1, 1, 1, "wb", "lru", 10)
+        instruction_cache = CacheOptions(True, 1, 1, 1, "wt", "lru", 7)
+        for memory_stalls in [False, True]:
+            with self.subTest(memory_stalls=memory_stalls):
+                simulations = [
+                    RiscvSimulation(
+                        mode="five_stage_pipeline",
+                        execution_latencies={"mul": 4, "div": 10},
+                        data_cache=data_cache,
+                        instruction_cache=instruction_cache,
+                        memory_stalls=memory_stalls,
+                    )
+                    for _ in range(2)
+                ]
+                for simulation in simulations:
+                    simulation.load_program(get_fibonacci_recursive(6))
+                simulations[0].run()
+                while simulations[1].step():
+                    pass
+                self.assertEqual(
+                    simulations[0].state.register_file.registers,
+                    simulations[1].state.register_file.registers,
+                )
+                self.assertEqual(
+                    simulations[0].state.performance_metrics.cycles,
+                    simulations[1].state.performance_metrics.cycles,
+                )
+                self.assertEqual(
+                    simulations[0].state.performance_metrics.stalls,
+                    simulations[1].state.performance_metrics.stalls,
+                )
@@ -13,6 +13,7 @@ from architecture_simulator.uarch.riscv.riscv_architectural_state import (
     RiscvArchitecturalState,
 )
 from architecture_simulator.simulation.riscv_simulation import RiscvSimulation
+from architecture_simulator.simulation.undo_log import UndoLog
 from architecture_simulator.isa.riscv.rv32i_instructions import ADDI, BNE, BEQ, JAL, LW
 from architecture_simulator.uarch.riscv.pipeline import InstructionExecutionException
 
@@ -395,3 +396,196 @@ class TestRiscvSimulation(unittest.TestCase):
         self.assertTrue(sim.has_started)
         sim.step()
         self.assertTrue(sim.has_started)
+
+    def test_functional_mode(self):
+        programm = """
+        .data
+        text: .string "Hi"
+        .text
+        addi x1, x0, 16
+        addi x2, x0, 10
+        loop:
+        add x3, x3, x1
+        addi x2, x2, -1
+        bne x2, zero, loop
+        la a0, text
+        li a7, 4
+        ecall
+        lui x4, 0x12345
+        la x8, text
+        sw x4, 4(x8)
+        lb x5, 6(x8)
+        jal ra, end
+        addi x6, x0, 1
+        end:
+        li a0, 3
+        li a7, 93
+        ecall
+        addi x7, x0, 1
+        """
+        single_stage = RiscvSimulation(mode="single_stage_pipeline")
+        single_stage.load_program(programm)
+        single_stage.run()
+        functional = RiscvSimulation(mode="functional")
+        functional.load_program(programm)
+        functional.run()
+        self.assertTrue(functional.is_done())
+        self.assertEqual(
+            functional.state.register_file.registers,
+            single_stage.state.register_file.registers,
+        )
+        self.assertEqual(
+            functional.get_data_memory_entries(),
+            single_stage.get_data_memory_entries(),
+        )
+        self.assertEqual(
+            functional.state.program_counter, single_stage.state.program_counter
+        )
+        self.assertEqual(functional.get_exit_code(), 3)
+        self.assertEqual(functional.get_output(), "Hi")
+        for attribute in [
+            "instruction_count",
+            "branch_count",
+            "procedure_count",
+            "cycles",
+        ]:
+            self.assertEqual(
+                getattr(functional.state.performance_metrics, attribute),
+                getattr(single_stage.state.performance_metrics, attribute),
+            )
+
+    def test_functional_mode_step(self):
+        simulation = RiscvSimulation(mode="functional")
+        simulation.load_program("addi x1, x0, 3\nadd x2, x1, x1\nlw x3, 0(x0)")
+        self.assertTrue(simulation.step())
+        self.assertEqual(simulation.state.register_file.registers[1], 3)
+        self.assertEqual(simulation.state.program_counter, 4)
+        self.assertTrue(simulation.step())
+        self.assertEqual(simulation.state.register_file.registers[2], 6)
+        with self.assertRaises(InstructionExecutionException) as context:
+            simulation.step()
+        self.assertEqual(context.exception.address, 8)
+        self.assertEqual(simulation.state.performance_metrics.instruction_count, 3)
+
+    def test_functional_mode_predecode(self):
+        simulation = RiscvSimulation(mode="functional")
+        simulation.load_program("addi x1, x0, 3\nadd x2, x1, x1")
+        engine = simulation.state.pipeline
+        self.assertIsNotNone(engine.predecoded)
+        self.assertEqual(len(engine.predecoded), 2)
+        simulation.run()
+        self.assertEqual(simulation.state.register_file.registers[2], 6)
+        self.assertEqual(simulation.state.previous_program_counter, 4)
+
+        # writing an instruction must invalidate the dispatch table
+        simulation.state.instruction_memory.write_instruction(4, ADDI(2, 1, 5))
+        simulation.state.program_counter = 0
+        simulation.run()
+        self.assertEqual(simulation.state.register_file.registers[2], 8)
+        self.assertEqual(simulation.state.performance_metrics.instruction_count, 4)
+        self.assertEqual(simulation.state.performance_metrics.cycles, 4)
+
+        # replacing the instructions must invalidate the dispatch table, too
+        simulation.state.instruction_memory.instructions = {0: ADDI(3, 0, 1)}
+        simulation.state.program_counter = 0
+        simulation.run()
+        self.assertEqual(simulation.state.register_file.registers[3], 1)
+        self.assertEqual(simulation.state.program_counter, 4)
+
+    def test_functional_mode_predecoded_exception(self):
+        simulation = RiscvSimulation(mode="functional")
+        simulation.load_program("addi x1, x0, 3\nlw x3, 0(x0)")
+        with self.assertRaises(InstructionExecutionException) as context:
+            simulation.run()
+        self.assertEqual(context.exception.address, 4)
+        self.assertEqual(context.exception.instruction_repr, "lw x3, 0(x0)")
+        self.assertEqual(simulation.state.performance_metrics.instruction_count, 2)
+
+    def test_checkpoint(self):
+        program = """
+        .data
+        a: .word 5
+        .text
+        la x1, a
+        lw x2, 0(x1)
+        addi x3, x0, 0
+        loop:
+        add x3, x3, x2
+        addi x2, x2, -1
+        bne x2, x0, loop
+        sw x3, 4(x1)
+        """
+        for mode in ["single_stage_pipeline", "five_stage_pipeline", "functional"]:
+            with self.subTest(mode=mode):
+                simulation = RiscvSimulation(mode=mode)
+                simulation.load_program(program)
+                while simulation.state.register_file.registers[2] == 0:
+                    simulation.step()
+                checkpoint = simulation.checkpoint()
+                address = int(simulation.state.register_file.registers[1]) + 4
+                cycles = simulation.state.performance_metrics.cycles
+                simulation.run()
+                self.assertEqual(simulation.state.memory.read_word(address), 15)
+                total_cycles = simulation.state.performance_metrics.cycles
+
+                # another input from the same state
+                simulation.restore(checkpoint)
+                self.assertEqual(simulation.state.performance_metrics.cycles, cycles)
+                self.assertEqual(simulation.state.memory.read_word(address), 0)
+                simulation.state.register_file.registers[2] = fixedint.UInt32(3)
+                simulation.run()
+                self.assertEqual(simulation.state.memory.read_word(address), 6)
+
+                # the checkpoint is not changed by the runs
+                simulation.restore(checkpoint)
+                simulation.run()
+                self.assertEqual(simulation.state.memory.read_word(address), 15)
+                self.assertEqual(
+                    simulation.state.performance_metrics.cycles, total_cycles
+                )
+
+    def test_step_back(self):
+        program = """
+        .data
+        a: .word 0
+        .text
+        la x2, a
+        addi x1, x0, 20
+        loop:
+        addi x1, x1, -1
+        sw x1, 0(x2)
+        bne x1, x0, loop
+        """
+        for mode in ["single_stage_pipeline", "five_stage_pipeline", "functional"]:
+            with self.subTest(mode=mode):
+                simulation = RiscvSimulation(mode=mode)
+                simulation.undo_log = UndoLog(checkpoint_interval=4, max_checkpoints=3)
+                simulation.load_program(program)
+                for _ in range(20):
+                    simulation.step()
+                self.assertEqual(simulation.step_back(5), 5)
+                reference = RiscvSimulation(mode=mode)
+                reference.load_program(program)
+                for _ in range(15):
+                    reference.step()
+                self.assertEqual(
+                    simulation.state.register_file.registers,
+                    reference.state.register_file.registers,
+                )
+                self.assertEqual(
+                    simulation.state.memory.memory_file,
+                    reference.state.memory.memory_file,
+                )
+                self.assertEqual(
+                    simulation.state.performance_metrics.cycles,
+                    reference.state.performance_metrics.cycles,
+                )
+                self.assertEqual(
+                    simulation.state.program_counter, reference.state.program_counter
+                )
+                # the oldest checkpoint is at step 8
+                self.assertEqual(simulation.step_back(10), 7)
+                self.assertEqual(simulation.step_back(), 0)
+                simulation.step()
+                simulation.run()
+                self.assertEqual(simulation.step_back(), 0)
@@ -0,0 +1,137 @@
+import unittest
+
+from architecture_simulator.simulation.riscv_simulation import RiscvSimulation
+from architecture_simulator.uarch.memory.cache import CacheOptions
+from architecture_simulator.uarch.memory.shared_cache import SharedCache
+
+
+class TestSharedCache(unittest.TestCase):
+    def test_access(self):
+        cache = SharedCache(
+            num_index_bits=0,
+            num_block_bits=0,
+            associativity=2,
+            hit_latency=2,
+            miss_penalty=10,
+        )
+        self.assertEqual(cache.access(0), 12)
+        self.assertEqual(cache.access(4), 12)
+        self.assertEqual(cache.access(0), 2)
+        # evicts 4
+        self.assertEqual(cache.access(8), 12)
+        self.assertEqual(cache.access(4), 12)
+        self.assertEqual(
+            cache.get_cache_stats(),
+            {
+                "hits": "1",
+                "accesses": "5",
+                "last_hit": False,
+                "amat": "10.00",
+                "compulsory_misses": "3",
+                "capacity_misses": "1",
+                "conflict_misses": "0",
+            },
+        )
+        # write backs allocate without being counted
+        cache.update(12)
+        self.assertEqual(cache.access(12), 2)
+        self.assertEqual(cache.accesses, 6)
+        cache.reset()
+        self.assertEqual(cache.access(12), 12)
+        self.assertEqual(cache.accesses, 1)
+
+    def test_write_no_allocate(self):
+        cache = SharedCache(
+            num_index_bits=0,
+            num_block_bits=0,
+            associativity=2,
+            miss_penalty=10,
+            cache_type="wt",
+        )
+        self.assertEqual(cache.access(0, is_write=True), 10)
+        cache.update(0)
+        self.assertEqual(cache.access(0, is_write=True), 10)
+        self.assertEqual(cache.access(0), 10)
+        self.assertEqual(cache.access(0, is_write=True), 0)
+
+    def test_hierarchy(self):
+        program = """
+        .data
+        a: .word 1
+        b: .word 2
+        .text
+        la x1, a
+        lw x2, 0(x1)
+        lw x3, 4(x1)
+        lw x4, 0(x1)
+        lw x5, 0(x1)
+        """
+        data_cache = CacheOptions(
+            enable=True,
+            num_index_bits=0,
+            num_block_bits=0,
+            associativity=1,
+            cache_type="wb",
+            replacement_strategy="lru",
+            miss_penalty=100,
+            hit_latency=1,
+        )
+        instruction_cache = CacheOptions(
+            enable=True,
+            num_index_bits=0,
+            num_block_bits=1,
+            associativity=1,
+            cache_type="wt",
+            replacement_strategy="lru",
+            miss_penalty=100,
+        )
+        # a and b are in the same block of the L2 cache, but not of the data cache
+        l2_cache = CacheOptions(
+            enable=True,
+            num_index_bits=1,
+            num_block_bits=1,
+            associativity=2,
+            cache_type="wb",
+            replacement_strategy="lru",
+            miss_penalty=20,
+            hit_latency=3,
+        )
+
+        simulation = RiscvSimulation(data_cache=data_cache, l2_cache=l2_cache)
+        simulation.load_program(program)
+        simulation.run()
+        self.assertEqual(simulation.state.register_file.registers[2:6], [1, 2, 1, 1])
+        # data cache: L2 miss (1 + 3 + 20), L2 hit (1 + 3) twice, hit (1)
+        self.assertEqual(simulation.state.performance_metrics.cycles, 6 + 33)
+        data_stats = simulation.get_data_cache_stats()
+        self.assertEqual(data_stats["amat"], "8.25")
+        l2_stats = simulation.get_l2_cache_stats()
+        assert l2_stats is not None
+        self.assertEqual((l2_stats["hits"], l2_stats["accesses"]), ("2", "3"))
+        self.assertEqual(l2_stats["amat"], "9.67")
+        self.assertEqual(
+            simulation.get_cache_stats_repr(),
+            "L1 data cache: hits: 1, misses: 3, AMAT: 8.25 cycles, compulsory: 2, capacity: 1, conflict: 0\n"
+            + "L2 cache: hits: 2, misses: 1, AMAT: 9.67 cycles, compulsory: 1, capacity: 0, conflict: 0\n",
+        )
+
+        # the instruction cache misses share the L2 cache
+        simulation = RiscvSimulation(
+            data_cache=data_cache,
+            instruction_cache=instruction_cache,
+            l2_cache=l2_cache,
+        )
+        simulation.load_program(program)
+        simulation.run()
+        # three instruction blocks that miss in the L2 cache (3 + 20)
+        self.assertEqual(simulation.state.performance_metrics.cycles, 6 + 69 + 33)
+        l2_stats = simulation.get_l2_cache_stats()
+        assert l2_stats is not None
+        self.assertEqual((l2_stats["hits"], l2_stats["accesses"]), ("2", "6"))
+
+        # without the L2 cache, every miss costs the miss penalty
+        simulation = RiscvSimulation(data_cache=data_cache)
+        simulation.load_program(program)
+        simulation.run()
+        self.assertIsNone(simulation.get_l2_cache_stats())
+        self.assertEqual(simulation.state.performance_metrics.cycles, 6 + 4 + 300)
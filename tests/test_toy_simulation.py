@@ -228,3 +228,23 @@ INC"""
         self.assertTrue(sim.has_started)
         sim.step()
         self.assertTrue(sim.has_started)
+
+    def test_step_back(self):
+        sim = ToySimulation()
+        sim.load_program(
+            ".data\na: .word 0\nb: .word 0\n.text\nINC\nSTO a\nINC\nADD a\nSTO b"
+        )
+        sim.step()
+        sim.step()
+        sim.single_step()
+        self.assertEqual(sim.state.accu, 2)
+        self.assertEqual(sim.step_back(3), 3)
+        self.assertEqual(sim.state.accu, 1)
+        self.assertEqual(sim.next_cycle, 1)
+        self.assertEqual(sim.state.performance_metrics.cycles, 2)
+        sim.run()
+        self.assertEqual(sim.state.memory.read_halfword(4094), 3)
+        # everything can be undone
+        self.assertEqual(sim.step_back(100), 10)
+        self.assertFalse(sim.has_started)
+        self.assertEqual(sim.state.memory.read_halfword(4095), 0)
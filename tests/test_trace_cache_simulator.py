@@ -0,0 +1,120 @@
+import os
+import random
+import tempfile
+import unittest
+
+from architecture_simulator.simulation.riscv_simulation import RiscvSimulation
+from architecture_simulator.uarch.memory.access_trace import (
+    AccessTracer,
+    replay_access_trace,
+)
+from architecture_simulator.uarch.memory.cache import Cache
+from architecture_simulator.uarch.memory.decoded_address import DecodedAddress
+from architecture_simulator.uarch.memory.replacement_strategies import LRU, PLRU
+from architecture_simulator.uarch.memory.trace_cache_simulator import (
+    decode_addresses,
+    load_trace,
+    simulate_cache,
+)
+from tests.riscv_programs.fibonacci_recursive import get_fibonacci_recursive
+from tests.test_access_trace import cache_options
+
+
+class TestTraceCacheSimulator(unittest.TestCase):
+    def test_decode_addresses(self):
+        addresses = [0, 4, 0x1234, 0xFFFFFFFF, 0xDEADBEEC]
+        for num_index_bits, num_block_bits in [(0, 0), (2, 1), (3, 3)]:
+            tags, set_indices = decode_addresses(
+                addresses, num_index_bits, num_block_bits
+            )
+            for address, tag, set_index in zip(addresses, tags, set_indices):
+                decoded_address = DecodedAddress(
+                    num_index_bits, num_block_bits, address
+                )
+                self.assertEqual(tag, decoded_address.tag)
+                self.assertEqual(set_index, decoded_address.cache_set_index)
+
+    def test_same_as_cache(self):
+        rng = random.Random(7)
+        addresses = [rng.randrange(0, 512) * 4 for _ in range(3000)]
+        is_write = bytes(rng.randrange(2) for _ in addresses)
+        for replacement_strategy in [LRU, PLRU]:
+            for num_index_bits, num_block_bits, associativity in [
+                (0, 0, 1),
+                (0, 1, 8),
+                (2, 0, 4),
+                (3, 2, 2),
+            ]:
+                for write_allocate in [True, False]:
+                    cache = Cache(
+                        num_index_bits,
+                        num_block_bits,
+                        associativity,
+                        replacement_strategy,
+                    )
+                    expected = bytearray()
+                    for address, write in zip(addresses, is_write):
+                        decoded_address = DecodedAddress(
+                            num_index_bits, num_block_bits, address
+                        )
+                        if cache.read_block(decoded_address) is not None:
+                            expected.append(1)
+                            continue
+                        expected.append(0)
+                        if write_allocate or not write:
+                            cache.write_block(
+                                decoded_address, [0] * 2**num_block_bits, False
+                            )
+                    hits = simulate_cache(
+                        addresses,
+                        num_index_bits,
+                        num_block_bits,
+                        associativity,
+                        "lru" if replacement_strategy is LRU else "plru",
+                        is_write,
+                        write_allocate,
+                    )
+                    self.assertEqual(hits, expected)
+
+    def test_trace_file(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        path = os.path.join(directory.name, "trace.bin")
+        simulation = RiscvSimulation(
+            data_cache=cache_options(0, 0, 1),
+            instruction_cache=cache_options(0, 0, 1),
+        )
+        simulation.load_program(get_fibonacci_recursive(6))
+        with AccessTracer(path, simulation.state):
+            simulation.run()
+
+        for options in [
+            cache_options(1, 1, 2),
+            cache_options(2, 0, 4, "wt", "plru"),
+            cache_options(0, 2, 2, "wt"),
+        ]:
+            addresses, is_write = load_trace(path)
+            hits = simulate_cache(
+                addresses,
+                options.num_index_bits,
+                options.num_block_bits,
+                options.associativity,
+                options.replacement_strategy,
+                is_write,
+                write_allocate=options.cache_type != "wt",
+            )
+            result = replay_access_trace(path, options)
+            self.assertEqual(len(hits), result.accesses)
+            self.assertEqual(sum(hits), result.hits)
+
+            addresses, _ = load_trace(path, instruction_fetches=True)
+            hits = simulate_cache(
+                addresses,
+                options.num_index_bits,
+                options.num_block_bits,
+                options.associativity,
+                options.replacement_strategy,
+            )
+            result = replay_access_trace(path, options, instruction_cache=True)
+            self.assertEqual(len(hits), result.accesses)
+            self.assertEqual(sum(hits), result.hits)
@@ -18,6 +18,7 @@ export const riscvSettings = {
         num_block_bits: 0,
         associativity: 4,
         miss_penalty: 0,
+        hit_latency: 0,
         replacement_strategy: "lru",
         cache_type: "wb",
         showPlruTree: ref(true), // not needed for python but for the gui
@@ -28,11 +29,25 @@ export const riscvSettings = {
         num_block_bits: 0,
         associativity: 4,
         miss_penalty: 0,
+        hit_latency: 0,
         replacement_strategy: "lru",
         cache_type: "wt", // doesn't matter except dirty bit would be shown with wb
         showPlruTree: ref(true), // not needed for python but for the gui
     }),
+    // unified cache behind the data and instruction cache, only shown in the stats
+    l2Cache: ref({
+        enable: false,
+        num_index_bits: 4,
+        num_block_bits: 2,
+        associativity: 4,
+        miss_penalty: 0,
+        hit_latency: 0,
+        replacement_strategy: "lru",
+        cache_type: "wb",
+        showPlruTree: ref(false), // not needed for python but for the gui
+    }),
     visContainerSelection: ref("Processor"),
     dataCacheTooBig: ref(false),
     instructionCacheTooBig: ref(false),
+    l2CacheTooBig: ref(false),
 };
@@ -41,7 +41,8 @@ export class RiscvSimulationStore extends BaseSimulationStore {
                 riscvSettings.pipelineMode.value,
                 riscvSettings.dataHazardDetection.value,
                 riscvSettings.dataCache.value,
-                riscvSettings.instructionCache.value
+                riscvSettings.instructionCache.value,
+                riscvSettings.l2Cache.value
             )
         );
         this.registerEntries = [];
@@ -57,6 +58,7 @@ export class RiscvSimulationStore extends BaseSimulationStore {
         this.instructionCacheStats = null;
         this.dataCacheEntries = null;
         this.dataCacheStats = null;
+        this.l2CacheStats = null;
         this.output = "";
         this.exitCode = null;
     }
@@ -102,6 +104,13 @@ export class RiscvSimulationStore extends BaseSimulationStore {
         );
     }
 
+    /**
+     * Syncs the L2 cache stats.
+     */
+    syncL2Cache() {
+        this.l2CacheStats = this.toJsSafe(this.simulation.get_l2_cache_stats());
+    }
+
     /**
      * Syncs the memory table entries.
      * Also keeps track of which entries have changed.
@@ -177,6 +186,7 @@ export class RiscvSimulationStore extends BaseSimulationStore {
         this.syncSvgDirectives();
         this.syncInstructionCache();
         this.syncDataCache();
+        this.syncL2Cache();
         this.syncOutput();
         this.syncExitCode();
         super.syncAll();